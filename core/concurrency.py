@@ -0,0 +1,29 @@
+# core/concurrency.py
+"""
+Primitivas de troca entre threads do simulador
+- LatestValue: último valor publicado, um escritor e vários leitores, sem locks
+  (parâmetros do control loading e do som, estado da estação do instrutor)
+"""
+
+
+class LatestValue:
+    """
+    Caixa de valor mais recente, um escritor e qualquer número de leitores
+    Atribuir/ler uma referência é atômico no CPython: com objetos imutáveis o
+    leitor sempre vê um valor inteiro, sem locks e sem bloquear o escritor
+    """
+
+    def __init__(self, value=None):
+        self._value = value
+        self._sequence = 0
+
+    def write(self, value):
+        self._value = value
+        self._sequence += 1
+
+    def read(self):
+        return self._value
+
+    @property
+    def sequence(self) -> int:
+        return self._sequence
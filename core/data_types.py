@@ -19,6 +19,7 @@ class ControlInputs:
     rudder: float            # [-1,1]
     flaps: float = 0.0       # [0,1]
     gear: float = 1.0        # [0,1] (baixado=1)
+    brakes: float = 0.0      # [0,1]
 
 # Estado da aeronave (convenção corpo e Euler)
 @dataclass
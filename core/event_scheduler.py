@@ -0,0 +1,120 @@
+# core/event_scheduler.py
+"""
+Agenda de eventos em tempo simulado (fila de prioridade)
+- Heap ordenado por (instante, prioridade, ordem de criação): por frame só são
+  examinados os eventos vencidos, sem contadores nem testes de módulo em cada módulo
+- every(período): periódico, instantes k·período a partir do início (sem deriva
+  acumulada); frames longos demais disparam uma vez e pulam os instantes perdidos,
+  a menos que catch_up=True
+- at(t) / after(atraso): uma vez, em tempo simulado absoluto ou relativo
+- Cancelamento preguiçoso: o evento cancelado fica no heap e é descartado ao vencer
+- Tempo sempre o da simulação: o mesmo roteiro de eventos em tempo real ou acelerado
+"""
+
+from dataclasses import dataclass, field
+import heapq
+import itertools
+from typing import Callable, List, Optional, Tuple
+
+from core.sim_logging import get_logger
+
+_log = get_logger('events')
+
+
+@dataclass(eq=False)
+class ScheduledEvent:
+    callback: Callable[[], None]
+    time: float                          # próximo disparo [s de simulação]
+    period: Optional[float] = None       # None = uma vez só
+    priority: int = 0                    # menor dispara antes no mesmo instante
+    name: str = ''
+    catch_up: bool = False
+    start: float = 0.0
+    occurrences: int = 0                 # quantas vezes já disparou
+    cancelled: bool = field(default=False, repr=False)
+
+    def cancel(self):
+        self.cancelled = True
+
+    @property
+    def pending(self) -> bool:
+        return not self.cancelled and (self.period is not None or self.occurrences == 0)
+
+
+class EventScheduler:
+    """Eventos por instante de simulação; run_due(t) dispara tudo que venceu até t"""
+
+    # Tolerância na comparação de instantes (k·dt acumulado vs. k·período exato)
+    EPSILON = 1e-9
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, int, ScheduledEvent]] = []
+        self._sequence = itertools.count()
+        self.time = 0.0
+        self.dispatched = 0
+        self.errors = 0
+
+    def __len__(self) -> int:
+        return sum(1 for *_, event in self._heap if not event.cancelled)
+
+    def _push(self, event: ScheduledEvent) -> ScheduledEvent:
+        heapq.heappush(self._heap, (event.time, event.priority, next(self._sequence), event))
+        return event
+
+    def at(self, time_s: float, callback: Callable[[], None], priority: int = 0, name: str = '') -> ScheduledEvent:
+        """Uma vez, no instante de simulação dado (no passado = no próximo run_due)"""
+        return self._push(ScheduledEvent(callback, float(time_s), priority=priority, name=name))
+
+    def after(self, delay: float, callback: Callable[[], None], priority: int = 0, name: str = '') -> ScheduledEvent:
+        if delay < 0.0:
+            raise ValueError(f"Atraso deve ser >= 0, recebido {delay}")
+        return self.at(self.time + delay, callback, priority, name)
+
+    def every(self, period: float, callback: Callable[[], None], start: Optional[float] = None,
+              priority: int = 0, name: str = '', catch_up: bool = False) -> ScheduledEvent:
+        """Periódico; primeiro disparo em start (padrão: agora + período)"""
+        if not period > 0.0:
+            raise ValueError(f"Período deve ser positivo, recebido {period}")
+        start = self.time + period if start is None else float(start)
+        return self._push(ScheduledEvent(callback, start, period=float(period), priority=priority, name=name,
+                                         catch_up=catch_up, start=start))
+
+    def next_time(self) -> Optional[float]:
+        """Instante do próximo evento ativo (None se a agenda estiver vazia)"""
+        heap = self._heap
+        while heap and heap[0][3].cancelled:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def run_due(self, now: float) -> int:
+        """Dispara, em ordem, todos os eventos com instante <= now; devolve quantos"""
+        self.time = now
+        heap = self._heap
+        limit = now + self.EPSILON
+        count = 0
+        while heap and heap[0][0] <= limit:
+            _, _, _, event = heapq.heappop(heap)
+            if event.cancelled:
+                continue
+            event.occurrences += 1
+            if event.period is not None:
+                # Instante seguinte calculado a partir do início: sem deriva de soma
+                if event.catch_up:
+                    event.time = event.start + event.occurrences * event.period
+                else:
+                    missed = int((now - event.start) / event.period + self.EPSILON)
+                    event.occurrences = max(event.occurrences, missed + 1)
+                    event.time = event.start + event.occurrences * event.period
+                self._push(event)
+            try:
+                event.callback()
+            except Exception as e:
+                self.errors += 1
+                name = event.name or repr(event.callback)
+                _log.error("❌ Erro no evento %s em t=%.3fs: %s", name, now, e, extra={'aggregate': name})
+            count += 1
+        self.dispatched += count
+        return count
+
+    def clear(self):
+        self._heap.clear()
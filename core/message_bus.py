@@ -1,5 +1,10 @@
 # core/message_bus.py
 
+from core.sim_logging import get_logger
+
+_log = get_logger('bus')
+
+
 class MessageBus:
     def __init__(self):
         # Dicionário: tópico -> lista de funções inscritas
@@ -10,16 +15,18 @@ class MessageBus:
         if topic not in self.subscribers:
             self.subscribers[topic] = []
         self.subscribers[topic].append(callback)
-        print(f"✅ Nova inscrição no tópico: {topic}")
+        _log.debug("✅ Nova inscrição no tópico: %s", topic)
 
     def publish(self, topic, message):
         """Publica uma mensagem para todos inscritos no tópico"""
-        if topic in self.subscribers:
-            for callback in self.subscribers[topic]:
-                try:
-                    callback(message)  # Chama cada função inscrita
-                except Exception as e:
-                    print(f"❌ Erro ao entregar mensagem: {e}")
-            print(f"📤 Mensagem publicada em '{topic}': {message}")
-        else:
-            print(f"⚠️  Tópico '{topic}' sem inscritos")
\ No newline at end of file
+        # Caminho quente: nada é formatado aqui (logs de debug desligados custam só o teste de nível)
+        subscribers = self.subscribers.get(topic)
+        if subscribers is None:
+            _log.debug("⚠️  Tópico '%s' sem inscritos", topic)
+            return
+        for callback in subscribers:
+            try:
+                callback(message)  # Chama cada função inscrita
+            except Exception as e:
+                _log.error("❌ Erro ao entregar mensagem em '%s': %s", topic, e)
+        _log.debug("📤 Mensagem publicada em '%s'", topic)
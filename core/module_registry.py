@@ -0,0 +1,236 @@
+# core/module_registry.py
+"""
+Registro de módulos guiado por configuração
+- YAML lido e validado uma vez; forma já parseada em cache por caminho + mtime
+- Só os módulos listados em modules.enabled são importados, e só na hora de construir
+- Cada módulo é um entry point "pacote.modulo:Classe" + fábrica que sabe montar o
+  construtor a partir do contexto (bus, configs, dt); plugins externos entram pelo
+  grupo de entry points "flightsim.modules" (fábrica(contexto) → módulo)
+- Tempo de import e de construção medidos por módulo (report()), mais o aquecimento
+  dos kernels numéricos do backend escolhido em simulation.kernels
+"""
+
+import copy
+from dataclasses import dataclass
+import importlib
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+from utils import jit
+
+ENTRY_POINT_GROUP = "flightsim.modules"
+
+# caminho absoluto → (mtime_ns, tamanho, config parseada)
+_CONFIG_CACHE: Dict[str, Tuple[int, int, dict]] = {}
+
+
+def load_yaml(path: str) -> dict:
+    """
+    YAML parseado uma vez por versão do arquivo; devolve cópia (quem recebe pode
+    alterar sem contaminar o cache)
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    cached = _CONFIG_CACHE.get(path)
+    if cached is None or cached[0] != stat.st_mtime_ns or cached[1] != stat.st_size:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = (stat.st_mtime_ns, stat.st_size, yaml.safe_load(f) or {})
+        _CONFIG_CACHE[path] = cached
+    return copy.deepcopy(cached[2])
+
+
+def load_simulation_config(path: str) -> dict:
+    config = load_yaml(path)
+    validate_simulation_config(config)
+    return config
+
+
+def validate_simulation_config(config: dict):
+    """Erros de estrutura aparecem na partida, não no primeiro frame"""
+    simulation = config.get('simulation')
+    if not isinstance(simulation, dict):
+        raise ValueError("Seção 'simulation' ausente")
+    frame_rate = simulation.get('frame_rate')
+    if isinstance(frame_rate, bool) or not isinstance(frame_rate, int) or frame_rate <= 0:
+        raise ValueError(f"simulation.frame_rate deve ser inteiro positivo (Hz), recebido {frame_rate!r}")
+    enabled = config.get('modules', {}).get('enabled')
+    if not isinstance(enabled, list) or not all(isinstance(name, str) for name in enabled):
+        raise ValueError("modules.enabled deve ser uma lista de nomes de módulo")
+    kernels = simulation.get('kernels', 'python')
+    if kernels not in jit.BACKENDS:
+        raise ValueError(f"simulation.kernels deve ser um de {jit.BACKENDS}, recebido {kernels!r}")
+    duplicated = {name for name in enabled if enabled.count(name) > 1}
+    if duplicated:
+        raise ValueError(f"Módulos repetidos em modules.enabled: {sorted(duplicated)}")
+
+
+@dataclass
+class ModuleContext:
+    """O que as fábricas precisam para montar qualquer módulo"""
+    bus: Any
+    simulation_config: dict
+    vehicle_config: dict
+    dt: float
+
+
+@dataclass(frozen=True)
+class ModuleSpec:
+    name: str
+    entry_point: str                                  # "pacote.modulo:Classe"
+    build: Callable[[Any, ModuleContext], Any]        # (classe, contexto) → instância
+    switch: Optional[Tuple[str, str]] = None          # ('vehicle' | 'simulation', seção) com enabled: true
+
+
+def _xplane_interface(cls, ctx: ModuleContext):
+    xplane = ctx.simulation_config['xplane']
+    initial = ctx.simulation_config['aircraft']['initial_conditions']
+    return cls(ctx.bus, xplane['host'], xplane['port'], origin=(initial['latitude'], initial['longitude'], 0.0),
+               visual_output=xplane.get('visual_output'), backend=xplane.get('backend'),
+               dt=ctx.dt)
+
+
+def _landing_gear(cls, ctx: ModuleContext):
+    from systems.landing_gear import GroundModel
+    return cls(ctx.bus, ctx.vehicle_config, GroundModel.from_config(ctx.simulation_config['ground']), dt=ctx.dt)
+
+
+def _with_dt(cls, ctx: ModuleContext):
+    return cls(ctx.bus, dt=ctx.dt)
+
+
+def _with_vehicle(cls, ctx: ModuleContext):
+    return cls(ctx.bus, ctx.vehicle_config, dt=ctx.dt)
+
+
+def _with_simulation(cls, ctx: ModuleContext):
+    return cls(ctx.bus, ctx.simulation_config, dt=ctx.dt)
+
+
+# Ordem de registro no orquestrador = ordem desta tabela (IOS aplica comandos no início
+# do frame; propulsão antes da dinâmica para o empuxo valer no mesmo frame)
+BUILTIN_MODULES: Dict[str, ModuleSpec] = {spec.name: spec for spec in [
+    ModuleSpec('instructor_station', 'interfaces.instructor_station:InstructorStation', _with_simulation,
+               switch=('simulation', 'instructor_station')),
+    ModuleSpec('xplane_interface', 'interfaces.xplane_interface:XPlaneInterface', _xplane_interface),
+    ModuleSpec('scripted_inputs', 'interfaces.scripted_inputs:ScriptedInputs', _with_simulation,
+               switch=('simulation', 'scripted_inputs')),
+    ModuleSpec('control_loading', 'interfaces.control_loading:ControlLoading', _with_vehicle,
+               switch=('vehicle', 'control_loading')),
+    ModuleSpec('flight_controls', 'systems.flight_controls:FlightControls', _with_vehicle),
+    ModuleSpec('propulsion', 'systems.propulsion:Propulsion', lambda cls, ctx: cls(ctx.bus, ctx.vehicle_config)),
+    ModuleSpec('mass_properties', 'dynamics.mass_properties:MassProperties', _with_vehicle),
+    ModuleSpec('landing_gear', 'systems.landing_gear:LandingGear', _landing_gear),
+    ModuleSpec('weather', 'systems.weather:Weather', _with_simulation),
+    ModuleSpec('flight_dynamics', 'dynamics.flight_dynamics:SimpleFlightDynamics', _with_dt),
+    ModuleSpec('traffic', 'systems.traffic:Traffic', _with_simulation, switch=('simulation', 'traffic')),
+    ModuleSpec('instruments', 'systems.instruments:Instruments', _with_vehicle),
+    ModuleSpec('navigation', 'systems.navigation:Navigation', _with_simulation),
+    ModuleSpec('motion_cueing', 'visual_systems.motion_cueing:MotionCueing', _with_simulation),
+    ModuleSpec('sound_system', 'visual_systems.sound_system:SoundSystem', _with_vehicle,
+               switch=('vehicle', 'sound')),
+]}
+
+
+def resolve_entry_point(entry_point: str):
+    module_name, _, attribute = entry_point.partition(':')
+    target = importlib.import_module(module_name)
+    for part in attribute.split('.') if attribute else ():
+        target = getattr(target, part)
+    return target
+
+
+def _plugin_spec(name: str) -> Optional[ModuleSpec]:
+    """Procura nos pacotes instalados; só chamado para nomes que não são internos"""
+    from importlib.metadata import entry_points
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        if ep.name == name:
+            return ModuleSpec(name, ep.value, lambda factory, ctx: factory(ctx))
+    return None
+
+
+@dataclass
+class ModuleTiming:
+    name: str
+    import_time: float    # s
+    init_time: float      # s
+
+
+class ModuleRegistry:
+    """
+    Monta os módulos habilitados na configuração, na ordem de BUILTIN_MODULES
+    (plugins depois, na ordem em que aparecem em modules.enabled)
+    """
+
+    def __init__(self, simulation_config: dict, vehicle_config: dict):
+        validate_simulation_config(simulation_config)
+        self.simulation_config = simulation_config
+        self.vehicle_config = vehicle_config
+        self.frame_rate = simulation_config['simulation']['frame_rate']
+        self.enabled = list(simulation_config['modules']['enabled'])
+        self.specs = self._select_specs()
+        self.modules: Dict[str, Any] = {}
+        self.timings: List[ModuleTiming] = []
+        self.kernel_warmup = 0.0   # s
+
+    @classmethod
+    def from_files(cls, simulation_path: str, vehicle_path: str) -> 'ModuleRegistry':
+        return cls(load_simulation_config(simulation_path), load_yaml(vehicle_path))
+
+    def _select_specs(self) -> List[ModuleSpec]:
+        configs = {'simulation': self.simulation_config, 'vehicle': self.vehicle_config}
+        unknown = [name for name in self.enabled if name not in BUILTIN_MODULES]
+        plugins = []
+        for name in unknown:
+            spec = _plugin_spec(name)
+            if spec is None:
+                raise ValueError(f"Módulo desconhecido em modules.enabled: '{name}' "
+                                 f"(internos: {', '.join(BUILTIN_MODULES)})")
+            plugins.append(spec)
+
+        specs = []
+        for spec in list(BUILTIN_MODULES.values()) + plugins:
+            if spec.name not in self.enabled:
+                continue
+            if spec.switch is not None:
+                source, section = spec.switch
+                if not configs[source].get(section, {}).get('enabled', False):
+                    continue
+            specs.append(spec)
+        return specs
+
+    def build(self, bus, dt: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Importa e constrói cada módulo habilitado; nome → instância, na ordem de registro.
+        O backend dos kernels é escolhido antes (os módulos alocam buffers no construtor)
+        e os kernels são aquecidos depois, ainda na partida
+        """
+        jit.select_backend(self.simulation_config['simulation'].get('kernels'))
+        context = ModuleContext(bus, self.simulation_config, self.vehicle_config,
+                                dt if dt is not None else 1.0 / self.frame_rate)
+        for spec in self.specs:
+            start = time.perf_counter()
+            target = resolve_entry_point(spec.entry_point)
+            imported = time.perf_counter()
+            self.modules[spec.name] = spec.build(target, context)
+            self.timings.append(ModuleTiming(spec.name, imported - start, time.perf_counter() - imported))
+        self.kernel_warmup = jit.warm_up()
+        return self.modules
+
+    def register_all(self, orchestrator):
+        for module in self.modules.values():
+            orchestrator.register_module(module)
+
+    def total_time(self) -> float:
+        return sum(t.import_time + t.init_time for t in self.timings) + self.kernel_warmup
+
+    def report(self) -> str:
+        """Tabela de partida: import e construção por módulo, mais lento primeiro"""
+        lines = [f"{'módulo':20s} {'import':>9s} {'init':>9s}"]
+        for t in sorted(self.timings, key=lambda t: t.import_time + t.init_time, reverse=True):
+            lines.append(f"{t.name:20s} {t.import_time * 1e3:7.1f}ms {t.init_time * 1e3:7.1f}ms")
+        lines.append(f"{'kernels (' + jit.backend() + ')':20s} {'':9s} {self.kernel_warmup * 1e3:7.1f}ms")
+        lines.append(f"{'total':20s} {self.total_time() * 1e3:17.1f}ms")
+        return "\n".join(lines)
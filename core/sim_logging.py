@@ -0,0 +1,248 @@
+# core/sim_logging.py
+"""
+Logging do simulador fora do caminho quente
+- Categorias = loggers "flightsim.<categoria>" (bus, orchestrator, dynamics, xplane...)
+- No thread do frame só acontece: teste de nível (cacheado pelo logging), filtro de
+  taxa e um put_nowait numa fila limitada; nada é formatado nem escrito ali
+- Formatação preguiçosa: mensagem com %-args, montada só na thread escritora (passe
+  escalares, não objetos que o frame seguinte vai alterar); nível desligado custa só
+  a checagem de nível
+- Limite de taxa por (categoria, modelo, argumentos): até 'burst' registros por
+  janela; o resto é contado e sai agregado. Mensagens com argumentos que mudam a
+  cada frame (nº do frame, tempo) agregam por uma chave explícita:
+  extra={'aggregate': 'frame_overrun'} → "Frame 36 atrasado ... (×37 em 1 s)"
+- Fila cheia descarta e conta, nunca bloqueia o frame
+- Sem configure_logging() os registros seguem as regras padrão do logging (avisos e
+  erros no stderr, info/debug descartados) - testes e rodadas em lote ficam quietos
+"""
+
+from dataclasses import dataclass
+import logging
+import math
+import queue
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT_LOGGER = 'flightsim'
+DEFAULT_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def get_logger(category: str) -> logging.Logger:
+    return logging.getLogger(f'{ROOT_LOGGER}.{category}')
+
+
+@dataclass
+class _Window:
+    start: float
+    count: int
+    suppressed: int = 0
+    last: Optional[logging.LogRecord] = None
+
+
+class RateLimiter(logging.Filter):
+    """
+    Até burst registros por janela de interval segundos por (categoria, modelo, argumentos)
+    ou (categoria, modelo, record.aggregate) quando a chamada define a chave de agregação;
+    os suprimidos saem depois como um registro de resumo (drain)
+    """
+
+    def __init__(self, interval: float = 1.0, burst: int = 5, overrides: Dict[str, Tuple[float, int]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self.overrides = {f'{ROOT_LOGGER}.{k}' if not k.startswith(ROOT_LOGGER) else k: v
+                          for k, v in (overrides or {}).items()}
+        self.clock = clock
+        self.suppressed = 0
+        self._windows: Dict[Tuple[str, object, object], _Window] = {}
+        self._pending: List[logging.LogRecord] = []
+        self._lock = threading.Lock()
+
+    def _limits(self, name: str) -> Tuple[float, int]:
+        return self.overrides.get(name, (self.interval, self.burst))
+
+    @staticmethod
+    def _key(record: logging.LogRecord) -> Tuple[str, object, object]:
+        aggregate = getattr(record, 'aggregate', None)
+        if aggregate is not None:
+            return record.name, record.msg, aggregate
+        # Escalares entram como estão; objetos (exceções) pelo repr, estável entre frames
+        args = record.args if isinstance(record.args, tuple) else (record.args,)
+        return record.name, record.msg, tuple(a if isinstance(a, _SCALARS) else repr(a) for a in args)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        interval, burst = self._limits(record.name)
+        key = self._key(record)
+        now = self.clock()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window.start >= interval:
+                if window is not None and window.suppressed:
+                    self._pending.append(self._summary(window, interval))
+                self._windows[key] = _Window(now, 1)
+                return True
+            if window.count < burst:
+                window.count += 1
+                return True
+            window.suppressed += 1
+            window.last = record
+            self.suppressed += 1
+            return False
+
+    @staticmethod
+    def _summary(window: _Window, interval: float) -> logging.LogRecord:
+        last = window.last
+        total = window.count + window.suppressed
+        return logging.makeLogRecord(dict(last.__dict__, msg=f"{last.getMessage()} (×{total} em {interval:g} s)",
+                                          args=None))
+
+    def drain(self, flush: bool = False) -> List[logging.LogRecord]:
+        """Resumos das janelas já encerradas (flush=True: de todas, ao encerrar)"""
+        now = math.inf if flush else self.clock()
+        with self._lock:
+            summaries, self._pending = self._pending, []
+            for key, window in list(self._windows.items()):
+                interval, _ = self._limits(key[0])
+                if now - window.start >= interval:
+                    if window.suppressed:
+                        summaries.append(self._summary(window, interval))
+                    del self._windows[key]
+        return summaries
+
+
+class QueueEmitter(logging.Handler):
+    """Só enfileira o registro como está: sem formatar e sem o lock do Handler"""
+
+    def __init__(self, records: queue.Queue, limiter: Optional[RateLimiter] = None):
+        super().__init__()
+        self.records = records
+        self.dropped = 0
+        if limiter is not None:
+            self.addFilter(limiter)
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if not self.filter(record):
+            return False
+        self.emit(record)
+        return True
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.records.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class AsyncLogWriter:
+    """Thread que formata e escreve os registros da fila e os resumos do limitador"""
+
+    _STOP = object()
+
+    def __init__(self, stream=None, queue_size: int = 10000, limiter: Optional[RateLimiter] = None,
+                 fmt: str = DEFAULT_FORMAT):
+        self.records: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.limiter = limiter if limiter is not None else RateLimiter()
+        self.emitter = QueueEmitter(self.records, self.limiter)
+        self.output = logging.StreamHandler(stream if stream is not None else sys.stdout)
+        self.output.setFormatter(logging.Formatter(fmt))
+        self.written = 0
+        self._thread = None
+
+    def _write(self, record: logging.LogRecord):
+        try:
+            self.output.handle(record)
+            self.written += 1
+        except Exception:
+            self.output.handleError(record)
+
+    def _run(self):
+        poll = max(min(self.limiter.interval, 0.5), 0.01)
+        while True:
+            try:
+                record = self.records.get(timeout=poll)
+            except queue.Empty:
+                record = None
+            if record is self._STOP:
+                break
+            if record is not None:
+                self._write(record)
+            for summary in self.limiter.drain():
+                self._write(summary)
+        # Fila restante e resumos pendentes antes de sair
+        while True:
+            try:
+                record = self.records.get_nowait()
+            except queue.Empty:
+                break
+            if record is not self._STOP:
+                self._write(record)
+        for summary in self.limiter.drain(flush=True):
+            self._write(summary)
+        self.output.flush()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Escreve o que falta e encerra a thread"""
+        if self._thread is not None:
+            self.records.put(self._STOP)
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {'written': self.written, 'dropped': self.emitter.dropped, 'suppressed': self.limiter.suppressed}
+
+
+_WRITER: Optional[AsyncLogWriter] = None
+
+
+def configure_logging(config: Optional[dict] = None, stream=None) -> AsyncLogWriter:
+    """
+    Liga a escrita assíncrona para os loggers do simulador (seção 'logging' da
+    configuração); chamar de novo troca a configuração anterior
+    """
+    global _WRITER
+    config = config or {}
+    rate = config.get('rate_limit', {})
+    overrides = {name: (float(limit.get('interval', rate.get('interval', 1.0))),
+                        int(limit.get('burst', rate.get('burst', 5))))
+                 for name, limit in rate.get('categories', {}).items()}
+    limiter = RateLimiter(float(rate.get('interval', 1.0)), int(rate.get('burst', 5)), overrides)
+    level = logging.getLevelName(str(config.get('level', 'INFO')).upper())
+    if not isinstance(level, int):
+        raise ValueError(f"logging.level inválido: {config.get('level')!r}")
+
+    shutdown_logging()
+    writer = AsyncLogWriter(stream, int(config.get('queue_size', 10000)), limiter)
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.propagate = False
+    root.addHandler(writer.emitter)
+    for category, category_level in config.get('categories', {}).items():
+        get_logger(category).setLevel(str(category_level).upper())
+    writer.start()
+    _WRITER = writer
+    return writer
+
+
+def shutdown_logging():
+    """Esvazia a fila e volta ao comportamento padrão do logging"""
+    global _WRITER
+    if _WRITER is None:
+        return
+    root = logging.getLogger(ROOT_LOGGER)
+    root.removeHandler(_WRITER.emitter)
+    root.propagate = True
+    root.setLevel(logging.NOTSET)
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith(ROOT_LOGGER + '.'):
+            logging.getLogger(name).setLevel(logging.NOTSET)
+    _WRITER.stop()
+    _WRITER = None
@@ -1,22 +1,30 @@
 # core/simulation_orchestrator.py
 
 import time
-from typing import List, Any
+from typing import Callable, List, Any
+
+from core.event_scheduler import EventScheduler, ScheduledEvent
+from core.sim_logging import get_logger
+
+_log = get_logger('orchestrator')
 
 
 class SimulationOrchestrator:
     """
     Maestro que coordena todos os módulos do simulador
     Garante execução em tempo real e ordem determinística
+    Comportamento periódico/pontual (logs, falhas, mudanças de clima) vai na agenda
+    de eventos em tempo simulado, disparada no fim de cada frame
     """
 
-    def __init__(self, message_bus, frame_rate: int = 60):
+    def __init__(self, message_bus, frame_rate: int = 60, real_time: bool = True):
         # Dependências
         self.message_bus = message_bus
 
         # Configuração de tempo
         self.frame_rate = frame_rate
         self.frame_period = 1.0 / frame_rate  # Ex: 0.016666s para 60Hz
+        self.real_time = real_time  # False = o mais rápido possível (mesmos eventos em tempo simulado)
 
         # Gerenciamento de módulos
         self.modules: List[Any] = []  # Lista de todos os módulos registrados
@@ -25,10 +33,13 @@ class SimulationOrchestrator:
         self.is_running = False
         self.frame_count = 0
         self.simulation_time = 0.0
+        self._frame_elapsed = 0.0
+
+        # Agenda de eventos em tempo simulado (heap): só os vencidos são tocados por frame
+        self.scheduler = EventScheduler()
+        self.scheduler.every(1.0, self._log_progress, name='progress')
 
-        print(f"🎮 Simulation Orchestrator criado!")
-        print(f"   - Frame rate: {frame_rate}Hz")
-        print(f"   - Frame period: {self.frame_period:.4f}s")
+        _log.info("🎮 Simulation Orchestrator criado: %sHz (frame period %.4fs)", frame_rate, self.frame_period)
 
     def register_module(self, module) -> bool:
         """
@@ -37,18 +48,31 @@ class SimulationOrchestrator:
         """
         # Verifica se o módulo tem o método update()
         if not hasattr(module, 'update'):
-            print(f"❌ ERRO: {module.__class__.__name__} não tem método 'update()'")
+            _log.error("❌ ERRO: %s não tem método 'update()'", module.__class__.__name__)
             return False
 
         if not callable(module.update):
-            print(f"❌ ERRO: 'update' em {module.__class__.__name__} não é chamável")
+            _log.error("❌ ERRO: 'update' em %s não é chamável", module.__class__.__name__)
             return False
 
-        # Adiciona à lista de módulos
+        # Adiciona à lista de módulos; quem tiver eventos periódicos os agenda aqui
         self.modules.append(module)
-        print(f"✅ Módulo registrado: {module.__class__.__name__}")
+        if callable(getattr(module, 'schedule_events', None)):
+            module.schedule_events(self.scheduler)
+        _log.info("✅ Módulo registrado: %s", module.__class__.__name__)
         return True
 
+    def every(self, period: float, callback: Callable[[], None], **kwargs) -> ScheduledEvent:
+        """Evento periódico em tempo simulado (ver EventScheduler.every)"""
+        return self.scheduler.every(period, callback, **kwargs)
+
+    def at(self, time_s: float, callback: Callable[[], None], **kwargs) -> ScheduledEvent:
+        """Evento único no instante de simulação dado (falhas, mudança de clima...)"""
+        return self.scheduler.at(time_s, callback, **kwargs)
+
+    def after(self, delay: float, callback: Callable[[], None], **kwargs) -> ScheduledEvent:
+        return self.scheduler.after(delay, callback, **kwargs)
+
     def run(self, duration: float = None):
         """
         Inicia o loop principal de simulação
@@ -57,13 +81,10 @@ class SimulationOrchestrator:
         self.is_running = True
         self.frame_count = 0
         self.simulation_time = 0.0
+        self.scheduler.time = 0.0
 
-        print("🚀 INICIANDO SIMULAÇÃO")
-        print(f"   - Módulos ativos: {len(self.modules)}")
-        print(f"   - Duração: {'INFINITA' if duration is None else f'{duration}s'}")
-        print("-" * 50)
-
-        start_wall_time = time.time()
+        _log.info("🚀 INICIANDO SIMULAÇÃO - módulos ativos: %d, duração: %s, ritmo: %s", len(self.modules),
+                  'INFINITA' if duration is None else f'{duration}s', 'tempo real' if self.real_time else 'acelerado')
 
         try:
             while self.is_running:
@@ -76,22 +97,24 @@ class SimulationOrchestrator:
                 # 📊 CONTAGEM E TEMPO
                 self.frame_count += 1
                 self.simulation_time = self.frame_count * self.frame_period
+                self._frame_elapsed = time.time() - frame_start_time
 
-                # ⏰ CONTROLE DE TEMPO REAL
-                self._enforce_real_time(frame_start_time)
+                # 📅 EVENTOS VENCIDOS ATÉ O TEMPO SIMULADO ATUAL (inclui o log de progresso)
+                self.scheduler.run_due(self.simulation_time)
 
-                # 📝 LOG DE PROGRESSO
-                self._log_progress(frame_start_time)
+                # ⏰ CONTROLE DE TEMPO REAL
+                if self.real_time:
+                    self._enforce_real_time(frame_start_time)
 
                 # 🛑 VERIFICAÇÃO DE DURAÇÃO
                 if duration and self.simulation_time >= duration:
-                    print(f"⏰ Duração de {duration}s alcançada - parando simulação")
+                    _log.info("⏰ Duração de %ss alcançada - parando simulação", duration)
                     break
 
         except KeyboardInterrupt:
-            print("\n⏹️  Simulação interrompida pelo usuário (Ctrl+C)")
+            _log.info("⏹️  Simulação interrompida pelo usuário (Ctrl+C)")
         except Exception as e:
-            print(f"\n💥 Erro durante simulação: {e}")
+            _log.exception("💥 Erro durante simulação: %s", e)
         finally:
             self.stop()
 
@@ -101,7 +124,8 @@ class SimulationOrchestrator:
             try:
                 module.update()
             except Exception as e:
-                print(f"❌ Erro em {module.__class__.__name__}.update(): {e}")
+                # Mesmo erro do mesmo módulo a cada frame: o limite de taxa agrega em vez de inundar
+                _log.error("❌ Erro em %s.update(): %s", module.__class__.__name__, e)
 
     def _enforce_real_time(self, frame_start_time: float):
         """Garante que o frame respeite o tempo real"""
@@ -113,28 +137,22 @@ class SimulationOrchestrator:
         else:
             # Frame demorou mais que o esperado - potencial problema de performance
             delay = frame_elapsed - self.frame_period
-            print(f"⚠️  Frame {self.frame_count} atrasado: +{delay * 1000:.1f}ms")
-
-    def _log_progress(self, frame_start_time: float):
-        """Faz logging do progresso da simulação"""
-        frame_elapsed = time.time() - frame_start_time
+            _log.warning("⚠️  Frame %d atrasado: +%.1fms", self.frame_count, delay * 1000,
+                         extra={'aggregate': 'frame_overrun'})
 
-        # A cada segundo de simulação (em tempo de parede)
-        if self.frame_count % self.frame_rate == 0:
-            wall_time_elapsed = time.time() - frame_start_time
-            efficiency = (self.frame_period / frame_elapsed) * 100 if frame_elapsed > 0 else 100
+    def _log_progress(self):
+        """Progresso da simulação - evento periódico, a cada segundo simulado"""
+        frame_elapsed = self._frame_elapsed
+        efficiency = (self.frame_period / frame_elapsed) * 100 if frame_elapsed > 0 else 100
 
-            print(f"📊 Frame {self.frame_count} | "
-                  f"Tempo simulação: {self.simulation_time:.1f}s | "
-                  f"Eficiência: {efficiency:.1f}%")
+        _log.info("📊 Frame %d | Tempo simulação: %.1fs | Eficiência: %.1f%%",
+                  self.frame_count, self.simulation_time, efficiency)
 
     def stop(self):
         """Para a simulação gracefulmente"""
         self.is_running = False
-        print("\n🛑 SIMULAÇÃO PARADA")
-        print(f"   - Frames processados: {self.frame_count}")
-        print(f"   - Tempo simulado: {self.simulation_time:.2f}s")
-        print(f"   - Módulos ativos: {len(self.modules)}")
+        _log.info("🛑 SIMULAÇÃO PARADA - frames processados: %d, tempo simulado: %.2fs, módulos ativos: %d",
+                  self.frame_count, self.simulation_time, len(self.modules))
 
     def get_stats(self) -> dict:
         """Retorna estatísticas da simulação"""
@@ -143,7 +161,8 @@ class SimulationOrchestrator:
             'simulation_time': self.simulation_time,
             'active_modules': len(self.modules),
             'frame_rate': self.frame_rate,
-            'frame_period': self.frame_period
+            'frame_period': self.frame_period,
+            'events_dispatched': self.scheduler.dispatched
         }
 
     def list_modules(self) -> List[str]:
@@ -0,0 +1,47 @@
+"""
+Modelo de atmosfera padrão (ISA) - troposfera e baixa estratosfera
+Todas as funções aceitam escalares ou arrays NumPy (lotes de aeronaves)
+"""
+
+import numpy as np
+
+# Constantes ISA ao nível do mar
+SEA_LEVEL_TEMPERATURE = 288.15   # K
+SEA_LEVEL_PRESSURE = 101325.0    # Pa
+SEA_LEVEL_DENSITY = 1.225        # kg/m³
+LAPSE_RATE = 0.0065              # K/m
+GAS_CONSTANT = 287.05287         # J/(kg·K)
+GAMMA = 1.4
+GRAVITY = 9.80665                # m/s²
+TROPOPAUSE_ALTITUDE = 11000.0    # m
+
+_EXPONENT = GRAVITY / (GAS_CONSTANT * LAPSE_RATE)
+_T_TROPOPAUSE = SEA_LEVEL_TEMPERATURE - LAPSE_RATE * TROPOPAUSE_ALTITUDE
+_P_TROPOPAUSE = SEA_LEVEL_PRESSURE * (_T_TROPOPAUSE / SEA_LEVEL_TEMPERATURE) ** _EXPONENT
+
+
+def isa_atmosphere(altitude_m, temperature_offset: float = 0.0):
+    """
+    Retorna (temperatura [K], pressão [Pa], densidade [kg/m³], velocidade do som [m/s])
+    para a altitude geopotencial dada. Vetorizado sobre arrays.
+    """
+    h = np.clip(np.asarray(altitude_m, dtype=float), -500.0, 20000.0)
+
+    t_std = np.where(h <= TROPOPAUSE_ALTITUDE,
+                     SEA_LEVEL_TEMPERATURE - LAPSE_RATE * h,
+                     _T_TROPOPAUSE)
+    pressure = np.where(
+        h <= TROPOPAUSE_ALTITUDE,
+        SEA_LEVEL_PRESSURE * (t_std / SEA_LEVEL_TEMPERATURE) ** _EXPONENT,
+        _P_TROPOPAUSE * np.exp(-GRAVITY * (h - TROPOPAUSE_ALTITUDE) / (GAS_CONSTANT * _T_TROPOPAUSE)),
+    )
+
+    temperature = t_std + temperature_offset
+    density = pressure / (GAS_CONSTANT * temperature)
+    speed_of_sound = np.sqrt(GAMMA * GAS_CONSTANT * temperature)
+    return temperature, pressure, density, speed_of_sound
+
+
+def density_ratio(altitude_m, temperature_offset: float = 0.0):
+    """Razão de densidade sigma = rho / rho0"""
+    return isa_atmosphere(altitude_m, temperature_offset)[2] / SEA_LEVEL_DENSITY
@@ -1,11 +1,17 @@
 """
 Modelo de dinâmica de voo SIMPLES para teste
 Física básica baseada nas equações de movimento
+Contas do frame nos kernels de dynamics/kernels.py (Python puro ou Numba)
 """
 
 import numpy as np
 from core.message_bus import MessageBus
 from core.data_types import ControlInputs, AircraftState, Vector3, ForcesMoments
+from core.sim_logging import get_logger
+from dynamics import kernels
+from utils import jit
+
+_log = get_logger('dynamics')
 
 
 class SimpleFlightDynamics:
@@ -14,163 +20,198 @@ class SimpleFlightDynamics:
     Implementa equações de movimento básicas
     """
 
-    def __init__(self, message_bus: MessageBus):
+    def __init__(self, message_bus: MessageBus, dt: float = 1 / 60.0):
         self.bus = message_bus
+        self.dt = dt  # Passo de tempo do frame [s]
 
         # Estado inicial da aeronave
         self.state = AircraftState(
             position_ned=Vector3(0, 0, -1000),  # 1000m de altura
             velocity_body=Vector3(50, 0, 0),  # 50 m/s para frente
-            attitude=Vector3(0, 0, 0)  # Nivelado
+            rates_body=Vector3(0, 0, 0),
+            euler=Vector3(0, 0, 0),  # Nivelado
+            mass=1000.0,
+            inertia_principal=(2000.0, 3000.0, 4000.0)
         )
 
-        # Parâmetros da aeronave (Cessna 172-like)
+        # Propriedades de massa em cache - substituídas pelo evento 'mass_properties'
         self.mass = 1000.0  # kg
+        self.cg = np.zeros(3)  # CG relativo ao ponto de referência [m]
+        self.inertia = np.diag([2000.0, 3000.0, 4000.0])
+        self.inertia_inv = np.linalg.inv(self.inertia)
+
+        # Parâmetros da aeronave (Cessna 172-like)
         self.gravity = 9.81  # m/s²
         self.wing_area = 16.2  # m²
-        self.dt = 1 / 60.0  # Passo de tempo (60Hz)
 
         # Controles atuais
-        self.current_controls = ControlInputs()
-
-        # Inscreve para receber controles
+        self.current_controls = ControlInputs(throttle=0.0, elevator=0.0, aileron=0.0, rudder=0.0)
+
+        # Último estado do motor/hélice (None enquanto Propulsion não publicar)
+        self.propulsion_state = None
+
+        # Forças de contato com o solo (None enquanto LandingGear não publicar)
+        self.gear_forces = None
+
+        # Atmosfera e vento (ar parado ISA ao nível do mar até Weather publicar)
+        self.air_density = 1.225  # kg/m³
+        self.wind_ned = np.zeros(3)
+        self.turbulence_body = np.zeros(3)
+        self.air_velocity = np.array([50.0, 0.0, 0.0])  # velocidade relativa ao ar no corpo
+
+        # Kernels do backend selecionado (utils/jit.py) e seus buffers pré-alocados
+        self._forces_moments = jit.compiled(kernels.forces_moments)
+        self._dynamics = jit.compiled(kernels.rigid_body_dynamics)
+        self._kinematics = jit.compiled(kernels.rigid_body_kinematics)
+        self._stage = jit.compiled(kernels.euler_stage)
+        self._x = jit.buffer(kernels.STATE_SIZE)
+        self._xdot = jit.buffer(kernels.STATE_SIZE)
+        self._inputs = jit.buffer(kernels.INPUT_SIZE)
+        self._fm = jit.buffer(kernels.FM_SIZE)
+        self._mass_buffer = jit.buffer(kernels.MASS_SIZE)
+        self._params = jit.buffer([self.wing_area, 0.3, 5.0, 0.03, 0.5,  # CL0, CL_alpha/rad, CD0, CD_alpha/rad
+                                   5000.0, 3000.0, 1000.0])             # aileron, profundor, leme [N·m]
+        self._pack_mass()
+
+        # Congelamento pela estação do instrutor (estado publicado, sem integrar)
+        self.frozen = False
+
+        # Inscreve para receber controles, propulsão e propriedades de massa
         self.bus.subscribe("controls", self._handle_controls)
+        self.bus.subscribe("propulsion_state", self._handle_propulsion)
+        self.bus.subscribe("mass_properties", self._handle_mass_properties)
+        self.bus.subscribe("gear_forces", self._handle_gear_forces)
+        self.bus.subscribe("environment", self._handle_environment)
 
-        print("✅ SimpleFlightDynamics inicializado")
+        _log.info("✅ SimpleFlightDynamics inicializado")
 
     def _handle_controls(self, controls: ControlInputs):
         """Processa controles recebidos do piloto/X-Plane"""
         self.current_controls = controls
 
+    def _handle_propulsion(self, propulsion_state):
+        """Recebe empuxo/RPM calculados pelo módulo de propulsão"""
+        self.propulsion_state = propulsion_state
+
+    def _handle_gear_forces(self, gear_forces: ForcesMoments):
+        """Recebe forças do trem de pouso (em torno do ponto de referência)"""
+        self.gear_forces = gear_forces
+
+    def _handle_environment(self, environment):
+        """Recebe densidade, vento médio e turbulência do módulo de clima"""
+        self.air_density = environment.density
+        self.wind_ned = np.asarray(environment.wind_ned, dtype=float)
+        self.turbulence_body = np.asarray(environment.turbulence_body, dtype=float)
+
+    def _handle_mass_properties(self, mass_properties):
+        """Cacheia massa, CG e I⁻¹ - só chega quando algum componente mudou"""
+        self.mass = mass_properties.mass
+        self.cg = mass_properties.cg
+        self.inertia = mass_properties.inertia
+        self.inertia_inv = mass_properties.inertia_inv
+        self.state.mass = self.mass
+        self.state.inertia_principal = tuple(np.diag(self.inertia))
+        self._pack_mass()
+
     def update(self):
         """Atualiza física - chamado a cada frame"""
         # Calcula forças e momentos
-        forces_moments = self._calculate_forces_moments()
-
-        # Integra equações de movimento
-        self._integrate_equations_of_motion(forces_moments)
+        self._calculate_forces_moments()
 
-        # Atualiza valores derivados
-        self.state.update_derived_values()
+        # Integra equações de movimento (exceto com o simulador congelado)
+        if not self.frozen:
+            self._integrate_equations_of_motion()
 
         # Publica estado atualizado
         self.bus.publish("aircraft_state", self.state)
 
-        # Log a cada segundo
-        if hasattr(self, 'frame_count'):
-            self.frame_count += 1
+    def schedule_events(self, scheduler):
+        """Log a cada segundo simulado (agenda do orquestrador)"""
+        scheduler.every(1.0, self._log_state, name='flight_dynamics.log')
+
+    def _log_state(self):
+        state = self.state
+        _log.info("✈️  FlightDynamics: Altura=%.0fm, Vel=%.1fm/s, Pitch=%.2frad",
+                  -state.position_ned.z, state.velocity_body.x, state.euler.y)
+
+    def set_frozen(self, frozen: bool):
+        """Congela/descongela a integração (comando da estação do instrutor)"""
+        self.frozen = bool(frozen)
+
+    def reset_position(self, north: float, east: float, altitude: float,
+                       heading_deg: float = None, airspeed: float = None):
+        """Reposiciona a aeronave; com proa/velocidade, reinicia nivelada e sem rotação"""
+        self.state.position_ned = Vector3(float(north), float(east), -float(altitude))
+        if heading_deg is not None:
+            self.state.euler = Vector3(0.0, 0.0, float(np.radians(heading_deg)))
+            self.state.rates_body = Vector3(0.0, 0.0, 0.0)
+        if airspeed is not None:
+            self.state.velocity_body = Vector3(float(airspeed), 0.0, 0.0)
+
+    def _pack_inputs(self):
+        """Controles, empuxo, atmosfera e trem de pouso no buffer de entrada dos kernels"""
+        inputs, controls = self._inputs, self.current_controls
+        inputs[kernels.ELEVATOR] = controls.elevator
+        inputs[kernels.AILERON] = controls.aileron
+        inputs[kernels.RUDDER] = controls.rudder
+        inputs[kernels.THRUST] = self._calculate_thrust()
+        inputs[kernels.DENSITY] = self.air_density
+        for i in range(3):
+            inputs[kernels.WIND_NED + i] = self.wind_ned[i]
+            inputs[kernels.TURBULENCE_BODY + i] = self.turbulence_body[i]
+        g = kernels.GEAR
+        if self.gear_forces is None:
+            for i in range(6):
+                inputs[g + i] = 0.0
         else:
-            self.frame_count = 1
-
-        if self.frame_count % 60 == 0:
-            print(f"✈️  FlightDynamics: Altura={-self.state.position_ned.z:.0f}m, "
-                  f"Vel={self.state.velocity_body.x:.1f}m/s, "
-                  f"Pitch={self.state.attitude.y:.2f}rad")
-
-    def _calculate_forces_moments(self) -> ForcesMoments:
-        """Calcula forças e momentos atuando na aeronave"""
-        # Força de sustentação (simplificada)
-        lift = self._calculate_lift()
-
-        # Força de arrasto (simplificada)
-        drag = self._calculate_drag()
-
-        # Força de propulsão
-        thrust = self._calculate_thrust()
-
-        # Força gravitacional
-        gravity_force = self.mass * self.gravity
-
-        # Converte forças para o sistema de coordenadas do corpo
-        # Simplificação: assumindo ângulos pequenos
-        pitch = self.state.attitude.y
-        roll = self.state.attitude.x
-
-        # Forças no sistema do corpo [X, Y, Z]
-        Fx = thrust - drag  # Forward force
-        Fy = 0.0  # Lateral force (simplificado)
-        Fz = -lift  # Upward force (negative in body Z)
-
-        # Momentos [L, M, N] - simplificado
-        L = self.current_controls.aileron * 5000.0  # Rolling moment
-        M = self.current_controls.elevator * 3000.0  # Pitching moment
-        N = self.current_controls.rudder * 1000.0  # Yawing moment
-
-        return ForcesMoments(
-            force_body=Vector3(Fx, Fy, Fz),
-            moment_body=Vector3(L, M, N)
-        )
-
-    def _calculate_lift(self) -> float:
-        """Calcula força de sustentação"""
-        # Coeficiente de sustentação simplificado
-        CL0 = 0.3
-        CL_alpha = 5.0  # por radiano
-
-        alpha = self.state.alpha
-        dynamic_pressure = 0.5 * 1.225 * self.state.velocity_body.x ** 2
-
-        CL = CL0 + CL_alpha * alpha
-        lift = CL * dynamic_pressure * self.wing_area
-
-        return max(lift, 0)  # Não permite sustentação negativa
-
-    def _calculate_drag(self) -> float:
-        """Calcula força de arrasto"""
-        # Coeficiente de arrasto simplificado
-        CD0 = 0.03
-        CD_alpha = 0.5  # por radiano
-
-        alpha = self.state.alpha
-        dynamic_pressure = 0.5 * 1.225 * self.state.velocity_body.x ** 2
-
-        CD = CD0 + CD_alpha * alpha ** 2
-        drag = CD * dynamic_pressure * self.wing_area
-
-        return drag
+            f, m = self.gear_forces.forces, self.gear_forces.moments
+            inputs[g], inputs[g + 1], inputs[g + 2] = f.x, f.y, f.z
+            inputs[g + 3], inputs[g + 4], inputs[g + 5] = m.x, m.y, m.z
+
+    def _pack_mass(self):
+        """Massa, CG, I e I⁻¹ (por linhas) - refeito só quando as propriedades de massa mudam"""
+        values = [self.mass, *np.asarray(self.cg, dtype=float).ravel(),
+                  *np.asarray(self.inertia, dtype=float).ravel(), *np.asarray(self.inertia_inv, dtype=float).ravel()]
+        for i, value in enumerate(values):
+            self._mass_buffer[i] = float(value)
+
+    def _pack_state(self):
+        x, state = self._x, self.state
+        for offset, vector in ((kernels.POSITION, state.position_ned), (kernels.VELOCITY, state.velocity_body),
+                               (kernels.RATES, state.rates_body), (kernels.EULER, state.euler)):
+            x[offset], x[offset + 1], x[offset + 2] = vector.x, vector.y, vector.z
+
+    def _calculate_forces_moments(self):
+        """Calcula forças e momentos atuando na aeronave no buffer do frame (kernel forces_moments)"""
+        self._pack_state()
+        self._pack_inputs()
+        fm = self._fm
+        self._forces_moments(self._x, self._inputs, self._params, fm)
+        # Velocidade relativa ao ar (vento em NED levado para o corpo + turbulência), sem realocar
+        air = self.air_velocity
+        a = kernels.AIR_VELOCITY
+        air[0], air[1], air[2] = fm[a], fm[a + 1], fm[a + 2]
 
     def _calculate_thrust(self) -> float:
-        """Calcula força de propulsão"""
-        max_thrust = 6000.0  # Newtons
-        return self.current_controls.throttle[0] * max_thrust
-
-    def _integrate_equations_of_motion(self, fm: ForcesMoments):
-        """Integra as equações de movimento (Euler simples)"""
-        # Acelerações lineares (F = ma)
-        ax = fm.force_body.x / self.mass
-        ay = fm.force_body.y / self.mass
-        az = fm.force_body.z / self.mass
-
-        # Atualiza velocidades lineares
-        self.state.velocity_body.x += ax * self.dt
-        self.state.velocity_body.y += ay * self.dt
-        self.state.velocity_body.z += az * self.dt
-
-        # Acelerações angulares (simplificado)
-        I_roll = 2000.0  # Momento de inércia roll
-        I_pitch = 3000.0  # Momento de inércia pitch
-        I_yaw = 4000.0  # Momento de inércia yaw
-
-        p_dot = fm.moment_body.x / I_roll
-        q_dot = fm.moment_body.y / I_pitch
-        r_dot = fm.moment_body.z / I_yaw
-
-        # Atualiza velocidades angulares
-        self.state.angular_rates.x += p_dot * self.dt
-        self.state.angular_rates.y += q_dot * self.dt
-        self.state.angular_rates.z += r_dot * self.dt
-
-        # Atualiza ângulos de atitude (simplificado)
-        self.state.attitude.x += self.state.angular_rates.x * self.dt
-        self.state.attitude.y += self.state.angular_rates.y * self.dt
-        self.state.attitude.z += self.state.angular_rates.z * self.dt
-
-        # Atualiza posição (convertendo do sistema do corpo para NED)
-        # Simplificação: assumindo ângulos pequenos
-        u, v, w = self.state.velocity_body.x, self.state.velocity_body.y, self.state.velocity_body.z
-        phi, theta, psi = self.state.attitude.x, self.state.attitude.y, self.state.attitude.z
-
-        # Matriz de rotação simplificada (para ângulos pequenos)
-        self.state.position_ned.x += (u * np.cos(psi) - v * np.sin(psi)) * self.dt
-        self.state.position_ned.y += (u * np.sin(psi) + v * np.cos(psi)) * self.dt
-        self.state.position_ned.z += w * self.dt  # Lembrete: Z positivo é para baixo no NED
\ No newline at end of file
+        """Empuxo da hélice publicado pelo módulo de propulsão"""
+        if self.propulsion_state is None:
+            return 0.0  # Sem módulo de propulsão ativo: planador
+        return self.propulsion_state.thrust
+
+    def _integrate_equations_of_motion(self):
+        """
+        Integra as equações de movimento de corpo rígido (Euler semi-implícito):
+        velocidades com as acelerações do estado atual, depois posição e atitude
+        com as velocidades novas; usa as forças já calculadas no buffer do frame
+        """
+        x, xdot, dt = self._x, self._xdot, self.dt
+        self._dynamics(x, self._fm, self._mass_buffer, self.gravity, xdot)
+        self._stage(x, xdot, kernels.VELOCITY, kernels.EULER, dt)
+        self._kinematics(x, xdot)
+        self._stage(x, xdot, kernels.POSITION, kernels.VELOCITY, dt)
+        self._stage(x, xdot, kernels.EULER, kernels.STATE_SIZE, dt)
+
+        self.state.position_ned = Vector3(float(x[0]), float(x[1]), float(x[2]))  # Z positivo é para baixo
+        self.state.velocity_body = Vector3(float(x[3]), float(x[4]), float(x[5]))
+        self.state.rates_body = Vector3(float(x[6]), float(x[7]), float(x[8]))
+        self.state.euler = Vector3(float(x[9]), float(x[10]), float(x[11]))
@@ -0,0 +1,144 @@
+# dynamics/kernels.py
+"""
+Kernels escalares da dinâmica de corpo rígido (ver utils/jit.py)
+- forces_moments: aerodinâmica simplificada + empuxo + trem de pouso no ponto de referência
+- rigid_body_dynamics / rigid_body_kinematics: as duas metades das derivadas 6-DOF
+  (acelerações no corpo; taxas de posição NED e de ângulos de Euler)
+- euler_stage: um estágio do integrador (x += ẋ·dt numa faixa do vetor de estado)
+- Sem chamadas entre kernels e sem objetos Python: cada função compila sozinha no Numba
+
+Vetor de estado (12): posição NED, velocidade no corpo, taxas p q r, ângulos phi theta psi
+"""
+
+import math
+
+from utils import jit
+
+POSITION, VELOCITY, RATES, EULER = 0, 3, 6, 9
+STATE_SIZE = 12
+
+# inputs: superfícies, empuxo, atmosfera e forças do trem (corpo, no ponto de referência)
+ELEVATOR, AILERON, RUDDER, THRUST, DENSITY, WIND_NED, TURBULENCE_BODY, GEAR = 0, 1, 2, 3, 4, 5, 8, 11
+INPUT_SIZE = 17
+
+# params: área de referência, polar simplificada e potência de controle [N·m por unidade]
+WING_AREA, CL0, CL_ALPHA, CD0, CD_ALPHA, ROLL_POWER, PITCH_POWER, YAW_POWER = range(8)
+PARAM_SIZE = 8
+
+# forces_moments: força (3) e momento (3) no corpo + velocidade relativa ao ar (3)
+FORCE, MOMENT, AIR_VELOCITY = 0, 3, 6
+FM_SIZE = 9
+
+# mass: massa, CG (3), tensor de inércia e sua inversa (9 cada, por linhas)
+MASS, CG, INERTIA, INERTIA_INV = 0, 1, 4, 13
+MASS_SIZE = 22
+
+
+def forces_moments(x, inputs, params, out):
+    """Forças/momentos em torno do ponto de referência (a gravidade entra na integração)"""
+    s_phi, c_phi = math.sin(x[EULER]), math.cos(x[EULER])
+    s_theta, c_theta = math.sin(x[EULER + 1]), math.cos(x[EULER + 1])
+    s_psi, c_psi = math.sin(x[EULER + 2]), math.cos(x[EULER + 2])
+
+    # Vento NED levado ao corpo (transposta da matriz corpo → NED) mais turbulência
+    wn, we, wd = inputs[WIND_NED], inputs[WIND_NED + 1], inputs[WIND_NED + 2]
+    wind_u = c_theta * c_psi * wn + c_theta * s_psi * we + -s_theta * wd + inputs[TURBULENCE_BODY]
+    wind_v = ((s_phi * s_theta * c_psi - c_phi * s_psi) * wn + (s_phi * s_theta * s_psi + c_phi * c_psi) * we
+              + s_phi * c_theta * wd + inputs[TURBULENCE_BODY + 1])
+    wind_w = ((c_phi * s_theta * c_psi + s_phi * s_psi) * wn + (c_phi * s_theta * s_psi - s_phi * c_psi) * we
+              + c_phi * c_theta * wd + inputs[TURBULENCE_BODY + 2])
+    u_air = x[VELOCITY] - wind_u
+    v_air = x[VELOCITY + 1] - wind_v
+    w_air = x[VELOCITY + 2] - wind_w
+
+    alpha = math.atan2(w_air, u_air)
+    dynamic_pressure = 0.5 * inputs[DENSITY] * (u_air * u_air)
+    lift = (params[CL0] + params[CL_ALPHA] * alpha) * dynamic_pressure * params[WING_AREA]
+    if lift < 0.0:
+        lift = 0.0                      # sem sustentação negativa
+    drag = (params[CD0] + params[CD_ALPHA] * (alpha * alpha)) * dynamic_pressure * params[WING_AREA]
+
+    out[FORCE] = inputs[THRUST] - drag + inputs[GEAR]
+    out[FORCE + 1] = 0.0 + inputs[GEAR + 1]
+    out[FORCE + 2] = -lift + inputs[GEAR + 2]
+    out[MOMENT] = inputs[AILERON] * params[ROLL_POWER] + inputs[GEAR + 3]
+    out[MOMENT + 1] = inputs[ELEVATOR] * params[PITCH_POWER] + inputs[GEAR + 4]
+    out[MOMENT + 2] = inputs[RUDDER] * params[YAW_POWER] + inputs[GEAR + 5]
+    out[AIR_VELOCITY] = u_air
+    out[AIR_VELOCITY + 1] = v_air
+    out[AIR_VELOCITY + 2] = w_air
+
+
+def rigid_body_dynamics(x, fm, mass, gravity, xdot):
+    """Acelerações no corpo: F/m + g - ω × v e I⁻¹ (M_cg - ω × Iω) → xdot[3:9]"""
+    fx, fy, fz = fm[FORCE], fm[FORCE + 1], fm[FORCE + 2]
+    cx, cy, cz = mass[CG], mass[CG + 1], mass[CG + 2]
+
+    # Momentos transferidos do ponto de referência para o CG: M - cg × F
+    ml = fm[MOMENT] - (cy * fz - cz * fy)
+    mm = fm[MOMENT + 1] - (cz * fx - cx * fz)
+    mn = fm[MOMENT + 2] - (cx * fy - cy * fx)
+
+    # Gravidade no corpo (última linha da matriz corpo → NED)
+    s_phi, c_phi = math.sin(x[EULER]), math.cos(x[EULER])
+    s_theta, c_theta = math.sin(x[EULER + 1]), math.cos(x[EULER + 1])
+    gx = gravity * -s_theta
+    gy = gravity * (s_phi * c_theta)
+    gz = gravity * (c_phi * c_theta)
+
+    u, v, w = x[VELOCITY], x[VELOCITY + 1], x[VELOCITY + 2]
+    p, q, r = x[RATES], x[RATES + 1], x[RATES + 2]
+    xdot[VELOCITY] = fx / mass[MASS] + gx - (q * w - r * v)
+    xdot[VELOCITY + 1] = fy / mass[MASS] + gy - (r * u - p * w)
+    xdot[VELOCITY + 2] = fz / mass[MASS] + gz - (p * v - q * u)
+
+    # Tensor completo: h = Iω, τ = M - ω × h, ω̇ = I⁻¹ τ
+    hx = mass[INERTIA] * p + mass[INERTIA + 1] * q + mass[INERTIA + 2] * r
+    hy = mass[INERTIA + 3] * p + mass[INERTIA + 4] * q + mass[INERTIA + 5] * r
+    hz = mass[INERTIA + 6] * p + mass[INERTIA + 7] * q + mass[INERTIA + 8] * r
+    tx = ml - (q * hz - r * hy)
+    ty = mm - (r * hx - p * hz)
+    tz = mn - (p * hy - q * hx)
+    xdot[RATES] = mass[INERTIA_INV] * tx + mass[INERTIA_INV + 1] * ty + mass[INERTIA_INV + 2] * tz
+    xdot[RATES + 1] = mass[INERTIA_INV + 3] * tx + mass[INERTIA_INV + 4] * ty + mass[INERTIA_INV + 5] * tz
+    xdot[RATES + 2] = mass[INERTIA_INV + 6] * tx + mass[INERTIA_INV + 7] * ty + mass[INERTIA_INV + 8] * tz
+
+
+def rigid_body_kinematics(x, xdot):
+    """Velocidade NED (corpo → NED) e taxas dos ângulos de Euler → xdot[0:3] e xdot[9:12]"""
+    s_phi, c_phi = math.sin(x[EULER]), math.cos(x[EULER])
+    s_theta, c_theta = math.sin(x[EULER + 1]), math.cos(x[EULER + 1])
+    s_psi, c_psi = math.sin(x[EULER + 2]), math.cos(x[EULER + 2])
+    u, v, w = x[VELOCITY], x[VELOCITY + 1], x[VELOCITY + 2]
+    p, q, r = x[RATES], x[RATES + 1], x[RATES + 2]
+
+    xdot[POSITION] = c_theta * c_psi * u + (s_phi * s_theta * c_psi - c_phi * s_psi) * v \
+        + (c_phi * s_theta * c_psi + s_phi * s_psi) * w
+    xdot[POSITION + 1] = c_theta * s_psi * u + (s_phi * s_theta * s_psi + c_phi * c_psi) * v \
+        + (c_phi * s_theta * s_psi - s_phi * c_psi) * w
+    xdot[POSITION + 2] = -s_theta * u + s_phi * c_theta * v + c_phi * c_theta * w
+
+    xdot[EULER] = p + (q * s_phi + r * c_phi) * math.tan(x[EULER + 1])
+    xdot[EULER + 1] = q * c_phi - r * s_phi
+    xdot[EULER + 2] = (q * s_phi + r * c_phi) / c_theta
+
+
+def euler_stage(x, xdot, first, last, dt):
+    """x[first:last] += xdot[first:last]·dt (estágios separados = Euler semi-implícito)"""
+    for i in range(first, last):
+        x[i] = x[i] + xdot[i] * dt
+
+
+@jit.register_warmup
+def _warm_up():
+    x = jit.buffer([0.0, 0.0, -1000.0, 50.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.05, 0.0])
+    inputs = jit.buffer(INPUT_SIZE)
+    inputs[DENSITY] = 1.225
+    params = jit.buffer([16.2, 0.3, 5.0, 0.03, 0.5, 5000.0, 3000.0, 1000.0])
+    mass = jit.buffer([1000.0, 0.0, 0.0, 0.0, 2000.0, 0.0, 0.0, 0.0, 3000.0, 0.0, 0.0, 0.0, 4000.0,
+                       1 / 2000.0, 0.0, 0.0, 0.0, 1 / 3000.0, 0.0, 0.0, 0.0, 1 / 4000.0])
+    fm, xdot = jit.buffer(FM_SIZE), jit.buffer(STATE_SIZE)
+    jit.compiled(forces_moments)(x, inputs, params, fm)
+    jit.compiled(rigid_body_dynamics)(x, fm, mass, 9.81, xdot)
+    jit.compiled(rigid_body_kinematics)(x, xdot)
+    jit.compiled(euler_stage)(x, xdot, 0, STATE_SIZE, 1 / 60.0)
@@ -0,0 +1,197 @@
+# dynamics/mass_properties.py
+"""
+Propriedades de massa a partir de massas pontuais (estrutura, tanques, ocupantes, bagagem)
+- Somatórios de massa, 1º momento e tensor de 2º momento atualizados incrementalmente:
+  alterar um componente custa O(1) e frames sem alteração não custam nada
+- CG, tensor de inércia e sua inversa só são recalculados quando algo mudou
+- Cada alteração é publicada no tópico 'mass_properties' para a dinâmica cachear I⁻¹
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+@dataclass
+class PointMass:
+    """Componente de massa concentrada nos eixos do corpo (origem no ponto de referência)"""
+    name: str
+    mass: float                              # kg
+    position: Sequence[float]                # (x, y, z) [m], x à frente, z para baixo
+    category: str = "payload"                # structure | fuel | occupant | baggage | payload
+    capacity: Optional[float] = None         # massa máxima [kg] (tanques, assentos)
+    inertia: Optional[Sequence[float]] = None  # (Ixx, Iyy, Izz, Ixy, Ixz, Iyz) própria em torno do seu CG
+
+
+@dataclass
+class MassPropertiesData:
+    """Contrato: MassProperties → FlightDynamics, DataRecorder"""
+    mass: float = 0.0
+    cg: np.ndarray = field(default_factory=lambda: np.zeros(3))            # [m] relativo à referência
+    inertia: np.ndarray = field(default_factory=lambda: np.eye(3))         # [kg·m²] em torno do CG
+    inertia_inv: np.ndarray = field(default_factory=lambda: np.eye(3))
+    version: int = 0                                                        # incrementa a cada alteração
+
+
+def inertia_tensor(ixx, iyy, izz, ixy=0.0, ixz=0.0, iyz=0.0) -> np.ndarray:
+    """Monta o tensor de inércia (produtos de inércia definidos como ∫xy dm)"""
+    return np.array([[ixx, -ixy, -ixz],
+                     [-ixy, iyy, -iyz],
+                     [-ixz, -iyz, izz]], dtype=float)
+
+
+class MassProperties:
+    def __init__(self, message_bus, config, dt: float = 1 / 60.0):
+        self.bus = message_bus
+        self.dt = dt
+
+        mass_config = config['mass_properties']
+        # Combustível só é debitado dos tanques quando o acumulado passa deste limiar
+        self.fuel_update_threshold = float(mass_config.get('fuel_update_threshold', 0.5))
+        # Reconstrução completa periódica para eliminar erro de arredondamento acumulado
+        self.resync_interval = int(mass_config.get('resync_interval', 1000))
+
+        self.components: Dict[str, PointMass] = {}
+        self._mass = 0.0
+        self._first_moment = np.zeros(3)
+        self._second_moment = np.zeros((3, 3))
+        self._changes_since_resync = 0
+
+        for item in mass_config['components']:
+            self.add_component(PointMass(
+                name=item['name'],
+                mass=float(item['mass']),
+                position=tuple(float(v) for v in item['position']),
+                category=item.get('category', 'payload'),
+                capacity=item.get('capacity'),
+                inertia=item.get('inertia'),
+            ))
+
+        self.fuel_flow = 0.0        # kg/s vindo da propulsão
+        self.pending_fuel = 0.0     # kg queimados ainda não debitados dos tanques
+
+        self.data = MassPropertiesData()
+        self._dirty = True
+        self._version = 0
+
+        # ASSINA estes tópicos:
+        self.bus.subscribe('propulsion_state', self.handle_propulsion_state)
+
+    # ------------------------------------------------------------------ somatórios
+
+    @staticmethod
+    def _contribution(component: PointMass):
+        """(m, m·r, tensor de 2º momento em torno da referência) de um componente"""
+        m = component.mass
+        r = np.asarray(component.position, dtype=float)
+        second = m * (np.dot(r, r) * np.eye(3) - np.outer(r, r))
+        if component.inertia is not None:
+            second = second + inertia_tensor(*component.inertia)
+        return m, m * r, second
+
+    def _apply(self, component: PointMass, sign: float):
+        m, first, second = self._contribution(component)
+        self._mass += sign * m
+        self._first_moment += sign * first
+        self._second_moment += sign * second
+
+    def _mark_changed(self):
+        self._dirty = True
+        self._changes_since_resync += 1
+        if self._changes_since_resync >= self.resync_interval:
+            self.rebuild()
+
+    def rebuild(self):
+        """Reconstrói todos os somatórios do zero (O(n))"""
+        self._mass = 0.0
+        self._first_moment = np.zeros(3)
+        self._second_moment = np.zeros((3, 3))
+        for component in self.components.values():
+            self._apply(component, +1.0)
+        self._changes_since_resync = 0
+        self._dirty = True
+
+    # ------------------------------------------------------------------ alterações
+
+    def add_component(self, component: PointMass):
+        if component.name in self.components:
+            raise ValueError(f"Componente '{component.name}' já existe")
+        self.components[component.name] = component
+        self._apply(component, +1.0)
+        self._mark_changed()
+
+    def remove_component(self, name: str):
+        self._apply(self.components.pop(name), -1.0)
+        self._mark_changed()
+
+    def set_mass(self, name: str, mass: float):
+        """Altera a massa de um componente (saturada na capacidade)"""
+        component = self.components[name]
+        if component.capacity is not None:
+            mass = min(mass, float(component.capacity))
+        mass = max(mass, 0.0)
+        if mass == component.mass:
+            return
+        self._apply(component, -1.0)
+        component.mass = mass
+        self._apply(component, +1.0)
+        self._mark_changed()
+
+    def set_position(self, name: str, position: Sequence[float]):
+        component = self.components[name]
+        self._apply(component, -1.0)
+        component.position = tuple(float(v) for v in position)
+        self._apply(component, +1.0)
+        self._mark_changed()
+
+    def fuel_remaining(self) -> float:
+        return sum(c.mass for c in self.components.values() if c.category == 'fuel')
+
+    def burn_fuel(self, amount: float):
+        """Debita combustível dos tanques proporcionalmente ao conteúdo de cada um"""
+        tanks = [c for c in self.components.values() if c.category == 'fuel' and c.mass > 0.0]
+        total = sum(t.mass for t in tanks)
+        if total <= 0.0:
+            return
+        fraction = min(amount / total, 1.0)
+        for tank in tanks:
+            self.set_mass(tank.name, tank.mass * (1.0 - fraction))
+
+    # ------------------------------------------------------------------ resultados
+
+    @property
+    def properties(self) -> MassPropertiesData:
+        """CG, inércia em torno do CG e inversa (recalculados apenas se sujos)"""
+        if self._dirty:
+            self._recompute()
+        return self.data
+
+    def _recompute(self):
+        mass = self._mass
+        cg = self._first_moment / mass
+        # Teorema dos eixos paralelos: da referência para o CG
+        inertia = self._second_moment - mass * (np.dot(cg, cg) * np.eye(3) - np.outer(cg, cg))
+        self._version += 1
+        self.data = MassPropertiesData(
+            mass=mass,
+            cg=cg,
+            inertia=inertia,
+            inertia_inv=np.linalg.inv(inertia),
+            version=self._version,
+        )
+        self._dirty = False
+
+    def handle_propulsion_state(self, propulsion_state):
+        self.fuel_flow = propulsion_state.fuel_flow
+
+    def update(self):
+        # LÓGICA: acumula a queima e só mexe nos tanques acima do limiar
+        self.pending_fuel += self.fuel_flow * self.dt
+        if self.pending_fuel >= self.fuel_update_threshold:
+            self.burn_fuel(self.pending_fuel)
+            self.pending_fuel = 0.0
+
+        # PUBLICA neste tópico (apenas quando algo mudou):
+        if self._dirty:
+            self.bus.publish('mass_properties', self.properties)
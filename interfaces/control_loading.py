@@ -0,0 +1,250 @@
+# interfaces/control_loading.py
+"""
+Control loading (force feel) de manche e pedais
+- Malha de força em thread própria a ~1 kHz, desacoplada do frame da simulação
+- Modelo por eixo: mola de centragem + rigidez aerodinâmica (∝ q), momento de
+  charneira, amortecimento, atrito de Coulomb suavizado e batentes
+- O loop principal só publica os parâmetros mais recentes (rigidez, offset,
+  trim) e lê as posições mais recentes através de LatestValue: troca de
+  referência de objetos imutáveis, sem locks
+- SimulatedControlHardware substitui o hardware real em testes headless
+- loop_stats() reporta taxa, jitter e atrasos para conferir o alvo de 1 kHz
+"""
+
+from dataclasses import dataclass
+import math
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from core.concurrency import LatestValue
+
+AXES = ('elevator', 'aileron', 'rudder')
+
+DEFAULT_AXIS = {
+    'mass': 2.0,             # kg equivalente no punho
+    'centering': 20.0,       # N por unidade de curso (mola mecânica)
+    'aero_stiffness': 0.05,  # N por unidade de curso por Pa de pressão dinâmica
+    'hinge_alpha': 0.0,      # N por rad por Pa (ângulo de ataque/derrapagem → força)
+    'damping': 8.0,          # N·s por unidade de curso
+    'friction': 2.0,         # N
+}
+
+
+@dataclass(frozen=True)
+class ForceFeelParameters:
+    """Contrato: loop principal → thread de força (troca pelo valor mais recente)"""
+    stiffness: Tuple[float, float, float] = (20.0, 20.0, 20.0)   # N por unidade de curso
+    offset: Tuple[float, float, float] = (0.0, 0.0, 0.0)         # N (momento de charneira)
+    trim: Tuple[float, float, float] = (0.0, 0.0, 0.0)           # posição de força nula
+
+
+@dataclass(frozen=True)
+class ControlLoadingState:
+    """Contrato: ControlLoading → FlightControls, DataRecorder"""
+    positions: Tuple[float, float, float] = (0.0, 0.0, 0.0)      # curso normalizado [-1, 1]
+    velocities: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    forces: Tuple[float, float, float] = (0.0, 0.0, 0.0)         # N comandados
+    tick: int = 0
+
+
+class SimulatedControlHardware:
+    """
+    Manche/pedais simulados: massa por eixo + força do "piloto" opcional
+    pilot_force(t, positions) → forças [N] (padrão: mãos fora)
+    """
+
+    def __init__(self, mass=(2.0, 2.0, 3.0), pilot_force: Optional[Callable] = None, max_step: float = 0.0005):
+        self.mass = np.asarray(mass, dtype=float)
+        self.pilot_force = pilot_force
+        self.max_step = max_step
+        self.positions = np.zeros(3)
+        self.velocities = np.zeros(3)
+        self.time = 0.0
+
+    def read(self):
+        return self.positions.copy(), self.velocities.copy()
+
+    def apply(self, forces, dt: float):
+        """Integra o eixo sob a força comandada pelo tempo real decorrido (subpassos)"""
+        steps = max(1, math.ceil(dt / self.max_step))
+        h = dt / steps
+        for _ in range(steps):
+            total = forces if self.pilot_force is None else forces + self.pilot_force(self.time, self.positions)
+            self.velocities += total / self.mass * h
+            self.positions += self.velocities * h
+            self.time += h
+
+
+class ForceLoop:
+    """Malha de força de alta taxa (thread dedicada ou passo manual em testes)"""
+
+    def __init__(self, hardware, axes_config, rate_hz: float = 1000.0, stop_stiffness: float = 5000.0,
+                 stop_damping: float = 60.0, history: int = 4096,
+                 clock: Callable[[], float] = time.perf_counter, sleep: Callable[[float], None] = time.sleep):
+        self.hardware = hardware
+        self.clock = clock
+        self.sleep = sleep
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.damping = np.array([axes_config[a]['damping'] for a in AXES], dtype=float)
+        self.friction = np.array([axes_config[a]['friction'] for a in AXES], dtype=float)
+        self.stop_stiffness = stop_stiffness
+        self.stop_damping = stop_damping
+
+        self.parameters = LatestValue(ForceFeelParameters())
+        self.output = LatestValue(ControlLoadingState())
+
+        # Histórico circular dos períodos medidos (jitter)
+        self._periods = np.zeros(history)
+        self._count = 0
+        self.overruns = 0
+        self.ticks = 0
+
+        self._thread = None
+        self._stop = threading.Event()
+
+    def force(self, positions, velocities, parameters: ForceFeelParameters):
+        """Força comandada por eixo [N]"""
+        stiffness = np.asarray(parameters.stiffness)
+        force = (-stiffness * (positions - np.asarray(parameters.trim)) + np.asarray(parameters.offset)
+                 - self.damping * velocities - self.friction * np.tanh(velocities / 0.01))
+        # Batentes: mola/amortecedor rígidos além de ±1
+        beyond = np.abs(positions) > 1.0
+        if beyond.any():
+            overshoot = positions - np.clip(positions, -1.0, 1.0)
+            force = force - beyond * (self.stop_stiffness * overshoot + self.stop_damping * velocities)
+        return force
+
+    def step(self, dt: float):
+        """Uma iteração: lê o hardware, calcula e comanda a força, publica o estado"""
+        positions, velocities = self.hardware.read()
+        force = self.force(positions, velocities, self.parameters.read())
+        self.hardware.apply(force, dt)
+        self.ticks += 1
+        self.output.write(ControlLoadingState(tuple(positions.tolist()), tuple(velocities.tolist()),
+                                              tuple(force.tolist()), self.ticks))
+
+    def _run(self):
+        period = self.period
+        clock, sleep = self.clock, self.sleep
+        previous = clock()
+        deadline = previous + period
+        while not self._stop.is_set():
+            delay = deadline - clock()
+            if delay > 0.0:
+                sleep(delay)
+            now = clock()
+            elapsed = now - previous
+            previous = now
+            self._periods[self._count % len(self._periods)] = elapsed
+            self._count += 1
+
+            self.step(elapsed)
+
+            deadline += period
+            if now - deadline > period:
+                # Atrasou mais de um período inteiro: conta e ressincroniza em vez de recuperar em rajada
+                self.overruns += 1
+                deadline = now + period
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='control-loading', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def loop_stats(self) -> dict:
+        """Taxa e jitter medidos nas últimas iterações"""
+        if self._count < 2:
+            return {'ticks': self.ticks, 'rate_hz': 0.0, 'mean_period_ms': 0.0, 'jitter_ms': 0.0,
+                    'p99_period_ms': 0.0, 'max_period_ms': 0.0, 'overruns': self.overruns}
+        # Enquanto o histórico não deu a volta, descarta o 1º período (inclui a partida da thread)
+        periods = self._periods[1:self._count] if self._count <= len(self._periods) else self._periods
+        mean = float(periods.mean())
+        return {
+            'ticks': self.ticks,
+            'rate_hz': 1.0 / mean,
+            'mean_period_ms': mean * 1e3,
+            'jitter_ms': float(periods.std()) * 1e3,
+            'p99_period_ms': float(np.percentile(periods, 99)) * 1e3,
+            'max_period_ms': float(periods.max()) * 1e3,
+            'overruns': self.overruns,
+        }
+
+
+class ControlLoading:
+    def __init__(self, message_bus, config, hardware=None, dt: float = 1 / 60.0):
+        self.bus = message_bus
+        self.dt = dt
+
+        loading = config.get('control_loading', {})
+        axes_config = {axis: {**DEFAULT_AXIS, **loading.get('axes', {}).get(axis, {})} for axis in AXES}
+        self.centering = np.array([axes_config[a]['centering'] for a in AXES])
+        self.aero_stiffness = np.array([axes_config[a]['aero_stiffness'] for a in AXES])
+        self.hinge_alpha = np.array([axes_config[a]['hinge_alpha'] for a in AXES])
+        self.trim = [0.0, 0.0, 0.0]
+
+        if hardware is None:
+            hardware = SimulatedControlHardware(mass=[axes_config[a]['mass'] for a in AXES])
+        self.loop = ForceLoop(hardware, axes_config,
+                              rate_hz=float(loading.get('rate_hz', 1000.0)),
+                              stop_stiffness=float(loading.get('stop_stiffness', 5000.0)),
+                              stop_damping=float(loading.get('stop_damping', 60.0)))
+
+        self.density = 1.225
+        self.state = None
+
+        # ASSINA estes tópicos:
+        self.bus.subscribe('aircraft_state', self.handle_aircraft_state)
+        self.bus.subscribe('environment', self.handle_environment)
+
+    def handle_aircraft_state(self, state):
+        self.state = state
+
+    def handle_environment(self, environment):
+        self.density = environment.density
+
+    def set_trim(self, axis: str, position: float):
+        """Desloca a posição de força nula do eixo"""
+        self.trim[AXES.index(axis)] = position
+
+    def start(self):
+        self.loop.start()
+
+    def stop(self):
+        self.loop.stop()
+
+    def loop_stats(self) -> dict:
+        return self.loop.loop_stats()
+
+    def parameters(self) -> ForceFeelParameters:
+        """Rigidez e momento de charneira para o estado de voo atual"""
+        if self.state is None:
+            return ForceFeelParameters(tuple(self.centering.tolist()), (0.0, 0.0, 0.0), tuple(self.trim))
+        u, v, w = self.state.velocity_body.x, self.state.velocity_body.y, self.state.velocity_body.z
+        airspeed = math.sqrt(u * u + v * v + w * w)
+        dynamic_pressure = 0.5 * self.density * airspeed * airspeed
+        alpha = math.atan2(w, u)
+        beta = math.asin(v / airspeed) if airspeed > 1e-3 else 0.0
+        # Profundor sente α, leme sente β; aileron só a rigidez
+        flow_angle = np.array([alpha, 0.0, beta])
+        stiffness = self.centering + self.aero_stiffness * dynamic_pressure
+        offset = -self.hinge_alpha * flow_angle * dynamic_pressure
+        return ForceFeelParameters(tuple(stiffness.tolist()), tuple(offset.tolist()), tuple(self.trim))
+
+    def update(self):
+        # LÓGICA: parâmetros do frame → thread de força; posição mais recente → barramento
+        self.loop.parameters.write(self.parameters())
+
+        # PUBLICA neste tópico:
+        self.bus.publish('control_loading_state', self.loop.output.read())
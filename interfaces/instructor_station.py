@@ -0,0 +1,428 @@
+# interfaces/instructor_station.py
+"""
+Estação do instrutor (IOS) servida por socket local
+- Vários clientes acompanham o estado da aeronave e enviam comandos
+  (falhas, clima, reposicionamento, congelamento)
+- Estado quantizado em inteiros (cm, cm/s, 1e-4 rad) e enviado como delta em
+  relação ao último quadro que aquele cliente recebeu: máscara de campos
+  alterados + diferenças em 1/2/4 bytes; quadro-chave só na conexão
+- Cada cliente escolhe a própria taxa ({"rate_hz": 5})
+- Comandos ({"command": nome, "args": {...}, "id": n}) entram numa fila e são
+  aplicados por update(), na fronteira do frame, pelos handlers registrados
+- O loop da simulação nunca toca em sockets: só troca a referência do quadro
+  mais recente (LatestValue). Uma thread com selectors atende todos os
+  clientes sem bloquear; cliente lento simplesmente recebe menos quadros
+"""
+
+from dataclasses import dataclass
+import json
+import queue
+import selectors
+import socket
+import struct
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from core.concurrency import LatestValue
+
+# (campo, resolução) na ordem do vetor transmitido
+STATE_FIELDS = (
+    ('north', 0.01), ('east', 0.01), ('down', 0.01),          # m
+    ('u', 0.01), ('v', 0.01), ('w', 0.01),                    # m/s
+    ('p', 1e-4), ('q', 1e-4), ('r', 1e-4),                    # rad/s
+    ('phi', 1e-4), ('theta', 1e-4), ('psi', 1e-4),            # rad
+)
+SCALES = np.array([scale for _, scale in STATE_FIELDS])
+
+DEFAULT_IOS = {
+    'host': '127.0.0.1',
+    'port': 5055,
+    'max_clients': 8,
+    'default_rate_hz': 10.0,
+    'max_backlog': 65536,      # bytes pendentes de um cliente antes de desconectá-lo
+    'send_buffer': 8192,       # SO_SNDBUF pequeno: link lento recebe quadros novos, não antigos
+}
+
+KEYFRAME, DELTA, REPLY = b'K', b'D', b'R'
+_LENGTH = struct.Struct('<I')
+_KEY_HEADER = struct.Struct('<cId')        # tipo, quadro, tempo
+_DELTA_HEADER = struct.Struct('<cIdB')     # tipo, quadro, tempo, bytes por diferença
+_MASK_BYTES = (len(STATE_FIELDS) + 7) // 8
+_WIDTHS = ((1, '<i1', 127), (2, '<i2', 32767), (4, '<i4', 2 ** 31 - 1))
+
+
+@dataclass(frozen=True)
+class StateFrame:
+    """Contrato: InstructorStation (frame) → thread de rede"""
+    frame: int
+    time: float
+    values: np.ndarray      # int64 quantizado, somente leitura
+
+
+def quantize(state) -> np.ndarray:
+    pos, vel, rates, euler = state.position_ned, state.velocity_body, state.rates_body, state.euler
+    values = np.array([pos.x, pos.y, pos.z, vel.x, vel.y, vel.z,
+                       rates.x, rates.y, rates.z, euler.x, euler.y, euler.z])
+    return np.rint(values / SCALES).astype(np.int64)
+
+
+def _message(body: bytes) -> bytes:
+    return _LENGTH.pack(len(body)) + body
+
+
+def encode_frame(frame: StateFrame, previous: Optional[np.ndarray]) -> bytes:
+    """Quadro-chave sem referência; senão máscara + diferenças na menor largura que couber"""
+    if previous is not None:
+        delta = frame.values - previous
+        changed = delta != 0
+        largest = int(np.abs(delta).max())
+        for width, dtype, limit in _WIDTHS:
+            if largest <= limit:
+                mask = np.packbits(changed, bitorder='little').tobytes()
+                return _message(_DELTA_HEADER.pack(DELTA, frame.frame, frame.time, width) + mask
+                                + delta[changed].astype(dtype).tobytes())
+    return _message(_KEY_HEADER.pack(KEYFRAME, frame.frame, frame.time) + frame.values.astype('<i8').tobytes())
+
+
+class StateDecoder:
+    """Reconstrói o estado do lado do cliente a partir de quadros-chave e deltas"""
+
+    def __init__(self):
+        self.values = None
+        self.frame = -1
+        self.time = 0.0
+
+    def decode(self, body: bytes):
+        kind = body[:1]
+        if kind == KEYFRAME:
+            _, self.frame, self.time = _KEY_HEADER.unpack_from(body)
+            self.values = np.frombuffer(body, '<i8', offset=_KEY_HEADER.size).astype(np.int64)
+        elif kind == DELTA:
+            if self.values is None:
+                raise ValueError("Delta recebido antes do quadro-chave")
+            _, self.frame, self.time, width = _DELTA_HEADER.unpack_from(body)
+            start = _DELTA_HEADER.size
+            mask = np.frombuffer(body, np.uint8, _MASK_BYTES, start)
+            changed = np.unpackbits(mask, bitorder='little')[:len(STATE_FIELDS)].astype(bool)
+            dtype = next(d for w, d, _ in _WIDTHS if w == width)
+            self.values[changed] += np.frombuffer(body, dtype, offset=start + _MASK_BYTES)
+        else:
+            raise ValueError(f"Tipo de quadro desconhecido: {kind!r}")
+
+    def state(self) -> Dict[str, float]:
+        physical = self.values * SCALES
+        return {name: float(value) for (name, _), value in zip(STATE_FIELDS, physical)}
+
+
+class _Client:
+    def __init__(self, sock, address, rate_hz):
+        self.sock = sock
+        self.address = address
+        self.rate_hz = rate_hz
+        self.next_send = 0.0
+        self.sent = None            # último vetor quantizado enviado a este cliente
+        self.sent_frame = -1
+        self.inbox = bytearray()
+        self.outbox = bytearray()
+        self.frames = 0
+        self.skipped = 0
+
+
+class InstructorServer:
+    """Thread de rede: aceita clientes, lê comandos e envia quadros sem bloquear"""
+
+    def __init__(self, latest: LatestValue, commands: queue.SimpleQueue, config: dict):
+        self.latest = latest
+        self.commands = commands
+        self.replies = queue.SimpleQueue()
+        self.host = config['host']
+        self.port = int(config['port'])
+        self.max_clients = int(config['max_clients'])
+        self.default_rate = float(config['default_rate_hz'])
+        self.max_backlog = int(config['max_backlog'])
+        self.send_buffer = int(config['send_buffer'])
+
+        self.address = None
+        self.clients = {}
+        self.bytes_sent = 0
+        self.disconnected = 0
+        self._next_id = 0
+        self._listener = None
+        self._selector = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        # Bind no thread principal: erro de porta aparece na inicialização
+        self._listener = socket.create_server((self.host, self.port))
+        self._listener.setblocking(False)
+        self.address = self._listener.getsockname()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ, None)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='instructor-station', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        for client_id in list(self.clients):
+            self._drop(client_id)
+        if self._selector is not None:
+            self._selector.close()
+            self._listener.close()
+            self._selector = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            for key, events in self._selector.select(timeout=0.002):
+                if key.data is None:
+                    self._accept()
+                elif key.data in self.clients:
+                    if events & selectors.EVENT_READ:
+                        self._receive(key.data)
+                    if events & selectors.EVENT_WRITE and key.data in self.clients:
+                        self._flush(key.data)
+            self._send_replies()
+            self._send_states()
+
+    def _accept(self):
+        try:
+            sock, address = self._listener.accept()
+        except BlockingIOError:
+            return
+        if len(self.clients) >= self.max_clients:
+            sock.close()
+            return
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer)
+        client_id = self._next_id
+        self._next_id += 1
+        self.clients[client_id] = _Client(sock, address, self.default_rate)
+        self._selector.register(sock, selectors.EVENT_READ, client_id)
+
+    def _drop(self, client_id):
+        client = self.clients.pop(client_id)
+        try:
+            self._selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+        self.disconnected += 1
+
+    def _receive(self, client_id):
+        client = self.clients[client_id]
+        try:
+            data = client.sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self._drop(client_id)
+            return
+        client.inbox += data
+        while b'\n' in client.inbox:
+            line, _, rest = bytes(client.inbox).partition(b'\n')
+            client.inbox = bytearray(rest)
+            self._handle_line(client_id, client, line)
+
+    def _handle_line(self, client_id, client, line):
+        try:
+            request = json.loads(line)
+            if 'rate_hz' in request:
+                client.rate_hz = max(float(request['rate_hz']), 0.0)
+                client.next_send = 0.0
+            if 'command' in request:
+                self.commands.put((client_id, request.get('id'), str(request['command']),
+                                   dict(request.get('args') or {})))
+        except (ValueError, TypeError, AttributeError) as error:
+            self.replies.put((client_id, {'id': None, 'ok': False, 'error': f"requisição inválida: {error}"}))
+
+    def _queue(self, client_id, data: bytes):
+        client = self.clients[client_id]
+        client.outbox += data
+        if len(client.outbox) > self.max_backlog:
+            self._drop(client_id)     # nunca lê: desiste dele em vez de acumular memória
+            return
+        self._flush(client_id)
+
+    def _flush(self, client_id):
+        client = self.clients[client_id]
+        try:
+            sent = client.sock.send(client.outbox)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._drop(client_id)
+            return
+        del client.outbox[:sent]
+        self.bytes_sent += sent
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client.outbox else 0)
+        self._selector.modify(client.sock, events, client_id)
+
+    def _send_replies(self):
+        while True:
+            try:
+                client_id, reply = self.replies.get_nowait()
+            except queue.Empty:
+                return
+            if client_id in self.clients:
+                self._queue(client_id, _message(REPLY + json.dumps(reply).encode()))
+
+    def _send_states(self):
+        frame = self.latest.read()
+        if frame is None:
+            return
+        now = time.perf_counter()
+        for client_id, client in list(self.clients.items()):
+            if client.rate_hz <= 0.0 or frame.frame == client.sent_frame or now < client.next_send:
+                continue
+            if client.outbox:
+                # Link lento: pula este quadro; o próximo delta parte do que ele já tem
+                client.skipped += 1
+                continue
+            data = encode_frame(frame, client.sent)
+            client.sent, client.sent_frame = frame.values, frame.frame
+            client.frames += 1
+            client.next_send = max(client.next_send + 1.0 / client.rate_hz, now)
+            self._queue(client_id, data)
+
+
+class InstructorStation:
+    def __init__(self, message_bus, config, dt: float = 1 / 60.0):
+        self.bus = message_bus
+        self.dt = dt
+        settings = dict(DEFAULT_IOS, **(config.get('instructor_station') or {}))
+
+        self.handlers: Dict[str, Callable] = {}
+        self.commands = queue.SimpleQueue()
+        self.latest = LatestValue()
+        self.server = InstructorServer(self.latest, self.commands, settings)
+
+        self.state = None
+        self.frame = 0
+        self.applied = 0
+        self.rejected = 0
+
+        # ASSINA estes tópicos:
+        self.bus.subscribe('aircraft_state', self.handle_aircraft_state)
+
+    def handle_aircraft_state(self, state):
+        self.state = state
+
+    def register_command(self, name: str, handler: Callable):
+        """Comando do IOS → método do módulo (ex.: 'freeze' → SimpleFlightDynamics.set_frozen)"""
+        self.handlers[name] = handler
+
+    def start(self):
+        self.server.start()
+
+    def stop(self):
+        self.server.stop()
+
+    @property
+    def address(self):
+        return self.server.address
+
+    def apply_commands(self):
+        """Esvazia a fila de comandos chegados durante o frame anterior"""
+        while True:
+            try:
+                client_id, request_id, name, args = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            reply = {'id': request_id, 'command': name, 'frame': self.frame, 'ok': True}
+            handler = self.handlers.get(name)
+            try:
+                if handler is None:
+                    raise KeyError(f"comando desconhecido: {name}")
+                handler(**args)
+                self.applied += 1
+            except Exception as error:
+                reply.update(ok=False, error=str(error))
+                self.rejected += 1
+            self.server.replies.put((client_id, reply))
+
+    def update(self):
+        # LÓGICA: comandos aplicados na fronteira do frame, depois o quadro de estado
+        self.apply_commands()
+        self.frame += 1
+        if self.state is not None:
+            values = quantize(self.state)
+            values.flags.writeable = False
+            self.latest.write(StateFrame(self.frame, self.frame * self.dt, values))
+
+    def stats(self) -> dict:
+        clients = list(self.server.clients.values())
+        return {
+            'clients': len(clients),
+            'frames_sent': sum(c.frames for c in clients),
+            'frames_skipped': sum(c.skipped for c in clients),
+            'bytes_sent': self.server.bytes_sent,
+            'commands_applied': self.applied,
+            'commands_rejected': self.rejected,
+            'disconnected': self.server.disconnected,
+        }
+
+
+class InstructorClient:
+    """Cliente bloqueante simples (ferramentas e testes)"""
+
+    def __init__(self, address, timeout: float = 2.0):
+        self.sock = socket.create_connection(address, timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.decoder = StateDecoder()
+        self.replies = []
+        self.frames = 0
+        self._buffer = bytearray()
+        self._next_id = 0
+
+    def close(self):
+        self.sock.close()
+
+    def _send(self, request: dict):
+        self.sock.sendall(json.dumps(request).encode() + b'\n')
+
+    def set_rate(self, rate_hz: float):
+        self._send({'rate_hz': rate_hz})
+
+    def command(self, name: str, **args) -> int:
+        self._next_id += 1
+        self._send({'command': name, 'args': args, 'id': self._next_id})
+        return self._next_id
+
+    def _read(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            data = self.sock.recv(65536)
+            if not data:
+                raise ConnectionError("IOS encerrou a conexão")
+            self._buffer += data
+        chunk = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return chunk
+
+    def receive(self):
+        """Lê uma mensagem: ('state', dict) ou ('reply', dict)"""
+        body = self._read(_LENGTH.unpack(self._read(_LENGTH.size))[0])
+        if body[:1] == REPLY:
+            reply = json.loads(body[1:])
+            self.replies.append(reply)
+            return 'reply', reply
+        self.decoder.decode(body)
+        self.frames += 1
+        return 'state', self.decoder.state()
+
+    def wait_reply(self, request_id: int) -> dict:
+        while True:
+            kind, message = self.receive()
+            if kind == 'reply' and message.get('id') == request_id:
+                return message
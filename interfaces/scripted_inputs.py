@@ -0,0 +1,240 @@
+# interfaces/scripted_inputs.py
+"""
+Entradas do piloto roteirizadas (cenários) para rodadas headless e em lote
+- Roteiro por canal (YAML ou dict): lista de segmentos aplicados em ordem sobre o valor
+  padrão do canal
+    steps / linear / trace  → definem o valor (degraus, rampas, traço gravado) e mantêm
+                              o último valor até 'end' (padrão: fim do cenário)
+    doublet / 3211 / pulse / sine → somam uma perturbação ao que já existe
+- compile(rate) amostra tudo uma vez numa tabela (amostras × canais) em grade uniforme,
+  já saturada nos limites de cada canal
+- No frame: índice em O(1) (t·rate) + interpolação linear entre duas linhas; com o
+  frame alinhado à grade, o ControlInputs do frame já vem pronto da compilação
+- ScriptedInputs publica em 'pilot_controls' (no lugar do X-Plane ou do mock)
+"""
+
+from dataclasses import dataclass, field
+import math
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import yaml
+
+from core.data_types import ControlInputs
+from core.message_bus import MessageBus
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHANNELS = ('throttle', 'elevator', 'aileron', 'rudder', 'flaps', 'gear', 'brakes')
+LIMITS = {'throttle': (0.0, 1.0), 'elevator': (-1.0, 1.0), 'aileron': (-1.0, 1.0), 'rudder': (-1.0, 1.0),
+          'flaps': (0.0, 1.0), 'gear': (0.0, 1.0), 'brakes': (0.0, 1.0)}
+DEFAULTS = {'throttle': 0.6, 'elevator': 0.0, 'aileron': 0.0, 'rudder': 0.0, 'flaps': 0.0, 'gear': 1.0,
+            'brakes': 0.0}
+
+# Sequências de sinais das entradas multi-degrau, em múltiplos da largura de pulso
+PULSE_TRAINS = {
+    'pulse': ((1, 1.0),),
+    'doublet': ((1, 1.0), (1, -1.0)),
+    '3211': ((3, 1.0), (2, -1.0), (1, 1.0), (1, -1.0)),
+}
+SEGMENT_TYPES = ('steps', 'linear', 'trace', 'sine') + tuple(PULSE_TRAINS)
+
+
+def _points(segment: dict):
+    points = np.asarray(segment.get('points', ()), dtype=float)
+    if points.ndim != 2 or points.shape[1] != 2 or len(points) == 0:
+        raise ValueError(f"Segmento '{segment['type']}' precisa de points [[t, valor], ...]")
+    if np.any(np.diff(points[:, 0]) < 0.0):
+        raise ValueError(f"Segmento '{segment['type']}': tempos de points devem ser crescentes")
+    return points[:, 0], points[:, 1]
+
+
+def _trace(segment: dict, base_dir: str):
+    """Traço gravado: arrays no próprio roteiro ou colunas de um CSV com cabeçalho"""
+    if 'file' in segment:
+        path = segment['file'] if os.path.isabs(segment['file']) else os.path.join(base_dir, segment['file'])
+        table = np.genfromtxt(path, delimiter=',', names=True)
+        time_s = table[segment.get('time_column', 'time')]
+        values = table[segment['column']]
+    else:
+        time_s, values = np.asarray(segment['time'], dtype=float), np.asarray(segment['values'], dtype=float)
+    if time_s.shape != values.shape or time_s.size < 2 or np.any(np.diff(time_s) <= 0.0):
+        raise ValueError("Traço precisa de tempos estritamente crescentes e o mesmo número de valores")
+    return time_s + float(segment.get('start', 0.0)), values
+
+
+@dataclass
+class InputScenario:
+    """Roteiro de entradas: duração, valores padrão e segmentos por canal"""
+    name: str
+    duration: float
+    channels: Dict[str, List[dict]] = field(default_factory=dict)
+    defaults: Dict[str, float] = field(default_factory=dict)
+    loop: bool = False
+    base_dir: str = '.'                # resolve caminhos de traços em arquivo
+
+    def __post_init__(self):
+        if not self.duration > 0.0:
+            raise ValueError(f"Duração do cenário deve ser positiva, recebido {self.duration!r}")
+        for name, segments in self.channels.items():
+            if name not in CHANNELS:
+                raise ValueError(f"Canal desconhecido no cenário: '{name}' (canais: {', '.join(CHANNELS)})")
+            for segment in segments:
+                if segment.get('type') not in SEGMENT_TYPES:
+                    raise ValueError(f"Tipo de segmento desconhecido em '{name}': {segment.get('type')!r} "
+                                     f"(tipos: {', '.join(SEGMENT_TYPES)})")
+        unknown = set(self.defaults) - set(CHANNELS)
+        if unknown:
+            raise ValueError(f"Canais desconhecidos em defaults: {sorted(unknown)}")
+
+    @classmethod
+    def from_dict(cls, data: dict, base_dir: str = '.') -> 'InputScenario':
+        return cls(name=data.get('name', 'scenario'), duration=float(data['duration']),
+                   channels={name: list(segments) for name, segments in data.get('channels', {}).items()},
+                   defaults=dict(data.get('defaults', {})), loop=bool(data.get('loop', False)), base_dir=base_dir)
+
+    @classmethod
+    def load(cls, path: str) -> 'InputScenario':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+        return cls.from_dict(data.get('scenario', data), base_dir=os.path.dirname(os.path.abspath(path)))
+
+    @classmethod
+    def from_steps(cls, name: str, duration: float, inputs: Dict[str, Sequence], defaults: Dict[str, float] = None):
+        """Degraus (t, valor) por canal - o formato de Maneuver.inputs"""
+        return cls(name, duration, {channel: [{'type': 'steps', 'points': [list(p) for p in sorted(points)]}]
+                                    for channel, points in inputs.items() if len(points)},
+                   defaults=dict(defaults or {}))
+
+    def _apply(self, segment: dict, time_s: np.ndarray, values: np.ndarray):
+        kind = segment['type']
+        if kind in ('steps', 'linear', 'trace'):
+            if kind == 'trace':
+                breaks, levels = _trace(segment, self.base_dir)
+            else:
+                breaks, levels = _points(segment)
+            end = float(segment.get('end', math.inf))
+            mask = (time_s >= breaks[0]) & (time_s < end)
+            t = time_s[mask]
+            if kind == 'steps':
+                values[mask] = levels[np.searchsorted(breaks, t, side='right') - 1]
+            else:
+                values[mask] = np.interp(t, breaks, levels)     # mantém o último valor depois do fim
+            return
+
+        start = float(segment.get('start', 0.0))
+        amplitude = float(segment['amplitude'])
+        if kind == 'sine':
+            end = float(segment.get('end', math.inf))
+            mask = (time_s >= start) & (time_s < end)
+            frequency = float(segment['frequency']) if 'frequency' in segment else 2.0 * math.pi / float(segment['period'])
+            values[mask] += amplitude * np.sin(frequency * (time_s[mask] - start) + float(segment.get('phase', 0.0)))
+            return
+
+        width = float(segment['width'])
+        for multiple, sign in PULSE_TRAINS[kind]:
+            end = start + multiple * width
+            values[(time_s >= start) & (time_s < end)] += sign * amplitude
+            start = end
+
+    def compile(self, rate: float) -> 'CompiledScenario':
+        """Tabela (amostras × canais) na grade k/rate, de 0 até a duração inclusive"""
+        period = 1.0 / rate
+        count = int(math.floor(self.duration * rate + 1e-9)) + 1
+        time_s = np.arange(count) * period
+        table = np.empty((count, len(CHANNELS)))
+        for j, channel in enumerate(CHANNELS):
+            values = np.full(count, float(self.defaults.get(channel, DEFAULTS[channel])))
+            for segment in self.channels.get(channel, ()):
+                self._apply(segment, time_s, values)
+            low, high = LIMITS[channel]
+            table[:, j] = np.clip(values, low, high)
+        return CompiledScenario(self.name, rate, table, self.duration, self.loop)
+
+
+class CompiledScenario:
+    """Entradas prontas por frame: índice em O(1), interpolação entre linhas vizinhas"""
+
+    def __init__(self, name: str, rate: float, table: np.ndarray, duration: float, loop: bool = False):
+        self.name = name
+        self.rate = rate
+        self.table = table
+        self.duration = duration
+        self.loop = loop
+        self._rows = table.tolist()
+        self._last = len(self._rows) - 1
+        # Frames alinhados à grade: objeto pronto, nada alocado no laço
+        self.frames = [ControlInputs(*row) for row in self._rows]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def values(self, time_s: float) -> List[float]:
+        """Valores dos canais (ordem de CHANNELS) no instante t"""
+        if self.loop:
+            time_s %= self.duration
+        position = time_s * self.rate
+        if position <= 0.0:
+            return self._rows[0]
+        index = int(position)
+        if index >= self._last:
+            return self._rows[self._last]
+        frac = position - index
+        a, b = self._rows[index], self._rows[index + 1]
+        return [x + frac * (y - x) for x, y in zip(a, b)]
+
+    def controls(self, time_s: float) -> ControlInputs:
+        return ControlInputs(*self.values(time_s))
+
+    def frame(self, k: int, dt: float) -> ControlInputs:
+        """Entradas do frame k; com dt = 1/rate é só um índice"""
+        if abs(dt * self.rate - 1.0) > 1e-9:
+            return self.controls(k * dt)
+        if self.loop:
+            return self.controls(k * dt) if k > self._last else self.frames[k]
+        return self.frames[min(k, self._last)]
+
+
+class ScriptedInputs:
+    """
+    Módulo do orquestrador que toca um cenário compilado no lugar do piloto
+    """
+
+    def __init__(self, message_bus: MessageBus, config: dict, dt: float = 1 / 60.0):
+        self.bus = message_bus
+        self.dt = dt
+        section = config['scripted_inputs']
+        scenario = section.get('scenario')
+        if isinstance(scenario, str):
+            if not os.path.isabs(scenario):
+                scenario = os.path.join(_PROJECT_ROOT, scenario)
+            scenario = InputScenario.load(scenario)
+        elif isinstance(scenario, dict):
+            scenario = InputScenario.from_dict(scenario)
+        elif not isinstance(scenario, InputScenario):
+            raise ValueError("scripted_inputs.scenario deve ser um caminho, um dict ou um InputScenario")
+        self.scenario = scenario.compile(float(section.get('rate', 1.0 / dt)))
+        self.frame_count = 0
+        self.controls: Optional[ControlInputs] = None
+
+    def update(self):
+        # LÓGICA: linha do frame na tabela compilada
+        self.controls = self.scenario.frame(self.frame_count, self.dt)
+        self.frame_count += 1
+
+        # PUBLICA neste tópico:
+        self.bus.publish('pilot_controls', self.controls)
+
+    def reset(self):
+        self.frame_count = 0
+
+
+# Controles do modo mock do XPlaneInterface: senoides incomensuráveis de período
+# comum 20π s (5, 3, 2 e 1 ciclos), tocadas em laço
+MOCK_SCENARIO = InputScenario('mock_pilot', 20.0 * math.pi, loop=True, channels={
+    'elevator': [{'type': 'sine', 'amplitude': 0.2, 'frequency': 0.5}],
+    'aileron': [{'type': 'sine', 'amplitude': 0.1, 'frequency': 0.3}],
+    'rudder': [{'type': 'sine', 'amplitude': 0.05, 'frequency': 0.2}],
+    'throttle': [{'type': 'sine', 'amplitude': 0.2, 'frequency': 0.1}],
+})
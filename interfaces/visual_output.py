@@ -0,0 +1,199 @@
+# interfaces/visual_output.py
+"""
+Estágio de saída visual: estados com carimbo de tempo → pose no instante de exibição
+- Cada aircraft_state vira um instantâneo imutável (tempo, posição e velocidade NED,
+  quaternion corpo → NED, taxas no corpo); os últimos ficam numa tupla trocada por
+  referência (escritor único, leitura sem locks, como LatestValue)
+- pose(t) dentro do histórico: Hermite cúbico na posição (usa as velocidades dos dois
+  instantâneos) e slerp no quaternion
+- pose(t) além do último estado: dead reckoning (velocidade + aceleração estimada dos
+  dois últimos instantâneos) e taxas angulares integradas no quaternion, até
+  max_extrapolation; depois disso a pose fica parada no horizonte
+- Exibição = agora + transport_delay: o X-Plane recebe a pose de quando a imagem chega
+  à tela, não a de quando a física publicou
+- VisualOutput envia na própria taxa (thread) ou a cada estado (rate = 0): a física
+  pode rodar mais devagar ou fora de fase com o visual
+"""
+
+from dataclasses import dataclass
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from core.data_types import AircraftState
+from utils.coordinate_transforms import (body_to_ned, euler_to_quaternion, quaternion_multiply,
+                                         quaternion_slerp, rotation_quaternion)
+
+
+@dataclass(frozen=True)
+class PoseSnapshot:
+    time: float                      # s (relógio do estágio de saída)
+    position: np.ndarray             # NED [m]
+    velocity: np.ndarray             # NED [m/s]
+    quaternion: np.ndarray           # corpo → NED [w, x, y, z]
+    rates: np.ndarray                # corpo [rad/s]
+
+    @classmethod
+    def from_state(cls, time_s: float, state: AircraftState) -> 'PoseSnapshot':
+        """Copia o estado (a dinâmica reaproveita o mesmo objeto a cada frame)"""
+        phi, theta, psi = state.euler.x, state.euler.y, state.euler.z
+        velocity_body = np.array([state.velocity_body.x, state.velocity_body.y, state.velocity_body.z])
+        arrays = (np.array([state.position_ned.x, state.position_ned.y, state.position_ned.z]),
+                  body_to_ned(velocity_body, phi, theta, psi),
+                  euler_to_quaternion(phi, theta, psi),
+                  np.array([state.rates_body.x, state.rates_body.y, state.rates_body.z]))
+        for array in arrays:
+            array.flags.writeable = False
+        return cls(float(time_s), *arrays)
+
+
+class PoseExtrapolator:
+    """Histórico curto de instantâneos → pose em qualquer instante"""
+
+    def __init__(self, history: int = 8, max_extrapolation: float = 0.25):
+        if history < 2:
+            raise ValueError("history precisa guardar pelo menos 2 instantâneos")
+        if max_extrapolation < 0.0:
+            raise ValueError("max_extrapolation deve ser >= 0")
+        self.history = history
+        self.max_extrapolation = max_extrapolation
+        self._snapshots: Tuple[PoseSnapshot, ...] = ()
+
+    def push(self, time_s: float, state: AircraftState):
+        """Novo estado da física; tempos fora de ordem são descartados"""
+        snapshots = self._snapshots
+        if snapshots and time_s <= snapshots[-1].time:
+            return
+        self._snapshots = (snapshots + (PoseSnapshot.from_state(time_s, state),))[-self.history:]
+
+    @property
+    def latest(self) -> Optional[PoseSnapshot]:
+        snapshots = self._snapshots
+        return snapshots[-1] if snapshots else None
+
+    def lead(self, time_s: float) -> float:
+        """Quanto t está além do último estado [s] (negativo = dentro do histórico)"""
+        latest = self.latest
+        return float('nan') if latest is None else time_s - latest.time
+
+    def pose(self, time_s: float) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(posição NED, quaternion) no instante pedido; None antes do primeiro estado"""
+        snapshots = self._snapshots
+        if not snapshots:
+            return None
+        if time_s <= snapshots[0].time:
+            return snapshots[0].position, snapshots[0].quaternion
+        if time_s >= snapshots[-1].time:
+            return self._extrapolate(snapshots, time_s)
+
+        # Par que contém t (histórico curto: busca linear a partir do fim)
+        i = len(snapshots) - 1
+        while snapshots[i - 1].time > time_s:
+            i -= 1
+        a, b = snapshots[i - 1], snapshots[i]
+        h = b.time - a.time
+        s = (time_s - a.time) / h
+        s2, s3 = s * s, s * s * s
+        position = ((2.0 * s3 - 3.0 * s2 + 1.0) * a.position + (s3 - 2.0 * s2 + s) * h * a.velocity
+                    + (3.0 * s2 - 2.0 * s3) * b.position + (s3 - s2) * h * b.velocity)
+        return position, quaternion_slerp(a.quaternion, b.quaternion, s)
+
+    def _extrapolate(self, snapshots, time_s: float):
+        last = snapshots[-1]
+        tau = min(time_s - last.time, self.max_extrapolation)
+        position = last.position + last.velocity * tau
+        if len(snapshots) > 1:
+            previous = snapshots[-2]
+            acceleration = (last.velocity - previous.velocity) / (last.time - previous.time)
+            position = position + 0.5 * acceleration * tau * tau
+        # Taxas no corpo: rotação incremental à direita
+        quaternion = quaternion_multiply(last.quaternion, rotation_quaternion(last.rates * tau))
+        return position, quaternion
+
+
+class VisualOutput:
+    """
+    Envia a pose do instante de exibição (agora + transport_delay) pelo callback
+    send(posição NED, quaternion); em thread própria quando rate > 0
+    """
+
+    def __init__(self, send: Callable[[np.ndarray, np.ndarray], None], rate: float = 0.0,
+                 transport_delay: float = 0.0, max_extrapolation: float = 0.25, history: int = 8,
+                 clock: Callable[[], float] = time.perf_counter):
+        if rate < 0.0 or transport_delay < 0.0:
+            raise ValueError("rate e transport_delay devem ser >= 0")
+        self.send_pose = send
+        self.rate = rate
+        self.transport_delay = transport_delay
+        self.clock = clock
+        self.extrapolator = PoseExtrapolator(history, max_extrapolation)
+
+        self.sent = 0
+        self.extrapolated = 0      # envios além do último estado
+        self.saturated = 0         # além do horizonte de extrapolação (pose parada)
+        self.max_lead = 0.0        # s
+
+        self._thread = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_config(cls, send, config: Optional[dict], clock: Callable[[], float] = time.perf_counter):
+        """Seção xplane.visual_output (ausente = envio a cada estado, sem compensação)"""
+        config = config or {}
+        return cls(send, rate=float(config.get('rate', 0.0)),
+                   transport_delay=float(config.get('transport_delay', 0.0)),
+                   max_extrapolation=float(config.get('max_extrapolation', 0.25)),
+                   history=int(config.get('history', 8)), clock=clock)
+
+    def push(self, state: AircraftState, time_s: Optional[float] = None):
+        """Carimba o estado recebido (relógio do estágio, ou o tempo dado)"""
+        self.extrapolator.push(self.clock() if time_s is None else time_s, state)
+        if self.rate == 0.0:
+            self.send()
+
+    def send(self, now: Optional[float] = None) -> bool:
+        """Uma pose para o instante de exibição; False se ainda não houve estado"""
+        display_time = (self.clock() if now is None else now) + self.transport_delay
+        pose = self.extrapolator.pose(display_time)
+        if pose is None:
+            return False
+        lead = self.extrapolator.lead(display_time)
+        if lead > 0.0:
+            self.extrapolated += 1
+            self.max_lead = max(self.max_lead, lead)
+            if lead > self.extrapolator.max_extrapolation:
+                self.saturated += 1
+        self.send_pose(*pose)
+        self.sent += 1
+        return True
+
+    def _run(self):
+        period = 1.0 / self.rate
+        deadline = time.perf_counter() + period
+        while not self._stop.is_set():
+            delay = deadline - time.perf_counter()
+            if delay > 0.0:
+                time.sleep(delay)
+            self.send()
+            deadline += period
+            if time.perf_counter() - deadline > period:
+                deadline = time.perf_counter() + period     # atrasou: ressincroniza sem rajada
+
+    def start(self):
+        if self.rate == 0.0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='visual-output', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {'sent': self.sent, 'extrapolated': self.extrapolated, 'saturated': self.saturated,
+                'max_lead_ms': self.max_lead * 1e3}
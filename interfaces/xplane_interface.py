@@ -1,39 +1,61 @@
 """
 Interface REAL com o X-Plane
-- Lê controles do X-Plane e publica no Message Bus
-- Recebe estado do nosso modelo e envia para X-Plane
+- Lê controles do X-Plane e publica no Message Bus ('pilot_controls' → FlightControls)
+- Recebe estado do nosso modelo e envia para X-Plane pelo estágio de saída visual
+  (interpolação/extrapolação até o instante de exibição, ver visual_output.py)
 """
 
+import importlib
+import importlib.util
+import math
 import time
-import sys
 import os
 
-BACKEND = os.getenv("FLIGHTSIM_XPC_BACKEND", "auto")
+import numpy as np
 
-try:
-    if BACKEND == "mock":
-        from xpc_mock import XPlaneConnectMock as XPlaneConnect
-    else:
-        import xpc  # biblioteca oficial XPlaneConnect
-        XPlaneConnect = xpc.XPlaneConnect
-except Exception:
-    # fallback automático
-    from xpc_mock import XPlaneConnectMock as XPlaneConnect
+from core.message_bus import MessageBus
+from core.data_types import ControlInputs, AircraftState
+from core.sim_logging import get_logger
+from utils.coordinate_transforms import local_tangent_plane, quaternion_to_euler
+from interfaces.visual_output import VisualOutput
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_log = get_logger('xplane')
 
-from core.message_bus import MessageBus
-from core.data_types import ControlInputs, AircraftState, Vector3
+# Único lugar que conhece os clientes do X-Plane: nome → (módulo, classe) tentados em ordem
+BACKENDS = {
+    'auto': (("xpc", "XPlaneConnect"), ("XPlaneConnect", "XPlaneConnect")),
+    'mock': (("xpc_mock", "XPlaneConnectMock"),),
+    'none': (),
+}
+ENV_VAR = "FLIGHTSIM_XPC_BACKEND"
 
-try:
-    import XPlaneConnect as xpc
+# nome → classe cliente (ou None); cada nome é sondado no máximo uma vez por processo
+_RESOLVED = {}
 
-    XPLANE_AVAILABLE = True
-    print("✅ XPlaneConnect disponível - modo REAL ativado")
-except ImportError:
-    XPLANE_AVAILABLE = False
-    print("⚠️  XPlaneConnect não disponível - conectando ao MOCK")
-    from xplane_local_test.xplane_client import get_xplane_client
+
+def resolve_backend(name: str = None):
+    """
+    Classe cliente do XPlaneConnect ou None (controles mock internos)
+    Resolvida uma vez, na primeira interface criada - importar este módulo não sonda
+    nada. FLIGHTSIM_XPC_BACKEND tem precedência sobre xplane.backend da configuração:
+    auto (padrão) | mock | none. Módulos ausentes são descartados por find_spec, sem
+    pagar uma tentativa de import
+    """
+    name = os.getenv(ENV_VAR) or name or 'auto'
+    if name not in BACKENDS:
+        raise ValueError(f"Backend do X-Plane desconhecido: {name!r} (opções: {', '.join(BACKENDS)})")
+    if name not in _RESOLVED:
+        client = None
+        for module_name, attribute in BACKENDS[name]:
+            if importlib.util.find_spec(module_name) is None:
+                continue
+            try:
+                client = getattr(importlib.import_module(module_name), attribute)
+                break
+            except (ImportError, AttributeError):
+                continue
+        _RESOLVED[name] = client
+    return _RESOLVED[name]
 
 
 class XPlaneInterface:
@@ -41,46 +63,72 @@ class XPlaneInterface:
     Interface com X-Plane (real ou mock)
     """
 
-    def __init__(self, message_bus: MessageBus, xplane_host: str = '127.0.0.1', xplane_port: int = 49000):
+    def __init__(self, message_bus: MessageBus, xplane_host: str = '127.0.0.1', xplane_port: int = 49000,
+                 origin: tuple = (40.0, -75.0, 0.0), visual_output: dict = None, clock=time.perf_counter,
+                 backend: str = None, dt: float = 1 / 60.0):
         self.bus = message_bus
+        self.dt = dt
         self.host = xplane_host
         self.port = xplane_port
 
+        # Origem (lat, lon, alt) do referencial NED do nosso modelo - rotação ECEF→NED em cache
+        self.tangent_plane = local_tangent_plane(*origin)
+
         # Estado
         self.connected = False
         self.xp_client = None
         self.frame_count = 0
 
-        # Para mock
-        self.mock_controls = ControlInputs()
-        self.mock_auto_pilot = False
+        # Para mock (cenário compilado no primeiro frame sem X-Plane)
+        self.mock_controls = ControlInputs(throttle=0.0, elevator=0.0, aileron=0.0, rudder=0.0)
+        self.mock_scenario = None
+
+        # Últimos controles lidos e último estado recebido (só para os logs agendados)
+        self.xplane_controls = None
+        self.our_state = None
 
         # Conecta ao X-Plane (se disponível)
-        if XPLANE_AVAILABLE:
+        self.backend = resolve_backend(backend)
+        if self.backend is not None:
+            _log.info("✅ XPlaneConnect disponível (%s) - modo REAL ativado", self.backend.__module__)
             self._connect_to_xplane()
         else:
-            print("🔶 Executando em modo MOCK - controles simulados")
+            _log.info("🔶 XPlaneConnect não disponível - executando em modo MOCK, controles simulados")
             self.connected = True  # Mock sempre "conectado"
 
-        # Inscreve para receber estado do nosso modelo
+        # Pose própria: estados carimbados, enviados para o instante de exibição
+        self.visual = VisualOutput.from_config(self._send_pose_to_real_xplane, visual_output, clock=clock)
+
+        # Tráfego IA: os mais próximos ocupam slots multiplayer estáveis (criados no 1º lote)
+        self.traffic_slots = None
+        self.traffic_sent = 0
+
+        # Inscreve para receber estado do nosso modelo e o tráfego próximo
         self.bus.subscribe("aircraft_state", self._handle_our_aircraft_state)
+        self.bus.subscribe("traffic", self._handle_traffic)
 
     def _connect_to_xplane(self):
         """Conecta com X-Plane real"""
         try:
-            self.xp_client = xpc.XPlaneConnect(self.host, self.port)
+            self.xp_client = self.backend(self.host, self.port)
             self.connected = True
-            print(f"✅ Conectado ao X-Plane em {self.host}:{self.port}")
+            _log.info("✅ Conectado ao X-Plane em %s:%s", self.host, self.port)
         except Exception as e:
-            print(f"❌ Falha ao conectar com X-Plane: {e}")
-            print("🔶 Continuando em modo MOCK")
+            _log.error("❌ Falha ao conectar com X-Plane: %s - continuando em modo MOCK", e)
             self.connected = False
 
+    def start(self):
+        """Envio da pose na taxa do visual (xplane.visual_output.rate > 0)"""
+        self.visual.start()
+
+    def stop(self):
+        self.visual.stop()
+
     def update(self):
         """Chamado a cada frame - lê controles do X-Plane"""
         self.frame_count += 1
 
-        if XPLANE_AVAILABLE and self.connected and self.xp_client:
+        if self.connected and self.xp_client:
             self._read_real_xplane_controls()
         else:
             self._generate_mock_controls()
@@ -100,76 +148,68 @@ class XPlaneInterface:
                 flaps=ctrl_data[5]  # 0 to 1
             )
 
-            # Publica controles no nosso sistema
-            self.bus.publish("controls", controls)
-
-            # Log a cada segundo para não poluir
-            if self.frame_count % 60 == 0:
-                print(f"🎮 X-Plane Controls: elev={controls.elevator:.2f}, thr={controls.throttle[0]:.2f}")
+            # Publica controles do piloto (FlightControls aplica trim, autopiloto e atuadores)
+            self.xplane_controls = controls
+            self.bus.publish("pilot_controls", controls)
 
         except Exception as e:
-            print(f"❌ Erro lendo controles do X-Plane: {e}")
+            _log.error("❌ Erro lendo controles do X-Plane: %s", e)
             self.connected = False
 
     def _generate_mock_controls(self):
-        """Gera controles mock para desenvolvimento sem X-Plane"""
-        # Simula um piloto automático simples ou entrada manual
-        if self.mock_auto_pilot:
-            # Modo automático - voo reto e nivelado
-            controls = ControlInputs(
-                elevator=0.1,  # Leve subida
-                aileron=0.0,
-                rudder=0.0,
-                throttle=[0.7],
-                flaps=0.0
-            )
-        else:
-            # Modo manual - controles variando suavemente
-            import math
-            time_s = self.frame_count / 60.0
-            controls = ControlInputs(
-                elevator=0.2 * math.sin(time_s * 0.5),  # Oscila suavemente
-                aileron=0.1 * math.sin(time_s * 0.3),
-                rudder=0.05 * math.sin(time_s * 0.2),
-                throttle=[0.6 + 0.2 * math.sin(time_s * 0.1)],
-                flaps=0.0
-            )
-
-        # Alterna entre manual e automático a cada 10 segundos
-        if self.frame_count % 600 == 0:
-            self.mock_auto_pilot = not self.mock_auto_pilot
-            mode = "AUTOPILOT" if self.mock_auto_pilot else "MANUAL"
-            print(f"🔀 Modo Mock: {mode}")
+        """Controles mock para desenvolvimento sem X-Plane: cenário compilado tocado em laço"""
+        # Piloto manual simulado - controles variando suavemente
+        # (o piloto automático de verdade fica em FlightControls)
+        if self.mock_scenario is None:
+            from interfaces.scripted_inputs import MOCK_SCENARIO
+            self.mock_scenario = MOCK_SCENARIO.compile(1.0 / self.dt)
+        controls = self.mock_scenario.frame(self.frame_count, self.dt)
+        self.mock_controls = controls
 
         # Publica controles mock
-        self.bus.publish("controls", controls)
-
-        # Log a cada 2 segundos
-        if self.frame_count % 120 == 0:
-            print(f"🎮 Mock Controls: elev={controls.elevator:.2f}, thr={controls.throttle[0]:.2f}")
+        self.bus.publish("pilot_controls", controls)
 
     def _handle_our_aircraft_state(self, our_state: AircraftState):
-        """Recebe estado do nosso modelo e envia para X-Plane"""
-        if XPLANE_AVAILABLE and self.connected and self.xp_client:
-            self._send_to_real_xplane(our_state)
-        else:
-            # Em modo mock, apenas mostra o estado
-            if self.frame_count % 120 == 0:  # A cada 2 segundos
-                print(
-                    f"✈️  Nosso Estado: Altura={-our_state.position_ned.z:.0f}m, Vel={our_state.velocity_body.x:.1f}m/s")
-
-    def _send_to_real_xplane(self, our_state: AircraftState):
-        """Envia estado para X-Plane real"""
+        """Recebe estado do nosso modelo: carimbado e (com rate = 0) enviado em seguida"""
+        self.our_state = our_state  # Em modo mock, apenas mostrado pelo log periódico
+        if self.connected and self.xp_client:
+            self.visual.push(our_state)
+
+    def schedule_events(self, scheduler):
+        """Logs periódicos em tempo simulado: controles do X-Plane a cada 1 s, mock a cada 2 s"""
+        scheduler.every(1.0, self._log_xplane_controls, name='xplane.controls_log')
+        scheduler.every(2.0, self._log_mock, name='xplane.mock_log')
+
+    def _log_xplane_controls(self):
+        controls = self.xplane_controls
+        if controls is not None and self.connected and self.xp_client:
+            _log.info("🎮 X-Plane Controls: elev=%.2f, thr=%.2f", controls.elevator, controls.throttle[0])
+
+    def _log_mock(self):
+        if self.connected and self.xp_client:
+            return
+        controls = self.mock_controls
+        _log.info("🎮 Mock Controls: elev=%.2f, thr=%.2f", controls.elevator, controls.throttle)
+        if self.our_state is not None:
+            state = self.our_state
+            _log.info("✈️  Nosso Estado: Altura=%.0fm, Vel=%.1fm/s", -state.position_ned.z, state.velocity_body.x)
+
+    def _send_pose_to_real_xplane(self, position, quaternion):
+        """Envia a pose (NED + quaternion corpo → NED) para X-Plane real"""
+        if not (self.connected and self.xp_client):
+            return
         try:
-            # Converte nosso estado para formato X-Plane
-            # X-Plane espera: [lat, lon, alt, pitch, roll, heading, gear]
+            # Converte para formato X-Plane
+            # X-Plane espera: [lat, lon, alt, pitch, roll, heading, gear] (graus, metros MSL)
+            lat, lon, alt = self.tangent_plane.ned_to_lla(position[0], position[1], position[2])
+            roll, pitch, heading = quaternion_to_euler(quaternion)
             xplane_data = [
-                0.0,  # Lat - usar referência local
-                0.0,  # Lon - usar referência local
-                -our_state.position_ned.z,  # Altitude (nosso Z é negativo para altura)
-                our_state.attitude.y,  # Pitch (radianos)
-                our_state.attitude.x,  # Roll (radianos)
-                our_state.attitude.z,  # Heading (radianos)
+                float(lat),
+                float(lon),
+                float(alt),
+                math.degrees(pitch),  # Pitch
+                math.degrees(roll),  # Roll
+                math.degrees(heading) % 360.0,  # Heading
                 1  # Gear down
             ]
 
@@ -177,5 +217,34 @@ class XPlaneInterface:
             self.xp_client.sendPOSI(xplane_data)
 
         except Exception as e:
-            print(f"❌ Erro enviando estado para X-Plane: {e}")
-            self.connected = False
\ No newline at end of file
+            _log.error("❌ Erro enviando estado para X-Plane: %s", e)
+            self.connected = False
+
+    def _handle_traffic(self, picture):
+        """TrafficPicture mais próxima (já limitada pelo módulo Traffic) - um lote por frame"""
+        if self.connected and self.xp_client:
+            if self.traffic_slots is None:
+                from systems.traffic import MultiplayerSlots
+                self.traffic_slots = MultiplayerSlots()
+            self._send_traffic_to_real_xplane(picture)
+
+    def _send_traffic_to_real_xplane(self, picture):
+        """
+        Converte todas as posições de uma vez e envia o lote de POSI multiplayer
+        (o XPlaneConnect não tem pacote com várias aeronaves: um POSI por slot)
+        """
+        assigned = self.traffic_slots.assign(picture.ids)
+        if not assigned:
+            return
+        try:
+            positions = picture.positions
+            lat, lon, alt = self.tangent_plane.ned_to_lla(positions[:, 0], positions[:, 1], positions[:, 2])
+            attitudes = np.degrees(picture.attitudes)
+            for n, slot in assigned:
+                self.xp_client.sendPOSI([float(lat[n]), float(lon[n]), float(alt[n]),
+                                         float(attitudes[n, 1]), float(attitudes[n, 0]), float(attitudes[n, 2]), 1],
+                                        slot)
+            self.traffic_sent += len(assigned)
+        except Exception as e:
+            _log.error("❌ Erro enviando tráfego para X-Plane: %s", e)
+            self.connected = False
@@ -3,35 +3,74 @@ Arquivo principal do simulador de voo
 Integra todos os módulos
 """
 
-import sys
 import os
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from core.message_bus import MessageBus
+from core.module_registry import ModuleRegistry
 from core.simulation_orchestrator import SimulationOrchestrator
-from interfaces.xplane_interface import XPlaneInterface
-from dynamics.flight_dynamics import SimpleFlightDynamics
+from core.sim_logging import configure_logging, shutdown_logging
+
+SIMULATION_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "config", "simulation_config.yaml")
+VEHICLE_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "config", "vehicle_configs", "cessna_172.yaml")
+
+# Comandos do IOS: nome → (módulo, método)
+INSTRUCTOR_COMMANDS = {
+    "freeze": ("flight_dynamics", "set_frozen"),
+    "reset_position": ("flight_dynamics", "reset_position"),
+    "turbulence": ("weather", "set_turbulence"),
+    "gust": ("weather", "trigger_gust"),
+    "pitot_blocked": ("instruments", "set_pitot_blocked"),
+    "static_blocked": ("instruments", "set_static_blocked"),
+    "altimeter_setting": ("instruments", "set_altimeter_setting"),
+}
+
+
+def build_simulation(registry: ModuleRegistry):
+    """
+    Partida até o primeiro frame: barramento, orquestrador e módulos habilitados já
+    registrados, sem nenhuma thread iniciada (o caminho medido por utils/startup_budget.py)
+    """
+    # 1. Message Bus e Orchestrator na taxa de simulation.frame_rate
+    bus = MessageBus()
+    orchestrator = SimulationOrchestrator(bus, frame_rate=registry.frame_rate,
+                                          real_time=registry.simulation_config['simulation'].get('real_time', True))
+
+    # 2. Criar só os módulos habilitados em modules.enabled (import sob demanda)
+    modules = registry.build(bus, dt=orchestrator.frame_period)
+
+    # Estação do instrutor: rede em thread própria, comandos aplicados no início do frame
+    instructor_station = modules.get("instructor_station")
+    if instructor_station is not None:
+        for command, (name, method) in INSTRUCTOR_COMMANDS.items():
+            if name in modules:
+                instructor_station.register_command(command, getattr(modules[name], method))
+
+    # 3. Registrar módulos na ordem do registro
+    registry.register_all(orchestrator)
+    return orchestrator, modules
+
 
 def main():
     print("🚀 SIMULADOR DE VOO - DESENVOLVIMENTO")
     print("=" * 60)
 
-    # 1. Criar Message Bus
-    bus = MessageBus()
-
-    # 2. Criar Orchestrator (30Hz para desenvolvimento)
-    orchestrator = SimulationOrchestrator(bus, frame_rate=30)
+    # Configuração validada na partida; logging assíncrono antes de qualquer módulo
+    registry = ModuleRegistry.from_files(SIMULATION_CONFIG, VEHICLE_CONFIG)
+    log_writer = configure_logging(registry.simulation_config.get('logging'))
 
-    # 3. Criar módulos
     print("\n📦 INICIALIZANDO MÓDULOS:")
+    orchestrator, modules = build_simulation(registry)
+    instructor_station = modules.get("instructor_station")
 
-    xplane_interface = XPlaneInterface(bus)
-    flight_dynamics = SimpleFlightDynamics(bus)
+    # Force feel (~1 kHz), síntese sonora e envio da pose ao X-Plane rodam em threads próprias
+    control_loading = modules.get("control_loading")
+    sound_system = modules.get("sound_system")
+    xplane_interface = modules.get("xplane_interface")
 
-    # 4. Registrar módulos
-    orchestrator.register_module(xplane_interface)
-    orchestrator.register_module(flight_dynamics)
+    print("\n⏱️  PARTIDA:")
+    print(registry.report())
 
     print(f"\n🔧 CONFIGURAÇÃO:")
     print(f"   - Frame rate: {orchestrator.frame_rate}Hz")
@@ -50,10 +89,34 @@ def main():
     print("-" * 60)
 
     # Executar simulação
+    if control_loading is not None:
+        control_loading.start()
+    if sound_system is not None:
+        sound_system.start()
+    if xplane_interface is not None:
+        xplane_interface.start()
+    if instructor_station is not None:
+        instructor_station.start()
+        print(f"🧑‍✈️ IOS ouvindo em {instructor_station.address}")
     try:
         orchestrator.run(duration=30.0)
     except KeyboardInterrupt:
         print("\n⏹️  Interrompido pelo usuário")
+    finally:
+        if control_loading is not None:
+            control_loading.stop()
+            print(f"🕹️  Control loading: {control_loading.loop_stats()}")
+        if sound_system is not None:
+            sound_system.stop()
+            print(f"🔊 Som: {sound_system.stats()}")
+        if instructor_station is not None:
+            instructor_station.stop()
+            print(f"🧑‍✈️ IOS: {instructor_station.stats()}")
+        if xplane_interface is not None:
+            xplane_interface.stop()
+            print(f"🖥️  Visual: {xplane_interface.visual.stats()}")
+        shutdown_logging()
+        print(f"📝 Log: {log_writer.stats()}")
 
     # Estatísticas finais
     stats = orchestrator.get_stats()
@@ -0,0 +1,200 @@
+# models/aircraft_compiler.py
+"""
+Compilador do modelo de aeronave a partir do YAML do veículo
+- Valida as seções aerodynamics e propulsion.propeller uma vez, na carga
+- Dobra os grupos constantes na matriz de coeficientes: S, S·c̄, S·b por linha;
+  b/2 e c̄/2 nas colunas de taxa; deflexão máxima nas colunas de controle
+- Transferência de momento do centro aerodinâmico e braço do empuxo viram
+  matrizes/vetores fixos
+- Um kernel achatado (forces_moments) calcula forças e momentos de N aeronaves,
+  de tipos diferentes, num buffer fornecido por quem chama
+"""
+
+from dataclasses import dataclass
+import os
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+# Termos da expansão: coeficiente = Σ derivada · termo
+TERMS = ('zero', 'alpha', 'alpha2', 'beta', 'p', 'q', 'r', 'elevator', 'aileron', 'rudder')
+# Linhas: forças nos eixos de estabilidade, momentos nos eixos do corpo
+COEFFICIENTS = ('CD', 'CY', 'CL', 'Cl', 'Cm', 'Cn')
+# Colunas da entrada do kernel (uma linha por aeronave)
+INPUTS = ('u', 'v', 'w', 'p', 'q', 'r', 'elevator', 'aileron', 'rudder', 'density', 'thrust')
+CONTROLS = ('elevator', 'aileron', 'rudder')
+
+MIN_AIRSPEED = 1.0  # m/s - abaixo disso as taxas adimensionais perdem sentido
+
+# caminho absoluto → (mtime_ns, modelo compilado)
+_COMPILED: Dict[str, Tuple[int, 'CompiledAircraft']] = {}
+
+
+@dataclass(frozen=True)
+class CompiledAircraft:
+    name: str
+    coefficients: np.ndarray     # (6, len(TERMS)) já multiplicado pelas referências
+    transfer: np.ndarray         # (3, 3) r_aero× - força aerodinâmica → momento no ponto de referência
+    thrust_axis: np.ndarray      # (3,) unitário
+    thrust_arm: np.ndarray       # (3,) r_hélice × eixo - momento por N de empuxo
+
+
+def _vector(value, label: str) -> np.ndarray:
+    vector = np.asarray(value, dtype=float)
+    if vector.shape != (3,) or not np.all(np.isfinite(vector)):
+        raise ValueError(f"{label} deve ter 3 componentes finitas, recebido {value!r}")
+    return vector
+
+
+def _skew(r: np.ndarray) -> np.ndarray:
+    """Matriz tal que _skew(r) @ F = r × F"""
+    return np.array([[0.0, -r[2], r[1]],
+                     [r[2], 0.0, -r[0]],
+                     [-r[1], r[0], 0.0]])
+
+
+def compile_aircraft(config: dict) -> CompiledAircraft:
+    """YAML do veículo (já carregado) → arrays constantes do kernel"""
+    aero = config.get('aerodynamics')
+    if not isinstance(aero, dict):
+        raise ValueError("Seção 'aerodynamics' ausente no veículo")
+
+    reference = aero.get('reference', {})
+    lengths = {}
+    for key in ('area', 'chord', 'span'):
+        value = reference.get(key)
+        if not isinstance(value, (int, float)) or not value > 0.0:
+            raise ValueError(f"aerodynamics.reference.{key} deve ser positivo, recebido {value!r}")
+        lengths[key] = float(value)
+    area, chord, span = lengths['area'], lengths['chord'], lengths['span']
+    aero_point = _vector(reference.get('point', (0.0, 0.0, 0.0)), "aerodynamics.reference.point")
+
+    controls = aero.get('controls', {})
+    unknown = set(controls) - set(CONTROLS)
+    if unknown:
+        raise ValueError(f"Controles desconhecidos em aerodynamics.controls: {sorted(unknown)}")
+
+    # Escalas dobradas: linha (área × comprimento de referência), coluna (b/2, c̄/2, deflexão)
+    row_scale = np.array([area, area, area, area * span, area * chord, area * span])
+    column_scale = np.ones(len(TERMS))
+    column_scale[TERMS.index('p')] = span
+    column_scale[TERMS.index('q')] = chord
+    column_scale[TERMS.index('r')] = span
+    for name in CONTROLS:
+        deflection = controls.get(name, 0.0)
+        if not isinstance(deflection, (int, float)):
+            raise ValueError(f"aerodynamics.controls.{name} deve ser numérico, recebido {deflection!r}")
+        column_scale[TERMS.index(name)] = float(deflection)
+
+    table = aero.get('coefficients', {})
+    missing = [name for name in COEFFICIENTS if name not in table]
+    if missing:
+        raise ValueError(f"Coeficientes ausentes em aerodynamics.coefficients: {missing}")
+    derivatives = np.zeros((len(COEFFICIENTS), len(TERMS)))
+    for row, name in enumerate(COEFFICIENTS):
+        for term, value in (table[name] or {}).items():
+            if term not in TERMS:
+                raise ValueError(f"{name}: termo desconhecido '{term}' (válidos: {', '.join(TERMS)})")
+            if not isinstance(value, (int, float)) or not np.isfinite(value):
+                raise ValueError(f"{name}.{term} deve ser um número finito, recebido {value!r}")
+            derivatives[row, TERMS.index(term)] = float(value)
+
+    propeller = config.get('propulsion', {}).get('propeller', {})
+    thrust_point = _vector(propeller.get('position', (0.0, 0.0, 0.0)), "propulsion.propeller.position")
+    thrust_axis = _vector(propeller.get('thrust_axis', (1.0, 0.0, 0.0)), "propulsion.propeller.thrust_axis")
+    norm = np.linalg.norm(thrust_axis)
+    if norm == 0.0:
+        raise ValueError("propulsion.propeller.thrust_axis não pode ser nulo")
+    thrust_axis = thrust_axis / norm
+
+    return CompiledAircraft(
+        name=str(config.get('name', 'aircraft')),
+        coefficients=derivatives * row_scale[:, None] * column_scale[None, :],
+        transfer=_skew(aero_point),
+        thrust_axis=thrust_axis,
+        thrust_arm=np.cross(thrust_point, thrust_axis),
+    )
+
+
+def load_aircraft(path: str) -> CompiledAircraft:
+    """Compila uma vez por versão do arquivo"""
+    from core.module_registry import load_yaml
+
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _COMPILED.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, compile_aircraft(load_yaml(path)))
+        _COMPILED[path] = cached
+    return cached[1]
+
+
+class AircraftModelSet:
+    """
+    Vários tipos de aeronave empilhados; cada linha da entrada escolhe o tipo pelo
+    índice. Buffers de trabalho alocados uma vez para até `capacity` aeronaves
+    """
+
+    def __init__(self, models: Sequence[CompiledAircraft], capacity: int = 1):
+        self.models = list(models)
+        if not self.models:
+            raise ValueError("AircraftModelSet precisa de pelo menos um modelo")
+        self.names = [model.name for model in self.models]
+        self.coefficients = np.stack([m.coefficients for m in self.models])
+        self.transfer = np.stack([m.transfer for m in self.models])
+        self.thrust_axis = np.stack([m.thrust_axis for m in self.models])
+        self.thrust_arm = np.stack([m.thrust_arm for m in self.models])
+        self._reserve(capacity)
+
+    def _reserve(self, capacity: int):
+        self.capacity = capacity
+        self._terms = np.zeros((capacity, len(TERMS)))
+        self._terms[:, 0] = 1.0
+        self._gathered = np.empty((capacity,) + self.coefficients.shape[1:])
+        self._transfer = np.empty((capacity, 3, 3))
+        self._coeffs = np.empty((capacity, len(COEFFICIENTS)))
+        self._aero = np.empty((capacity, 3))
+
+    def index(self, name: str) -> int:
+        return self.names.index(name)
+
+    def forces_moments(self, types: np.ndarray, inputs: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        types (N,) índices de tipo, inputs (N, len(INPUTS)) → out (N, 6):
+        [Fx, Fy, Fz, L, M, N] nos eixos do corpo, momentos no ponto de referência
+        """
+        n = len(types)
+        if n > self.capacity:
+            self._reserve(n)
+        u, v, w = inputs[:, 0], inputs[:, 1], inputs[:, 2]
+        density, thrust = inputs[:, 9], inputs[:, 10]
+
+        speed_sq = u * u + v * v + w * w
+        speed = np.maximum(np.sqrt(speed_sq), MIN_AIRSPEED)
+        qbar = 0.5 * density * speed_sq
+
+        terms = self._terms[:n]
+        alpha = np.arctan2(w, u, out=terms[:, 1])
+        np.multiply(alpha, alpha, out=terms[:, 2])
+        np.arcsin(np.clip(v / speed, -1.0, 1.0), out=terms[:, 3])
+        np.multiply(inputs[:, 3:6], (0.5 / speed)[:, None], out=terms[:, 4:7])
+        terms[:, 7:10] = inputs[:, 6:9]
+
+        # [D, Y, L, l, m, n] dimensionais = q̄ · (coeficientes dobrados) @ termos
+        coeffs = np.einsum('nij,nj->ni', np.take(self.coefficients, types, axis=0, out=self._gathered[:n]),
+                           terms, out=self._coeffs[:n])
+        coeffs *= qbar[:, None]
+
+        # Estabilidade → corpo (arrasto e sustentação giram com α)
+        drag, side, lift = coeffs[:, 0], coeffs[:, 1], coeffs[:, 2]
+        cos_a, sin_a = np.cos(alpha), np.sin(alpha)
+        aero = self._aero[:n]
+        aero[:, 0] = lift * sin_a - drag * cos_a
+        aero[:, 1] = side
+        aero[:, 2] = -drag * sin_a - lift * cos_a
+
+        out[:, 0:3] = aero + thrust[:, None] * self.thrust_axis[types]
+        out[:, 3:6] = (coeffs[:, 3:6]
+                       + np.einsum('nij,nj->ni', np.take(self.transfer, types, axis=0, out=self._transfer[:n]), aero)
+                       + thrust[:, None] * self.thrust_arm[types])
+        return out
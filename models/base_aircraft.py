@@ -1,14 +1,51 @@
+# models/base_aircraft.py
+"""
+Aeronave montada sobre o modelo compilado (models/aircraft_compiler.py)
+- Uma chamada ao kernel por frame em vez de somar ForcesMoments de objetos separados
+- Entrada e saída em buffers próprios, reaproveitados a cada frame
+- Vários tipos podem compartilhar um AircraftModelSet (tráfego, frotas)
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from core.data_types import AircraftState, ControlInputs, ForcesMoments, Vector3
+from models.aircraft_compiler import INPUTS, AircraftModelSet, compile_aircraft
+
+
 class BaseAircraft:
-    def __init__(self, config):
-        self.state = AircraftState()
-        self.mass_props = MassProperties(config)
-        self.aero_model = AerodynamicModel(config)
-        self.propulsion = PropulsionModel(config)
-
-    def calculate_forces_moments(self):
-        aero_forces = self.aero_model.calculate(self.state)
-        prop_forces = self.propulsion.calculate(self.state)
-        return aero_forces + prop_forces
-
-    def update_state(self, new_state):
-        self.state = new_state
\ No newline at end of file
+    def __init__(self, config: dict, model_set: Optional[AircraftModelSet] = None, type_index: int = 0):
+        if model_set is None:
+            model_set = AircraftModelSet([compile_aircraft(config)])
+        self.model_set = model_set
+        self.name = model_set.names[type_index]
+        self.state: Optional[AircraftState] = None
+
+        self._types = np.array([type_index])
+        self._inputs = np.zeros((1, len(INPUTS)))
+        self._inputs[0, INPUTS.index('density')] = 1.225
+        self.forces_moments = np.zeros((1, 6))   # [Fx, Fy, Fz, L, M, N] do último cálculo
+
+    def update_state(self, new_state: AircraftState):
+        self.state = new_state
+
+    def calculate_forces_moments(self, controls: ControlInputs, thrust: float = 0.0, density: float = 1.225,
+                                 air_velocity_body: Optional[np.ndarray] = None) -> ForcesMoments:
+        """
+        Forças e momentos no ponto de referência. air_velocity_body: velocidade relativa
+        ao ar (com vento e turbulência); sem ela, usa a velocidade do estado
+        """
+        row = self._inputs[0]
+        if air_velocity_body is None:
+            vel = self.state.velocity_body
+            row[0:3] = (vel.x, vel.y, vel.z)
+        else:
+            row[0:3] = air_velocity_body
+        rates = self.state.rates_body
+        row[3:10] = (rates.x, rates.y, rates.z, controls.elevator, controls.aileron, controls.rudder, density)
+        row[10] = thrust
+
+        fx, fy, fz, l, m, n = self.model_set.forces_moments(self._types, self._inputs, self.forces_moments)[0]
+        return ForcesMoments(forces=Vector3(float(fx), float(fy), float(fz)),
+                             moments=Vector3(float(l), float(m), float(n)))
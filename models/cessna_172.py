@@ -0,0 +1,20 @@
+# models/cessna_172.py
+"""
+Cessna 172SP - geometria, derivadas e hélice em config/vehicle_configs/cessna_172.yaml
+"""
+
+import os
+from typing import Optional
+
+from models.aircraft_compiler import AircraftModelSet, load_aircraft
+from models.base_aircraft import BaseAircraft
+
+CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      "config", "vehicle_configs", "cessna_172.yaml")
+
+
+class Cessna172(BaseAircraft):
+    def __init__(self, model_set: Optional[AircraftModelSet] = None, type_index: int = 0):
+        if model_set is None:
+            model_set = AircraftModelSet([load_aircraft(CONFIG)])
+        super().__init__(None, model_set, type_index)
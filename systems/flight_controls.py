@@ -0,0 +1,197 @@
+# systems/flight_controls.py
+"""
+Sistema de controle de voo: trims, piloto automático e atuadores
+- Diagrama de blocos (utils.control_blocks) compilado uma vez na criação
+- Piloto automático: altitude hold (altitude → razão de subida → arfagem →
+  profundor) e heading hold (proa → inclinação → aileron, com coordenação de
+  curva pelo leme)
+- Atuadores: limite de curso, limite de taxa e atraso de 1ª ordem por superfície
+- build_control_diagram() aceita batch_size > 1 para lotes de aeronaves
+"""
+
+import math
+
+from core.data_types import ControlInputs
+from utils.control_blocks import (BlockDiagram, FirstOrderLag, Gain, PID, RateLimiter, Saturation, Sum,
+                                  Switch, Wrap)
+
+GRAVITY = 9.81
+
+DEFAULT_ACTUATORS = {
+    'elevator': {'rate': 2.0, 'tau': 0.05},
+    'aileron': {'rate': 2.5, 'tau': 0.05},
+    'rudder': {'rate': 2.0, 'tau': 0.05},
+    'throttle': {'rate': 1.0, 'tau': 0.2},
+}
+
+DEFAULT_AUTOPILOT = {
+    'altitude_gain': 0.15,                      # (m/s) de razão de subida por m de erro
+    'max_climb_rate': 4.0,                      # m/s
+    'climb_rate_pid': {'kp': 0.03, 'ki': 0.005, 'limit': 0.2},   # → rad de arfagem
+    'pitch_pid': {'kp': 2.0, 'ki': 0.3, 'kd': 0.0, 'limit': 1.0},
+    'pitch_rate_gain': 1.0,
+    'heading_gain': 1.2,                        # rad de inclinação por rad de erro de proa
+    'max_bank': 0.44,                           # rad (25°)
+    'roll_pid': {'kp': 2.0, 'ki': 0.1, 'kd': 0.0, 'limit': 1.0},
+    'roll_rate_gain': 0.8,
+    'yaw_rate_gain': 2.0,
+    'reference_speed': 55.0,                    # m/s para r = g·φ / V
+}
+
+SURFACES = ('elevator', 'aileron', 'rudder')
+
+
+def _pid(output, error, gains):
+    limit = float(gains.get('limit', math.inf))
+    return PID(output, error, gains.get('kp', 0.0), gains.get('ki', 0.0), gains.get('kd', 0.0), -limit, limit)
+
+
+def build_control_diagram(config: dict, dt: float, batch_size: int = 1) -> BlockDiagram:
+    """Monta e compila o diagrama de controle a partir da seção 'flight_controls'"""
+    actuators = {**DEFAULT_ACTUATORS, **config.get('actuators', {})}
+    ap = {**DEFAULT_AUTOPILOT, **config.get('autopilot', {})}
+    diagram = BlockDiagram(batch_size=batch_size)
+    add = diagram.add
+
+    # Altitude hold
+    add(Sum('altitude_error', ['altitude_target', 'altitude'], '+-'))
+    add(Gain('climb_rate_demand', 'altitude_error', ap['altitude_gain']))
+    add(Saturation('climb_rate_command', 'climb_rate_demand', -ap['max_climb_rate'], ap['max_climb_rate']))
+    add(Sum('climb_rate_error', ['climb_rate_command', 'climb_rate'], '+-'))
+    add(_pid('pitch_command', 'climb_rate_error', ap['climb_rate_pid']))
+    add(Sum('pitch_error', ['pitch_command', 'pitch'], '+-'))
+    add(_pid('elevator_pitch', 'pitch_error', ap['pitch_pid']))
+    add(Gain('pitch_damping', 'pitch_rate', ap['pitch_rate_gain']))
+    add(Sum('autopilot_elevator', ['elevator_pitch', 'pitch_damping'], '+-'))
+
+    # Heading hold + coordenação de curva
+    add(Sum('heading_difference', ['heading_target', 'heading'], '+-'))
+    add(Wrap('heading_error', 'heading_difference'))
+    add(Gain('bank_demand', 'heading_error', ap['heading_gain']))
+    add(Saturation('bank_command', 'bank_demand', -ap['max_bank'], ap['max_bank']))
+    add(Sum('roll_error', ['bank_command', 'roll'], '+-'))
+    add(_pid('aileron_roll', 'roll_error', ap['roll_pid']))
+    add(Gain('roll_damping', 'roll_rate', ap['roll_rate_gain']))
+    add(Sum('autopilot_aileron', ['aileron_roll', 'roll_damping'], '+-'))
+    add(Gain('yaw_rate_command', 'roll', GRAVITY / ap['reference_speed']))
+    add(Sum('yaw_rate_error', ['yaw_rate_command', 'yaw_rate'], '+-'))
+    add(Gain('autopilot_rudder', 'yaw_rate_error', ap['yaw_rate_gain']))
+
+    # Seleção piloto/autopiloto + trim
+    engage = {'elevator': 'altitude_hold', 'aileron': 'heading_hold', 'rudder': 'heading_hold'}
+    for surface in SURFACES:
+        add(Switch(f'{surface}_selected', engage[surface], f'autopilot_{surface}', f'pilot_{surface}'))
+        add(Sum(f'{surface}_demand', [f'{surface}_selected', f'trim_{surface}']))
+
+    # Atuadores: curso → taxa → atraso
+    for surface in SURFACES + ('throttle',):
+        lower = 0.0 if surface == 'throttle' else -1.0
+        demand = 'pilot_throttle' if surface == 'throttle' else f'{surface}_demand'
+        add(Saturation(f'{surface}_limited', demand, lower, 1.0))
+        add(RateLimiter(f'{surface}_rate_limited', f'{surface}_limited', actuators[surface]['rate']))
+        add(FirstOrderLag(f'{surface}_position', f'{surface}_rate_limited', actuators[surface]['tau']))
+
+    return diagram.compile(dt)
+
+
+class FlightControls:
+    def __init__(self, message_bus, config, dt: float = 1 / 60.0):
+        self.bus = message_bus
+        self.dt = dt
+
+        self.diagram = build_control_diagram(config.get('flight_controls', {}), dt)
+        signal = self.diagram.signal
+        # Visões das linhas do diagrama (coluna 0 = esta aeronave)
+        self._inputs = {name: signal(name) for name in self.diagram.external_inputs}
+        self._positions = [signal(f'{s}_position') for s in ('throttle',) + SURFACES]
+
+        self.pilot = ControlInputs(throttle=0.0, elevator=0.0, aileron=0.0, rudder=0.0)
+        self.control_loading = None   # posições do manche/pedais com force feel, quando houver
+        self.altitude_hold = False
+        self.heading_hold = False
+        self.state = None
+        self.controls = self.pilot
+
+        # ASSINA estes tópicos:
+        self.bus.subscribe('pilot_controls', self.handle_pilot_controls)
+        self.bus.subscribe('aircraft_state', self.handle_aircraft_state)
+        self.bus.subscribe('control_loading_state', self.handle_control_loading_state)
+
+    def handle_pilot_controls(self, controls):
+        self.pilot = controls
+
+    def handle_control_loading_state(self, loading_state):
+        self.control_loading = loading_state
+
+    def handle_aircraft_state(self, state):
+        self.state = state
+
+    def set_trim(self, surface: str, value: float):
+        """Trim somado à demanda da superfície (piloto ou autopiloto)"""
+        self._inputs[f'trim_{surface}'][0] = value
+
+    def engage_altitude_hold(self, altitude: float = None):
+        """Mantém a altitude dada (padrão: altitude atual)"""
+        if altitude is None:
+            altitude = -self.state.position_ned.z if self.state is not None else 0.0
+        self._inputs['altitude_target'][0] = altitude
+        if not self.altitude_hold:
+            self.diagram.reset(['pitch_command', 'elevator_pitch'])
+        self.altitude_hold = True
+
+    def engage_heading_hold(self, heading: float = None):
+        """Mantém a proa dada [rad] (padrão: proa atual)"""
+        if heading is None:
+            heading = self.state.euler.z if self.state is not None else 0.0
+        self._inputs['heading_target'][0] = heading
+        if not self.heading_hold:
+            self.diagram.reset(['aileron_roll'])
+        self.heading_hold = True
+
+    def disengage_autopilot(self):
+        self.altitude_hold = False
+        self.heading_hold = False
+
+    def _write_inputs(self):
+        inputs, pilot = self._inputs, self.pilot
+        throttle = pilot.throttle
+        # XPlaneInterface ainda envia a manete como lista (um elemento por motor)
+        inputs['pilot_throttle'][0] = throttle[0] if isinstance(throttle, (list, tuple)) else throttle
+        if self.control_loading is not None:
+            # Manche/pedais com control loading substituem os eixos vindos do X-Plane
+            elevator, aileron, rudder = self.control_loading.positions
+        else:
+            elevator, aileron, rudder = pilot.elevator, pilot.aileron, pilot.rudder
+        inputs['pilot_elevator'][0] = elevator
+        inputs['pilot_aileron'][0] = aileron
+        inputs['pilot_rudder'][0] = rudder
+        inputs['altitude_hold'][0] = self.altitude_hold
+        inputs['heading_hold'][0] = self.heading_hold
+
+        state = self.state
+        if state is None:
+            return
+        u, v, w = state.velocity_body.x, state.velocity_body.y, state.velocity_body.z
+        phi, theta = state.euler.x, state.euler.y
+        s_phi, c_phi = math.sin(phi), math.cos(phi)
+        s_theta, c_theta = math.sin(theta), math.cos(theta)
+        inputs['altitude'][0] = -state.position_ned.z
+        inputs['climb_rate'][0] = s_theta * u - s_phi * c_theta * v - c_phi * c_theta * w
+        inputs['pitch'][0] = theta
+        inputs['roll'][0] = phi
+        inputs['heading'][0] = state.euler.z
+        inputs['roll_rate'][0] = state.rates_body.x
+        inputs['pitch_rate'][0] = state.rates_body.y
+        inputs['yaw_rate'][0] = state.rates_body.z
+
+    def update(self):
+        # LÓGICA: entradas → diagrama compilado → posições dos atuadores
+        self._write_inputs()
+        self.diagram.evaluate()
+        throttle, elevator, aileron, rudder = (float(p[0]) for p in self._positions)
+        pilot = self.pilot
+        self.controls = ControlInputs(throttle=throttle, elevator=elevator, aileron=aileron, rudder=rudder,
+                                      flaps=pilot.flaps, gear=pilot.gear, brakes=pilot.brakes)
+
+        # PUBLICA neste tópico:
+        self.bus.publish('controls', self.controls)
@@ -1,4 +1,50 @@
 # systems/instruments.py
+"""
+Instrumentos de voo e do motor
+- Sistema pitot-estático: pressão de impacto compressível, erro de posição da
+  tomada estática, desalinhamento do pitot com o escoamento e obstruções
+- Atrasos de 1ª e 2ª ordem de todos os ponteiros em um único banco de filtros
+  em espaço de estados discretizado (x ← Ad·x + Bd·u, uma multiplicação por frame)
+- InstrumentData é um buffer reaproveitado: o mesmo objeto é atualizado e
+  publicado a cada frame (assinantes que guardam histórico devem copiar)
+"""
+
+from dataclasses import dataclass
+import math
+from typing import Dict
+
+import numpy as np
+
+from dynamics.atmosphere_model import (GAMMA, GAS_CONSTANT, GRAVITY, LAPSE_RATE, SEA_LEVEL_PRESSURE,
+                                       SEA_LEVEL_TEMPERATURE, isa_atmosphere)
+from utils.numerical_integration import discretize_zoh
+
+# Ordem das entradas/saídas do banco de filtros
+CHANNELS = ('airspeed', 'altitude', 'vertical_speed', 'roll', 'pitch', 'heading',
+            'turn_rate', 'slip', 'rpm', 'manifold_pressure', 'fuel_flow', 'oil_temperature')
+
+DEFAULT_LAGS = {
+    'airspeed': {'tau': 0.3},
+    'altitude': {'tau': 0.5},
+    'vertical_speed': {'wn': 0.8, 'zeta': 0.9},
+    'roll': {'tau': 0.05},
+    'pitch': {'tau': 0.05},
+    'heading': {'tau': 0.1},
+    'turn_rate': {'wn': 8.0, 'zeta': 0.6},
+    'slip': {'wn': 6.0, 'zeta': 0.35},
+    'rpm': {'tau': 0.2},
+    'manifold_pressure': {'tau': 0.3},
+    'fuel_flow': {'tau': 1.0},
+    'oil_temperature': {'tau': 90.0},
+}
+
+STANDARD_RATE = math.radians(3.0)    # rad/s - curva de 2 minutos
+_SPEED_OF_SOUND_SL = math.sqrt(GAMMA * GAS_CONSTANT * SEA_LEVEL_TEMPERATURE)
+_ALTIMETER_EXPONENT = GAS_CONSTANT * LAPSE_RATE / GRAVITY
+_TWO_PI = 2.0 * math.pi
+_MIN_PRESSURE_RATIO = 1e-6            # mantém a lei de potência do altímetro real (estática ≤ 0 satura)
+
+
 @dataclass
 class InstrumentData:
     """Contrato: Instruments → XPlaneInterface, DataRecorder"""
@@ -7,8 +53,8 @@ class InstrumentData:
     vertical_speed: float = 0.0  # m/s
     attitude_indicator: tuple = (0.0, 0.0)  # (roll, pitch) rad
     heading_indicator: float = 0.0  # rad
-    turn_coordinator: float = 0.0
-    slip_ball: float = 0.0
+    turn_coordinator: float = 0.0  # 1.0 = curva padrão (3°/s) para a direita
+    slip_ball: float = 0.0  # rad, positivo = bola à direita
     engine_instruments: Dict = None
 
     def __post_init__(self):
@@ -16,17 +62,259 @@ class InstrumentData:
             self.engine_instruments = {'rpm': 0.0, 'temp': 0.0}
 
 
+class LagFilterBank:
+    """
+    Banco de atrasos independentes montado como um único sistema linear
+    Canais {'tau'} são de 1ª ordem e {'wn', 'zeta'} de 2ª ordem (estados y, y').
+    Aceita várias linhas (aeronaves) no mesmo passo
+    """
+
+    def __init__(self, lags, dt: float, num_rows: int = 1):
+        num_inputs = len(lags)
+        orders = [2 if 'wn' in lag else 1 for lag in lags]
+        num_states = sum(orders)
+        a = np.zeros((num_states, num_states))
+        b = np.zeros((num_states, num_inputs))
+        output_index = []
+
+        i = 0
+        for channel, (lag, order) in enumerate(zip(lags, orders)):
+            output_index.append(i)
+            if order == 1:
+                a[i, i] = -1.0 / lag['tau']
+                b[i, channel] = 1.0 / lag['tau']
+            else:
+                wn, zeta = lag['wn'], lag['zeta']
+                a[i, i + 1] = 1.0
+                a[i + 1, i] = -wn * wn
+                a[i + 1, i + 1] = -2.0 * zeta * wn
+                b[i + 1, channel] = wn * wn
+            i += order
+
+        ad, bd = discretize_zoh(a, b, dt)
+        self.num_states = num_states
+        self.output_index = np.array(output_index)
+        # [Ad | Bd] transposta: z = [x | u] (linha por aeronave), x ← z · [Ad | Bd]ᵀ
+        self._transition = np.ascontiguousarray(np.hstack([ad, bd]).T)
+        self._z = np.zeros((num_rows, num_states + num_inputs))
+        self._next = np.zeros((num_rows, num_states))
+        self.inputs = self._z[:, num_states:]
+        self.outputs = np.zeros((num_rows, num_inputs))
+
+    def reset(self):
+        """Ponteiros assumem o valor das entradas atuais, sem transitório"""
+        self._z[:, :self.num_states] = 0.0
+        self._z[:, self.output_index] = self.inputs
+        np.take(self._z, self.output_index, axis=1, out=self.outputs)
+
+    def step(self) -> np.ndarray:
+        """Avança um passo com as entradas já escritas em self.inputs"""
+        np.dot(self._z, self._transition, out=self._next)
+        self._z[:, :self.num_states] = self._next
+        np.take(self._next, self.output_index, axis=1, out=self.outputs)
+        return self.outputs
+
+
 class Instruments:
-    def __init__(self, message_bus):
+    def __init__(self, message_bus, config, dt: float = 1 / 60.0):
         self.bus = message_bus
+        self.dt = dt
+
+        instruments = config.get('instruments', {})
+        lags = dict(DEFAULT_LAGS, **instruments.get('lags', {}))
+        self.filters = LagFilterBank([lags[name] for name in CHANNELS], dt)
+        self._inputs = self.filters.inputs[0]
+        self._outputs = self.filters.outputs[0]
+
+        pitot_static = instruments.get('pitot_static', {})
+        self.static_error = float(pitot_static.get('static_error', 0.0))              # Δp / q
+        self.static_error_alpha = float(pitot_static.get('static_error_alpha', 0.0))  # Δp / q por rad
+        self.pitot_incidence = float(pitot_static.get('pitot_incidence', 0.0))        # rad
+        self.altimeter_setting = float(pitot_static.get('altimeter_setting', SEA_LEVEL_PRESSURE))
+        self.turn_cant = math.radians(float(instruments.get('turn_coordinator_cant_deg', 30.0)))
+        self.slip_limit = float(instruments.get('slip_ball_limit', 0.3))
+
+        oil = instruments.get('oil_temperature', {})
+        self.oil_idle_rise = float(oil.get('idle_rise', 40.0))      # K acima do ambiente
+        self.oil_power_rise = float(oil.get('power_rise', 60.0))    # K adicionais à potência nominal
+        self.rated_power = float(config.get('propulsion', {}).get('engine', {}).get('rated_power', 1.0))
+
+        self.pitot_blocked = False
+        self.static_blocked = False
+        self._total_pressure = SEA_LEVEL_PRESSURE
+        self._static_pressure = SEA_LEVEL_PRESSURE
+
+        self.state = None
+        self.environment = None
+        self.propulsion = None
+        self._previous_velocity = None
+        self._previous_altitude = None
+        self._heading = None
+        self._initialized = False
+
+        self.data = InstrumentData(engine_instruments={'rpm': 0.0, 'temp': 0.0,
+                                                       'manifold_pressure': 0.0, 'fuel_flow': 0.0})
 
         # ASSINA estes tópicos:
         self.bus.subscribe('aircraft_state', self.handle_aircraft_state)
-        self.bus.subscribe('systems_state', self.handle_systems_state)
+        self.bus.subscribe('environment', self.handle_environment)
+        self.bus.subscribe('propulsion_state', self.handle_propulsion_state)
+
+    def handle_aircraft_state(self, state):
+        self.state = state
+
+    def handle_environment(self, environment):
+        self.environment = environment
+
+    def handle_propulsion_state(self, propulsion_state):
+        self.propulsion = propulsion_state
+
+    def set_pitot_blocked(self, blocked: bool):
+        """Pitot obstruído com dreno também obstruído: pressão total fica presa"""
+        self.pitot_blocked = blocked
+
+    def set_static_blocked(self, blocked: bool):
+        """Tomada estática obstruída: altímetro congela, VSI vai a zero"""
+        self.static_blocked = blocked
+
+    def set_altimeter_setting(self, pressure_pa: float):
+        """Ajuste do altímetro (QNH) [Pa]"""
+        self.altimeter_setting = pressure_pa
+
+    def _pitot_static(self, altitude, u, v, w, phi, theta, psi):
+        """Pressões sentidas → (velocidade indicada [m/s], altitude indicada [m])"""
+        environment = self.environment
+        if environment is None:
+            temperature, pressure, density, speed_of_sound = (float(x) for x in isa_atmosphere(altitude))
+            wind_n = wind_e = wind_d = 0.0
+            gust_u = gust_v = gust_w = 0.0
+        else:
+            pressure, density = environment.pressure, environment.density
+            speed_of_sound = environment.speed_of_sound
+            wind_n, wind_e, wind_d = environment.wind_ned
+            gust_u, gust_v, gust_w = environment.turbulence_body
+
+        # Vento NED → corpo (linhas de Rᵀ da sequência 3-2-1)
+        s_phi, c_phi = math.sin(phi), math.cos(phi)
+        s_theta, c_theta = math.sin(theta), math.cos(theta)
+        s_psi, c_psi = math.sin(psi), math.cos(psi)
+        wind_u = c_theta * c_psi * wind_n + c_theta * s_psi * wind_e - s_theta * wind_d
+        wind_v = ((s_phi * s_theta * c_psi - c_phi * s_psi) * wind_n
+                  + (s_phi * s_theta * s_psi + c_phi * c_psi) * wind_e + s_phi * c_theta * wind_d)
+        wind_w = ((c_phi * s_theta * c_psi + s_phi * s_psi) * wind_n
+                  + (c_phi * s_theta * s_psi - s_phi * c_psi) * wind_e + c_phi * c_theta * wind_d)
+        air_u = u - wind_u - gust_u
+        air_v = v - wind_v - gust_v
+        air_w = w - wind_w - gust_w
+        airspeed = math.sqrt(air_u * air_u + air_v * air_v + air_w * air_w)
+
+        if airspeed > 1e-3:
+            alpha = math.atan2(air_w, air_u)
+            beta = math.asin(max(-1.0, min(1.0, air_v / airspeed)))
+        else:
+            alpha = beta = 0.0
+
+        dynamic_pressure = 0.5 * density * airspeed * airspeed
+        mach = airspeed / speed_of_sound
+        impact_pressure = pressure * ((1.0 + 0.2 * mach * mach) ** 3.5 - 1.0)
+        misalignment = math.cos(alpha - self.pitot_incidence) * math.cos(beta)
+
+        if not self.static_blocked:
+            self._static_pressure = pressure + dynamic_pressure * (self.static_error
+                                                                   + self.static_error_alpha * alpha)
+        if not self.pitot_blocked:
+            self._total_pressure = pressure + impact_pressure * misalignment * misalignment
+
+        sensed = max(self._total_pressure - self._static_pressure, 0.0)
+        indicated_airspeed = _SPEED_OF_SOUND_SL * math.sqrt(
+            5.0 * ((sensed / SEA_LEVEL_PRESSURE + 1.0) ** (2.0 / 7.0) - 1.0))
+        pressure_ratio = max(self._static_pressure / self.altimeter_setting, _MIN_PRESSURE_RATIO)
+        indicated_altitude = (SEA_LEVEL_TEMPERATURE / LAPSE_RATE) * (1.0 - pressure_ratio ** _ALTIMETER_EXPONENT)
+        return indicated_airspeed, indicated_altitude
+
+    def _fill_inputs(self):
+        """Escreve os valores 'verdadeiros' sentidos por cada instrumento no vetor de entradas"""
+        state = self.state
+        u, v, w = state.velocity_body.x, state.velocity_body.y, state.velocity_body.z
+        p, q, r = state.rates_body.x, state.rates_body.y, state.rates_body.z
+        phi, theta, psi = state.euler.x, state.euler.y, state.euler.z
+
+        indicated_airspeed, indicated_altitude = self._pitot_static(-state.position_ned.z, u, v, w,
+                                                                    phi, theta, psi)
+
+        # VSI mede a taxa de variação da pressão estática (altitude indicada)
+        if self._previous_altitude is None:
+            climb_rate = 0.0
+        else:
+            climb_rate = (indicated_altitude - self._previous_altitude) / self.dt
+        self._previous_altitude = indicated_altitude
+
+        # Giro direcional sem salto em 0/2π: acumula a menor variação de proa
+        if self._heading is None:
+            self._heading = psi
+        else:
+            self._heading += (psi - self._heading + math.pi) % _TWO_PI - math.pi
+
+        # Giro do coordenador inclinado sente r·cos(c) + p·sin(c); escala calibrada em r
+        # Força específica lateral e normal para a bola: f = dV/dt + ω×V - g
+        if self._previous_velocity is None:
+            dv = dw = 0.0
+        else:
+            dv = (v - self._previous_velocity[1]) / self.dt
+            dw = (w - self._previous_velocity[2]) / self.dt
+        self._previous_velocity = (u, v, w)
+        specific_y = dv + r * u - p * w - GRAVITY * math.sin(phi) * math.cos(theta)
+        specific_z = dw + p * v - q * u - GRAVITY * math.cos(phi) * math.cos(theta)
+
+        propulsion = self.propulsion
+        ambient = self.environment.temperature if self.environment is not None else SEA_LEVEL_TEMPERATURE
+        inputs = self._inputs
+        inputs[0] = indicated_airspeed
+        inputs[1] = indicated_altitude
+        inputs[2] = climb_rate
+        inputs[3] = phi
+        inputs[4] = theta
+        inputs[5] = self._heading
+        inputs[6] = (r + p * math.tan(self.turn_cant)) / STANDARD_RATE
+        inputs[7] = math.atan2(-specific_y, -specific_z)
+        if propulsion is not None:
+            inputs[8] = propulsion.rpm
+            inputs[9] = propulsion.manifold_pressure
+            inputs[10] = propulsion.fuel_flow
+            inputs[11] = ambient + self.oil_idle_rise + self.oil_power_rise * max(propulsion.power, 0.0) / self.rated_power
+        else:
+            inputs[11] = ambient
+
+    def calculate_instruments(self) -> InstrumentData:
+        self._fill_inputs()
+        if self._initialized:
+            self.filters.step()
+        else:
+            self.filters.reset()
+            self._initialized = True
+
+        out = self._outputs
+        data = self.data
+        data.airspeed_indicator = float(out[0])
+        data.altimeter = float(out[1])
+        data.vertical_speed = float(out[2])
+        data.attitude_indicator = (float(out[3]), float(out[4]))
+        data.heading_indicator = float(out[5]) % _TWO_PI
+        data.turn_coordinator = float(out[6])
+        data.slip_ball = max(-self.slip_limit, min(self.slip_limit, float(out[7])))
+        engine = data.engine_instruments
+        engine['rpm'] = float(out[8])
+        engine['manifold_pressure'] = float(out[9])
+        engine['fuel_flow'] = float(out[10])
+        engine['temp'] = float(out[11])
+        return data
 
     def update(self):
+        if self.state is None:
+            return
+
         # LÓGICA: Calcula valores dos instrumentos
         instrument_data = self.calculate_instruments()
 
         # PUBLICA neste tópico:
-        self.bus.publish('instrument_data', instrument_data)
\ No newline at end of file
+        self.bus.publish('instrument_data', instrument_data)
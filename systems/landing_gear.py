@@ -0,0 +1,338 @@
+# systems/landing_gear.py
+"""
+Trem de pouso e contato com o solo
+- Amortecedores mola-amortecedor por perna com atrito de pneu (rolamento, frenagem, lateral)
+- Altura do solo via índice espacial: grade de elevação (O(1)) + hash uniforme
+  sobre os retângulos das pistas (O(1) por ponto de contato)
+- Saída rápida "longe do solo": em voo o frame custa uma comparação
+- Subpassos de integração só durante o contato, dimensionados pela frequência
+  natural dos amortecedores, sem aumentar o frame rate global
+"""
+
+from dataclasses import dataclass, field
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.data_types import ForcesMoments, Vector3
+from utils.coordinate_transforms import euler_to_dcm
+from utils.data_interpolation import LookupTable
+
+
+# ============================================================== índice espacial do solo
+
+class TerrainGrid:
+    """Grade regular de elevação em coordenadas locais (norte, leste) [m]"""
+
+    def __init__(self, north_axis, east_axis, elevations, friction: float = 0.7):
+        self.table = LookupTable([north_axis, east_axis], elevations)
+        self.max_elevation = float(np.max(self.table.values))
+        self.friction = friction  # fator de atrito da superfície (grama/terra)
+
+    @classmethod
+    def flat(cls, elevation: float = 0.0, extent: float = 1.0e6, friction: float = 0.7):
+        axis = np.array([-extent, extent])
+        return cls(axis, axis, np.full((2, 2), float(elevation)), friction)
+
+    def elevation(self, north: float, east: float) -> float:
+        return self.table.scalar(north, east)
+
+    def elevation_batch(self, north, east):
+        return self.table(north, east)
+
+
+@dataclass
+class Runway:
+    name: str
+    threshold: Tuple[float, float]   # (norte, leste) da cabeceira [m]
+    heading: float                   # rumo da pista [rad]
+    length: float                    # m
+    width: float                     # m
+    elevation: float                 # m
+    friction: float = 1.0            # fator de atrito da superfície (asfalto = 1)
+
+    def __post_init__(self):
+        self._cos = math.cos(self.heading)
+        self._sin = math.sin(self.heading)
+
+    def contains(self, north: float, east: float) -> bool:
+        dn = north - self.threshold[0]
+        de = east - self.threshold[1]
+        along = dn * self._cos + de * self._sin
+        cross = -dn * self._sin + de * self._cos
+        return 0.0 <= along <= self.length and abs(cross) <= 0.5 * self.width
+
+    def corners(self) -> np.ndarray:
+        along = np.array([self._cos, self._sin])
+        cross = np.array([-self._sin, self._cos]) * 0.5 * self.width
+        start = np.asarray(self.threshold, dtype=float)
+        end = start + along * self.length
+        return np.array([start - cross, start + cross, end + cross, end - cross])
+
+
+class RunwayIndex:
+    """Hash espacial uniforme: cada célula guarda as pistas cujo retângulo a toca"""
+
+    def __init__(self, runways: Sequence[Runway], cell_size: float = 250.0):
+        self.runways = list(runways)
+        self.cell_size = cell_size
+        self._inv_cell = 1.0 / cell_size
+        self.cells: Dict[Tuple[int, int], List[Runway]] = {}
+
+        for runway in self.runways:
+            corners = runway.corners()
+            lo = np.floor(corners.min(axis=0) * self._inv_cell).astype(int)
+            hi = np.floor(corners.max(axis=0) * self._inv_cell).astype(int)
+            for i in range(lo[0], hi[0] + 1):
+                for j in range(lo[1], hi[1] + 1):
+                    self.cells.setdefault((i, j), []).append(runway)
+
+    def query(self, north: float, east: float) -> Optional[Runway]:
+        key = (math.floor(north * self._inv_cell), math.floor(east * self._inv_cell))
+        for runway in self.cells.get(key, ()):
+            if runway.contains(north, east):
+                return runway
+        return None
+
+
+class GroundModel:
+    """Superfície do solo: pistas (quando houver) sobrepostas à grade de terreno"""
+
+    def __init__(self, terrain: Optional[TerrainGrid] = None, runways: Sequence[Runway] = ()):
+        self.terrain = terrain if terrain is not None else TerrainGrid.flat()
+        self.runway_index = RunwayIndex(runways)
+        self.max_elevation = max([self.terrain.max_elevation] + [r.elevation for r in runways])
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """Monta o solo a partir da seção 'ground' da configuração de simulação"""
+        terrain_cfg = config.get('terrain', {})
+        friction = float(terrain_cfg.get('friction', 0.7))
+        if 'grid_file' in terrain_cfg:
+            data = np.load(terrain_cfg['grid_file'])
+            terrain = TerrainGrid(data['north'], data['east'], data['elevation'], friction)
+        else:
+            terrain = TerrainGrid.flat(float(terrain_cfg.get('elevation', 0.0)), friction=friction)
+
+        runways = [Runway(name=r['name'],
+                          threshold=tuple(r['threshold']),
+                          heading=math.radians(r['heading_deg']),
+                          length=float(r['length']),
+                          width=float(r['width']),
+                          elevation=float(r['elevation']),
+                          friction=float(r.get('friction', 1.0)))
+                   for r in config.get('runways', [])]
+        return cls(terrain, runways)
+
+    def surface(self, north: float, east: float) -> Tuple[float, float, Optional[Runway]]:
+        """(elevação, fator de atrito, pista) no ponto dado"""
+        runway = self.runway_index.query(north, east)
+        if runway is not None:
+            return runway.elevation, runway.friction, runway
+        return self.terrain.elevation(north, east), self.terrain.friction, None
+
+
+# ============================================================== trem de pouso
+
+@dataclass
+class GearState:
+    """Contrato: LandingGear → FlightDynamics, Instruments, SoundSystem, DataRecorder"""
+    weight_on_wheels: bool = False
+    compression: List[float] = field(default_factory=list)   # m por perna
+    normal_force: List[float] = field(default_factory=list)  # N por perna
+    ground_speed: float = 0.0                                 # m/s no ponto de contato
+    runway: Optional[str] = None
+
+
+def _cross_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Produto vetorial linha a linha (np.cross tem overhead alto para arrays pequenos)"""
+    return np.column_stack((a[..., 1] * b[..., 2] - a[..., 2] * b[..., 1],
+                            a[..., 2] * b[..., 0] - a[..., 0] * b[..., 2],
+                            a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]))
+
+
+class LandingGear:
+    def __init__(self, message_bus, config, ground: Optional[GroundModel] = None, dt: float = 1 / 60.0):
+        self.bus = message_bus
+        self.ground = ground if ground is not None else GroundModel()
+        self.dt = dt
+
+        gear = config['landing_gear']
+        struts = gear['struts']
+        self.names = [s['name'] for s in struts]
+        self.positions = np.array([s['position'] for s in struts], dtype=float)  # ponto de contato estendido
+        self.spring = np.array([s['spring'] for s in struts], dtype=float)
+        self.damping = np.array([s['damping'] for s in struts], dtype=float)
+        self.max_compression = np.array([s['max_compression'] for s in struts], dtype=float)
+        self.steerable = np.array([s.get('steerable', False) for s in struts], dtype=bool)
+        self.brakes = np.array([s.get('brakes', False) for s in struts], dtype=bool)
+
+        self.rolling_friction = float(gear['rolling_friction'])
+        self.braking_friction = float(gear['braking_friction'])
+        self.side_friction = float(gear['side_friction'])
+        self.max_steering = float(gear['max_steering'])
+        self.friction_velocity = float(gear.get('friction_velocity', 0.2))  # regularização de Coulomb
+        self.contact_margin = float(gear.get('contact_margin', 2.0))
+        self.substep_accuracy = float(gear.get('substep_accuracy', 0.1))     # ω·dt máximo por subpasso
+
+        # Maior distância de um ponto de contato à referência: limite para a saída rápida
+        self.reach = float(np.max(np.linalg.norm(self.positions, axis=1)))
+
+        # Entradas mais recentes
+        self.state = None
+        self.mass = 1000.0
+        self.rudder = 0.0
+        self.brake = 0.0
+
+        # Saídas reaproveitadas quando não há contato (sem alocação em voo)
+        self._zero = ForcesMoments(forces=Vector3(0.0, 0.0, 0.0), moments=Vector3(0.0, 0.0, 0.0))
+        self._airborne = GearState(compression=[0.0] * len(self.names),
+                                   normal_force=[0.0] * len(self.names))
+        self.forces = self._zero
+        self.gear_state = self._airborne
+        self.substeps = 0
+
+        # ASSINA estes tópicos:
+        self.bus.subscribe('aircraft_state', self.handle_aircraft_state)
+        self.bus.subscribe('controls', self.handle_controls)
+        self.bus.subscribe('mass_properties', self.handle_mass_properties)
+
+    def handle_aircraft_state(self, state):
+        self.state = state
+
+    def handle_controls(self, controls):
+        self.rudder = controls.rudder
+        self.brake = controls.brakes
+
+    def handle_mass_properties(self, mass_properties):
+        self.mass = mass_properties.mass
+
+    def update(self):
+        # LÓGICA: forças de contato (ou saída rápida em voo)
+        if self.state is not None:
+            self.forces, self.gear_state = self.calculate(self.state)
+
+        # PUBLICA nestes tópicos:
+        self.bus.publish('gear_forces', self.forces)
+        self.bus.publish('gear_state', self.gear_state)
+
+    def calculate(self, state):
+        """Forças e momentos (em torno do ponto de referência, eixos do corpo) do trem"""
+        pos = state.position_ned
+        altitude = -pos.z
+
+        # Saída rápida 1: acima de todo o terreno, sem nenhuma consulta
+        if altitude - self.reach > self.ground.max_elevation + self.contact_margin:
+            self.substeps = 0
+            return self._zero, self._airborne
+
+        # Saída rápida 2: uma consulta de solo sob a aeronave
+        elevation, _, _ = self.ground.surface(pos.x, pos.y)
+        if altitude - self.reach > elevation + self.contact_margin:
+            self.substeps = 0
+            return self._zero, self._airborne
+
+        euler = state.euler
+        body_to_ned = euler_to_dcm(euler.x, euler.y, euler.z)
+        ned_points = np.array([pos.x, pos.y, pos.z]) + self.positions @ body_to_ned.T
+
+        # Consulta do solo por ponto de contato (O(1) cada)
+        surfaces = [self.ground.surface(p[0], p[1]) for p in ned_points]
+        ground_down = np.array([-s[0] for s in surfaces])
+        friction_scale = np.array([s[1] for s in surfaces])
+        penetration = ned_points[:, 2] - ground_down
+
+        # Velocidade dos pontos de contato em NED: R (v + ω × r)
+        vel = state.velocity_body
+        rates = state.rates_body
+        v_body = np.array([vel.x, vel.y, vel.z])
+        omega = np.array([rates.x, rates.y, rates.z])
+        v_points = (v_body + _cross_rows(np.broadcast_to(omega, self.positions.shape), self.positions)) @ body_to_ned.T
+
+        in_contact = penetration > 0.0
+        if not np.any(in_contact):
+            self.substeps = 0
+            return self._zero, self._airborne
+
+        normal = self._normal_forces(penetration, v_points[:, 2], in_contact, body_to_ned[2, 2])
+        friction = self._tire_forces(normal, v_points, body_to_ned, friction_scale, in_contact)
+
+        # Força total em NED (normal para cima = -Z) e conversão para o corpo
+        forces_ned = friction.copy()
+        forces_ned[:, 2] -= normal
+        forces_body = forces_ned @ body_to_ned
+        total_force = forces_body.sum(axis=0)
+        total_moment = _cross_rows(self.positions, forces_body).sum(axis=0)
+
+        runway = next((s[2].name for s in surfaces if s[2] is not None), None)
+        contact_speed = float(np.linalg.norm(v_points[in_contact, :2], axis=1).mean())
+        gear_state = GearState(
+            weight_on_wheels=True,
+            compression=np.clip(penetration, 0.0, None).tolist(),
+            normal_force=normal.tolist(),
+            ground_speed=contact_speed,
+            runway=runway,
+        )
+        forces = ForcesMoments(forces=Vector3(*total_force.tolist()),
+                               moments=Vector3(*total_moment.tolist()))
+        return forces, gear_state
+
+    def _normal_forces(self, penetration, sink_rate, in_contact, gravity_axis):
+        """
+        Força normal média no frame, integrando cada amortecedor em subpassos
+        com uma massa efetiva (peso dividido entre as pernas em contato)
+        """
+        count = int(np.count_nonzero(in_contact))
+        m_eff = self.mass / count
+        k = self.spring[in_contact]
+        c = self.damping[in_contact]
+
+        # Subpassos suficientes para a perna mais rígida/amortecida ficar estável
+        omega_n = np.sqrt(k / m_eff).max()
+        damping_rate = (c / m_eff).max()
+        substeps = max(1, math.ceil(self.dt * max(omega_n, damping_rate) / self.substep_accuracy))
+        h = self.dt / substeps
+        self.substeps = substeps
+
+        x = penetration[in_contact].copy()
+        x_dot = sink_rate[in_contact].copy()
+        gravity = 9.81 * max(gravity_axis, 0.0)
+        accumulated = np.zeros_like(x)
+        for _ in range(substeps):
+            force = np.where(x > 0.0, np.maximum(k * x + c * x_dot, 0.0), 0.0)
+            accumulated += force
+            x_dot += (gravity - force / m_eff) * h
+            x += x_dot * h
+
+        normal = np.zeros(len(self.names))
+        normal[in_contact] = accumulated / substeps
+        # Batente: amortecedor no fim de curso transmite toda a carga
+        bottomed = penetration > self.max_compression
+        normal[bottomed] += self.spring[bottomed] * 10.0 * (penetration[bottomed] - self.max_compression[bottomed])
+        return normal
+
+    def _tire_forces(self, normal, v_points, body_to_ned, friction_scale, in_contact):
+        """Atrito de rolamento/frenagem ao longo da roda e atrito lateral (Coulomb regularizado)"""
+        # Direção de rolamento de cada roda no plano do solo (nariz esterçável pelo leme)
+        steering = np.where(self.steerable, self.rudder * self.max_steering, 0.0)
+        wheel = (np.cos(steering)[:, None] * body_to_ned[:2, 0]
+                 + np.sin(steering)[:, None] * body_to_ned[:2, 1])
+        wheel /= np.maximum(np.linalg.norm(wheel, axis=1, keepdims=True), 1e-9)
+        side = np.column_stack((-wheel[:, 1], wheel[:, 0]))
+
+        v_ground = v_points[:, :2]
+        v_roll = np.einsum('ij,ij->i', v_ground, wheel)
+        v_side = np.einsum('ij,ij->i', v_ground, side)
+
+        mu_roll = np.where(self.brakes,
+                           self.rolling_friction + self.brake * (self.braking_friction - self.rolling_friction),
+                           self.rolling_friction)
+        limit = normal * friction_scale
+        f_roll = -mu_roll * limit * np.clip(v_roll / self.friction_velocity, -1.0, 1.0)
+        f_side = -self.side_friction * limit * np.clip(v_side / self.friction_velocity, -1.0, 1.0)
+
+        friction = np.zeros((len(self.names), 3))
+        friction[:, :2] = f_roll[:, None] * wheel + f_side[:, None] * side
+        friction[~in_contact] = 0.0
+        return friction
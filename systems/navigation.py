@@ -0,0 +1,415 @@
+# systems/navigation.py
+"""
+Rádio-navegação: receptores VOR, ILS (localizador + glide slope), NDB/ADF e DME
+- Base de radioauxílios em CSV carregada uma vez; posições convertidas para ECEF
+- Índice KD-tree sobre ECEF (consultas de alcance e vizinho mais próximo em
+  O(log n)) e tabela ordenada por frequência para sintonia por busca binária
+- Base + índice gravados em cache (.idx.npz) invalidado pelo mtime/tamanho do
+  arquivo fonte: startup com uma base mundial só faz np.load
+- Alcance, linha de visada (horizonte rádio) e marcações calculados para todos
+  os receptores sintonizados em uma única passada vetorizada
+"""
+
+from dataclasses import dataclass
+import csv
+import math
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils.coordinate_transforms import ecef_to_lla, ecef_to_ned_matrix, lla_to_ecef, local_tangent_plane
+
+NAUTICAL_MILE = 1852.0
+CACHE_VERSION = 1
+RADIO_HORIZON = 4120.0          # m por √m de altura (terra 4/3)
+
+NAVAID_TYPES = ('VOR', 'ILS', 'NDB', 'DME')
+# Tipos que cada receptor aceita
+RECEIVER_TYPES = {'nav': ('VOR', 'ILS'), 'adf': ('NDB',), 'dme': ('VOR', 'ILS', 'DME')}
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_TWO_PI = 2.0 * math.pi
+
+
+@dataclass
+class ReceiverOutput:
+    """Saída de um receptor (buffer reaproveitado a cada frame)"""
+    ident: str = ""
+    valid: bool = False
+    bearing: float = 0.0            # rad - marcação verdadeira até a estação
+    radial: float = 0.0             # rad - radial magnética em que a aeronave está (VOR)
+    deviation: float = 0.0          # rad - desvio do curso (positivo = curso à direita)
+    to_from: int = 0                # +1 TO, -1 FROM, 0 sem sinal
+    glideslope_deviation: float = 0.0  # rad - positivo = acima da rampa
+    relative_bearing: float = 0.0   # rad - ponteiro do ADF
+    distance: float = 0.0           # m - distância oblíqua (DME)
+
+
+@dataclass
+class NavigationData:
+    """Contrato: Navigation → FlightControls, XPlaneInterface, DataRecorder"""
+    receivers: Dict = None
+
+    def __post_init__(self):
+        if self.receivers is None:
+            self.receivers = {}
+
+
+# ============================================================== índice espacial
+
+class KDTree:
+    """
+    KD-tree balanceada implícita (nós em ordem de heap, faixas [lo, hi) contíguas)
+    Só guarda a permutação dos pontos e o eixo/valor de corte de cada nó, então
+    a árvore cabe em três arrays (e no cache em disco)
+    """
+
+    def __init__(self, points, leaf_size: int = 16, order=None, split_dims=None, split_values=None):
+        points = np.asarray(points, dtype=float)
+        self.leaf_size = leaf_size
+        if order is None:
+            order, split_dims, split_values = self._build(points, leaf_size)
+        self.order = np.asarray(order)
+        self.split_dims = np.asarray(split_dims)
+        self.split_values = np.asarray(split_values)
+        self.points = np.ascontiguousarray(points[self.order])
+
+    @staticmethod
+    def _build(points, leaf_size):
+        n = len(points)
+        depth = max(0, math.ceil(math.log2(max(n, 1) / leaf_size))) if n > leaf_size else 0
+        split_dims = np.full(2 ** (depth + 1) - 1, -1, dtype=np.int8)
+        split_values = np.zeros(len(split_dims))
+        order = np.arange(n)
+        stack = [(0, 0, n)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if hi - lo <= leaf_size:
+                continue
+            block = points[order[lo:hi]]
+            dim = int(np.argmax(block.max(axis=0) - block.min(axis=0)))
+            mid = (lo + hi) // 2
+            order[lo:hi] = order[lo:hi][np.argpartition(block[:, dim], mid - lo)]
+            split_dims[node] = dim
+            split_values[node] = points[order[mid], dim]
+            stack.append((2 * node + 1, lo, mid))
+            stack.append((2 * node + 2, mid, hi))
+        return order, split_dims, split_values
+
+    def _is_leaf(self, node):
+        return node >= len(self.split_dims) or self.split_dims[node] < 0
+
+    def query_radius(self, center, radius: float) -> np.ndarray:
+        """Índices (originais) dos pontos a até 'radius' do centro"""
+        center = np.asarray(center, dtype=float)
+        found = []
+        stack = [(0, 0, len(self.points))]
+        while stack:
+            node, lo, hi = stack.pop()
+            if hi <= lo:
+                continue
+            if self._is_leaf(node):
+                block = self.points[lo:hi] - center
+                inside = np.einsum('ij,ij->i', block, block) <= radius * radius
+                found.append(self.order[lo:hi][inside])
+                continue
+            dim = self.split_dims[node]
+            mid = (lo + hi) // 2
+            split = self.split_values[node]
+            if center[dim] - radius <= split:
+                stack.append((2 * node + 1, lo, mid))
+            if center[dim] + radius >= split:
+                stack.append((2 * node + 2, mid, hi))
+        return np.concatenate(found) if found else np.zeros(0, dtype=int)
+
+    def nearest(self, center):
+        """(índice original, distância) do ponto mais próximo"""
+        center = np.asarray(center, dtype=float)
+        best_index, best_dist2 = -1, math.inf
+        stack = [(0, 0, len(self.points), 0.0)]
+        while stack:
+            node, lo, hi, bound2 = stack.pop()
+            if hi <= lo or bound2 >= best_dist2:
+                continue
+            if self._is_leaf(node):
+                block = self.points[lo:hi] - center
+                dist2 = np.einsum('ij,ij->i', block, block)
+                k = int(np.argmin(dist2))
+                if dist2[k] < best_dist2:
+                    best_index, best_dist2 = int(self.order[lo + k]), float(dist2[k])
+                continue
+            dim = self.split_dims[node]
+            mid = (lo + hi) // 2
+            delta = center[dim] - self.split_values[node]
+            near, far = ((2 * node + 1, lo, mid), (2 * node + 2, mid, hi)) if delta < 0 else \
+                ((2 * node + 2, mid, hi), (2 * node + 1, lo, mid))
+            stack.append(far + (delta * delta,))
+            stack.append(near + (0.0,))
+        return best_index, math.sqrt(best_dist2)
+
+
+# ============================================================== base de dados
+
+class NavaidDatabase:
+    """Radioauxílios em arrays (colunas) + KD-tree ECEF + índice por frequência"""
+
+    FIELDS = ('lat', 'lon', 'elevation', 'frequency', 'range', 'magvar', 'course', 'glideslope', 'dme')
+
+    def __init__(self, ident, kind, lat, lon, elevation, frequency, range_m, magvar, course, glideslope,
+                 dme, tree: Optional[KDTree] = None):
+        self.ident = np.asarray(ident)
+        self.kind = np.asarray(kind, dtype=np.int8)           # índice em NAVAID_TYPES
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.elevation = np.asarray(elevation, dtype=float)
+        self.frequency = np.asarray(frequency, dtype=np.int64)  # kHz
+        self.range = np.asarray(range_m, dtype=float)           # m
+        self.magvar = np.asarray(magvar, dtype=float)           # rad
+        self.course = np.asarray(course, dtype=float)           # rad verdadeiro
+        self.glideslope = np.asarray(glideslope, dtype=float)   # rad
+        self.dme = np.asarray(dme, dtype=bool)
+        self.ecef = np.stack(lla_to_ecef(self.lat, self.lon, self.elevation), axis=-1)
+        self.tree = tree if tree is not None else KDTree(self.ecef)
+        self.max_range = float(self.range.max()) if len(self.range) else 0.0
+
+        self._by_frequency = np.argsort(self.frequency, kind='stable')
+        self._sorted_frequency = self.frequency[self._by_frequency]
+        self.loaded_from_cache = False
+
+    def __len__(self):
+        return len(self.ident)
+
+    @classmethod
+    def from_csv(cls, path: str):
+        columns = {name: [] for name in ('ident', 'kind') + cls.FIELDS}
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = csv.DictReader(line for line in f if not line.startswith('#'))
+            for row in rows:
+                kind = row['type'].strip().upper()
+                frequency = float(row['frequency'])
+                columns['ident'].append(row['ident'].strip())
+                columns['kind'].append(NAVAID_TYPES.index(kind))
+                # Tudo em kHz inteiros: VOR/ILS/DME vêm em MHz, NDB em kHz
+                columns['frequency'].append(round(frequency if kind == 'NDB' else frequency * 1000.0))
+                for name in ('lat', 'lon', 'elevation', 'range', 'magvar', 'course', 'glideslope', 'dme'):
+                    columns[name].append(float(row[name]))
+
+        return cls(columns['ident'], columns['kind'], columns['lat'], columns['lon'], columns['elevation'],
+                   columns['frequency'],
+                   np.asarray(columns['range']) * NAUTICAL_MILE,
+                   np.radians(columns['magvar']),
+                   np.radians(columns['course']),
+                   np.radians(columns['glideslope']),
+                   columns['dme'])
+
+    @classmethod
+    def load(cls, path: str, cache_path: Optional[str] = None):
+        """Carrega do cache se ele corresponder ao arquivo fonte; senão lê o CSV e grava o cache"""
+        cache_path = cache_path or os.path.splitext(path)[0] + '.idx.npz'
+        source = os.stat(path)
+        stamp = np.array([CACHE_VERSION, source.st_mtime_ns, source.st_size], dtype=np.int64)
+
+        if os.path.exists(cache_path):
+            try:
+                with np.load(cache_path, allow_pickle=False) as cached:
+                    if np.array_equal(cached['stamp'], stamp):
+                        tree = KDTree(cached['ecef'], order=cached['order'], split_dims=cached['split_dims'],
+                                      split_values=cached['split_values'])
+                        database = cls(cached['ident'], cached['kind'], cached['lat'], cached['lon'],
+                                       cached['elevation'], cached['frequency'], cached['range'],
+                                       cached['magvar'], cached['course'], cached['glideslope'],
+                                       cached['dme'], tree=tree)
+                        database.loaded_from_cache = True
+                        return database
+            except (OSError, KeyError, ValueError):
+                pass   # cache corrompido ou de outro formato: reconstrói
+
+        database = cls.from_csv(path)
+        database.save_cache(cache_path, stamp)
+        return database
+
+    def save_cache(self, cache_path: str, stamp):
+        import tempfile   # só ao reconstruir o cache, não em toda partida
+        directory = os.path.dirname(os.path.abspath(cache_path))
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(suffix='.npz', dir=directory)
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, stamp=stamp, ident=self.ident.astype(str), kind=self.kind, lat=self.lat,
+                         lon=self.lon, elevation=self.elevation, frequency=self.frequency, range=self.range,
+                         magvar=self.magvar, course=self.course, glideslope=self.glideslope, dme=self.dme,
+                         ecef=self.ecef, order=self.tree.order, split_dims=self.tree.split_dims,
+                         split_values=self.tree.split_values)
+            os.replace(tmp_path, cache_path)   # troca atômica: leitores nunca veem cache pela metade
+        except OSError:
+            # Diretório sem escrita (instalação somente leitura): segue sem cache
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def stations_on(self, frequency_khz: int) -> np.ndarray:
+        """Índices das estações na frequência (busca binária na tabela ordenada)"""
+        lo = np.searchsorted(self._sorted_frequency, frequency_khz, side='left')
+        hi = np.searchsorted(self._sorted_frequency, frequency_khz, side='right')
+        return self._by_frequency[lo:hi]
+
+    def in_range(self, ecef, altitude: float) -> np.ndarray:
+        """Estações cujo alcance nominal e horizonte rádio cobrem a posição"""
+        candidates = self.tree.query_radius(ecef, self.max_range)
+        if len(candidates) == 0:
+            return candidates
+        return candidates[receivable(self, candidates, np.asarray(ecef, dtype=float), altitude)]
+
+    def nearest(self, ecef):
+        return self.tree.nearest(ecef)
+
+
+def receivable(database: NavaidDatabase, indices, ecef, altitude: float, slant=None) -> np.ndarray:
+    """Máscara vetorizada: dentro do alcance nominal e acima do horizonte rádio"""
+    if slant is None:
+        slant = np.linalg.norm(database.ecef[indices] - ecef, axis=-1)
+    horizon = RADIO_HORIZON * (math.sqrt(max(altitude, 0.0))
+                               + np.sqrt(np.maximum(database.elevation[indices], 0.0) + 10.0))
+    return (slant <= database.range[indices]) & (slant <= horizon)
+
+
+def _wrap(angle):
+    return (angle + math.pi) % _TWO_PI - math.pi
+
+
+# ============================================================== receptores
+
+class Navigation:
+    def __init__(self, message_bus, config, dt: float = 1 / 60.0):
+        self.bus = message_bus
+        self.dt = dt
+
+        navigation = config.get('navigation', {})
+        database_path = navigation.get('database', os.path.join('config', 'navaids.csv'))
+        if not os.path.isabs(database_path):
+            database_path = os.path.join(_PROJECT_ROOT, database_path)
+        self.database = NavaidDatabase.load(database_path, navigation.get('cache_file'))
+
+        initial = config.get('aircraft', {}).get('initial_conditions', {})
+        self.tangent_plane = local_tangent_plane(float(initial.get('latitude', 0.0)),
+                                                 float(initial.get('longitude', 0.0)), 0.0)
+        self.retune_interval = float(navigation.get('retune_interval', 2.0))
+
+        receivers = navigation.get('receivers', {'nav1': {'kind': 'nav'}, 'adf': {'kind': 'adf'}})
+        self.names = list(receivers)
+        self.kinds = [receivers[name].get('kind', 'nav') for name in self.names]
+        self.frequencies = [0] * len(self.names)
+        self.courses = np.radians([float(receivers[name].get('course_deg', 0.0)) for name in self.names])
+        self.station = np.full(len(self.names), -1)
+        self._tuned = np.zeros(0, dtype=int)
+        self.data = NavigationData(receivers={name: ReceiverOutput() for name in self.names})
+
+        self.state = None
+        self._since_retune = math.inf
+        for name in self.names:
+            if 'frequency' in receivers[name]:
+                self.tune(name, receivers[name]['frequency'])
+
+        # ASSINA estes tópicos:
+        self.bus.subscribe('aircraft_state', self.handle_aircraft_state)
+
+    def handle_aircraft_state(self, state):
+        self.state = state
+
+    def tune(self, receiver: str, frequency: float):
+        """Sintoniza o receptor: NAV/DME em MHz, ADF em kHz"""
+        i = self.names.index(receiver)
+        self.frequencies[i] = round(frequency if self.kinds[i] == 'adf' else frequency * 1000.0)
+        self._since_retune = math.inf   # resolve a estação no próximo frame
+
+    def set_course(self, receiver: str, course_rad: float):
+        """Seletor de curso (OBS) em rad magnéticos"""
+        self.courses[self.names.index(receiver)] = course_rad
+
+    def _resolve_stations(self, ecef):
+        """
+        Para cada receptor, a estação mais próxima do tipo aceito na frequência
+        sintonizada; os atributos das estações ficam em arrays por receptor
+        """
+        db = self.database
+        for i, (kind, frequency) in enumerate(zip(self.kinds, self.frequencies)):
+            candidates = db.stations_on(frequency)
+            allowed = [NAVAID_TYPES.index(t) for t in RECEIVER_TYPES[kind]]
+            candidates = candidates[np.isin(db.kind[candidates], allowed)]
+            if len(candidates) == 0:
+                self.station[i] = -1
+                self.data.receivers[self.names[i]].valid = False
+                continue
+            distances = np.linalg.norm(db.ecef[candidates] - ecef, axis=-1)
+            self.station[i] = candidates[int(np.argmin(distances))]
+
+        self._tuned = np.flatnonzero(self.station >= 0)
+        stations = self.station[self._tuned]
+        self._station_ecef = db.ecef[stations]
+        self._magvar = db.magvar[stations]
+        self._is_ils = db.kind[stations] == NAVAID_TYPES.index('ILS')
+        self._ils_course = db.course[stations] - self._magvar
+        self._glideslope = db.glideslope[stations]
+        self._range = db.range[stations]
+        self._antenna_horizon = np.sqrt(np.maximum(db.elevation[stations], 0.0) + 10.0)
+        self._has_distance = (db.dme[stations] | (db.kind[stations] == NAVAID_TYPES.index('DME'))).tolist()
+        self._outputs = [self.data.receivers[self.names[i]] for i in self._tuned]
+        for output, station in zip(self._outputs, stations):
+            output.ident = str(db.ident[station])
+
+    def calculate(self, state) -> NavigationData:
+        ecef = np.array(self.tangent_plane.ned_to_ecef(state.position_ned.x, state.position_ned.y,
+                                                       state.position_ned.z), dtype=float)
+        lat, lon, altitude = (float(x) for x in ecef_to_lla(*ecef))
+
+        self._since_retune += self.dt
+        if self._since_retune >= self.retune_interval:
+            self._resolve_stations(ecef)
+            self._since_retune = 0.0
+        if len(self._tuned) == 0:
+            return self.data
+
+        # LÓGICA: geometria de todos os receptores sintonizados de uma vez
+        relative_ned = (self._station_ecef - ecef) @ ecef_to_ned_matrix(lat, lon).T
+        north, east, down = relative_ned[:, 0], relative_ned[:, 1], relative_ned[:, 2]
+        slant = np.sqrt(north * north + east * east + down * down)
+        horizontal = np.hypot(north, east)
+        horizon = RADIO_HORIZON * (math.sqrt(max(altitude, 0.0)) + self._antenna_horizon)
+        valid = (slant <= self._range) & (slant <= horizon)
+
+        bearing = np.arctan2(east, north) % _TWO_PI
+        bearing_magnetic = bearing - self._magvar
+        radial = (bearing_magnetic + math.pi) % _TWO_PI
+
+        course = np.where(self._is_ils, self._ils_course, self.courses[self._tuned])
+        to_error = _wrap(bearing_magnetic - course)
+        to_from = np.where(np.abs(to_error) < 0.5 * math.pi, 1, -1)
+        deviation = np.where(to_from > 0, to_error, _wrap(course - radial))
+        # Elevação da aeronave vista da antena (glide slope na posição do ILS - simplificação)
+        glideslope_deviation = np.where(self._glideslope > 0.0,
+                                        np.arctan2(down, horizontal) - self._glideslope, 0.0)
+        relative_bearing = (bearing - state.euler.z) % _TWO_PI
+
+        rows = zip(self._outputs, valid.tolist(), bearing.tolist(), radial.tolist(), deviation.tolist(),
+                   to_from.tolist(), glideslope_deviation.tolist(), relative_bearing.tolist(), slant.tolist(),
+                   self._has_distance)
+        for output, ok, brg, rad, dev, tf, gs, rel, dist, has_distance in rows:
+            output.valid = ok
+            output.bearing = brg
+            output.radial = rad
+            output.deviation = dev
+            output.to_from = tf if ok else 0
+            output.glideslope_deviation = gs
+            output.relative_bearing = rel
+            output.distance = dist if has_distance else 0.0
+        return self.data
+
+    def update(self):
+        if self.state is None:
+            return
+
+        # LÓGICA: sintonia periódica + geometria dos receptores
+        navigation_data = self.calculate(self.state)
+
+        # PUBLICA neste tópico:
+        self.bus.publish('navigation_data', navigation_data)
@@ -0,0 +1,379 @@
+# systems/propulsion.py
+"""
+Modelo de propulsão: motor a pistão + hélice de passo fixo
+- Mapas de potência (RPM x pressão de admissão x densidade) e CT/CP x razão de avanço
+  pré-computados em tabelas de grade regular
+- RPM de equilíbrio resolvido a cada passo por Newton com partida a quente
+  (parte do RPM do frame anterior, converge em 1-2 iterações)
+- Caminho escalar num único kernel (propulsion_equilibrium, ver utils/jit.py): atmosfera,
+  Newton e saídas numa chamada, sem uma busca de tabela por chamada de método
+- API vetorizada (solve_batch) para lotes e Monte Carlo
+"""
+
+from dataclasses import dataclass
+import math
+
+import numpy as np
+
+from dynamics.atmosphere_model import isa_atmosphere
+from utils import jit
+from utils.data_interpolation import LookupTable, resample_uniform
+
+# inputs do kernel: condição do frame e parâmetros do Newton
+THROTTLE, AIRSPEED, ALTITUDE, RPM_GUESS, ITERATIONS, TOLERANCE, MAX_STEP = range(7)
+INPUT_SIZE = 7
+
+# params: manete → pressão de admissão, limites de RPM, hélice, consumo e densidade de referência
+IDLE_RATIO, FULL_RATIO, MIN_RPM, MAX_RPM, DIAMETER, D4, D5, BSFC, SEA_LEVEL_DENSITY = range(9)
+PARAM_SIZE = 9
+
+# Eixos das tabelas (grid: origens e depois inversos do passo; cells: última célula de cada eixo)
+AXIS_ALTITUDE, AXIS_MANIFOLD, AXIS_SIGMA, AXIS_ADVANCE, AXIS_RPM = range(5)
+NUM_AXES = 5
+# cells após as últimas células: strides do mapa do motor e início de cada tabela em `tables`
+RPM_STRIDE, MANIFOLD_STRIDE, DENSITY_OFFSET, CT_OFFSET, CP_OFFSET, CP_SLOPE_OFFSET, POWER_OFFSET, \
+    POWER_SLOPE_OFFSET = range(NUM_AXES, NUM_AXES + 8)
+CELLS_SIZE = NUM_AXES + 8
+
+# out: mesmos campos de PropulsionState
+OUT_RPM, OUT_THRUST, OUT_TORQUE, OUT_POWER, OUT_MANIFOLD, OUT_FUEL_FLOW = range(6)
+OUT_SIZE = 6
+
+
+@dataclass
+class PropulsionState:
+    """Contrato: Propulsion → FlightDynamics, Instruments, DataRecorder"""
+    rpm: float = 0.0
+    thrust: float = 0.0              # N (eixo X do corpo)
+    torque: float = 0.0              # N·m no eixo da hélice
+    power: float = 0.0               # W no eixo
+    manifold_pressure: float = 0.0   # Pa
+    fuel_flow: float = 0.0           # kg/s
+
+
+class PistonEngine:
+    """Motor a pistão aspirado representado por um mapa de potência pré-computado"""
+
+    def __init__(self, config: dict):
+        self.rated_power = float(config['rated_power'])
+        self.rated_rpm = float(config['rated_rpm'])
+        self.max_rpm = float(config['max_rpm'])
+        self.min_rpm = float(config['min_rpm'])
+        self.friction_fraction = float(config['friction_fraction'])
+        self.rated_manifold_pressure = float(config['rated_manifold_pressure'])
+        self.idle_manifold_ratio = float(config['idle_manifold_ratio'])
+        self.full_manifold_ratio = float(config['full_manifold_ratio'])
+        self.bsfc = float(config['bsfc'])
+
+        rpm_axis = np.linspace(0.0, self.max_rpm * 1.1, 34)
+        map_axis = np.linspace(10000.0, 110000.0, 21)
+        sigma_axis = np.linspace(0.2, 1.3, 12)
+        axes = (rpm_axis, map_axis, sigma_axis)
+
+        # Tabelas geradas uma única vez: potência e sua derivada em relação ao RPM
+        self.power_table = LookupTable.from_function(axes, self._power_model)
+        self.power_slope_table = LookupTable(
+            axes, np.gradient(self.power_table.values, rpm_axis, axis=0))
+
+    def _power_model(self, rpm, manifold_pressure, sigma):
+        """Potência no eixo [W] - modelo analítico usado apenas para gerar a tabela"""
+        n = rpm / self.rated_rpm
+        m = manifold_pressure / self.rated_manifold_pressure
+        # Ar mais frio em altitude aumenta a carga para o mesmo MAP (theta ≈ sigma^(1/4.256) na ISA)
+        charge = sigma ** (-1.0 / 8.512)
+        indicated = (1.0 + self.friction_fraction) * m * n * charge
+        friction = self.friction_fraction * n ** 2
+        return self.rated_power * (indicated - friction)
+
+    def manifold_pressure(self, throttle, ambient_pressure):
+        """Pressão de admissão [Pa] em função da manete e da pressão ambiente"""
+        throttle = np.clip(throttle, 0.0, 1.0)
+        ratio = self.idle_manifold_ratio + (self.full_manifold_ratio - self.idle_manifold_ratio) * throttle
+        return ratio * ambient_pressure
+
+    def fuel_flow(self, power):
+        """Consumo [kg/s] pelo consumo específico (sem consumo em potência negativa)"""
+        return self.bsfc * np.maximum(power, 0.0)
+
+
+class FixedPitchPropeller:
+    """Hélice de passo fixo com CT e CP tabelados em função da razão de avanço J"""
+
+    def __init__(self, config: dict, table_points: int = 101):
+        self.diameter = float(config['diameter'])
+
+        j_axis, ct = resample_uniform(config['advance_ratio'], config['ct'], table_points)
+        _, cp = resample_uniform(config['advance_ratio'], config['cp'], table_points)
+
+        self.ct_table = LookupTable([j_axis], ct)
+        self.cp_table = LookupTable([j_axis], cp)
+        self.cp_slope_table = LookupTable([j_axis], np.gradient(cp, j_axis))
+
+        # Constantes agrupadas: T = CT·ρ·n²·D⁴, P = CP·ρ·n³·D⁵
+        self.d4 = self.diameter ** 4
+        self.d5 = self.diameter ** 5
+
+
+def propulsion_equilibrium(inputs, params, tables, grid, cells, coords, fracs, index, out):
+    """
+    Frame escalar completo: atmosfera tabelada, Newton em P_motor - P_hélice e saídas.
+    Mesma saturação e ordem de redução de interp_multilinear (eixo a eixo), então cada
+    busca dá o mesmo valor que LookupTable.scalar; coords, fracs e index são rascunho
+    """
+    throttle = min(max(inputs[THROTTLE], 0.0), 1.0)
+    airspeed = max(inputs[AIRSPEED], 0.0)
+    rpm = min(max(inputs[RPM_GUESS], params[MIN_RPM]), params[MAX_RPM])
+    rho = 0.0
+    manifold = 0.0
+    iterations = int(inputs[ITERATIONS])
+    converged = False
+
+    # Passada 0 só localiza a altitude; a 1 a admissão e sigma (fixos no frame) mais
+    # razão de avanço e RPM; as seguintes só os dois últimos, que mudam no Newton
+    coords[AXIS_ALTITUDE] = inputs[ALTITUDE]
+    first, stop = AXIS_ALTITUDE, AXIS_MANIFOLD
+    for stage in range(iterations + 2):
+        if stage > 0:
+            coords[AXIS_ADVANCE] = airspeed / (rpm / 60.0 * params[DIAMETER])
+            coords[AXIS_RPM] = rpm
+        for d in range(first, stop):
+            pos = (coords[d] - grid[d]) * grid[NUM_AXES + d]
+            last = cells[d]
+            if pos <= 0.0:
+                idx, frac = 0, 0.0
+            elif pos >= last + 1.0:
+                idx, frac = last, 1.0
+            else:
+                idx = int(pos)
+                if idx > last:
+                    idx = last
+                frac = pos - idx
+            fracs[d] = frac
+            index[d] = idx
+
+        if stage == 0:
+            # Pressão no início de `tables`, densidade logo depois
+            i, f = index[AXIS_ALTITUDE], fracs[AXIS_ALTITUDE]
+            pressure = tables[i] + f * (tables[i + 1] - tables[i])
+            i += cells[DENSITY_OFFSET]
+            rho = tables[i] + f * (tables[i + 1] - tables[i])
+            manifold = pressure * (params[IDLE_RATIO] + (params[FULL_RATIO] - params[IDLE_RATIO]) * throttle)
+            coords[AXIS_MANIFOLD] = manifold
+            coords[AXIS_SIGMA] = rho / params[SEA_LEVEL_DENSITY]
+            first, stop = AXIS_MANIFOLD, NUM_AXES
+            continue
+        first = AXIS_ADVANCE
+
+        # Mapa do motor: potência e (no Newton) sua derivada, na mesma célula
+        final = converged or stage == iterations + 1
+        s0, s1 = cells[RPM_STRIDE], cells[MANIFOLD_STRIDE]
+        base = index[AXIS_RPM] * s0 + index[AXIS_MANIFOLD] * s1 + index[AXIS_SIGMA]
+        fr, fm, fs = fracs[AXIS_RPM], fracs[AXIS_MANIFOLD], fracs[AXIS_SIGMA]
+        engine_power = 0.0
+        engine_slope = 0.0
+        for t in range(1 if final else 2):
+            o = cells[POWER_OFFSET + t] + base
+            a00 = tables[o] + fr * (tables[o + s0] - tables[o])
+            a01 = tables[o + 1] + fr * (tables[o + s0 + 1] - tables[o + 1])
+            a10 = tables[o + s1] + fr * (tables[o + s0 + s1] - tables[o + s1])
+            a11 = tables[o + s1 + 1] + fr * (tables[o + s0 + s1 + 1] - tables[o + s1 + 1])
+            c0 = a00 + fm * (a10 - a00)
+            c1 = a01 + fm * (a11 - a01)
+            if t == 0:
+                engine_power = c0 + fs * (c1 - c0)
+            else:
+                engine_slope = c0 + fs * (c1 - c0)
+
+        # Hélice: CP sempre; CT nas saídas, dCP/dJ no Newton
+        n = rpm / 60.0
+        j = coords[AXIS_ADVANCE]
+        i, f = index[AXIS_ADVANCE], fracs[AXIS_ADVANCE]
+        k = cells[CP_OFFSET] + i
+        cp = tables[k] + f * (tables[k + 1] - tables[k])
+        if final:
+            k = cells[CT_OFFSET] + i
+            ct = tables[k] + f * (tables[k + 1] - tables[k])
+            power = cp * rho * n ** 3 * params[D5]
+            out[OUT_RPM] = rpm
+            out[OUT_THRUST] = ct * rho * n * n * params[D4]
+            out[OUT_TORQUE] = power / (2.0 * math.pi * n)
+            out[OUT_POWER] = power
+            out[OUT_MANIFOLD] = manifold
+            out[OUT_FUEL_FLOW] = params[BSFC] * max(engine_power, 0.0)
+            return
+
+        k = cells[CP_SLOPE_OFFSET] + i
+        cp_slope = tables[k] + f * (tables[k + 1] - tables[k])
+        residual = engine_power - cp * rho * n ** 3 * params[D5]
+        slope = engine_slope - rho * params[D5] * n * n * (3.0 * cp - j * cp_slope) / 60.0
+        max_step = inputs[MAX_STEP]
+        step = -residual / slope if slope < -1e-6 else max_step
+        step = min(max(step, -max_step), max_step)
+        rpm = min(max(rpm + step, params[MIN_RPM]), params[MAX_RPM])
+        if abs(step) < inputs[TOLERANCE]:
+            converged = True
+
+
+@jit.register_warmup
+def _warm_up():
+    inputs = jit.buffer([0.5, 30.0, 500.0, 2000.0, 2.0, 0.5, 500.0])
+    params = jit.buffer([0.3, 0.95, 500.0, 2700.0, 1.9, 13.0, 24.8, 8e-8, 1.225])
+    tables = jit.buffer(2 * 2 + 3 * 2 + 2 * 8)        # todas as tabelas com 2 pontos por eixo
+    grid = jit.buffer([0.0] * NUM_AXES + [1.0] * NUM_AXES)
+    cells = jit.buffer([0] * NUM_AXES + [4, 2, 2, 4, 6, 8, 10, 18], dtype=int)
+    jit.compiled(propulsion_equilibrium)(inputs, params, tables, grid, cells, jit.buffer(NUM_AXES),
+                                         jit.buffer(NUM_AXES), jit.buffer(NUM_AXES, dtype=int),
+                                         jit.buffer(OUT_SIZE))
+
+
+class PropulsionModel:
+    """
+    Motor e hélice acoplados no mesmo eixo
+    O RPM de equilíbrio é a raiz de P_motor(rpm) - P_hélice(rpm) = 0
+    """
+
+    def __init__(self, config: dict, newton_iterations: int = 4, rpm_tolerance: float = 0.5):
+        self.engine = PistonEngine(config['engine'])
+        self.propeller = FixedPitchPropeller(config['propeller'])
+        self.newton_iterations = newton_iterations
+        self.rpm_tolerance = rpm_tolerance
+        self.max_rpm_step = 500.0   # limita o passo de Newton longe do equilíbrio
+
+        # Atmosfera tabelada para não avaliar a ISA completa a cada frame
+        altitude_axis = np.linspace(-500.0, 12000.0, 126)
+        _, pressure, density, _ = isa_atmosphere(altitude_axis)
+        self.pressure_table = LookupTable([altitude_axis], pressure)
+        self.density_table = LookupTable([altitude_axis], density)
+        self.sea_level_density = float(isa_atmosphere(0.0)[2])
+        self._pack_kernel()
+
+    def _pack_kernel(self):
+        """Tabelas e constantes no formato do kernel propulsion_equilibrium (uma vez)"""
+        engine = self.engine
+        prop = self.propeller
+        # Mesma ordem de NUM_AXES: altitude, admissão, sigma, razão de avanço, RPM
+        axes = [(self.pressure_table, 0), (engine.power_table, 1), (engine.power_table, 2),
+                (prop.cp_table, 0), (engine.power_table, 0)]
+        origin = [table._origin[axis] for table, axis in axes]
+        inv_step = [table._inv_step[axis] for table, axis in axes]
+        last_cell = [table._last_cell[axis] for table, axis in axes]
+
+        tables, offsets = [], []
+        for table in (self.pressure_table, self.density_table, prop.ct_table, prop.cp_table,
+                      prop.cp_slope_table, engine.power_table, engine.power_slope_table):
+            offsets.append(len(tables))
+            tables.extend(table._flat_list)
+        strides = engine.power_table._strides
+
+        self._kernel = jit.compiled(propulsion_equilibrium)
+        self._inputs = jit.buffer(INPUT_SIZE)
+        self._params = jit.buffer([engine.idle_manifold_ratio, engine.full_manifold_ratio, engine.min_rpm,
+                                   engine.max_rpm, prop.diameter, prop.d4, prop.d5, engine.bsfc,
+                                   self.sea_level_density])
+        self._tables = jit.buffer(tables)
+        self._grid = jit.buffer(origin + inv_step)
+        self._cells = jit.buffer(last_cell + [strides[0], strides[1]] + offsets[1:], dtype=int)
+        self._coords = jit.buffer(NUM_AXES)
+        self._fracs = jit.buffer(NUM_AXES)
+        self._index = jit.buffer(NUM_AXES, dtype=int)
+        self._out = jit.buffer(OUT_SIZE)
+
+    def solve(self, throttle: float, airspeed: float, altitude: float,
+              rpm_guess: float) -> PropulsionState:
+        """
+        Solução escalar por frame (kernel propulsion_equilibrium, partida a quente em rpm_guess).
+        Limitação conhecida: no backend python um frame custa ~15-20 µs; a faixa de poucos µs
+        só é atingida com numba (~4 µs, quase tudo passagem de argumentos e PropulsionState)
+        """
+        inputs, out = self._inputs, self._out
+        inputs[THROTTLE] = throttle
+        inputs[AIRSPEED] = airspeed
+        inputs[ALTITUDE] = altitude
+        inputs[RPM_GUESS] = rpm_guess
+        inputs[ITERATIONS] = self.newton_iterations
+        inputs[TOLERANCE] = self.rpm_tolerance
+        inputs[MAX_STEP] = self.max_rpm_step
+        self._kernel(inputs, self._params, self._tables, self._grid, self._cells,
+                     self._coords, self._fracs, self._index, out)
+        return PropulsionState(float(out[OUT_RPM]), float(out[OUT_THRUST]), float(out[OUT_TORQUE]),
+                               float(out[OUT_POWER]), float(out[OUT_MANIFOLD]), float(out[OUT_FUEL_FLOW]))
+
+    def solve_batch(self, throttle, airspeed, altitude, rpm_guess=None) -> dict:
+        """
+        Solução vetorizada para N aeronaves (iterações fixas, sem laço por aeronave)
+        Retorna dicionário de arrays com os mesmos campos de PropulsionState
+        """
+        engine = self.engine
+        prop = self.propeller
+
+        throttle, airspeed, altitude = np.broadcast_arrays(
+            np.asarray(throttle, dtype=float), np.asarray(airspeed, dtype=float),
+            np.asarray(altitude, dtype=float))
+        airspeed = np.maximum(airspeed, 0.0)
+
+        pressure = self.pressure_table(altitude)
+        rho = self.density_table(altitude)
+        sigma = rho / self.sea_level_density
+        manifold = engine.manifold_pressure(throttle, pressure)
+
+        if rpm_guess is None:
+            rpm_guess = 0.8 * engine.rated_rpm
+        rpm = np.clip(np.broadcast_to(np.asarray(rpm_guess, dtype=float), throttle.shape),
+                      engine.min_rpm, engine.max_rpm)
+
+        for _ in range(self.newton_iterations):
+            n = rpm / 60.0
+            j = airspeed / (n * prop.diameter)
+            cp = prop.cp_table(j)
+            residual = engine.power_table(rpm, manifold, sigma) - cp * rho * n ** 3 * prop.d5
+            slope = (engine.power_slope_table(rpm, manifold, sigma)
+                     - rho * prop.d5 * n * n * (3.0 * cp - j * prop.cp_slope_table(j)) / 60.0)
+            step = np.where(slope < -1e-6, -residual / np.minimum(slope, -1e-6), self.max_rpm_step)
+            step = np.clip(step, -self.max_rpm_step, self.max_rpm_step)
+            rpm = np.clip(rpm + step, engine.min_rpm, engine.max_rpm)
+
+        n = rpm / 60.0
+        j = airspeed / (n * prop.diameter)
+        power = prop.cp_table(j) * rho * n ** 3 * prop.d5
+        return {
+            'rpm': rpm,
+            'thrust': prop.ct_table(j) * rho * n * n * prop.d4,
+            'torque': power / (2.0 * np.pi * n),
+            'power': power,
+            'manifold_pressure': manifold,
+            'fuel_flow': engine.fuel_flow(engine.power_table(rpm, manifold, sigma)),
+        }
+
+
+class Propulsion:
+    def __init__(self, message_bus, config):
+        self.bus = message_bus
+        self.model = PropulsionModel(config['propulsion'])
+
+        # Entradas mais recentes recebidas pelo barramento
+        self.throttle = 0.0
+        self.airspeed = 0.0
+        self.altitude = 0.0
+
+        # RPM inicial só serve como chute para a primeira iteração de Newton
+        self.state = PropulsionState(rpm=0.5 * self.model.engine.rated_rpm)
+
+        # ASSINA estes tópicos:
+        self.bus.subscribe('controls', self.handle_controls)
+        self.bus.subscribe('aircraft_state', self.handle_aircraft_state)
+
+    def handle_controls(self, controls):
+        throttle = controls.throttle
+        # XPlaneInterface ainda envia a manete como lista (um elemento por motor)
+        self.throttle = float(throttle[0] if isinstance(throttle, (list, tuple)) else throttle)
+
+    def handle_aircraft_state(self, state):
+        self.airspeed = state.velocity_body.x
+        self.altitude = -state.position_ned.z
+
+    def update(self):
+        # LÓGICA: RPM de equilíbrio partindo do RPM do frame anterior
+        self.state = self.model.solve(self.throttle, self.airspeed, self.altitude, self.state.rpm)
+
+        # PUBLICA neste tópico:
+        self.bus.publish('propulsion_state', self.state)
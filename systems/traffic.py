@@ -0,0 +1,347 @@
+# systems/traffic.py
+"""
+Tráfego IA e detecção de proximidade estilo TCAS
+- Todo o tráfego em arrays, avançado por um modelo cinemático vetorizado
+  (curva coordenada com razão limitada, subida e aceleração limitadas)
+- Hash espacial uniforme atualizado incrementalmente: só aeronaves que mudaram
+  de célula mexem nos conjuntos
+- Conflitos tráfego × tráfego só entre células vizinhas; os N mais próximos da
+  nossa aeronave (e os candidatos a TCAS) saem das células dentro do alcance de vigilância
+- TA/RA pela tau modificada do TCAS II (alcance protegido DMOD) e separação vertical
+"""
+
+from dataclasses import dataclass
+import math
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from utils.coordinate_transforms import euler_to_dcm
+
+GRAVITY = 9.81
+STANDARD_RATE = math.radians(3.0)  # rad/s
+
+DEFAULT_TCAS = {
+    'ta_tau': 40.0, 'ra_tau': 25.0,                # s
+    'ta_dmod': 1000.0, 'ra_dmod': 650.0,           # m
+    'ta_altitude': 260.0, 'ra_altitude': 180.0,    # m (~850 ft / 600 ft)
+}
+
+
+@dataclass(frozen=True)
+class TrafficAdvisory:
+    """Contrato: Traffic → Instruments, InstructorStation"""
+    id: int
+    level: str                  # 'TA' | 'RA'
+    range: float                # m (oblíquo)
+    bearing: float              # rad a partir do norte
+    relative_altitude: float    # m, positivo = tráfego acima
+    closure_rate: float         # m/s, positivo = aproximando
+    tau: float                  # s
+
+
+@dataclass(frozen=True)
+class TrafficPicture:
+    """Contrato: Traffic → XPlaneInterface (os mais próximos, do mais perto ao mais longe)"""
+    ids: Tuple[int, ...]
+    positions: np.ndarray       # (k, 3) NED [m]
+    attitudes: np.ndarray       # (k, 3) phi, theta, psi [rad]
+    advisories: Tuple[TrafficAdvisory, ...]
+    conflicts: np.ndarray       # (m, 2) pares de ids tráfego × tráfego
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+# ============================================================== hash espacial
+
+class SpatialHash:
+    """
+    Grade uniforme (norte, leste) → conjunto de índices. update() só mexe nas
+    aeronaves cuja célula mudou desde o frame anterior
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self._inv_cell = 1.0 / cell_size
+        self.cells: Dict[Tuple[int, int], Set[int]] = {}
+        self.keys: List[Tuple[int, int]] = []
+
+    def _keys(self, north: np.ndarray, east: np.ndarray) -> List[Tuple[int, int]]:
+        cells = np.floor(np.column_stack((north, east)) * self._inv_cell).astype(np.int64)
+        return list(map(tuple, cells.tolist()))
+
+    def update(self, north: np.ndarray, east: np.ndarray) -> int:
+        """Reposiciona os índices; devolve quantos trocaram de célula"""
+        keys = self._keys(north, east)
+        if len(keys) != len(self.keys):
+            self.cells = {}
+            for index, key in enumerate(keys):
+                self.cells.setdefault(key, set()).add(index)
+            self.keys = keys
+            return len(keys)
+
+        moved = 0
+        for index, (old, new) in enumerate(zip(self.keys, keys)):
+            if old != new:
+                members = self.cells[old]
+                members.discard(index)
+                if not members:
+                    del self.cells[old]
+                self.cells.setdefault(new, set()).add(index)
+                moved += 1
+        self.keys = keys
+        return moved
+
+    def query(self, north: float, east: float, radius: float) -> np.ndarray:
+        """Índices nas células que tocam o quadrado de lado 2·radius (candidatos, sem filtrar distância)"""
+        i0, i1 = math.floor((north - radius) * self._inv_cell), math.floor((north + radius) * self._inv_cell)
+        j0, j1 = math.floor((east - radius) * self._inv_cell), math.floor((east + radius) * self._inv_cell)
+        found: List[int] = []
+        if (i1 - i0 + 1) * (j1 - j0 + 1) <= len(self.cells):
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    found.extend(self.cells.get((i, j), ()))
+        else:
+            for (i, j), members in self.cells.items():
+                if i0 <= i <= i1 and j0 <= j <= j1:
+                    found.extend(members)
+        return np.array(found, dtype=np.int64)
+
+    def candidate_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Pares (i, j) na mesma célula ou em células vizinhas, cada par uma vez"""
+        first: List[np.ndarray] = []
+        second: List[np.ndarray] = []
+        for (i, j), members in self.cells.items():
+            here = np.fromiter(members, dtype=np.int64, count=len(members))
+            if len(here) > 1:
+                a, b = np.triu_indices(len(here), k=1)
+                first.append(here[a])
+                second.append(here[b])
+            # Metade dos vizinhos: cada par de células visitado uma vez
+            for key in ((i, j + 1), (i + 1, j - 1), (i + 1, j), (i + 1, j + 1)):
+                other = self.cells.get(key)
+                if other:
+                    there = np.fromiter(other, dtype=np.int64, count=len(other))
+                    first.append(np.repeat(here, len(there)))
+                    second.append(np.tile(there, len(here)))
+        if not first:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(first), np.concatenate(second)
+
+
+# ============================================================== modelo cinemático
+
+class TrafficModel:
+    """Estado de N aeronaves IA: curva coordenada, razão de subida e aceleração limitadas"""
+
+    def __init__(self, positions, headings, speeds, max_turn_rate: float = STANDARD_RATE,
+                 max_climb_rate: float = 5.0, max_acceleration: float = 1.0,
+                 heading_gain: float = 0.5, altitude_gain: float = 0.2):
+        self.positions = np.array(positions, dtype=float).reshape(-1, 3)
+        self.headings = np.array(headings, dtype=float)
+        self.speeds = np.array(speeds, dtype=float)
+        self.climb_rates = np.zeros(len(self.speeds))
+        self.turn_rates = np.zeros(len(self.speeds))
+
+        self.target_headings = self.headings.copy()
+        self.target_altitudes = -self.positions[:, 2].copy()
+        self.target_speeds = self.speeds.copy()
+
+        self.max_turn_rate = max_turn_rate
+        self.max_climb_rate = max_climb_rate
+        self.max_acceleration = max_acceleration
+        self.heading_gain = heading_gain
+        self.altitude_gain = altitude_gain
+
+    @classmethod
+    def spawn(cls, count: int, seed: Optional[int] = None, radius: float = 30000.0,
+              altitude_band: Sequence[float] = (600.0, 3000.0), speed_band: Sequence[float] = (45.0, 120.0),
+              center: Sequence[float] = (0.0, 0.0), **limits) -> 'TrafficModel':
+        """Tráfego uniforme num disco em torno de center, proas aleatórias"""
+        rng = np.random.default_rng(seed)
+        distance = radius * np.sqrt(rng.uniform(0.0, 1.0, count))
+        angle = rng.uniform(0.0, 2.0 * np.pi, count)
+        positions = np.column_stack((center[0] + distance * np.cos(angle),
+                                     center[1] + distance * np.sin(angle),
+                                     -rng.uniform(*altitude_band, count)))
+        return cls(positions, rng.uniform(0.0, 2.0 * np.pi, count), rng.uniform(*speed_band, count), **limits)
+
+    def __len__(self):
+        return len(self.speeds)
+
+    def set_targets(self, indices, heading=None, altitude=None, speed=None):
+        """Novos alvos para um subconjunto (índices ou máscara); None mantém o alvo atual"""
+        if heading is not None:
+            self.target_headings[indices] = heading
+        if altitude is not None:
+            self.target_altitudes[indices] = altitude
+        if speed is not None:
+            self.target_speeds[indices] = speed
+
+    def velocities(self) -> np.ndarray:
+        """(N, 3) NED [m/s]"""
+        horizontal = np.sqrt(np.maximum(self.speeds ** 2 - self.climb_rates ** 2, 0.0))
+        return np.column_stack((horizontal * np.cos(self.headings), horizontal * np.sin(self.headings),
+                                -self.climb_rates))
+
+    def attitudes(self) -> np.ndarray:
+        """(N, 3) phi, theta, psi - inclinação da curva coordenada e ângulo da trajetória"""
+        bank = np.arctan(self.speeds * self.turn_rates / GRAVITY)
+        pitch = np.arcsin(np.clip(self.climb_rates / np.maximum(self.speeds, 1.0), -1.0, 1.0))
+        return np.column_stack((bank, pitch, np.mod(self.headings, 2.0 * np.pi)))
+
+    def advance(self, dt: float):
+        error = np.angle(np.exp(1j * (self.target_headings - self.headings)))
+        self.turn_rates = np.clip(self.heading_gain * error, -self.max_turn_rate, self.max_turn_rate)
+        self.headings = self.headings + self.turn_rates * dt
+
+        altitude_error = self.target_altitudes + self.positions[:, 2]
+        self.climb_rates = np.clip(self.altitude_gain * altitude_error, -self.max_climb_rate, self.max_climb_rate)
+
+        step = self.max_acceleration * dt
+        self.speeds = self.speeds + np.clip(self.target_speeds - self.speeds, -step, step)
+
+        self.positions += self.velocities() * dt
+
+
+# ============================================================== proximidade
+
+def conflict_pairs(spatial_hash: SpatialHash, positions: np.ndarray, radius: float, height: float) -> np.ndarray:
+    """(m, 2) índices de pares mais próximos que radius na horizontal e height na vertical"""
+    first, second = spatial_hash.candidate_pairs()
+    delta = positions[first] - positions[second]
+    close = (delta[:, 0] ** 2 + delta[:, 1] ** 2 < radius * radius) & (np.abs(delta[:, 2]) < height)
+    pairs = np.column_stack((first[close], second[close]))
+    pairs.sort(axis=1)
+    return pairs
+
+
+def modified_tau(distance: np.ndarray, closure: np.ndarray, dmod: float) -> np.ndarray:
+    """τ_mod = (r² − DMOD²) / (r·ṙ); 0 dentro de DMOD; inf quando afastando"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tau = (distance ** 2 - dmod ** 2) / (distance * closure)
+    tau = np.where(closure > 0.0, tau, np.inf)
+    return np.where(distance <= dmod, 0.0, tau)
+
+
+def _threat(distance, closure, altitude, vertical_closure, tau_limit, dmod, altitude_limit):
+    """Alcance: τ_mod abaixo do limite; vertical: dentro da faixa ou chegando nela antes do limite"""
+    tau = modified_tau(distance, closure, dmod)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vertical_tau = np.where(vertical_closure > 0.0, (np.abs(altitude) - altitude_limit) / vertical_closure, np.inf)
+    return (tau < tau_limit) & ((np.abs(altitude) < altitude_limit) | (vertical_tau < tau_limit)), tau
+
+
+# ============================================================== módulo
+
+class Traffic:
+    def __init__(self, message_bus, config, dt: float = 1 / 60.0, model: Optional[TrafficModel] = None):
+        self.bus = message_bus
+        self.dt = dt
+
+        traffic = config.get('traffic', {})
+        if model is None:
+            model = TrafficModel.spawn(int(traffic.get('count', 50)), seed=traffic.get('seed'),
+                                       radius=float(traffic.get('spawn_radius', 30000.0)),
+                                       altitude_band=traffic.get('altitude_band', (600.0, 3000.0)),
+                                       speed_band=traffic.get('speed_band', (45.0, 120.0)))
+        self.model = model
+        self.ids = np.arange(len(model))
+
+        self.conflict_radius = float(traffic.get('conflict_radius', 900.0))
+        self.conflict_height = float(traffic.get('conflict_height', 150.0))
+        self.surveillance_range = float(traffic.get('surveillance_range', 15000.0))
+        self.stream_count = int(traffic.get('stream_count', 10))
+        self.tcas = dict(DEFAULT_TCAS, **traffic.get('tcas', {}))
+        # Célula ≥ raio de conflito: pares só entre células vizinhas
+        self.hash = SpatialHash(max(float(traffic.get('cell_size', 2000.0)), self.conflict_radius))
+
+        self.own_position = np.zeros(3)
+        self.own_velocity = np.zeros(3)
+        self.picture = TrafficPicture((), _frozen(np.empty((0, 3))), _frozen(np.empty((0, 3))), (),
+                                      _frozen(np.empty((0, 2), dtype=np.int64)))
+        self.cells_moved = 0
+
+        # ASSINA estes tópicos:
+        self.bus.subscribe('aircraft_state', self.handle_aircraft_state)
+
+    def handle_aircraft_state(self, state):
+        pos, vel, euler = state.position_ned, state.velocity_body, state.euler
+        self.own_position = np.array([pos.x, pos.y, pos.z])
+        self.own_velocity = euler_to_dcm(euler.x, euler.y, euler.z) @ np.array([vel.x, vel.y, vel.z])
+
+    def surveillance(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(índices, distâncias oblíquas) de todo o tráfego dentro do alcance, do mais perto ao mais longe"""
+        candidates = self.hash.query(self.own_position[0], self.own_position[1], self.surveillance_range)
+        if len(candidates) == 0:
+            return candidates, np.empty(0)
+        distance = np.linalg.norm(self.model.positions[candidates] - self.own_position, axis=1)
+        inside = distance <= self.surveillance_range
+        candidates, distance = candidates[inside], distance[inside]
+        order = np.argsort(distance)
+        return candidates[order], distance[order]
+
+    def advisories(self, indices: np.ndarray, distance: np.ndarray) -> Tuple[TrafficAdvisory, ...]:
+        relative = self.model.positions[indices] - self.own_position
+        relative_velocity = self.model.velocities()[indices] - self.own_velocity
+        with np.errstate(divide='ignore', invalid='ignore'):
+            closure = np.where(distance > 0.0, -np.sum(relative * relative_velocity, axis=1) / distance, 0.0)
+        altitude = -relative[:, 2]
+        vertical_closure = np.where(altitude > 0.0, relative_velocity[:, 2], -relative_velocity[:, 2])
+
+        t = self.tcas
+        traffic, tau = _threat(distance, closure, altitude, vertical_closure,
+                               t['ta_tau'], t['ta_dmod'], t['ta_altitude'])
+        resolution, _ = _threat(distance, closure, altitude, vertical_closure,
+                                t['ra_tau'], t['ra_dmod'], t['ra_altitude'])
+        bearing = np.arctan2(relative[:, 1], relative[:, 0])
+        return tuple(TrafficAdvisory(int(self.ids[k]), 'RA' if resolution[n] else 'TA', float(distance[n]),
+                                     float(bearing[n]), float(altitude[n]), float(closure[n]), float(tau[n]))
+                     for n, k in enumerate(indices) if traffic[n] or resolution[n])
+
+    def update(self):
+        # LÓGICA: avança o tráfego, reposiciona no hash, conflitos e TCAS só entre vizinhos
+        self.model.advance(self.dt)
+        positions = self.model.positions
+        self.cells_moved = self.hash.update(positions[:, 0], positions[:, 1])
+
+        conflicts = self.ids[conflict_pairs(self.hash, positions, self.conflict_radius, self.conflict_height)]
+        visible, distance = self.surveillance()
+        nearest = visible[:self.stream_count]
+        self.picture = TrafficPicture(tuple(self.ids[nearest].tolist()),
+                                      _frozen(positions[nearest].copy()),
+                                      _frozen(self.model.attitudes()[nearest]),
+                                      self.advisories(visible, distance),
+                                      _frozen(conflicts))
+
+        # PUBLICA neste tópico:
+        self.bus.publish('traffic', self.picture)
+
+
+class MultiplayerSlots:
+    """
+    id do tráfego → slot de aeronave multiplayer do X-Plane (1..max_slots); um id
+    mantém o slot enquanto continuar entre os mais próximos (o modelo não troca de lugar)
+    """
+
+    def __init__(self, max_slots: int = 19):
+        self.max_slots = max_slots
+        self.slots: Dict[int, int] = {}
+
+    def assign(self, ids: Sequence[int]) -> List[Tuple[int, int]]:
+        """(posição em ids, slot) para os ids que couberem, na ordem de ids"""
+        current = set(ids)
+        self.slots = {i: slot for i, slot in self.slots.items() if i in current}
+        free = sorted(set(range(1, self.max_slots + 1)) - set(self.slots.values()), reverse=True)
+        assigned = []
+        for n, i in enumerate(ids):
+            if i not in self.slots:
+                if not free:
+                    continue
+                self.slots[i] = free.pop()
+            assigned.append((n, self.slots[i]))
+        return assigned
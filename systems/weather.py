@@ -0,0 +1,291 @@
+# systems/weather.py
+"""
+Clima: atmosfera, camadas de vento, rajadas discretas e turbulência contínua
+- Turbulência Dryden/von Kármán sintetizada em blocos grandes por FFT a partir
+  de um gerador semeado (mesma semente = mesma turbulência)
+- Os blocos são gerados em distância normalizada (x / L), onde o espectro
+  não depende de altitude nem velocidade; por frame basta avançar a leitura
+  de V·dt/L no ring buffer e interpolar, sem filtrar nada em Python
+- Linhas independentes por aeronave permitem lotes/Monte Carlo com
+  turbulência independente e reprodutível
+"""
+
+from dataclasses import dataclass
+import math
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from dynamics.atmosphere_model import isa_atmosphere
+from utils.data_interpolation import LookupTable, resample_uniform
+
+FEET = 0.3048
+
+
+@dataclass
+class EnvironmentData:
+    """Contrato: Weather → Aerodynamics, FlightDynamics, Instruments, DataRecorder"""
+    temperature: float = 288.15                                  # K
+    pressure: float = 101325.0                                   # Pa
+    density: float = 1.225                                       # kg/m³
+    speed_of_sound: float = 340.29                               # m/s
+    wind_ned: Tuple[float, float, float] = (0.0, 0.0, 0.0)       # vento médio + rajada [m/s]
+    turbulence_body: Tuple[float, float, float] = (0.0, 0.0, 0.0)  # componente turbulenta [m/s]
+
+
+# ============================================================== espectros normalizados
+
+def longitudinal_spectrum(kappa, model: str = "dryden"):
+    """PSD de variância unitária da componente u em função de κ = Ω·L"""
+    if model == "von_karman":
+        return (2.0 / math.pi) / (1.0 + (1.339 * kappa) ** 2) ** (5.0 / 6.0)
+    return (2.0 / math.pi) / (1.0 + kappa ** 2)
+
+
+def transverse_spectrum(kappa, model: str = "dryden"):
+    """PSD de variância unitária das componentes v e w em função de κ = Ω·L"""
+    if model == "von_karman":
+        a = (1.339 * kappa) ** 2
+        return (1.0 / math.pi) * (1.0 + 8.0 / 3.0 * a) / (1.0 + a) ** (11.0 / 6.0)
+    return (1.0 / math.pi) * (1.0 + 3.0 * kappa ** 2) / (1.0 + kappa ** 2) ** 2
+
+
+def turbulence_scales(altitude_m, wind_20ft: float, high_altitude_sigma: Optional[float] = None):
+    """
+    Intensidades σ (u, v, w) [m/s] e escalas L (u, v, w) [m] - MIL-F-8785C
+    Baixa altitude (< 1000 ft) a partir do vento a 20 ft; acima de 2000 ft
+    turbulência isotrópica com L = 1750 ft; interpolação linear entre as faixas
+    """
+    h_ft = np.clip(np.asarray(altitude_m, dtype=float) / FEET, 10.0, None)
+    sigma_w = 0.1 * wind_20ft
+    if high_altitude_sigma is None:
+        high_altitude_sigma = sigma_w
+
+    h_low = np.minimum(h_ft, 1000.0)
+    factor = 0.177 + 0.000823 * h_low
+    sigma_low = np.stack([sigma_w / factor ** 0.4, sigma_w / factor ** 0.4, np.full_like(h_low, sigma_w)])
+    length_low = np.stack([h_low / factor ** 1.2, h_low / factor ** 1.2, h_low]) * FEET
+
+    sigma_high = np.full_like(sigma_low, high_altitude_sigma)
+    length_high = np.full_like(length_low, 1750.0 * FEET)
+
+    blend = np.clip((h_ft - 1000.0) / 1000.0, 0.0, 1.0)
+    sigma = sigma_low + (sigma_high - sigma_low) * blend
+    length = length_low + (length_high - length_low) * blend
+    return sigma, length
+
+
+# ============================================================== gerador em blocos
+
+class TurbulenceStream:
+    """
+    Ring buffer de ruído colorido com variância unitária, indexado em distância normalizada
+    Cada linha (aeronave × eixo) tem seu próprio cursor de leitura; blocos novos são
+    gerados de forma vetorizada só para as linhas que precisarem
+    """
+
+    def __init__(self, num_aircraft: int = 1, seed: Optional[int] = None, model: str = "dryden",
+                 block_size: int = 16384, overlap: int = 256, step: float = 0.01):
+        self.num_aircraft = num_aircraft
+        self.rows = 3 * num_aircraft
+        self.block_size = block_size
+        self.overlap = overlap
+        self.step = step                 # Δξ entre amostras (ξ = x / L)
+        self.capacity = 2 * block_size
+        self.rng = np.random.default_rng(seed)
+
+        # Filtros de forma no domínio da frequência, normalizados para variância 1
+        n = block_size + overlap
+        kappa = 2.0 * math.pi * np.fft.rfftfreq(n, d=step)
+        shapes = []
+        for spectrum in (longitudinal_spectrum, transverse_spectrum):
+            psd = spectrum(kappa, model)
+            two_sided_mean = (psd[0] + 2.0 * psd[1:-1].sum() + psd[-1]) / n
+            shapes.append(np.sqrt(psd / two_sided_mean))
+        axis_shape = np.array([shapes[0], shapes[1], shapes[1]])
+        self._shape = np.tile(axis_shape, (num_aircraft, 1))   # (linhas, n/2+1)
+
+        # Pesos de transição seno/cosseno preservam a variância entre blocos independentes
+        t = (np.arange(overlap) + 0.5) / overlap
+        self._fade_in = np.sin(0.5 * math.pi * t)
+        self._fade_out = np.cos(0.5 * math.pi * t)
+
+        self.buffer = np.zeros((self.rows, self.capacity))
+        self.written = np.zeros(self.rows, dtype=np.int64)   # amostras absolutas já escritas
+        self.position = np.zeros(self.rows)                   # cursor de leitura absoluto [amostras]
+        self._row_index = np.arange(self.rows)
+        self.blocks_generated = 0
+
+        # Primeira transição parte de um bloco já existente (sem rampa a partir de zero)
+        self._tail = self._generate(self._row_index)[:, block_size:]
+        self._refill(self._row_index)
+        self._refill(self._row_index)
+
+    def _generate(self, rows) -> np.ndarray:
+        noise = self.rng.standard_normal((len(rows), self.block_size + self.overlap))
+        spectrum = np.fft.rfft(noise, axis=1) * self._shape[rows]
+        return np.fft.irfft(spectrum, n=self.block_size + self.overlap, axis=1)
+
+    def _refill(self, rows):
+        block = self._generate(rows)
+        block[:, :self.overlap] = (self._tail[rows] * self._fade_out
+                                   + block[:, :self.overlap] * self._fade_in)
+        self._tail[rows] = block[:, self.block_size:]
+
+        # Escrita sempre alinhada em metades do ring buffer
+        start = (self.written[rows] // self.block_size) % 2 * self.block_size
+        columns = start[:, None] + np.arange(self.block_size)
+        self.buffer[np.asarray(rows)[:, None], columns] = block[:, :self.block_size]
+        self.written[rows] += self.block_size
+        self.blocks_generated += len(rows)
+
+    def advance(self, distance) -> np.ndarray:
+        """
+        Avança os cursores de `distance` (em ξ, escalar ou por linha) e
+        retorna a amostra interpolada de cada linha
+        """
+        distance = np.asarray(distance, dtype=float)
+        if not np.all(np.isfinite(distance)):
+            raise ValueError(f"Distância de turbulência não finita: {distance}")
+        self.position += distance / self.step
+
+        # Salto maior que o ring: os blocos pulados nunca seriam lidos, então o cursor
+        # é rebaseado dentro de um bloco novo em vez de gerar cada um deles
+        jumped = np.flatnonzero(self.position >= self.written)
+        if jumped.size:
+            self.position[jumped] %= self.block_size
+            self.written[jumped] = 0
+            self._refill(jumped)
+
+        # Mantém sempre pelo menos um bloco à frente de cada cursor
+        while True:
+            needs = np.flatnonzero(self.written - self.position < self.block_size)
+            if needs.size == 0:
+                break
+            self._refill(needs)
+
+        base = np.floor(self.position).astype(np.int64)
+        frac = self.position - base
+        first = self.buffer[self._row_index, base % self.capacity]
+        second = self.buffer[self._row_index, (base + 1) % self.capacity]
+        return first + frac * (second - first)
+
+
+def batch_turbulence(stream: TurbulenceStream, altitude, airspeed, dt: float,
+                     wind_20ft: float, high_altitude_sigma: Optional[float] = None) -> np.ndarray:
+    """
+    Turbulência no corpo (N, 3) [m/s] para N aeronaves de uma só vez,
+    cada uma lendo suas próprias linhas do stream
+    """
+    sigma, length = turbulence_scales(altitude, wind_20ft, high_altitude_sigma)
+    distance = np.asarray(airspeed, dtype=float) * dt / length        # (3, N)
+    samples = stream.advance(distance.T.ravel()).reshape(-1, 3)
+    return samples * sigma.T
+
+
+# ============================================================== vento e rajadas
+
+class WindLayers:
+    """Vento médio por camadas de altitude, tabelado em grade uniforme"""
+
+    def __init__(self, layers: Sequence[dict]):
+        layers = sorted(layers, key=lambda layer: layer['altitude'])
+        if len(layers) == 1:
+            layers = [layers[0], dict(layers[0], altitude=layers[0]['altitude'] + 1.0)]
+
+        altitude = [float(layer['altitude']) for layer in layers]
+        # Direção meteorológica: de onde o vento vem
+        direction = [math.radians(float(layer['direction_deg'])) for layer in layers]
+        speed = [float(layer['speed']) for layer in layers]
+        north = [-s * math.cos(d) for s, d in zip(speed, direction)]
+        east = [-s * math.sin(d) for s, d in zip(speed, direction)]
+
+        grid, north_grid = resample_uniform(altitude, north, 128)
+        _, east_grid = resample_uniform(altitude, east, 128)
+        self.north_table = LookupTable([grid], north_grid)
+        self.east_table = LookupTable([grid], east_grid)
+
+    def wind_ned(self, altitude: float) -> Tuple[float, float, float]:
+        return self.north_table.scalar(altitude), self.east_table.scalar(altitude), 0.0
+
+
+@dataclass
+class DiscreteGust:
+    """Rajada 1-cosseno: sobe até `amplitude` em `length` metros e volta a zero em 2·length"""
+    amplitude: Tuple[float, float, float]   # NED [m/s]
+    length: float                           # m
+    traveled: float = 0.0
+
+    def advance(self, distance: float) -> Optional[Tuple[float, float, float]]:
+        self.traveled += distance
+        if self.traveled >= 2.0 * self.length:
+            return None
+        shape = 0.5 * (1.0 - math.cos(math.pi * self.traveled / self.length))
+        return tuple(a * shape for a in self.amplitude)
+
+
+# ============================================================== módulo
+
+class Weather:
+    def __init__(self, message_bus, config, dt: float = 1 / 60.0):
+        self.bus = message_bus
+        self.dt = dt
+
+        weather = config['weather']
+        self.temperature_offset = float(weather.get('temperature_offset', 0.0))
+        self.wind_layers = WindLayers(weather.get('wind_layers', [{'altitude': 0.0, 'speed': 0.0,
+                                                                    'direction_deg': 0.0}]))
+
+        turbulence = weather.get('turbulence', {})
+        self.wind_20ft = float(turbulence.get('wind_20ft', 0.0))
+        self.high_altitude_sigma = turbulence.get('high_altitude_sigma')
+        self.stream = TurbulenceStream(seed=weather.get('seed'),
+                                       model=turbulence.get('model', 'dryden'))
+
+        self.gusts = []
+        self.airspeed = 0.0
+        self.altitude = 0.0
+        self.environment = EnvironmentData()
+
+        # ASSINA estes tópicos:
+        self.bus.subscribe('aircraft_state', self.handle_aircraft_state)
+
+    def handle_aircraft_state(self, state):
+        self.airspeed = abs(state.velocity_body.x)
+        self.altitude = -state.position_ned.z
+
+    def set_turbulence(self, wind_20ft: float, high_altitude_sigma: Optional[float] = None):
+        self.wind_20ft = wind_20ft
+        self.high_altitude_sigma = high_altitude_sigma
+
+    def trigger_gust(self, amplitude_ned: Sequence[float], length: float):
+        self.gusts.append(DiscreteGust(tuple(float(a) for a in amplitude_ned), float(length)))
+
+    def update(self):
+        # LÓGICA: atmosfera, vento médio, rajadas e turbulência
+        temperature, pressure, density, speed_of_sound = isa_atmosphere(self.altitude, self.temperature_offset)
+        distance = self.airspeed * self.dt
+
+        wind_n, wind_e, wind_d = self.wind_layers.wind_ned(self.altitude)
+        active = []
+        for gust in self.gusts:
+            value = gust.advance(distance)
+            if value is not None:
+                wind_n, wind_e, wind_d = wind_n + value[0], wind_e + value[1], wind_d + value[2]
+                active.append(gust)
+        self.gusts = active
+
+        sigma, length = turbulence_scales(self.altitude, self.wind_20ft, self.high_altitude_sigma)
+        turbulence = sigma * self.stream.advance(distance / length)
+
+        self.environment = EnvironmentData(
+            temperature=float(temperature),
+            pressure=float(pressure),
+            density=float(density),
+            speed_of_sound=float(speed_of_sound),
+            wind_ned=(wind_n, wind_e, wind_d),
+            turbulence_body=tuple(turbulence.tolist()),
+        )
+
+        # PUBLICA neste tópico:
+        self.bus.publish('environment', self.environment)
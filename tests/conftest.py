@@ -0,0 +1,48 @@
+"""
+Fixtures compartilhadas: configurações do repositório e estados de aeronave
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import yaml
+
+from core.data_types import AircraftState, Vector3
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
+VEHICLE_CONFIG = os.path.join(CONFIG_DIR, "vehicle_configs", "cessna_172.yaml")
+SIMULATION_CONFIG = os.path.join(CONFIG_DIR, "simulation_config.yaml")
+
+
+def _load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+@pytest.fixture
+def vehicle_config():
+    """cessna_172.yaml recém-lido (o teste pode alterar à vontade)"""
+    return _load(VEHICLE_CONFIG)
+
+
+@pytest.fixture
+def simulation_config():
+    """simulation_config.yaml recém-lido"""
+    return _load(SIMULATION_CONFIG)
+
+
+@pytest.fixture
+def make_state():
+    """Fábrica de AircraftState: voo nivelado a 50 m/s e 1000 m sobre a origem, massa de um C172"""
+    def make(altitude=1000.0, north=0.0, east=0.0, velocity=(50.0, 0.0, 0.0), rates=(0.0, 0.0, 0.0),
+             euler=(0.0, 0.0, 0.0)):
+        return AircraftState(position_ned=Vector3(north, east, -altitude),
+                             velocity_body=Vector3(*velocity),
+                             rates_body=Vector3(*rates),
+                             euler=Vector3(*euler),
+                             mass=977.0,
+                             inertia_principal=(1600.0, 1800.0, 2900.0))
+    return make
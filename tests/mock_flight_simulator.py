@@ -83,15 +83,20 @@ class MockDataRecorder:
         self.dados.append(f"ESTADO: x={estado.x:.1f}, altura={-estado.z:.1f}m")
 
     def update(self):
-        """Chamado a cada frame"""
-        # A cada 60 frames (1 segundo), mostra estatísticas
-        if len(self.dados) % 60 == 0 and len(self.dados) > 0:
-            print(f"📊 DataRecorder: Registrados {len(self.dados)} eventos")
-
-            # Mostra os últimos 3 eventos como exemplo
-            ultimos = self.dados[-3:] if len(self.dados) >= 3 else self.dados
-            for evento in ultimos:
-                print(f"   📝 {evento}")
+        """Chamado a cada frame - nada a fazer: o relatório é um evento agendado"""
+
+    def schedule_events(self, scheduler):
+        # A cada segundo simulado, mostra estatísticas
+        scheduler.every(1.0, self.relatorio, name='data_recorder')
+
+    def relatorio(self):
+        if not self.dados:
+            return
+        print(f"📊 DataRecorder: Registrados {len(self.dados)} eventos")
+
+        # Mostra os últimos 3 eventos como exemplo
+        for evento in self.dados[-3:]:
+            print(f"   📝 {evento}")
 
 
 # ==================== PROGRAMA PRINCIPAL ====================
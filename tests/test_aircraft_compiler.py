@@ -0,0 +1,117 @@
+"""
+Testes do modelo de aeronave compilado: kernel contra a forma direta, vários tipos e validação
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy
+import math
+
+import numpy as np
+import pytest
+
+from core.data_types import AircraftState, ControlInputs, Vector3
+from core.module_registry import load_yaml
+from models.aircraft_compiler import INPUTS, AircraftModelSet, compile_aircraft
+from models.cessna_172 import CONFIG, Cessna172
+
+
+def reference_forces_moments(config, row):
+    """Forma de livro-texto, sem nada pré-computado"""
+    aero = config['aerodynamics']
+    S, c, b = aero['reference']['area'], aero['reference']['chord'], aero['reference']['span']
+    u, v, w, p, q, r, de, da, dr, rho, thrust = row
+    V = math.sqrt(u * u + v * v + w * w)
+    alpha, beta = math.atan2(w, u), math.asin(v / V)
+    terms = {'zero': 1.0, 'alpha': alpha, 'alpha2': alpha ** 2, 'beta': beta,
+             'p': p * b / (2 * V), 'q': q * c / (2 * V), 'r': r * b / (2 * V),
+             'elevator': de * aero['controls']['elevator'], 'aileron': da * aero['controls']['aileron'],
+             'rudder': dr * aero['controls']['rudder']}
+    C = {name: sum(d * terms[t] for t, d in (table or {}).items()) for name, table in aero['coefficients'].items()}
+    qbar = 0.5 * rho * V * V
+    D, Y, L = qbar * S * C['CD'], qbar * S * C['CY'], qbar * S * C['CL']
+    force = np.array([-D * math.cos(alpha) + L * math.sin(alpha), Y, -D * math.sin(alpha) - L * math.cos(alpha)])
+    moment = qbar * S * np.array([b * C['Cl'], c * C['Cm'], b * C['Cn']])
+    moment += np.cross(aero['reference']['point'], force)
+    propeller = config['propulsion']['propeller']
+    axis = np.asarray(propeller['thrust_axis'], dtype=float)
+    axis /= np.linalg.norm(axis)
+    moment += np.cross(propeller['position'], thrust * axis)
+    return np.concatenate([force + thrust * axis, moment])
+
+
+def random_inputs(rng, n):
+    inputs = np.empty((n, len(INPUTS)))
+    inputs[:, 0] = rng.uniform(30.0, 70.0, n)
+    inputs[:, 1:3] = rng.uniform(-5.0, 5.0, (n, 2))
+    inputs[:, 3:6] = rng.uniform(-0.5, 0.5, (n, 3))
+    inputs[:, 6:9] = rng.uniform(-1.0, 1.0, (n, 3))
+    inputs[:, 9] = rng.uniform(0.9, 1.225, n)
+    inputs[:, 10] = rng.uniform(0.0, 2500.0, n)
+    return inputs
+
+
+def test_kernel_matches_textbook_for_mixed_types():
+    """Dois tipos no mesmo lote; cada linha bate com a forma direta do seu próprio YAML"""
+    cessna = load_yaml(CONFIG)
+    bigger = copy.deepcopy(cessna)
+    bigger['name'] = 'Cessna 182'
+    bigger['aerodynamics']['reference'].update(area=16.2 * 1.08, span=11.0)
+    bigger['aerodynamics']['coefficients']['Cm']['alpha'] = -1.1
+    bigger['propulsion']['propeller'].update(position=[1.9, 0.0, 0.1], thrust_axis=[1.0, 0.0, 0.05])
+
+    models = AircraftModelSet([compile_aircraft(cessna), compile_aircraft(bigger)], capacity=4)
+    rng = np.random.default_rng(7)
+    inputs = random_inputs(rng, 16)
+    types = rng.integers(0, 2, 16)
+    out = np.zeros((16, 6))
+    assert models.forces_moments(types, inputs, out) is out        # cresce os buffers internos quando preciso
+
+    for row, kind in zip(range(16), types):
+        expected = reference_forces_moments((cessna, bigger)[kind], inputs[row])
+        np.testing.assert_allclose(out[row], expected, rtol=1e-10, atol=1e-8)
+    assert models.index('Cessna 182') == 1
+
+
+def test_cessna_trim_point_is_plausible():
+    """Voo nivelado a 55 m/s: sustentação ≈ peso com α de poucos graus; estabilidade estática em arfagem"""
+    aircraft = Cessna172()
+    state = AircraftState(Vector3(0, 0, -1000), Vector3(55.0, 0.0, 0.0), Vector3(0, 0, 0), Vector3(0, 0, 0),
+                          1000.0, (1.0, 1.0, 1.0))
+    aircraft.update_state(state)
+    controls = ControlInputs(throttle=0.6, elevator=0.0, aileron=0.0, rudder=0.0)
+
+    def at_alpha(alpha):
+        air = 55.0 * np.array([math.cos(alpha), 0.0, math.sin(alpha)])
+        return aircraft.calculate_forces_moments(controls, thrust=1500.0, air_velocity_body=air)
+
+    lift_at = lambda alpha: -at_alpha(alpha).forces.z
+    assert lift_at(0.0) < 1000.0 * 9.81 < lift_at(math.radians(4.0))
+    assert at_alpha(math.radians(6.0)).moments.y < at_alpha(0.0).moments.y        # Cm_α < 0
+    last = at_alpha(math.radians(6.0))
+    assert aircraft.forces_moments[0, 0] == pytest.approx(last.forces.x)           # buffer do último frame
+
+    # Puxar o manche levanta o nariz; aileron + rola à direita; leme + guina à direita
+    pull = aircraft.calculate_forces_moments(ControlInputs(0.6, 1.0, 0.0, 0.0)).moments
+    roll_yaw = aircraft.calculate_forces_moments(ControlInputs(0.6, 0.0, 1.0, 1.0)).moments
+    level = aircraft.calculate_forces_moments(controls).moments
+    assert pull.y > level.y and roll_yaw.x > level.x and roll_yaw.z > level.z
+
+
+def test_compiler_rejects_bad_configs():
+    config = load_yaml(CONFIG)
+    broken = copy.deepcopy(config)
+    broken['aerodynamics']['reference']['area'] = 0.0
+    with pytest.raises(ValueError, match="area"):
+        compile_aircraft(broken)
+    broken = copy.deepcopy(config)
+    broken['aerodynamics']['coefficients']['CL']['alfa'] = 5.0
+    with pytest.raises(ValueError, match="alfa"):
+        compile_aircraft(broken)
+    broken = copy.deepcopy(config)
+    del broken['aerodynamics']['coefficients']['Cn']
+    with pytest.raises(ValueError, match="Cn"):
+        compile_aircraft(broken)
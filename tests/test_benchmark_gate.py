@@ -0,0 +1,49 @@
+"""
+Testes do portão de regressão de benchmarks
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+
+from utils.benchmark_gate import compare_runs, format_comparisons, load_benchmarks, write_baseline
+
+
+def stats(mean, stddev, rounds=200):
+    return {'mean': mean, 'stddev': stddev, 'rounds': rounds}
+
+
+def test_gate_needs_threshold_and_significance(tmp_path):
+    """Só reprova piora acima do limiar E significativa; benchmark ausente também reprova"""
+    baseline = {'bus': stats(10e-6, 0.5e-6), 'noisy': stats(10e-6, 20e-6, rounds=5),
+                'small': stats(10e-6, 0.1e-6), 'gone': stats(1e-3, 1e-5)}
+    current = {'bus': stats(12e-6, 0.5e-6), 'noisy': stats(14e-6, 20e-6, rounds=5),
+               'small': stats(10.5e-6, 0.1e-6)}
+    results = {r.name: r for r in compare_runs(baseline, current, threshold=0.10)}
+    assert results['bus'].regression                  # +20 %, t ≫ 3
+    assert not results['noisy'].regression            # +40 % mas dentro do ruído
+    assert not results['small'].regression            # significativo mas só +5 %
+    assert results['gone'].regression and results['gone'].current_mean is None
+    assert format_comparisons(list(results.values())).startswith("REGRESSÃO bus")
+
+    path = tmp_path / "run.json"
+    path.write_text(json.dumps({'benchmarks': [{'name': 'bus', 'fullname': 'tests/x.py::bus',
+                                                'stats': baseline['bus']}]}))
+    assert load_benchmarks(str(path)) == {'tests/x.py::bus': baseline['bus']}
+
+
+def test_committed_baseline_has_summary_stats_only(tmp_path):
+    """Baseline regravado sem as amostras brutas; o versionado cobre os benchmarks da suíte"""
+    run = tmp_path / "run.json"
+    run.write_text(json.dumps({'benchmarks': [{'name': 'bus', 'fullname': 'tests/x.py::bus',
+                                                'stats': dict(stats(1e-6, 1e-7), data=[1e-6] * 1000)}]}))
+    write_baseline(str(run), str(tmp_path / "baseline.json"))
+    assert load_benchmarks(str(tmp_path / "baseline.json")) == {'tests/x.py::bus': stats(1e-6, 1e-7)}
+
+    committed = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "benchmark_baseline.json")
+    names = load_benchmarks(committed)
+    assert 'tests/test_benchmarks.py::test_bench_headless_frame' in names
+    assert all('data' not in entry for entry in names.values())
@@ -0,0 +1,193 @@
+"""
+Benchmarks dos caminhos quentes (pytest-benchmark) e verificação de crescimento de memória
+
+Baseline versionado em tests/golden/benchmark_baseline.json. O atual foi medido numa
+máquina de desenvolvimento com numba instalado; antes de ligar o portão no CI, regravar
+lá com make bench-baseline (tempos absolutos não se comparam entre máquinas):
+    make bench             # mede e reprova regressão contra o baseline (utils/benchmark_gate.py)
+    make bench-baseline    # regrava o baseline depois de uma mudança de desempenho intencional
+
+Os testes de memória não dependem do plugin e rodam na suíte normal
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import contextlib
+import importlib.util
+import threading
+import tracemalloc
+
+import pytest
+
+from core.data_types import ControlInputs
+from core.message_bus import MessageBus
+from core.simulation_orchestrator import SimulationOrchestrator
+from dynamics import kernels
+from dynamics.flight_dynamics import SimpleFlightDynamics
+from utils import jit
+from utils.validation_tools import build_headless_modules
+from xplane_local_test.xplane_sim.physics import SimState, step_dynamics
+
+needs_benchmark = pytest.mark.skipif(importlib.util.find_spec("pytest_benchmark") is None,
+                                     reason="pytest-benchmark não instalado (requirements-dev.txt)")
+
+CONTROLS = ControlInputs(throttle=0.6, elevator=0.0, aileron=0.0, rudder=0.0)
+
+
+@pytest.fixture
+def quiet():
+    """Saída residual descartada: o custo medido não deve depender do terminal (o log já sai da thread do frame)"""
+    with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+        yield
+
+
+@pytest.fixture
+def chain(quiet, vehicle_config):
+    """Cadeia headless de main.py (controles → propulsão → massa → clima → dinâmica), autopiloto ligado"""
+    bus = MessageBus()
+    modules, controls, _ = build_headless_modules(bus, vehicle_config, 1 / 60.0)
+    controls.engage_altitude_hold(1000.0)
+    controls.engage_heading_hold(0.0)
+
+    def frame():
+        bus.publish('pilot_controls', CONTROLS)
+        for module in modules:
+            module.update()
+    return frame
+
+
+@pytest.fixture
+def xpc_server():
+    """Servidor mock do X-Plane (xplane_local_test) numa thread, porta livre"""
+    from xplane_local_test.xplane_sim.server import XPCSim, handle_client
+
+    loop = asyncio.new_event_loop()
+    sim = XPCSim()
+    server = loop.run_until_complete(asyncio.start_server(lambda r, w: handle_client(r, w, sim), '127.0.0.1', 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield server.sockets[0].getsockname()[:2]
+    loop.call_soon_threadsafe(server.close)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=1.0)
+
+
+# ============================================================== benchmarks
+
+@needs_benchmark
+def test_bench_message_bus_publish(benchmark, quiet):
+    bus = MessageBus()
+    for _ in range(3):
+        bus.subscribe('aircraft_state', lambda message: None)
+    benchmark(bus.publish, 'aircraft_state', CONTROLS)
+
+
+@needs_benchmark
+def test_bench_flight_dynamics_update(benchmark, quiet):
+    dynamics = SimpleFlightDynamics(MessageBus())
+    dynamics.set_frozen(True)        # estado fixo: todas as rodadas medem o mesmo ponto de voo
+    benchmark(dynamics.update)
+
+
+@needs_benchmark
+@pytest.mark.parametrize('backend', ['python', pytest.param('numba', marks=pytest.mark.skipif(
+    not jit.numba_available(), reason="numba não instalado"))])
+def test_bench_dynamics_kernels(benchmark, backend):
+    """Frame de kernels da dinâmica (forças, derivadas 6-DOF, estágios) por backend, já aquecido"""
+    x = jit.buffer([0.0, 0.0, -1000.0, 50.0, 0.0, 1.0, 0.01, 0.02, 0.0, 0.05, 0.04, 0.3], backend)
+    inputs = jit.buffer([0.02, 0.01, 0.0, 1200.0, 1.1] + [0.0] * 12, backend)
+    params = jit.buffer([16.2, 0.3, 5.0, 0.03, 0.5, 5000.0, 3000.0, 1000.0], backend)
+    mass = jit.buffer([1000.0, 0.0, 0.0, 0.0, 2000.0, 0.0, 0.0, 0.0, 3000.0, 0.0, 0.0, 0.0, 4000.0,
+                       1 / 2000.0, 0.0, 0.0, 0.0, 1 / 3000.0, 0.0, 0.0, 0.0, 1 / 4000.0], backend)
+    fm, xdot = jit.buffer(kernels.FM_SIZE, backend), jit.buffer(kernels.STATE_SIZE, backend)
+    forces_moments, dynamics, kinematics, stage = (jit.compiled(k, backend) for k in (
+        kernels.forces_moments, kernels.rigid_body_dynamics, kernels.rigid_body_kinematics, kernels.euler_stage))
+
+    def frame():
+        forces_moments(x, inputs, params, fm)
+        dynamics(x, fm, mass, 9.81, xdot)
+        kinematics(x, xdot)
+        stage(x, xdot, 0, 0, 0.0)     # sem avançar: todas as rodadas medem o mesmo estado
+    frame()
+    benchmark(frame)
+
+
+@needs_benchmark
+@pytest.mark.parametrize('backend', ['python', pytest.param('numba', marks=pytest.mark.skipif(
+    not jit.numba_available(), reason="numba não instalado"))])
+def test_bench_propulsion_solve(benchmark, monkeypatch, backend, vehicle_config):
+    """Equilíbrio motor/hélice de um frame com partida a quente, por backend"""
+    from systems.propulsion import PropulsionModel
+    monkeypatch.setattr(jit, '_BACKEND', backend)
+    model = PropulsionModel(vehicle_config['propulsion'])
+    rpm = model.solve(0.7, 50.0, 1000.0, 2000.0).rpm
+    benchmark(model.solve, 0.7, 50.0, 1000.0, rpm)
+
+
+@needs_benchmark
+def test_bench_orchestrator_frame_overhead(benchmark, quiet):
+    class Idle:
+        def update(self):
+            pass
+
+    orchestrator = SimulationOrchestrator(MessageBus(), frame_rate=60)
+    for _ in range(20):
+        orchestrator.register_module(Idle())
+    benchmark(orchestrator._update_all_modules)
+
+
+@needs_benchmark
+def test_bench_step_dynamics(benchmark):
+    state = SimState()
+    benchmark(step_dynamics, state, [0.1, -0.05, 0.0, 0.7], 0.02)
+
+
+@needs_benchmark
+def test_bench_headless_frame(benchmark, chain):
+    benchmark(chain)
+
+
+@needs_benchmark
+def test_bench_xplane_mock_round_trip(benchmark, xpc_server):
+    from xplane_local_test import xplaneconnect
+
+    xplaneconnect.openUDP(*xpc_server)
+    try:
+        benchmark(xplaneconnect.getPOSI)
+    finally:
+        xplaneconnect.closeUDP()
+
+
+# ============================================================== memória
+
+def memory_growth(step, warmup: int, frames: int) -> int:
+    """Bytes alocados e não liberados entre o fim do aquecimento e o fim da execução longa"""
+    tracemalloc.start()
+    try:
+        for _ in range(warmup):
+            step()
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(frames):
+            step()
+        return tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def test_headless_chain_memory_is_flat(chain):
+    """1 min de voo simulado a 60 Hz sem acumular memória (históricos, caches, listas)"""
+    assert memory_growth(chain, warmup=300, frames=3600) < 64 * 1024
+
+
+def test_orchestrator_frame_memory_is_flat(quiet):
+    """Frame do orquestrador com módulos que só publicam e recebem"""
+    orchestrator = SimulationOrchestrator(MessageBus(), frame_rate=60)
+    dynamics = SimpleFlightDynamics(orchestrator.message_bus)
+    dynamics.set_frozen(True)
+    orchestrator.register_module(dynamics)
+    orchestrator.message_bus.subscribe('aircraft_state', lambda state: None)
+    assert memory_growth(orchestrator._update_all_modules, warmup=300, frames=10000) < 64 * 1024
@@ -0,0 +1,80 @@
+"""
+Testes das transformações WGS-84 e corpo ↔ NED
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from utils.coordinate_transforms import (body_to_ned, dcm_to_euler, ecef_to_lla, euler_to_dcm,
+                                         geodetic_rates, lla_to_ecef, local_tangent_plane,
+                                         ned_to_body)
+
+
+def test_lla_ecef_roundtrip_vectorized():
+    """Ida e volta LLA → ECEF → LLA em lote, com precisão sub-milimétrica"""
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(-89.9, 89.9, 10000)
+    lon = rng.uniform(-180.0, 180.0, 10000)
+    alt = rng.uniform(-500.0, 40000.0, 10000)
+
+    lat2, lon2, alt2 = ecef_to_lla(*lla_to_ecef(lat, lon, alt))
+    assert np.abs(lat2 - lat).max() < 1e-9
+    assert np.abs(lon2 - lon).max() < 1e-9
+    assert np.abs(alt2 - alt).max() < 1e-6
+
+
+def test_known_ecef_points():
+    """Equador/meridiano de Greenwich e polo norte"""
+    x, y, z = lla_to_ecef(0.0, 0.0, 0.0)
+    assert abs(x - 6378137.0) < 1e-6 and abs(y) < 1e-6 and abs(z) < 1e-6
+
+    lat, _, alt = ecef_to_lla(*lla_to_ecef(90.0, 0.0, 100.0))
+    assert abs(lat - 90.0) < 1e-9
+    assert abs(alt - 100.0) < 1e-6
+
+
+def test_tangent_plane_roundtrip_and_cache():
+    """NED ↔ LLA no plano tangente e reaproveitamento da origem"""
+    plane = local_tangent_plane(40.0, -75.0, 0.0)
+    assert local_tangent_plane(40.0, -75.0, 0.0) is plane
+
+    north = np.array([0.0, 1000.0, -2500.0])
+    east = np.array([0.0, -300.0, 4000.0])
+    down = np.array([-1000.0, -50.0, 10.0])
+    n2, e2, d2 = plane.lla_to_ned(*plane.ned_to_lla(north, east, down))
+    assert np.allclose(n2, north, atol=1e-6)
+    assert np.allclose(e2, east, atol=1e-6)
+    assert np.allclose(d2, down, atol=1e-6)
+
+    # 1 km para o norte ≈ 1/111 grau de latitude
+    lat, lon, _ = plane.ned_to_lla(1000.0, 0.0, 0.0)
+    assert abs((lat - 40.0) * 111000.0 - 1000.0) < 10.0
+    assert abs(lon + 75.0) < 1e-9
+
+
+def test_geodetic_rates_consistent_with_tangent_plane():
+    """Velocidade norte integrada 1 s bate com o deslocamento do plano tangente"""
+    plane = local_tangent_plane(-23.4322, -46.4695, 30.0)
+    lat_dot, lon_dot, _ = geodetic_rates(-23.4322, 30.0, 50.0, 20.0, 0.0)
+    lat, lon, _ = plane.ned_to_lla(50.0, 20.0, 0.0)
+    assert abs(lat - (-23.4322 + lat_dot)) < 1e-8
+    assert abs(lon - (-46.4695 + lon_dot)) < 1e-8
+
+
+def test_body_ned_rotation():
+    """Rotações corpo ↔ NED são inversas e o DCM recupera os ângulos de Euler"""
+    phi = np.array([0.1, -0.5, 1.0])
+    theta = np.array([0.3, 0.2, -1.2])
+    psi = np.array([1.0, -2.5, 3.0])
+    vectors = np.array([[1.0, 0.0, 0.0], [0.0, 2.0, -1.0], [3.0, -1.0, 0.5]])
+
+    back = ned_to_body(body_to_ned(vectors, phi, theta, psi), phi, theta, psi)
+    assert np.allclose(back, vectors)
+
+    dcm = euler_to_dcm(phi, theta, psi)
+    assert dcm.shape == (3, 3, 3)
+    assert np.allclose(np.stack(dcm_to_euler(dcm), axis=-1), np.stack([phi, theta, psi], axis=-1))
@@ -0,0 +1,95 @@
+"""
+Testes da agenda de eventos: ordem do heap, periódicos sem deriva e orquestrador em tempo simulado
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import contextlib
+import time
+
+import pytest
+
+from core.event_scheduler import EventScheduler
+from core.message_bus import MessageBus
+from core.simulation_orchestrator import SimulationOrchestrator
+
+
+def test_due_events_fire_in_order_without_drift():
+    scheduler = EventScheduler()
+    fired = []
+    scheduler.every(1.0, lambda: fired.append(('tick', scheduler.time)))
+    scheduler.at(2.5, lambda: fired.append(('failure', scheduler.time)), priority=1)
+    scheduler.at(2.5, lambda: fired.append(('weather', scheduler.time)), priority=0)
+    cancelled = scheduler.at(3.0, lambda: fired.append(('cancelled', scheduler.time)))
+    cancelled.cancel()
+
+    # Tempo acumulado por frames de 1/60 s: nenhum tick perdido nem duplicado
+    dt, t = 1 / 60.0, 0.0
+    for _ in range(60 * 1000):
+        t += dt
+        scheduler.run_due(t)
+    ticks = [when for name, when in fired if name == 'tick']
+    assert len(ticks) == 1000 and all(abs(when - (k + 1)) < dt for k, when in enumerate(ticks))
+    assert [name for name, _ in fired[2:4]] == ['weather', 'failure']    # mesmo instante: prioridade
+    assert 'cancelled' not in {name for name, _ in fired}
+    assert len(scheduler) == 1 and scheduler.next_time() == pytest.approx(1001.0)
+
+    # Frame longo (ex.: pausa): periódico dispara uma vez e pula os perdidos; catch_up recupera todos
+    skipping, catching = [], []
+    scheduler = EventScheduler()
+    scheduler.every(0.1, lambda: skipping.append(1))
+    scheduler.every(0.1, lambda: catching.append(1), catch_up=True)
+    scheduler.run_due(1.05)
+    scheduler.run_due(1.1)
+    assert len(skipping) == 2 and len(catching) == 11
+
+    # Erro num callback não derruba a agenda; um periódico pode se cancelar
+    scheduler = EventScheduler()
+    counts = []
+    event = scheduler.every(1.0, lambda: counts.append(1) or (len(counts) == 3 and event.cancel()))
+    scheduler.after(0.5, lambda: 1 / 0, name='falha')
+    with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+        for step in range(1, 11):
+            scheduler.run_due(float(step))
+    assert len(counts) == 3 and scheduler.errors == 1 and not event.pending
+    with pytest.raises(ValueError):
+        scheduler.every(0.0, lambda: None)
+
+
+def test_orchestrator_events_follow_simulated_time():
+    """Mesmo roteiro de eventos em tempo real e acelerado; módulos agendam ao registrar"""
+
+    class Logger:
+        def __init__(self):
+            self.updates = 0
+            self.logged = []
+
+        def update(self):
+            self.updates += 1
+
+        def schedule_events(self, scheduler):
+            scheduler.every(0.25, lambda: self.logged.append(round(scheduler.time, 6)))
+
+    runs = []
+    for real_time in (True, False):
+        with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+            orchestrator = SimulationOrchestrator(MessageBus(), frame_rate=60, real_time=real_time)
+            logger = Logger()
+            orchestrator.register_module(logger)
+            events = []
+            orchestrator.at(0.5, lambda: events.append(('failure', orchestrator.simulation_time)))
+            orchestrator.after(0.1, lambda: events.append(('weather', orchestrator.simulation_time)))
+            start = time.perf_counter()
+            orchestrator.run(duration=1.0)
+            elapsed = time.perf_counter() - start
+        runs.append((logger.logged, [name for name, _ in events]))
+        assert logger.updates == 60 and logger.logged == [0.25, 0.5, 0.75, 1.0]
+        assert events[0][1] == pytest.approx(0.1, abs=1 / 60.0) and events[1][1] == pytest.approx(0.5)
+        if real_time:
+            assert elapsed > 0.9
+        else:
+            assert elapsed < 0.5
+    assert runs[0] == runs[1]
@@ -0,0 +1,137 @@
+"""
+Testes dos blocos de controle, do diagrama compilado e do piloto automático
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import math
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from core.message_bus import MessageBus
+from core.data_types import AircraftState, ControlInputs, Vector3
+from systems.flight_controls import FlightControls, build_control_diagram
+from utils.control_blocks import (BlockDiagram, FirstOrderLag, Gain, LeadLag, RateLimiter, Saturation, Sum,
+                                  TransferFunction)
+
+
+def test_compile_orders_blocks_and_detects_loops():
+    """Ordem de inserção não importa; laço algébrico é rejeitado"""
+    diagram = BlockDiagram([Saturation('y', 'b', -1.0, 1.0), Gain('b', 'a', 2.0), Sum('a', ['x', 'k'])])
+    diagram.compile(0.01)
+    assert [b.output for b in diagram.order] == ['a', 'b', 'y']
+    assert sorted(diagram.external_inputs) == ['k', 'x']
+
+    diagram.set('x', 0.2)
+    diagram.set('k', 0.1)
+    diagram.evaluate()
+    assert abs(diagram.signal('y')[0] - 0.6) < 1e-12
+
+    with pytest.raises(ValueError):
+        BlockDiagram([Gain('a', 'b', 1.0), Gain('b', 'a', 1.0)]).compile(0.01)
+
+
+def test_dynamic_blocks_batched():
+    """Limitador de taxa, atraso de 1ª ordem e lead-lag em lote de aeronaves"""
+    dt = 0.01
+    diagram = BlockDiagram([RateLimiter('limited', 'x', rate=1.0),
+                            FirstOrderLag('lagged', 'x', tau=0.5),
+                            LeadLag('leadlag', 'x', lead=0.2, lag=0.5, gain=2.0)], batch_size=3)
+    diagram.compile(dt)
+    diagram.evaluate()              # primeiro passo parte do regime com x = 0
+    diagram.set('x', np.array([1.0, -1.0, 0.5]))
+    for _ in range(50):
+        diagram.evaluate()
+    assert np.allclose(diagram.signal('limited'), [0.5, -0.5, 0.5])
+    assert np.allclose(diagram.signal('lagged'), np.array([1.0, -1.0, 0.5]) * (1.0 - math.exp(-1.0)), atol=5e-3)
+    for _ in range(1000):
+        diagram.evaluate()
+    assert np.allclose(diagram.signal('leadlag'), [2.0, -2.0, 1.0], atol=1e-6)
+
+
+def test_transfer_function_matches_difference_equation():
+    """H(z) = 0.1 / (1 - 0.9 z⁻¹) reproduz y[k] = 0.9 y[k-1] + 0.1 x[k]"""
+    diagram = BlockDiagram([TransferFunction('y', 'x', [0.1], [1.0, -0.9])]).compile(0.01)
+    diagram.evaluate()
+    rng = np.random.default_rng(0)
+    expected = 0.0
+    for x in rng.normal(size=100):
+        diagram.set('x', x)
+        diagram.evaluate()
+        expected = 0.9 * expected + 0.1 * x
+        assert abs(diagram.signal('y')[0] - expected) < 1e-12
+
+
+def test_evaluate_does_not_allocate():
+    """Depois de compilado, evaluate() não aloca arrays"""
+    diagram = build_control_diagram({}, 1 / 60.0, batch_size=256)
+    diagram.evaluate()
+    tracemalloc.start()
+    for _ in range(100):
+        diagram.evaluate()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 2048
+
+
+def test_autopilot_holds_altitude_and_heading_batched():
+    """Autopiloto leva um lote de aeronaves (planta linear simples) a alvos diferentes"""
+    n, dt, speed = 6, 1 / 60.0, 55.0
+    diagram = build_control_diagram({}, dt, batch_size=n)
+    signal = diagram.signal
+    signal('altitude_target')[:] = 1000.0 + np.linspace(-150.0, 150.0, n)
+    signal('heading_target')[:] = np.linspace(-2.5, 2.5, n)
+    signal('altitude_hold')[:] = 1.0
+    signal('heading_hold')[:] = 1.0
+
+    h = np.full(n, 1000.0)
+    theta, q, phi, p, r, psi = (np.zeros(n) for _ in range(6))
+    for _ in range(int(150 / dt)):
+        signal('altitude')[:] = h
+        signal('climb_rate')[:] = speed * np.sin(theta)
+        signal('pitch')[:] = theta
+        signal('pitch_rate')[:] = q
+        signal('roll')[:] = phi
+        signal('roll_rate')[:] = p
+        signal('yaw_rate')[:] = r
+        signal('heading')[:] = psi
+        diagram.evaluate()
+        q += (4.0 * signal('elevator_position') - 2.0 * q) * dt
+        theta += q * dt
+        h += speed * np.sin(theta) * dt
+        p += (6.0 * signal('aileron_position') - 3.0 * p) * dt
+        phi += p * dt
+        r += (3.0 * signal('rudder_position') - 2.0 * r) * dt
+        psi += r * np.cos(phi) * dt
+
+    assert np.abs(h - signal('altitude_target')).max() < 1.0
+    heading_error = (psi - signal('heading_target') + math.pi) % (2.0 * math.pi) - math.pi
+    assert np.abs(heading_error).max() < math.radians(1.0)
+
+
+def test_module_applies_trim_and_actuator_rate():
+    """FlightControls publica 'controls' com trim e limite de taxa dos atuadores"""
+    bus = MessageBus()
+    controls = FlightControls(bus, {})
+    received = []
+    bus.subscribe('controls', received.append)
+
+    bus.publish('aircraft_state', AircraftState(Vector3(0, 0, -1000), Vector3(55, 0, 0), Vector3(0, 0, 0),
+                                                Vector3(0, 0, 0), 977.0, (1600.0, 1800.0, 2900.0)))
+    controls.update()
+    controls.set_trim('elevator', 0.1)
+    bus.publish('pilot_controls', ControlInputs(throttle=[0.8], elevator=1.0, aileron=0.0, rudder=0.0))
+    for _ in range(6):
+        controls.update()
+
+    assert received[-1].throttle < 0.8
+    assert 0.0 < received[-1].elevator < 6 * 2.0 / 60.0
+    for _ in range(120):
+        controls.update()
+    assert abs(received[-1].elevator - 1.0) < 1e-3     # 1.0 + trim saturado no batente
+    assert abs(received[-1].throttle - 0.8) < 1e-3
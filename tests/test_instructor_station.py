@@ -0,0 +1,132 @@
+"""
+Testes da estação do instrutor: codificação delta, comandos na fronteira do frame e cliente lento
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import socket
+import threading
+import time
+
+import numpy as np
+
+from core.message_bus import MessageBus
+from core.data_types import AircraftState, Vector3
+from interfaces.instructor_station import (InstructorClient, InstructorStation, StateDecoder, StateFrame,
+                                           encode_frame, quantize)
+
+
+def make_state(t):
+    return AircraftState(Vector3(55.0 * t, 3.0, -1000.0 - 0.5 * t), Vector3(55.0, 0.0, 0.5),
+                         Vector3(0.0, 0.01 * np.sin(t), 0.0), Vector3(0.0, 0.05, 1.2), 1000.0,
+                         (1.0, 1.0, 1.0))
+
+
+def make_station():
+    bus = MessageBus()
+    station = InstructorStation(bus, {'instructor_station': {'port': 0}}, dt=1 / 60.0)
+    return bus, station
+
+
+def test_delta_frames_round_trip_and_are_small():
+    """Deltas só carregam os campos alterados e reconstroem exatamente o estado quantizado"""
+    decoder = StateDecoder()
+    previous = None
+    sizes = []
+    for frame in range(1, 200):
+        values = quantize(make_state(frame / 60.0))
+        data = encode_frame(StateFrame(frame, frame / 60.0, values), previous)
+        decoder.decode(data[4:])
+        assert np.array_equal(decoder.values, values) and decoder.frame == frame
+        previous = values
+        sizes.append(len(data))
+
+    assert sizes[0] > 100                       # quadro-chave: 12 inteiros de 64 bits
+    assert max(sizes[1:]) <= 4 + 14 + 2 + 3 * 2
+    state = decoder.state()
+    assert abs(state['north'] - 55.0 * 199 / 60.0) <= 0.005 and abs(state['psi'] - 1.2) < 1e-4
+
+    # Salto grande (reposicionamento) continua cabendo em diferenças de 4 bytes
+    jump = previous.copy()
+    jump[0] += 10_000_000
+    decoder.decode(encode_frame(StateFrame(200, 0.0, jump), previous)[4:])
+    assert np.array_equal(decoder.values, jump)
+
+
+def test_commands_applied_at_frame_boundary():
+    """Comandos chegam pela rede mas só executam dentro de update(), na thread da simulação"""
+    bus, station = make_station()
+    calls = []
+    station.register_command('freeze', lambda frozen: calls.append((frozen, threading.get_ident(), station.frame)))
+    station.start()
+    client = InstructorClient(station.address)
+    try:
+        client.set_rate(60.0)
+        request = client.command('freeze', frozen=True)
+        bad = client.command('explode')
+        time.sleep(0.05)
+        assert calls == []                      # nada aplicado fora do frame
+
+        for frame in range(5):
+            bus.publish('aircraft_state', make_state(frame / 60.0))
+            station.update()
+        reply = client.wait_reply(request)
+        assert reply['ok'] and reply['frame'] == 0
+        assert calls == [(True, threading.get_ident(), 0)]
+        assert not client.wait_reply(bad)['ok']
+
+        kind, state = client.receive()
+        while kind != 'state':
+            kind, state = client.receive()
+        assert abs(state['down'] + 1000.0) < 0.1
+    finally:
+        client.close()
+        station.stop()
+    assert station.stats()['commands_applied'] == 1 and station.stats()['commands_rejected'] == 1
+
+
+def test_slow_client_does_not_stall_frames_or_other_clients():
+    """Cliente que nunca lê: o frame não espera e o cliente rápido segue na taxa pedida"""
+    bus, station = make_station()
+    station.start()
+    slow = socket.socket()
+    slow.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024)     # antes do connect: janela pequena
+    slow.connect(station.address)
+    slow.sendall(b'{"rate_hz": 1000}\n')
+    fast = InstructorClient(station.address)
+    fast.set_rate(20.0)
+    received = []
+
+    def reader():
+        try:
+            while True:
+                if fast.receive()[0] == 'state':
+                    received.append(time.perf_counter())
+        except OSError:
+            pass
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    worst = 0.0
+    try:
+        start = time.perf_counter()
+        frame = 0
+        while time.perf_counter() - start < 1.5:
+            frame += 1
+            bus.publish('aircraft_state', make_state(frame / 60.0))
+            before = time.perf_counter()
+            station.update()
+            worst = max(worst, time.perf_counter() - before)
+            time.sleep(0.001)
+        stats = station.stats()
+    finally:
+        fast.close()
+        slow.close()
+        station.stop()
+
+    assert worst < 0.005
+    assert 20 <= len(received) <= 32            # ~20 Hz durante 1,5 s
+    assert stats['frames_skipped'] > 0
@@ -0,0 +1,91 @@
+"""
+Testes dos instrumentos: banco de filtros de atraso e sistema pitot-estático
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import math
+
+import numpy as np
+
+from core.message_bus import MessageBus
+from systems.instruments import Instruments, LagFilterBank
+
+def test_filter_bank_matches_analytic_step():
+    """Resposta ao degrau: 1ª ordem = 1 - exp(-t/τ), 2ª ordem converge sem erro"""
+    dt = 0.01
+    bank = LagFilterBank([{'tau': 0.5}, {'wn': 4.0, 'zeta': 0.7}], dt, num_rows=3)
+    bank.inputs[:] = 1.0
+    for _ in range(50):
+        outputs = bank.step()
+    assert np.allclose(outputs[:, 0], 1.0 - math.exp(-0.5 / 0.5), atol=1e-9)
+
+    for _ in range(1000):
+        outputs = bank.step()
+    assert np.allclose(outputs, 1.0, atol=1e-6)
+
+
+def test_reused_buffer_and_sea_level_calibration(vehicle_config, make_state):
+    """Mesmo objeto publicado a cada frame; ASI ≈ TAS ao nível do mar sem vento"""
+    bus = MessageBus()
+    instruments = Instruments(bus, vehicle_config)
+    received = []
+    bus.subscribe('instrument_data', received.append)
+
+    bus.publish('aircraft_state', make_state(altitude=0.0))
+    for _ in range(3):
+        instruments.update()
+    assert received[0] is received[1] is received[2]
+    assert abs(received[0].airspeed_indicator - 50.0) < 0.5
+    assert abs(received[0].altimeter) < 15.0
+
+
+def test_altitude_lowers_indicated_airspeed(vehicle_config, make_state):
+    """Em altitude a densidade cai e a velocidade indicada fica abaixo da verdadeira"""
+    instruments = Instruments(MessageBus(), vehicle_config)
+    instruments.handle_aircraft_state(make_state(altitude=3000.0))
+    data = instruments.calculate_instruments()
+    assert 40.0 < data.airspeed_indicator < 46.0
+    assert abs(data.altimeter - 3000.0) < 30.0
+
+
+def test_static_blockage_freezes_altimeter_and_vsi(vehicle_config, make_state):
+    """Tomada estática obstruída: altímetro preso e VSI volta a zero na subida"""
+    instruments = Instruments(MessageBus(), vehicle_config)
+    instruments.handle_aircraft_state(make_state(altitude=1000.0))
+    frozen = instruments.calculate_instruments().altimeter
+    instruments.set_static_blocked(True)
+    for k in range(600):
+        instruments.handle_aircraft_state(make_state(altitude=1000.0 + 5.0 * k / 60.0))
+        data = instruments.calculate_instruments()
+    assert abs(data.altimeter - frozen) < 1e-6
+    assert abs(data.vertical_speed) < 1e-3
+
+
+def test_turn_coordinator_heading_wrap_and_slip(vehicle_config, make_state):
+    """Curva padrão marca 1.0, proa cruza 0/2π sem girar o ponteiro e a bola vai para a asa baixa"""
+    instruments = Instruments(MessageBus(), vehicle_config)
+    psi = 2.0 * math.pi - 0.05
+    for _ in range(600):
+        instruments.handle_aircraft_state(make_state(rates=(0.0, 0.0, math.radians(3.0)), euler=(0.0, 0.0, psi % (2.0 * math.pi))))
+        data = instruments.calculate_instruments()
+        psi += math.radians(3.0) / 60.0
+    assert abs(data.turn_coordinator - 1.0) < 1e-3
+    assert abs(data.heading_indicator - (psi - 2.0 * math.pi)) < 0.01
+
+    slipping = Instruments(MessageBus(), vehicle_config)
+    for _ in range(300):
+        slipping.handle_aircraft_state(make_state(euler=(0.2, 0.0, 0.0)))
+        data = slipping.calculate_instruments()
+    assert abs(data.slip_ball - 0.2) < 1e-3
+
+
+def test_diverged_state_keeps_instruments_real(vehicle_config, make_state):
+    """Velocidade absurda (simulação divergindo) leva a estática abaixo de zero sem quebrar o frame"""
+    instruments = Instruments(MessageBus(), vehicle_config)
+    instruments.handle_aircraft_state(make_state(altitude=0.0, velocity=(1e4, 0.0, 0.0)))
+    data = instruments.calculate_instruments()
+    assert isinstance(data.altimeter, float) and math.isfinite(data.altimeter)
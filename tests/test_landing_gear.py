@@ -0,0 +1,71 @@
+"""
+Testes do trem de pouso e do índice espacial do solo
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import math
+
+import numpy as np
+
+from core.message_bus import MessageBus
+from systems.landing_gear import GroundModel, LandingGear, Runway, RunwayIndex, TerrainGrid
+
+def test_runway_index_matches_brute_force():
+    """Consulta pelo hash espacial = varredura linear em todas as pistas"""
+    rng = np.random.default_rng(7)
+    runways = [Runway(name=f"R{i}", threshold=tuple(rng.uniform(-20000, 20000, 2)),
+                      heading=rng.uniform(0, 2 * math.pi), length=rng.uniform(800, 3000),
+                      width=45.0, elevation=float(i))
+               for i in range(40)]
+    index = RunwayIndex(runways, cell_size=500.0)
+
+    for north, east in rng.uniform(-22000, 22000, (2000, 2)):
+        expected = [r for r in runways if r.contains(north, east)]
+        found = index.query(north, east)
+        if expected:
+            assert found in expected
+        else:
+            assert found is None
+
+
+def test_terrain_grid_bilinear():
+    """Grade de terreno interpola elevação entre os nós"""
+    terrain = TerrainGrid(np.array([0.0, 100.0]), np.array([0.0, 100.0]),
+                          np.array([[0.0, 10.0], [20.0, 30.0]]))
+    assert abs(terrain.elevation(50.0, 50.0) - 15.0) < 1e-12
+    assert terrain.max_elevation == 30.0
+
+
+def test_airborne_early_out(vehicle_config, make_state):
+    """Longe do solo não há forças nem subpassos"""
+    gear = LandingGear(MessageBus(), vehicle_config)
+    forces, state = gear.calculate(make_state(altitude=500.0, east=100.0, velocity=(0.0, 0.0, 0.0)))
+    assert forces.forces.z == 0.0
+    assert not state.weight_on_wheels
+    assert gear.substeps == 0
+
+
+def test_static_load_supports_weight(vehicle_config, simulation_config, make_state):
+    """Em repouso com leve compressão, a normal total se aproxima do peso"""
+    ground = GroundModel.from_config(simulation_config["ground"])
+    gear = LandingGear(MessageBus(), vehicle_config, ground)
+    gear.mass = 977.0
+
+    forces, state = gear.calculate(make_state(altitude=1.24, east=100.0, velocity=(0.0, 0.0, 0.0)))
+    assert state.weight_on_wheels
+    assert state.runway == "09"
+    assert gear.substeps >= 1
+    assert 0.5 * 977.0 * 9.81 < -forces.forces.z < 1.5 * 977.0 * 9.81
+
+
+def test_tire_friction_opposes_motion(vehicle_config, make_state):
+    """Atrito de rolamento com freio se opõe ao deslocamento"""
+    gear = LandingGear(MessageBus(), vehicle_config)
+    gear.mass = 977.0
+    gear.brake = 1.0
+    forces, _ = gear.calculate(make_state(altitude=1.24, east=100.0, velocity=(10.0, 0.0, 0.0)))
+    assert forces.forces.x < -1000.0
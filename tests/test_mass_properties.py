@@ -0,0 +1,88 @@
+"""
+Testes das propriedades de massa incrementais
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from core.message_bus import MessageBus
+from dynamics.mass_properties import MassProperties, PointMass
+from systems.propulsion import PropulsionState
+
+def brute_force(components):
+    """Referência: CG e inércia recalculados do zero"""
+    mass = sum(c.mass for c in components)
+    cg = sum(c.mass * np.asarray(c.position) for c in components) / mass
+    inertia = np.zeros((3, 3))
+    for c in components:
+        r = np.asarray(c.position) - cg
+        inertia += c.mass * (np.dot(r, r) * np.eye(3) - np.outer(r, r))
+        if c.inertia is not None:
+            ixx, iyy, izz, ixy, ixz, iyz = c.inertia
+            inertia += np.array([[ixx, -ixy, -ixz], [-ixy, iyy, -iyz], [-ixz, -iyz, izz]])
+    return mass, cg, inertia
+
+
+def test_incremental_matches_brute_force(vehicle_config):
+    """Alterações incrementais devem bater com o cálculo completo"""
+    props = MassProperties(MessageBus(), vehicle_config)
+    props.set_mass("copilot", 75.0)
+    props.set_mass("baggage", 30.0)
+    props.burn_fuel(20.0)
+    props.add_component(PointMass("cargo", 15.0, (-1.2, 0.2, 0.4)))
+
+    mass, cg, inertia = brute_force(list(props.components.values()))
+    data = props.properties
+    assert abs(data.mass - mass) < 1e-9
+    assert np.allclose(data.cg, cg, atol=1e-12)
+    assert np.allclose(data.inertia, inertia, atol=1e-9)
+    assert np.allclose(data.inertia_inv @ data.inertia, np.eye(3), atol=1e-12)
+
+
+def test_capacity_limits_mass(vehicle_config):
+    """Massa do componente é saturada na capacidade"""
+    props = MassProperties(MessageBus(), vehicle_config)
+    props.set_mass("left_tank", 500.0)
+    assert props.components["left_tank"].mass == props.components["left_tank"].capacity
+
+
+def test_publishes_only_on_change(vehicle_config):
+    """Evento 'mass_properties' sai no primeiro frame e depois só quando algo muda"""
+    bus = MessageBus()
+    props = MassProperties(bus, vehicle_config)
+    events = []
+    bus.subscribe("mass_properties", events.append)
+
+    for _ in range(10):
+        props.update()
+    assert len(events) == 1
+
+    props.set_mass("pilot", 95.0)
+    props.update()
+    props.update()
+    assert len(events) == 2
+    assert events[-1].version > events[0].version
+
+
+def test_fuel_burn_is_batched_by_threshold(vehicle_config):
+    """Queima de combustível acumula e só recalcula acima do limiar"""
+    bus = MessageBus()
+    props = MassProperties(bus, vehicle_config, dt=1.0)
+    props.update()
+    fuel_before = props.fuel_remaining()
+    events = []
+    bus.subscribe("mass_properties", events.append)
+
+    bus.publish("propulsion_state", PropulsionState(fuel_flow=0.1))
+    for _ in range(4):
+        props.update()
+    assert events == []
+    assert props.fuel_remaining() == fuel_before
+
+    props.update()
+    assert len(events) == 1
+    assert abs(props.fuel_remaining() - (fuel_before - 0.5)) < 1e-9
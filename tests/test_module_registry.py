@@ -0,0 +1,118 @@
+"""
+Testes do registro de módulos: import sob demanda, cache da configuração e validação
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import subprocess
+
+import pytest
+import yaml
+
+from core import module_registry
+from core.module_registry import ModuleRegistry, load_simulation_config, load_yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIMULATION_CONFIG = os.path.join(ROOT, "config", "simulation_config.yaml")
+VEHICLE_CONFIG = os.path.join(ROOT, "config", "vehicle_configs", "cessna_172.yaml")
+
+# Partida isolada: sys.modules limpo, saída do barramento descartada
+STARTUP = """
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from core.message_bus import MessageBus
+from core.module_registry import ModuleRegistry, load_yaml
+from core.simulation_orchestrator import SimulationOrchestrator
+config = load_yaml({simulation!r})
+if {enabled!r} is not None:
+    config['modules']['enabled'] = {enabled!r}
+with contextlib.redirect_stdout(io.StringIO()):
+    registry = ModuleRegistry(config, load_yaml({vehicle!r}))
+    orchestrator = SimulationOrchestrator(MessageBus(), frame_rate=registry.frame_rate)
+    registry.build(orchestrator.message_bus, dt=orchestrator.frame_period)
+    registry.register_all(orchestrator)
+    orchestrator._update_all_modules()
+print(json.dumps({{'elapsed': time.perf_counter() - start, 'frame_rate': orchestrator.frame_rate,
+                  'modules': [t.name for t in registry.timings], 'loaded': sorted(sys.modules)}}))
+"""
+
+
+def startup(enabled=None) -> dict:
+    code = STARTUP.format(root=ROOT, simulation=SIMULATION_CONFIG, vehicle=VEHICLE_CONFIG, enabled=enabled)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60, cwd=ROOT)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_only_enabled_modules_are_imported():
+    """Módulos fora de modules.enabled nem chegam a ser importados"""
+    info = startup(['flight_dynamics', 'weather'])
+    assert info['modules'] == ['weather', 'flight_dynamics']         # ordem do registro, não da lista
+    for absent in ('systems.navigation', 'interfaces.xplane_interface', 'visual_systems.motion_cueing',
+                   'interfaces.instructor_station'):
+        assert absent not in info['loaded']
+
+
+
+def test_xplane_interface_defers_traffic_and_scenario_imports():
+    """Importar a interface não carrega o tráfego nem o cenário mock (só no 1º lote / 1º frame mock)"""
+    code = (f"import json, sys; sys.path.insert(0, {ROOT!r}); import interfaces.xplane_interface; "
+            "print(json.dumps(sorted(sys.modules)))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60, cwd=ROOT)
+    assert result.returncode == 0, result.stderr
+    loaded = json.loads(result.stdout.splitlines()[-1])
+    assert 'systems.traffic' not in loaded and 'interfaces.scripted_inputs' not in loaded
+
+def test_default_startup_to_first_frame_is_fast():
+    """Configuração padrão: taxa do YAML e primeiro frame em poucas centenas de ms"""
+    info = startup()
+    assert info['frame_rate'] == 60
+    assert 'flight_dynamics' in info['modules'] and 'instructor_station' not in info['modules']
+    assert info['elapsed'] < 0.5
+
+
+def test_config_cache_and_validation(tmp_path, monkeypatch):
+    """Parse uma vez por versão do arquivo; cópia por chamada; erros de estrutura na partida"""
+    path = tmp_path / "simulation.yaml"
+    config = {'simulation': {'frame_rate': 50}, 'modules': {'enabled': ['flight_dynamics']}}
+    path.write_text(yaml.safe_dump(config))
+
+    parses = []
+    real_load = yaml.safe_load
+    monkeypatch.setattr(module_registry.yaml, 'safe_load', lambda f: parses.append(1) or real_load(f))
+    first = load_simulation_config(str(path))
+    first['simulation']['frame_rate'] = 1
+    assert load_simulation_config(str(path))['simulation']['frame_rate'] == 50 and len(parses) == 1
+
+    config['simulation']['frame_rate'] = 30
+    path.write_text(yaml.safe_dump(config))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_yaml(str(path))['simulation']['frame_rate'] == 30 and len(parses) == 2
+
+    with pytest.raises(ValueError, match="frame_rate"):
+        ModuleRegistry({'simulation': {'frame_rate': 0}, 'modules': {'enabled': []}}, {})
+    with pytest.raises(ValueError, match="desconhecido"):
+        ModuleRegistry({'simulation': {'frame_rate': 60}, 'modules': {'enabled': ['warp_drive']}}, {})
+
+    # Módulo opcional listado mas com a própria seção desligada
+    registry = ModuleRegistry({'simulation': {'frame_rate': 60},
+                               'modules': {'enabled': ['sound_system', 'flight_dynamics']}},
+                              {'sound': {'enabled': False}})
+    assert [spec.name for spec in registry.specs] == ['flight_dynamics']
+
+
+def test_modules_share_configured_frame_period():
+    """frame_rate do YAML chega a todos os módulos, inclusive a dinâmica"""
+    from core.message_bus import MessageBus
+    config = load_yaml(SIMULATION_CONFIG)
+    config['simulation']['frame_rate'] = 30
+    config['modules']['enabled'] = ['flight_controls', 'mass_properties', 'weather', 'flight_dynamics']
+    registry = ModuleRegistry(config, load_yaml(VEHICLE_CONFIG))
+    modules = registry.build(MessageBus())
+    assert {name: module.dt for name, module in modules.items()} == dict.fromkeys(modules, pytest.approx(1 / 30))
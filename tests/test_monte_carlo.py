@@ -0,0 +1,86 @@
+"""
+Testes da varredura Monte Carlo: estatística online, caminhos de parâmetros e retomada
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+
+import numpy as np
+import pytest
+
+from utils.monte_carlo import RunningStats, StreamingHistogram, SweepSpec, run_sweep, set_path
+
+
+def test_online_statistics_match_numpy_in_fixed_memory():
+    """Welford estável com offset grande; quantis do histograma dentro de ~1 bin após expansões"""
+    rng = np.random.default_rng(0)
+    values = 1e9 + rng.normal(0.0, 1.0, 20000)
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.mean == pytest.approx(values.mean(), abs=1e-5)
+    assert stats.variance == pytest.approx(values.var(ddof=1), rel=1e-6)
+
+    # Primeiras amostras num intervalo estreito: a faixa precisa dobrar várias vezes
+    values = np.concatenate([rng.uniform(-0.1, 0.1, 64), rng.normal(3.0, 2.0, 50000)])
+    histogram = StreamingHistogram(bins=64)
+    for value in values:
+        histogram.add(value)
+    assert histogram.counts.size == 64 and histogram.counts.sum() == values.size
+    for q in (0.05, 0.5, 0.95):
+        assert histogram.quantile(q) == pytest.approx(np.quantile(values, q), abs=histogram.width)
+
+    exact = StreamingHistogram(bins=64)
+    for value in values[:10]:
+        exact.add(value)
+    assert exact.quantile(0.5) == pytest.approx(np.median(values[:10]))
+
+
+def test_parameter_paths_and_deterministic_runs():
+    config = {'mass_properties': {'components': [{'name': 'pilot', 'mass': 80.0}, {'name': 'fuel', 'mass': 60.0}]}}
+    set_path(config, 'mass_properties.components[fuel].mass', 30.0)
+    set_path(config, 'mass_properties.components[0].mass', 95.0)
+    assert [c['mass'] for c in config['mass_properties']['components']] == [95.0, 30.0]
+    with pytest.raises(ValueError, match="massa"):
+        set_path(config, 'mass_properties.components[fuel].massa', 1.0)
+
+    spec = SweepSpec.from_dict({'maneuver': 'trim_cruise', 'samples': 3, 'seed': 4,
+                                'grid': {'vehicle.mass_properties.components[pilot].mass': [70.0, 90.0]},
+                                'distributions': {'initial.airspeed': {'uniform': [48.0, 52.0]}}})
+    assert spec.total_runs == 6
+    assert [spec.parameters(i)['vehicle.mass_properties.components[pilot].mass'] for i in range(6)] == \
+        [70.0, 70.0, 70.0, 90.0, 90.0, 90.0]
+    assert spec.parameters(4) == spec.parameters(4) and spec.parameters(4) != spec.parameters(5)
+    with pytest.raises(ValueError, match="Manobra"):
+        SweepSpec.from_dict({'maneuver': 'barrel_roll'})
+    with pytest.raises(ValueError, match="distribuição"):
+        SweepSpec.from_dict({'maneuver': 'trim_cruise', 'distributions': {'initial.airspeed': {'gauss': [50, 1]}}})
+
+
+def test_sweep_resumes_after_interruption(tmp_path):
+    """Metade das rodadas, linha final truncada (processo morto), retomada só refaz o que falta"""
+    spec = SweepSpec.from_dict({'maneuver': 'trim_cruise', 'duration': 4.0, 'samples': 2, 'seed': 1,
+                                'grid': {'vehicle.mass_properties.components[baggage].mass': [0.0, 20.0]},
+                                'distributions': {'initial.airspeed': {'normal': [50.0, 0.5]}}})
+    results = tmp_path / "sweep.jsonl"
+    first = run_sweep(spec, str(results), processes=2, limit=2)
+    assert first.runs == 2 and first.failures == 0
+    with open(results, "a", encoding="utf-8") as f:
+        f.write('{"run": 3, "param')
+
+    seen = []
+    final = run_sweep(spec, str(results), processes=2, progress=lambda summary, _: seen.append(summary['run']))
+    assert sorted(seen) == sorted(set(range(4)) - {json.loads(line)['run']
+                                                   for line in results.read_text().splitlines()[1:3]})
+    lines = results.read_text().splitlines()
+    assert len(lines) == 5 and sorted(json.loads(line)['run'] for line in lines[1:]) == [0, 1, 2, 3]
+    assert final.runs == 4 and final.stats['airspeed'].count == 4
+    assert 45.0 < final.stats['final_airspeed'].mean < 55.0
+
+    other = SweepSpec.from_dict({'maneuver': 'trim_cruise', 'duration': 5.0})
+    with pytest.raises(ValueError, match="outra especificação"):
+        run_sweep(other, str(results))
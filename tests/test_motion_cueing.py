@@ -0,0 +1,119 @@
+"""
+Testes do motion cueing: washout clássico e ótimo, cinemática inversa e espaço de trabalho
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import math
+import time
+
+import numpy as np
+
+from core.message_bus import MessageBus
+from core.data_types import AircraftState, Vector3
+from utils.numerical_integration import solve_continuous_riccati
+from visual_systems.motion_cueing import MotionCueing, StewartPlatform, build_washout, rotation_matrices
+
+DT = 1 / 500.0
+
+
+def run(washout, inputs, seconds):
+    return np.array([washout.step(inputs).copy() for _ in range(int(seconds / DT))])
+
+
+def test_classical_washout_returns_to_neutral_and_tilts():
+    """Aceleração sustentada: posição volta ao centro e o pitch assume asin(f·k/g) com taxa limitada"""
+    washout = build_washout({'washout': 'classical'}, DT)
+    poses = run(washout, np.array([2.0, 0.0, -9.81, 0.0, 0.0, 0.0]), 30.0)
+
+    assert poses[:500, 0].max() > 0.05                  # onset: plataforma acelera para frente
+    assert abs(poses[-1, 0]) < 1e-3
+    assert abs(poses[-1, 4] - math.asin(0.5 * 2.0 / 9.81)) < 1e-3
+    assert np.abs(np.diff(poses[:, 4])).max() <= math.radians(3.0) * DT + 1e-12
+
+    washout.reset()
+    poses = run(washout, np.array([0.0, 0.0, -9.81, 0.2, 0.0, 0.0]), 20.0)
+    assert poses[:, 3].max() > 0.02 and abs(poses[-1, 3]) < 1e-3
+
+
+def test_optimal_washout_cues_with_correct_sign_and_stays_bounded():
+    """Washout ótimo: onset e inclinação no sentido certo, excursões pequenas"""
+    washout = build_washout({'washout': 'optimal'}, DT)
+    poses = run(washout, np.array([2.0, 0.0, -9.81, 0.0, 0.0, 0.0]), 40.0)
+    assert poses[250, 0] > 0.0 and poses[-1, 4] > 0.8 * math.asin(1.0 / 9.81)
+    assert np.abs(poses[:, 0]).max() < 0.3
+
+    washout.reset()
+    poses = run(washout, np.array([0.0, 0.0, -12.81, 0.0, 0.0, 0.0]), 40.0)
+    assert poses[500, 2] < 0.0 and np.abs(poses[:, 2]).max() < 0.2
+
+
+def test_riccati_solution_satisfies_equation():
+    """P da Riccati com termo cruzado zera o resíduo e estabiliza a malha"""
+    rng = np.random.default_rng(3)
+    a = rng.normal(size=(4, 4))
+    b = rng.normal(size=(4, 2))
+    q, r, s = np.eye(4), np.diag([1.0, 2.0]), 0.1 * rng.normal(size=(4, 2))
+    p = solve_continuous_riccati(a, b, q, r, s)
+    gain = np.linalg.solve(r, b.T @ p + s.T)
+    residual = a.T @ p + p @ a - (p @ b + s) @ gain + q
+    assert np.abs(residual).max() < 1e-8
+    assert np.linalg.eigvals(a - b @ gain).real.max() < 0.0
+
+
+def test_inverse_kinematics_matches_per_leg_loop(simulation_config):
+    """Cinemática inversa vetorizada = laço perna a perna; neutra = curso médio"""
+    platform = StewartPlatform.from_config(simulation_config['motion_cueing']['platform'])
+    assert np.allclose(platform.inverse_kinematics(np.zeros(6)), 1.4)
+
+    rng = np.random.default_rng(7)
+    poses = rng.uniform(-1.0, 1.0, size=(20, 6)) * [0.1, 0.1, 0.1, 0.1, 0.1, 0.1]
+    batched = platform.leg_lengths(poses)
+    for pose, lengths in zip(poses, batched):
+        rotation = rotation_matrices(pose[None, 3:])[0]
+        top = np.array([0.0, 0.0, -platform.neutral_height]) + pose[:3]
+        expected = [np.linalg.norm(top + rotation @ platform.platform_joints[i] - platform.base_joints[i])
+                    for i in range(6)]
+        assert np.allclose(lengths, expected)
+        assert np.allclose(platform.inverse_kinematics(pose), expected)
+
+
+def test_workspace_limit_scales_pose_back():
+    """Pose fora do espaço de trabalho é recuada na mesma direção até caber"""
+    platform = StewartPlatform.from_config({})
+    inside = np.array([0.05, 0.0, 0.0, 0.0, 0.05, 0.0])
+    outside = np.array([0.25, 0.0, -0.15, 0.0, 0.3, 0.3])     # excursões ok, perna 6 longa demais
+    assert list(platform.check([inside, outside])) == [True, False]
+
+    limited, scale = platform.limit(outside)
+    assert 0.0 < scale < 1.0
+    assert np.allclose(limited, scale * outside)
+    assert platform.check(limited)[0]
+    lengths = platform.leg_lengths(limited)[0]
+    assert np.all((lengths >= platform.min_leg) & (lengths <= platform.max_leg))
+
+
+def test_module_runs_platform_rate_substeps_within_budget(simulation_config):
+    """MotionCueing roda ~500 Hz de amostras por frame e cada amostra cabe em 2 ms"""
+    bus = MessageBus()
+    motion = MotionCueing(bus, simulation_config, dt=1 / 30.0)
+    received = []
+    bus.subscribe('motion_commands', received.append)
+    assert motion.substeps == 17 and motion.rate_hz >= 500.0
+
+    state = AircraftState(Vector3(0, 0, -1000), Vector3(55, 0, 0), Vector3(0, 0, 0),
+                          Vector3(0, 0, 0), 1000.0, (1.0, 1.0, 1.0))
+    start = time.perf_counter()
+    for frame in range(30):
+        # Arremetida: acelera 2 m/s² para frente
+        state.velocity_body = Vector3(55 + 2.0 * frame / 30.0, 0, 0)
+        bus.publish('aircraft_state', state)
+        motion.update()
+    per_sample = (time.perf_counter() - start) / motion.ticks
+
+    assert motion.ticks == 30 * 17 and received[-1].tick == motion.ticks
+    assert received[-1].pose[4] > 0.0 and len(received[-1].leg_lengths) == 6
+    assert per_sample < 1 / 500.0
@@ -0,0 +1,110 @@
+"""
+Testes da navegação: índice KD-tree, cache em disco e geometria dos receptores
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import math
+import tempfile
+
+import numpy as np
+
+from core.message_bus import MessageBus
+from systems.navigation import KDTree, Navigation, NavaidDatabase
+
+NAVAIDS = """ident,type,lat,lon,elevation,frequency,range,magvar,course,glideslope,dme
+AAA,VOR,40.0,-75.0,0,113.2,100,0,0,0,1
+FAR,VOR,45.0,-75.0,0,113.2,100,0,0,0,1
+IXX,ILS,40.0,-74.9,0,109.3,18,0,270,3.0,1
+NB,NDB,40.3,-75.0,0,338,100,0,0,0,0
+"""
+
+
+def write_database(tmp_path):
+    path = tmp_path / "navaids.csv"
+    path.write_text(NAVAIDS, encoding="utf-8")
+    return str(path)
+
+
+def make_navigation(tmp_path, receivers):
+    config = {'aircraft': {'initial_conditions': {'latitude': 40.0, 'longitude': -75.0}},
+              'navigation': {'database': write_database(tmp_path), 'receivers': receivers}}
+    return Navigation(MessageBus(), config)
+
+
+def test_kdtree_matches_brute_force():
+    """Consultas de raio e vizinho mais próximo = varredura linear"""
+    rng = np.random.default_rng(3)
+    points = rng.uniform(-1e6, 1e6, (3000, 3))
+    tree = KDTree(points)
+    for center in rng.uniform(-1.1e6, 1.1e6, (50, 3)):
+        distances = np.linalg.norm(points - center, axis=1)
+        assert set(tree.query_radius(center, 2e5).tolist()) == set(np.flatnonzero(distances <= 2e5).tolist())
+        index, distance = tree.nearest(center)
+        assert index == int(np.argmin(distances))
+        assert abs(distance - distances.min()) < 1e-6
+
+
+def test_database_cache_roundtrip(tmp_path):
+    """Segunda carga vem do cache com o mesmo conteúdo; arquivo alterado invalida o cache"""
+    path = write_database(tmp_path)
+    first = NavaidDatabase.load(path)
+    second = NavaidDatabase.load(path)
+    assert not first.loaded_from_cache and second.loaded_from_cache
+    assert list(second.ident) == list(first.ident)
+    assert np.array_equal(second.tree.order, first.tree.order)
+    assert list(second.stations_on(113200)) == [0, 1]
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("NEW,NDB,41.0,-75.0,0,400,25,0,0,0,0\n")
+    third = NavaidDatabase.load(path)
+    assert not third.loaded_from_cache and len(third) == 5
+
+
+def test_read_only_directory_loads_without_cache(tmp_path, monkeypatch):
+    """Sem permissão de escrita o índice é reconstruído em memória e a carga não falha"""
+    path = write_database(tmp_path)
+    os.chmod(tmp_path, 0o555)
+    try:
+        if os.access(tmp_path, os.W_OK):            # root ignora o modo do diretório
+            def read_only(*args, **kwargs):
+                raise PermissionError(13, "Permission denied", str(tmp_path))
+            monkeypatch.setattr(tempfile, "mkstemp", read_only)
+        database = NavaidDatabase.load(path)
+        assert not database.loaded_from_cache and len(database) == 4
+        assert sorted(os.listdir(tmp_path)) == ["navaids.csv"]
+    finally:
+        os.chmod(tmp_path, 0o755)
+
+
+def test_tuning_picks_nearest_station_and_vor_geometry(tmp_path, make_state):
+    """Frequência compartilhada sintoniza a estação mais próxima; radial e TO/FROM corretos"""
+    navigation = make_navigation(tmp_path, {'nav1': {'kind': 'nav', 'frequency': 113.2, 'course_deg': 0.0}})
+    data = navigation.calculate(make_state(north=-20000.0, east=1000.0))
+    nav1 = data.receivers['nav1']
+    assert nav1.ident == "AAA" and nav1.valid
+    assert abs(math.degrees(nav1.radial) - 177.1) < 0.5
+    assert nav1.to_from == 1
+    assert nav1.deviation < 0.0      # a leste do curso 360 TO: curso à esquerda
+    assert abs(nav1.distance - math.hypot(20000.0, 1000.0)) < 200.0
+
+
+def test_line_of_sight_and_ils(tmp_path, make_state):
+    """Estação além do horizonte rádio fica inválida; ILS indica rampa e localizador"""
+    navigation = make_navigation(tmp_path, {'nav1': {'kind': 'nav', 'frequency': 109.3},
+                                            'adf': {'kind': 'adf', 'frequency': 338}})
+    # 5 NM a leste da antena do ILS (curso 270), 3° de rampa ≈ 486 m
+    east = 8533.0 + 5.0 * 1852.0
+    data = navigation.calculate(make_state(north=0.0, east=east, altitude=math.tan(math.radians(3.0)) * 9260.0,
+                                           euler=(0.0, 0.0, math.radians(270.0))))
+    ils = data.receivers['nav1']
+    assert ils.valid
+    assert abs(ils.deviation) < math.radians(0.5)
+    assert abs(ils.glideslope_deviation) < math.radians(0.2)
+
+    # NDB a ~53 km: dentro do alcance nominal, mas abaixo do horizonte rádio perto do solo
+    assert navigation.calculate(make_state(north=-20000.0, altitude=1000.0)).receivers['adf'].valid
+    assert not navigation.calculate(make_state(north=-20000.0, altitude=5.0)).receivers['adf'].valid
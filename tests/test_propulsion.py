@@ -0,0 +1,95 @@
+"""
+Testes do modelo de propulsão (motor a pistão + hélice de passo fixo)
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from core.message_bus import MessageBus
+from core.data_types import ControlInputs
+from systems.propulsion import Propulsion, PropulsionModel
+from utils import jit
+from utils.data_interpolation import LookupTable
+
+def test_lookup_table_scalar_matches_vectorized():
+    """Caminho escalar e vetorizado devem dar o mesmo resultado, inclusive fora da grade"""
+    axes = [np.linspace(0, 1, 5), np.linspace(0, 2, 7), np.linspace(-1, 1, 4)]
+    table = LookupTable.from_function(axes, lambda a, b, c: a * b + c * a + np.sin(b))
+
+    points = np.array([[0.33, 1.1, 0.2], [2.0, -1.0, 0.5], [0.999, 2.0, 1.0]])
+    batch = table(points[:, 0], points[:, 1], points[:, 2])
+    for point, expected in zip(points, batch):
+        assert abs(table.scalar(*point) - expected) < 1e-12
+
+
+def test_static_and_cruise_operating_points(vehicle_config):
+    """RPM estático e de cruzeiro em faixas plausíveis para um C172"""
+    model = PropulsionModel(vehicle_config["propulsion"])
+
+    static = model.solve(1.0, 0.0, 0.0, 1500.0)
+    assert 2200.0 < static.rpm < 2500.0
+    assert 2000.0 < static.thrust < 3500.0
+
+    cruise = model.solve(0.7, 55.0, 1500.0, 1500.0)
+    assert 2300.0 < cruise.rpm < 2700.0
+    assert cruise.thrust > 0.0
+    assert cruise.fuel_flow > 0.0
+
+
+def test_warm_start_converges_in_one_iteration(vehicle_config):
+    """Partindo do RPM anterior, uma iteração de Newton já basta"""
+    model = PropulsionModel(vehicle_config["propulsion"])
+    converged = model.solve(0.7, 55.0, 1500.0, 1500.0)
+
+    model.newton_iterations = 1
+    warm = model.solve(0.7, 55.0, 1500.0, converged.rpm)
+    assert abs(warm.rpm - converged.rpm) < 0.5
+
+
+def test_batch_matches_scalar(vehicle_config):
+    """Solução em lote reproduz a solução escalar aeronave por aeronave"""
+    model = PropulsionModel(vehicle_config["propulsion"])
+    throttle = np.array([1.0, 0.7, 0.0, 0.3])
+    airspeed = np.array([0.0, 55.0, 55.0, 30.0])
+    altitude = np.array([0.0, 1500.0, 1000.0, 3000.0])
+
+    batch = model.solve_batch(throttle, airspeed, altitude, rpm_guess=2000.0)
+    for i in range(throttle.size):
+        single = model.solve(throttle[i], airspeed[i], altitude[i], 2000.0)
+        assert abs(batch["rpm"][i] - single.rpm) < 1.0
+        assert abs(batch["thrust"][i] - single.thrust) < 1.0
+
+
+@pytest.mark.skipif(not jit.numba_available(), reason="numba não instalado")
+def test_numba_solve_matches_python(monkeypatch, vehicle_config):
+    """Kernel compilado e interpretado dão o mesmo equilíbrio (diferença só de arredondamento)"""
+    config = vehicle_config["propulsion"]
+    models = {}
+    for backend in ("python", "numba"):
+        monkeypatch.setattr(jit, "_BACKEND", backend)
+        models[backend] = PropulsionModel(config)
+
+    rng = np.random.default_rng(4)
+    for point in zip(rng.uniform(-0.2, 1.2, 100), rng.uniform(-10.0, 90.0, 100),
+                     rng.uniform(-1000.0, 14000.0, 100), rng.uniform(0.0, 3500.0, 100)):
+        python, numba = models["python"].solve(*point), models["numba"].solve(*point)
+        assert np.allclose(list(vars(numba).values()), list(vars(python).values()), rtol=1e-12, atol=0.0)
+
+
+def test_publishes_propulsion_state(vehicle_config):
+    """Módulo no barramento publica 'propulsion_state' a cada update"""
+    bus = MessageBus()
+    propulsion = Propulsion(bus, vehicle_config)
+    received = []
+    bus.subscribe("propulsion_state", received.append)
+
+    bus.publish("controls", ControlInputs(throttle=1.0, elevator=0.0, aileron=0.0, rudder=0.0))
+    propulsion.update()
+
+    assert len(received) == 1
+    assert received[0].thrust > 0.0
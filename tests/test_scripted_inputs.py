@@ -0,0 +1,101 @@
+"""
+Testes das entradas roteirizadas: formas dos sinais, índice O(1) com interpolação e publicação
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import contextlib
+import math
+
+import numpy as np
+import pytest
+
+from core.message_bus import MessageBus
+from interfaces.scripted_inputs import CHANNELS, MOCK_SCENARIO, InputScenario, ScriptedInputs
+
+ELEVATOR = CHANNELS.index('elevator')
+
+
+def test_segments_compile_to_expected_signals(tmp_path):
+    trace = tmp_path / "stick.csv"
+    trace.write_text("time,aileron\n0.0,0.0\n1.0,0.4\n2.0,-0.2\n")
+    scenario = InputScenario.from_dict({
+        'duration': 20.0,
+        'channels': {
+            'elevator': [{'type': 'linear', 'points': [[0.0, 0.0], [2.0, 0.1]]},
+                         {'type': '3211', 'start': 5.0, 'amplitude': 0.2, 'width': 0.5}],
+            'rudder': [{'type': 'doublet', 'start': 1.0, 'amplitude': 0.3, 'width': 1.0}],
+            'aileron': [{'type': 'trace', 'file': 'stick.csv', 'column': 'aileron', 'start': 10.0}],
+            'throttle': [{'type': 'steps', 'points': [[0.0, 0.5], [4.0, 1.4]]}],
+        }}, base_dir=str(tmp_path))
+    compiled = scenario.compile(60.0)
+    assert len(compiled) == 1201
+
+    def channel(name, t):
+        return compiled.values(t)[CHANNELS.index(name)]
+
+    # 3-2-1-1 somado à rampa mantida em 0,1: +3T, -2T, +T, -T
+    for t, expected in ((5.5, 0.3), (7.0, -0.1), (7.7, 0.3), (8.2, -0.1), (8.7, 0.1)):
+        assert channel('elevator', t) == pytest.approx(expected)
+    assert channel('elevator', 1.0) == pytest.approx(0.05)
+    assert [channel('rudder', t) for t in (0.5, 1.5, 2.5, 3.5)] == pytest.approx([0.0, 0.3, -0.3, 0.0])
+    assert channel('aileron', 9.0) == 0.0 and channel('aileron', 10.5) == pytest.approx(0.2)
+    assert channel('aileron', 15.0) == pytest.approx(-0.2)          # traço acabou: mantém o último valor
+    assert channel('throttle', 3.9) == 0.5 and channel('throttle', 4.0) == 1.0   # saturado em 1
+    assert compiled.frames[0].gear == 1.0 and compiled.frames[0].flaps == 0.0
+
+    # Fora da grade: interpolação entre as duas linhas vizinhas; além do fim, última linha
+    t = 5.0 - 0.5 / 60.0                                   # meio caminho até a borda do 3-2-1-1
+    assert compiled.values(t)[ELEVATOR] == pytest.approx(0.1 + 0.5 * 0.2)
+    assert compiled.values(100.0) == compiled.values(20.0)
+    assert compiled.frame(50, 1 / 50.0).elevator == pytest.approx(channel('elevator', 1.0))
+
+    with pytest.raises(ValueError, match="Canal desconhecido"):
+        InputScenario.from_dict({'duration': 1.0, 'channels': {'collective': []}})
+    with pytest.raises(ValueError, match="Tipo de segmento"):
+        InputScenario.from_dict({'duration': 1.0, 'channels': {'elevator': [{'type': 'chirp'}]}})
+
+
+def test_scripted_inputs_publish_precompiled_frames():
+    """Frames alinhados publicam objetos prontos; duas execuções dão a mesma sequência"""
+    config = {'scripted_inputs': {'scenario': 'config/scenarios/stick_inputs.yaml'}}
+    runs = []
+    for _ in range(2):
+        bus = MessageBus()
+        module = ScriptedInputs(bus, config, dt=1 / 60.0)
+        received = []
+        bus.subscribe('pilot_controls', received.append)
+        with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+            for _ in range(720):
+                module.update()
+        assert received[300] is module.scenario.frames[300]
+        runs.append([(c.elevator, c.aileron, c.throttle) for c in received])
+    assert runs[0] == runs[1]
+    assert runs[0][300][0] == pytest.approx(0.1) and runs[0][360][0] == pytest.approx(-0.1)
+
+
+def test_mock_scenario_reproduces_old_sinusoids_in_a_loop():
+    compiled = MOCK_SCENARIO.compile(60.0)
+    for frame in (1, 600, 3769, 3771, 9000):
+        t = frame / 60.0
+        controls = compiled.frame(frame, 1 / 60.0)
+        assert controls.elevator == pytest.approx(0.2 * math.sin(0.5 * t), abs=1e-3)
+        assert controls.aileron == pytest.approx(0.1 * math.sin(0.3 * t), abs=1e-3)
+        assert controls.throttle == pytest.approx(0.6 + 0.2 * math.sin(0.1 * t), abs=1e-3)
+    assert np.all(np.diff(compiled.table[:, CHANNELS.index('rudder')]) != 0.0)
+
+
+def test_mock_controls_follow_configured_frame_rate():
+    """A 30 Hz o cenário mock avança 1/30 s por frame, não 1/60 s"""
+    from interfaces.xplane_interface import XPlaneInterface
+    bus = MessageBus()
+    received = []
+    bus.subscribe('pilot_controls', received.append)
+    interface = XPlaneInterface(bus, dt=1 / 30.0)
+    interface.xp_client = None
+    for _ in range(300):
+        interface.update()
+    assert received[-1].elevator == pytest.approx(0.2 * math.sin(0.5 * 10.0), abs=1e-3)
@@ -0,0 +1,144 @@
+"""
+Testes do logging assíncrono: agregação por limite de taxa, formatação preguiçosa e frame sem E/S
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import io
+import logging
+import queue
+import threading
+import time
+
+import pytest
+
+from core.message_bus import MessageBus
+from core.sim_logging import QueueEmitter, RateLimiter, configure_logging, get_logger, shutdown_logging
+from core.simulation_orchestrator import SimulationOrchestrator
+
+
+class Lazy:
+    """Argumento que registra quando e em que thread foi formatado"""
+
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread().name)
+        return 'lazy'
+
+
+def test_rate_limit_aggregates_repeats_and_formats_lazily():
+    now = [0.0]
+    limiter = RateLimiter(interval=1.0, burst=2, overrides={'noisy': (1.0, 0)}, clock=lambda: now[0])
+    records = queue.Queue()
+    logger = logging.getLogger('flightsim.test_rate')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(QueueEmitter(records, limiter))
+    try:
+        # 37 atrasos no mesmo segundo: passam 2, o resto vira um resumo ao fim da janela
+        for frame in range(37):
+            now[0] = frame / 60.0
+            logger.warning("Frame %d atrasado: +%.1fms", frame, 3.0, extra={'aggregate': 'frame_overrun'})
+        logger.warning("outra mensagem")
+        assert records.qsize() == 3 and limiter.suppressed == 35
+        assert limiter.drain() == []                       # janela ainda aberta
+        now[0] = 1.5
+        summary, = limiter.drain()
+        assert summary.getMessage() == "Frame 36 atrasado: +3.0ms (×37 em 1 s)"
+
+        # Nível desligado: nada é criado nem formatado
+        lazy = Lazy()
+        logger.debug("valor %s", lazy)
+        assert records.qsize() == 3 and lazy.threads == []
+    finally:
+        logger.handlers.clear()
+
+    # Sobrescrita por categoria (burst 0 = só resumos) e resumo pendente ao reabrir a janela
+    noisy = RateLimiter(interval=1.0, burst=1, overrides={'flightsim.noisy': (0.5, 1)}, clock=lambda: now[0])
+    record = logging.makeLogRecord({'name': 'flightsim.noisy', 'msg': 'x %d', 'args': (1,)})
+    now[0] = 0.0
+    assert noisy.filter(record) and not noisy.filter(record) and not noisy.filter(record)
+    now[0] = 0.6
+    assert noisy.filter(record)
+    summary, = noisy.drain()
+    assert summary.getMessage() == 'x 1 (×3 em 0.5 s)'
+
+
+def test_same_template_from_different_modules_keeps_separate_budgets():
+    """Erros de módulos diferentes na mesma janela: cada um aparece e tem o próprio resumo"""
+    now = [0.0]
+    limiter = RateLimiter(interval=1.0, burst=1, clock=lambda: now[0])
+    records = queue.Queue()
+    logger = logging.getLogger('flightsim.orchestrator')
+    propagate, level = logger.propagate, logger.level
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(QueueEmitter(records, limiter))
+
+    def failing(name):
+        def update(self):
+            raise RuntimeError('boom')
+        return type(name, (), {'update': update})()
+
+    orchestrator = SimulationOrchestrator(MessageBus(), frame_rate=60)
+    for name in 'ABCDEFG':
+        orchestrator.register_module(failing(name))
+    try:
+        while not records.empty():
+            records.get_nowait()                                 # "Módulo registrado: A" ... "G"
+        for _ in range(10):
+            orchestrator._update_all_modules()
+        printed = [records.get_nowait().getMessage() for _ in range(records.qsize())]
+        assert printed == [f"❌ Erro em {name}.update(): boom" for name in 'ABCDEFG']
+        now[0] = 1.5
+        summaries = sorted(record.getMessage() for record in limiter.drain())
+        assert summaries == [f"❌ Erro em {name}.update(): boom (×10 em 1 s)" for name in 'ABCDEFG']
+    finally:
+        logger.handlers.clear()
+        logger.propagate, logger.level = propagate, level
+
+
+def test_writer_thread_formats_off_the_frame_and_flushes_on_stop():
+    stream = io.StringIO()
+    writer = configure_logging({'level': 'INFO', 'rate_limit': {'interval': 60.0, 'burst': 1},
+                                'categories': {'bus': 'DEBUG'}}, stream=stream)
+    try:
+        lazy = Lazy()
+        get_logger('dynamics').info("estado %s", lazy)
+        get_logger('dynamics').debug("não aparece %s", lazy)
+        bus = MessageBus()
+        bus.subscribe('aircraft_state', lambda message: None)
+        for _ in range(100):
+            bus.publish('aircraft_state', object())       # debug ligado só para 'bus'
+
+        # Orquestrador atrasado em todo frame: não bloqueia e o aviso sai agregado
+        orchestrator = SimulationOrchestrator(MessageBus(), frame_rate=1000)
+
+        class Slow:
+            def update(self):
+                time.sleep(0.002)
+
+        orchestrator.register_module(Slow())
+        start = time.perf_counter()
+        orchestrator.run(duration=0.2)
+        assert time.perf_counter() - start < 1.0
+    finally:
+        shutdown_logging()
+
+    output = stream.getvalue()
+    assert lazy.threads == ['log-writer']
+    assert 'não aparece' not in output and 'flightsim.dynamics: estado lazy' in output
+    assert output.count("📤 Mensagem publicada em 'aircraft_state'") == 2    # 1 + resumo
+    assert "(×100 em 60 s)" in output
+    assert "atrasado" in output and "(×200 em 60 s)" in output
+    assert writer.stats()['dropped'] == 0 and writer.stats()['suppressed'] > 0
+
+    # Sem configuração: volta ao padrão do logging (info descartado, nada na saída antiga)
+    assert logging.getLogger('flightsim').handlers == [] and not get_logger('bus').isEnabledFor(logging.INFO)
+    with pytest.raises(ValueError, match="logging.level"):
+        configure_logging({'level': 'verbose'})
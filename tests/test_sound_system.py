@@ -0,0 +1,105 @@
+"""
+Testes da síntese sonora: blocos contínuos, ring buffer, threads de áudio e fator de tempo real
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+import wave
+
+import numpy as np
+
+from core.message_bus import MessageBus
+from systems.propulsion import PropulsionState
+from visual_systems.sound_system import (AudioRingBuffer, NullSink, SoundParameters, SoundSynthesizer, SoundSystem,
+                                         WaveFileSink, measure_real_time_factor)
+
+def test_ring_buffer_wraps_and_pads_underrun():
+    """Escrita dá a volta no fim do buffer; leitura incompleta completa com silêncio"""
+    ring = AudioRingBuffer(8)
+    out = np.zeros(4, dtype=np.float32)
+    assert ring.write(np.arange(6, dtype=np.float32))
+    ring.read(out)
+    assert ring.write(np.arange(6, 12, dtype=np.float32))
+    assert not ring.write(np.ones(1, dtype=np.float32))     # cheio
+    ring.read(out)
+    assert list(out) == [4, 5, 6, 7]
+    out6 = np.zeros(6, dtype=np.float32)
+    assert ring.read(out6) == 4 and list(out6) == [8, 9, 10, 11, 0, 0]
+
+
+def test_blocks_are_continuous_across_block_sizes():
+    """Parâmetros constantes: dois blocos de 256 = um bloco de 512 (fase e ruído contínuos)"""
+    params = SoundParameters(rpm=2400.0, power_fraction=0.7, tip_mach=0.7, airspeed=50.0,
+                             weight_on_wheels=False, ground_speed=0.0)
+    small, large = SoundSynthesizer({}, 22050, 256), SoundSynthesizer({}, 22050, 512)
+    for synth in (small, large):
+        synth.reset(params)      # já em regime, sem rampa a partir do silêncio
+    for _ in range(3):
+        joined = np.concatenate([small.render(params), small.render(params)])
+        assert np.allclose(joined, large.render(params), atol=1e-5)
+
+
+def test_levels_follow_rpm_airspeed_and_ground_contact():
+    """Mais rotação/velocidade/rolagem = mais energia; toque no solo gera pancada"""
+    def rms(params, blocks=4):
+        synth = SoundSynthesizer({}, 22050, 512)
+        return np.sqrt(np.mean(np.concatenate([synth.render(params) for _ in range(blocks)]) ** 2))
+
+    assert rms(SoundParameters(rpm=2600.0, power_fraction=0.9, tip_mach=0.75)) > \
+        1.5 * rms(SoundParameters(rpm=800.0, power_fraction=0.05, tip_mach=0.2))
+    assert rms(SoundParameters(airspeed=60.0)) > 3.0 * rms(SoundParameters(airspeed=20.0))
+    assert rms(SoundParameters()) == 0.0
+
+    on_ground = SoundParameters(weight_on_wheels=True, ground_speed=25.0)
+    landing, rolling = SoundSynthesizer({}, 22050, 512), SoundSynthesizer({}, 22050, 512)
+    landing.reset(SoundParameters(ground_speed=25.0))
+    rolling.reset(on_ground)
+    touchdown = landing.render(on_ground)
+    assert np.abs(touchdown).max() > 1.3 * np.abs(rolling.render(on_ground)).max()
+
+
+def test_simulation_thread_never_renders(tmp_path, vehicle_config):
+    """update() só troca parâmetros; a síntese roda em outra thread e a saída recebe blocos"""
+    bus = MessageBus()
+    sink = NullSink()
+    sound = SoundSystem(bus, vehicle_config, sink=sink)
+    render_threads = set()
+    render = sound.synthesizer.render
+
+    def spy(params):
+        render_threads.add(threading.get_ident())
+        return render(params)
+
+    sound.synthesizer.render = spy
+    sound.start()
+    try:
+        for _ in range(20):
+            bus.publish('propulsion_state', PropulsionState(rpm=2300.0, power=80000.0))
+            sound.update()
+            time.sleep(1 / 60.0)
+    finally:
+        sound.stop()
+
+    stats = sound.stats()
+    assert render_threads and threading.get_ident() not in render_threads
+    assert stats['blocks_played'] > 10 and sink.frames == stats['blocks_played'] * 512
+    assert stats['underruns'] <= 1
+
+    path = tmp_path / "engine.wav"
+    wave_sink = WaveFileSink(str(path), 22050)
+    synth = SoundSynthesizer({}, 22050, 512)
+    for _ in range(10):
+        wave_sink.write(synth.render(SoundParameters(rpm=2300.0, power_fraction=0.6, tip_mach=0.65)))
+    wave_sink.close()
+    with wave.open(str(path), 'rb') as f:
+        assert f.getnframes() == 5120 and f.getframerate() == 22050
+
+
+def test_real_time_factor():
+    """Síntese bem acima do tempo real (gera vários segundos de áudio por segundo)"""
+    assert measure_real_time_factor(SoundSynthesizer({}, 22050, 512), seconds=5.0) > 10.0
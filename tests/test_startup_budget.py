@@ -0,0 +1,63 @@
+"""
+Testes do orçamento de partida: parse do -X importtime, orçamento da partida padrão e resolvedor do X-Plane
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import importlib.util
+
+import pytest
+
+from interfaces import xplane_interface
+from utils.startup_budget import StartupProfile, check_budget, measure_startup, parse_importtime
+
+IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     numpy.core._multiarray_umath
+import time:      1500 |      55000 |   numpy
+import time:       300 |      60000 | interfaces.xplane_interface
+"""
+
+
+def test_parse_importtime_and_budget_violations():
+    entries = parse_importtime(IMPORTTIME)
+    assert [(name, depth) for name, depth, _, _ in entries] == [
+        ('numpy.core._multiarray_umath', 2), ('numpy', 1), ('interfaces.xplane_interface', 0)]
+    assert entries[1][2:] == pytest.approx((1.5e-3, 55e-3))
+
+    profile = StartupProfile(imports=0.1, build=0.3, first_frame=0.2, process=0.7, loaded=['numpy', 'scipy'])
+    violations = check_budget(profile, {'total': 0.5})
+    assert len(violations) == 2 and violations[0].startswith('total: 600.0ms')
+    assert "'scipy' carregado na partida" in violations[1]
+
+
+def test_default_startup_fits_budget():
+    """Partida limpa de main.py até o primeiro frame: dentro do orçamento, nada pesado sob demanda carregado"""
+    profile = measure_startup(runs=3, top=10)
+    assert check_budget(profile) == []
+    assert 'dynamics.flight_dynamics' in profile.loaded and 'interfaces.instructor_station' not in profile.loaded
+    assert len(profile.heaviest) == 10
+    assert all(a[2] >= b[2] for a, b in zip(profile.heaviest, profile.heaviest[1:]))
+
+
+def test_xplane_backend_resolved_once(monkeypatch):
+    """Um resolvedor só: cada nome sondado uma vez, variável de ambiente acima da configuração"""
+    monkeypatch.setattr(xplane_interface, '_RESOLVED', {})
+    monkeypatch.delenv(xplane_interface.ENV_VAR, raising=False)
+    probes = []
+    real_find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name, *a: probes.append(name) or real_find_spec(name, *a))
+
+    first = xplane_interface.resolve_backend()
+    count = len(probes)
+    assert 1 <= count <= 2 and probes[0] == 'xpc'
+    assert xplane_interface.resolve_backend('auto') is first and len(probes) == count    # em cache
+    assert xplane_interface.resolve_backend('none') is None and len(probes) == count     # nada a sondar
+
+    monkeypatch.setenv(xplane_interface.ENV_VAR, 'none')
+    assert xplane_interface.resolve_backend('auto') is None
+    monkeypatch.delenv(xplane_interface.ENV_VAR)
+    with pytest.raises(ValueError, match="Backend do X-Plane desconhecido"):
+        xplane_interface.resolve_backend('xplane11')
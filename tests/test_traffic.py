@@ -0,0 +1,120 @@
+"""
+Testes do tráfego IA: hash espacial contra força bruta, TCAS e envio em lote ao X-Plane
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import contextlib
+import math
+
+import numpy as np
+import pytest
+
+from core.data_types import AircraftState, Vector3
+from core.message_bus import MessageBus
+from systems.traffic import MultiplayerSlots, SpatialHash, Traffic, TrafficModel, conflict_pairs
+
+
+def own_state(north=0.0, altitude=1000.0, speed=50.0, heading=0.0):
+    return AircraftState(Vector3(north, 0.0, -altitude), Vector3(speed, 0.0, 0.0), Vector3(0.0, 0.0, 0.0),
+                         Vector3(0.0, 0.0, heading), 1000.0, (1.0, 1.0, 1.0))
+
+
+def brute_force_pairs(positions, radius, height):
+    delta = positions[:, None, :] - positions[None, :, :]
+    close = (delta[..., 0] ** 2 + delta[..., 1] ** 2 < radius ** 2) & (np.abs(delta[..., 2]) < height)
+    i, j = np.nonzero(np.triu(close, k=1))
+    return set(zip(i.tolist(), j.tolist()))
+
+
+def test_spatial_hash_matches_brute_force_while_traffic_moves():
+    """Conflitos pelo hash incremental = todos os pares O(n²); poucas trocas de célula por frame"""
+    model = TrafficModel.spawn(400, seed=3, radius=8000.0, altitude_band=(900.0, 1100.0), speed_band=(50.0, 90.0))
+    model.set_targets(np.arange(0, 400, 2), heading=0.0)
+    spatial_hash = SpatialHash(1000.0)
+    moved = []
+    for frame in range(120):
+        model.advance(1 / 30.0)
+        moved.append(spatial_hash.update(model.positions[:, 0], model.positions[:, 1]))
+        if frame % 40 == 0:
+            found = {tuple(p) for p in conflict_pairs(spatial_hash, model.positions, 900.0, 150.0).tolist()}
+            assert found == brute_force_pairs(model.positions, 900.0, 150.0) and found
+    assert moved[0] == 400 and max(moved[1:]) < 20
+
+    # Rebuild do zero chega nas mesmas células
+    fresh = SpatialHash(1000.0)
+    fresh.update(model.positions[:, 0], model.positions[:, 1])
+    assert fresh.cells == spatial_hash.cells
+
+    candidates = set(spatial_hash.query(0.0, 0.0, 2500.0).tolist())
+    within = np.flatnonzero(np.hypot(model.positions[:, 0], model.positions[:, 1]) <= 2500.0)
+    assert set(within.tolist()) <= candidates
+
+
+def test_head_on_encounter_escalates_from_ta_to_ra():
+    """Tráfego de frente na mesma altitude: TA antes de RA; nada para quem se afasta"""
+    bus = MessageBus()
+    model = TrafficModel([[9000.0, 0.0, -1000.0], [-3000.0, 0.0, -1000.0], [4000.0, 2000.0, -2500.0]],
+                         headings=[math.pi, math.pi, 0.0], speeds=[60.0, 60.0, 60.0])
+    config = {'traffic': {'stream_count': 2, 'surveillance_range': 15000.0}}
+    traffic = Traffic(bus, config, dt=0.5, model=model)
+    pictures = []
+    bus.subscribe('traffic', pictures.append)
+
+    levels = []
+    with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+        for step in range(160):
+            bus.publish('aircraft_state', own_state(north=50.0 * 0.5 * step))
+            traffic.update()
+            levels.append({a.id: a.level for a in pictures[-1].advisories})
+            if step == 0:
+                assert pictures[-1].ids == (1, 2)          # os dois mais próximos, em ordem
+                assert not pictures[-1].positions.flags.writeable
+
+    head_on = [entry.get(0) for entry in levels]
+    first_ta, first_ra = head_on.index('TA'), head_on.index('RA')
+    # Aproximação a 110 m/s: TA com τ_mod = 40 s (r ≈ 4,6 km), RA com 25 s (r ≈ 2,9 km) → ~15,7 s depois
+    assert first_ta < first_ra and 15.0 < (first_ra - first_ta) * 0.5 < 16.5
+    assert 9000.0 - 110.0 * 0.5 * first_ta == pytest.approx(4630.0, abs=60.0)
+    assert all(1 not in entry for entry in levels)                     # atrás de nós, afastando
+    assert all(2 not in entry for entry in levels)                     # 1500 m acima, sem razão vertical
+
+
+def test_traffic_streamed_in_one_batch_with_stable_slots():
+    """XPlaneInterface manda os mais próximos num lote por frame; cada id mantém seu slot"""
+    from interfaces.xplane_interface import XPlaneInterface
+
+    class Recorder:
+        def __init__(self):
+            self.posi = []
+
+        def sendPOSI(self, values, ac=0):
+            self.posi.append((ac, values))
+
+    with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+        bus = MessageBus()
+        interface = XPlaneInterface(bus)
+        interface.xp_client, interface.connected = Recorder(), True
+        model = TrafficModel.spawn(50, seed=1, radius=5000.0)
+        traffic = Traffic(bus, {'traffic': {'stream_count': 5}}, dt=1.0, model=model)
+        bus.publish('aircraft_state', own_state())
+
+        slots = []
+        for _ in range(3):
+            interface.xp_client.posi.clear()
+            traffic.update()
+            sent = interface.xp_client.posi
+            assert len(sent) == 5 and sorted(ac for ac, _ in sent) == [1, 2, 3, 4, 5]
+            slots.append(dict(zip(traffic.picture.ids, (ac for ac, _ in sent))))
+
+    for before, after in zip(slots, slots[1:]):
+        assert all(after[i] == before[i] for i in set(before) & set(after))
+    lat, lon, alt = sent[0][1][:3]
+    assert abs(lat - 40.0) < 0.1 and abs(lon + 75.0) < 0.1 and 600.0 <= alt <= 3000.0
+
+    slots = MultiplayerSlots(max_slots=3)
+    assert slots.assign([10, 11, 12, 13]) == [(0, 1), (1, 2), (2, 3)]
+    assert slots.assign([13, 11]) == [(0, 1), (1, 2)]
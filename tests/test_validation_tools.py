@@ -0,0 +1,85 @@
+"""
+Testes da validação proof-of-match: comparação vetorizada, métricas e check ride em paralelo
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import math
+import time
+
+import numpy as np
+import pytest
+
+from utils.validation_tools import (CHECK_RIDE, GOLDEN_DIR, compare, evaluate_case, format_report,
+                                    oscillation_metrics, run_check_ride, schedule, step_metrics)
+
+
+def test_compare_flags_first_violation_and_nan():
+    """Erro fora da tolerância localizado no tempo; NaN nunca passa; referência interpolada"""
+    t = np.linspace(0.0, 10.0, 1001)
+    golden = {'time': t[::5], 'altitude': 1000.0 + t[::5], 'theta': 0.1 * np.sin(t[::5])}
+    recording = {'time': t, 'altitude': 1000.0 + t, 'theta': 0.1 * np.sin(t)}
+    recording['altitude'][t >= 3.0] += 10.0
+    recording['theta'][700] = np.nan
+
+    result = compare(recording, golden, {'altitude': (5.0, 0.0), 'theta': (0.0, 0.05)})
+    assert result['altitude'].first_violation == pytest.approx(3.0)
+    assert result['altitude'].fraction_outside == pytest.approx(0.7, abs=1e-2)
+    assert result['theta'].first_violation == pytest.approx(7.0) and math.isnan(result['theta'].max_error)
+
+    clean = compare({'time': t, 'altitude': 1000.0 + t, 'theta': 0.1 * np.sin(t)}, golden,
+                    {'altitude': (0.01, 0.0), 'theta': (1e-3, 0.0)})
+    assert all(channel.first_violation is None for channel in clean.values())
+
+
+def test_step_and_oscillation_metrics_match_analytic():
+    """2ª ordem: sobressinal = exp(−πζ/√(1−ζ²)); oscilação amortecida: período e ζ recuperados"""
+    t = np.arange(0.0, 60.0, 0.01)
+    zeta, wn = 0.5, 1.0
+    wd = wn * math.sqrt(1.0 - zeta ** 2)
+    tau = np.clip(t - 5.0, 0.0, None)
+    y = 1.0 - np.exp(-zeta * wn * tau) * (np.cos(wd * tau) + zeta / math.sqrt(1.0 - zeta ** 2) * np.sin(wd * tau))
+    metrics = step_metrics(t, 2.0 * y, t_step=5.0)
+    assert metrics['overshoot'] == pytest.approx(math.exp(-math.pi * zeta / math.sqrt(1.0 - zeta ** 2)), abs=2e-3)
+    assert metrics['final_value'] == pytest.approx(2.0, abs=1e-3)
+    assert 1.5 < metrics['rise_time'] < 1.8 and 5.0 < metrics['settling_time'] < 6.0
+
+    # Fugoide típica: T ≈ 30 s, ζ ≈ 0,05
+    t = np.arange(0.0, 300.0, 0.05)
+    period, damping = 30.0, 0.05
+    w = 2.0 * math.pi / period
+    speed = 50.0 + 0.01 * t + 5.0 * np.exp(-damping * w / math.sqrt(1 - damping ** 2) * t) * np.sin(w * t)
+    metrics = oscillation_metrics(t, speed)
+    assert metrics['period'] == pytest.approx(period, rel=0.01)
+    assert metrics['damping_ratio'] == pytest.approx(damping, abs=0.005)
+
+    assert list(schedule([(2.0, 1.0), (1.0, 0.5)], np.array([0.0, 1.0, 1.5, 2.0]))) == [0.0, 0.5, 0.5, 1.0]
+
+
+def test_check_ride_matches_golden_in_parallel():
+    """Suíte completa contra as referências em tests/golden, em processos separados, em < 60 s"""
+    start = time.perf_counter()
+    results = run_check_ride()
+    assert time.perf_counter() - start < 60.0
+    assert [r.name for r in results] == [case.name for case in CHECK_RIDE]
+    assert all(r.passed for r in results), format_report(results)
+
+
+def test_check_ride_detects_model_change(vehicle_config):
+    """Passageiros atrás tiram o trim da referência; com muito peso atrás o caso diverge e é abortado"""
+    config = vehicle_config
+    golden = os.path.join(GOLDEN_DIR, "trim_cruise.npz")
+    rear = next(c for c in config['mass_properties']['components'] if c['name'] == 'rear_passengers')
+
+    rear['mass'] = 40.0
+    result = evaluate_case(CHECK_RIDE[0], config, golden)
+    assert not result.passed and result.error is None
+    assert result.channels['airspeed'].first_violation is not None
+    assert "FAIL  trim_cruise" in format_report([result])
+
+    rear['mass'] = 200.0
+    result = evaluate_case(CHECK_RIDE[0], config, golden)
+    assert not result.passed and "divergiu" in result.error
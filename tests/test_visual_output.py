@@ -0,0 +1,122 @@
+"""
+Testes do estágio de saída visual: quaternions, interpolação/extrapolação e envio ao X-Plane
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import contextlib
+import math
+import time
+
+import numpy as np
+import pytest
+
+from core.data_types import AircraftState, Vector3
+from core.message_bus import MessageBus
+from interfaces.visual_output import PoseExtrapolator, VisualOutput
+from utils.coordinate_transforms import (euler_to_dcm, euler_to_quaternion, quaternion_slerp, quaternion_to_euler,
+                                         rotation_quaternion)
+
+SPEED, YAW_RATE, BANK = 50.0, 0.1, 0.2
+
+
+def turning_state(t: float) -> AircraftState:
+    """Curva nivelada de taxa constante (solução exata para comparar)"""
+    radius = SPEED / YAW_RATE
+    psi = YAW_RATE * t
+    # Taxas no corpo de uma curva com inclinação constante: ψ̇ projetada nos eixos y/z do corpo
+    rates = Vector3(0.0, YAW_RATE * math.sin(BANK), YAW_RATE * math.cos(BANK))
+    return AircraftState(Vector3(radius * math.sin(psi), radius * (1.0 - math.cos(psi)), -1000.0),
+                         Vector3(SPEED, 0.0, 0.0), rates, Vector3(BANK, 0.0, psi), 1000.0, (1.0, 1.0, 1.0))
+
+
+def pose_error(pose, t):
+    exact = turning_state(t)
+    position = np.array([exact.position_ned.x, exact.position_ned.y, exact.position_ned.z])
+    q = euler_to_quaternion(exact.euler.x, exact.euler.y, exact.euler.z)
+    return np.linalg.norm(pose[0] - position), 2.0 * math.acos(min(abs(float(np.dot(pose[1], q))), 1.0))
+
+
+def test_quaternion_helpers():
+    euler = (0.3, -0.4, 2.5)
+    q = euler_to_quaternion(*euler)
+    assert np.allclose(quaternion_to_euler(q), euler)
+    w, x, y, z = q
+    dcm = np.array([[1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)],
+                    [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)],
+                    [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)]])
+    assert np.allclose(dcm, euler_to_dcm(*euler))
+
+    # Slerp pelo caminho curto mesmo com o sinal trocado; proa 170° → -170° passa por 180°
+    a, b = euler_to_quaternion(0.0, 0.0, math.radians(170.0)), euler_to_quaternion(0.0, 0.0, math.radians(-170.0))
+    middle = quaternion_slerp(a, -b, 0.5)
+    assert abs(quaternion_to_euler(middle)[2]) == pytest.approx(math.pi)
+    assert np.allclose(quaternion_slerp(a, a, 0.3), a)
+    assert np.allclose(rotation_quaternion([0.0, 0.0, 0.0]), [1.0, 0.0, 0.0, 0.0])
+
+
+def test_physics_at_20hz_displayed_at_60hz_with_delay_compensation():
+    """Interpolado e extrapolado 50 ms à frente ficam em cm; manter o último estado erra metros"""
+    extrapolator = PoseExtrapolator(history=4, max_extrapolation=0.25)
+    interpolated, extrapolated, held = [], [], []
+    for frame in range(60):
+        t = frame / 20.0
+        extrapolator.push(t, turning_state(t))
+        for k in range(3):                                   # visual a 60 Hz entre estados da física
+            now = t + k / 60.0
+            extrapolated.append(pose_error(extrapolator.pose(now + 0.05), now + 0.05))
+            if frame > 0:
+                interpolated.append(pose_error(extrapolator.pose(now - 0.03), now - 0.03))
+            latest = extrapolator.latest
+            held.append(pose_error((latest.position, latest.quaternion), now + 0.05))
+
+    interpolated, extrapolated, held = np.array(interpolated), np.array(extrapolated), np.array(held)
+    assert interpolated[:, 0].max() < 0.01 and interpolated[:, 1].max() < 1e-3
+    assert extrapolated[:, 0].max() < 0.05 and extrapolated[:, 1].max() < 1e-6
+    assert held[:, 0].min() > 2.4 and held[:, 1].min() > 0.004
+
+    # Antes do primeiro estado não há pose; além do horizonte a pose para
+    assert PoseExtrapolator().pose(0.0) is None
+    frozen = extrapolator.pose(10.0)
+    assert np.allclose(frozen[0], extrapolator.pose(3.0 + 0.25)[0])
+
+
+def test_xplane_interface_sends_pose_for_display_time():
+    from interfaces.xplane_interface import XPlaneInterface
+
+    class Recorder:
+        def __init__(self):
+            self.posi = []
+
+        def sendPOSI(self, values, ac=0):
+            self.posi.append(values)
+
+    clock = [0.0]
+    with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+        bus = MessageBus()
+        interface = XPlaneInterface(bus, visual_output={'transport_delay': 0.05}, clock=lambda: clock[0])
+        interface.xp_client, interface.connected = Recorder(), True
+        for frame in range(10):
+            clock[0] = frame / 20.0
+            bus.publish('aircraft_state', turning_state(clock[0]))
+
+    assert len(interface.xp_client.posi) == 10
+    heading = interface.xp_client.posi[-1][5]
+    assert heading == pytest.approx(math.degrees(YAW_RATE * (0.45 + 0.05)), abs=1e-4)
+    assert interface.xp_client.posi[-1][4] == pytest.approx(math.degrees(BANK), abs=1e-4)
+    assert interface.visual.stats()['extrapolated'] == 10
+
+    # Taxa própria: a thread envia sem depender de novos estados; pose parada após o horizonte
+    sent = []
+    output = VisualOutput(lambda position, q: sent.append(position), rate=200.0, max_extrapolation=0.02)
+    output.push(turning_state(0.0))
+    output.start()
+    time.sleep(0.15)
+    output.stop()
+    assert len(sent) > 5 and output.saturated > 0
+    assert np.allclose(sent[-1], sent[-2])
+    with pytest.raises(ValueError):
+        VisualOutput(lambda *_: None, rate=-1.0)
@@ -0,0 +1,90 @@
+"""
+Testes da visualização offline: decimação min/max, preparo do relatório e processo de trabalho
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+
+import numpy as np
+import pytest
+
+from visual_systems.visualization import (ReportWorker, decimate_path, frame_time_histogram, load_recording,
+                                          minmax_decimate, prepare_report)
+
+
+def make_recording(seconds, rate=500.0, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    return {
+        'time': t,
+        'north': 60.0 * t,
+        'east': 500.0 * np.sin(t / 120.0),
+        'down': -1000.0 - 50.0 * np.sin(t / 30.0),
+        'airspeed': 55.0 + rng.normal(0.0, 0.5, len(t)),
+        'frame_time': np.abs(rng.normal(0.004, 0.0005, len(t))),
+    }
+
+
+def test_minmax_decimation_keeps_extremes_in_order():
+    """Picos isolados sobrevivem, pontos limitados a ~2 por balde e tempo crescente"""
+    t = np.arange(100_003) / 500.0
+    y = np.sin(t)
+    y[31_337] = 25.0
+    y[77_777] = -25.0
+    td, yd = minmax_decimate(t, y, 500)
+
+    assert len(yd) <= 2 * 500 + 2
+    assert yd.max() == 25.0 and yd.min() == -25.0
+    assert np.all(np.diff(td) >= 0.0)
+    assert t[31_337] in td
+
+    short = np.arange(10.0)
+    assert np.array_equal(minmax_decimate(short, short, 500)[1], short)
+
+
+def test_path_decimation_keeps_bounding_box():
+    """Trajetória decimada mantém a caixa envolvente e os pontos extremos"""
+    theta = np.linspace(0.0, 20.0 * np.pi, 400_000)
+    x, y = theta * np.cos(theta), theta * np.sin(theta)
+    xd, yd = decimate_path(x, y, 1000)
+    assert len(xd) <= 4 * 1000 + 2
+    assert (xd.min(), xd.max(), yd.min(), yd.max()) == (x.min(), x.max(), y.min(), y.max())
+    assert (xd[0], xd[-1]) == (x[0], x[-1])
+
+
+def test_large_recording_prepares_quickly(tmp_path):
+    """1 h a 500 Hz vira poucos milhares de pontos por painel em bem menos de segundos"""
+    recording = make_recording(3600.0)
+    path = tmp_path / "voo.npz"
+    np.savez(path, **recording)
+
+    start = time.perf_counter()
+    report = prepare_report(load_recording(str(path)), buckets=1000)
+    elapsed = time.perf_counter() - start
+
+    assert report.samples == 1_800_000
+    assert [series.name for series in report.series] == ['airspeed']
+    assert len(report.series[0].time) <= 2002 and len(report.path[0]) <= 4002
+    assert report.altitude.values.max() == pytest.approx(1050.0, abs=0.01)
+    counts, edges = report.histogram
+    assert counts.sum() == report.samples
+    assert 3.5 < report.frame_stats['mean_ms'] < 4.5 < report.frame_stats['p99_ms']
+    assert elapsed < 5.0
+
+    counts, edges, stats = frame_time_histogram(np.full(10, 0.01), bins=4)
+    assert counts.sum() == 10 and stats['max_ms'] == pytest.approx(10.0)
+
+
+def test_report_rendered_in_worker_process(tmp_path):
+    """Relatório multi-painel gerado por outro processo (requer matplotlib)"""
+    pytest.importorskip("matplotlib")
+    path = tmp_path / "voo.npz"
+    np.savez(path, **make_recording(120.0))
+    output = tmp_path / "relatorio.png"
+    with ReportWorker() as worker:
+        assert worker.submit(str(path), str(output)).result(timeout=120) == str(output)
+    assert output.stat().st_size > 0
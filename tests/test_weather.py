@@ -0,0 +1,95 @@
+"""
+Testes do clima: vento por camadas, rajadas e turbulência em blocos
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from core.message_bus import MessageBus
+from core.data_types import AircraftState, Vector3
+from systems.weather import (DiscreteGust, TurbulenceStream, Weather, WindLayers,
+                             batch_turbulence)
+
+CONFIG = {
+    'weather': {
+        'seed': 42,
+        'wind_layers': [{'altitude': 0.0, 'speed': 10.0, 'direction_deg': 270.0},
+                        {'altitude': 2000.0, 'speed': 20.0, 'direction_deg': 270.0}],
+        'turbulence': {'model': 'dryden', 'wind_20ft': 7.7},
+    }
+}
+
+
+def test_same_seed_same_turbulence():
+    """Mesma semente reproduz exatamente a mesma sequência"""
+    a = TurbulenceStream(seed=5, block_size=1024, overlap=64)
+    b = TurbulenceStream(seed=5, block_size=1024, overlap=64)
+    seq_a = np.array([a.advance(0.37) for _ in range(500)])
+    seq_b = np.array([b.advance(0.37) for _ in range(500)])
+    assert np.array_equal(seq_a, seq_b)
+
+
+def test_unit_variance_and_dryden_correlation():
+    """Ruído gerado tem variância ~1 e autocorrelação Dryden exp(-ξ) em u"""
+    stream = TurbulenceStream(num_aircraft=40, seed=11, block_size=4096, overlap=128)
+    samples = np.array([stream.advance(0.05) for _ in range(3000)])   # (tempo, linhas)
+
+    assert abs(samples.var() - 1.0) < 0.1
+
+    u = samples[:, 0::3]
+    lag = 20   # ξ = 1
+    acf = np.mean(u[:-lag] * u[lag:]) / np.mean(u * u)
+    assert abs(acf - np.exp(-1.0)) < 0.08
+
+
+def test_batch_aircraft_are_independent():
+    """Cada aeronave do lote recebe turbulência própria"""
+    stream = TurbulenceStream(num_aircraft=2, seed=3, block_size=2048, overlap=64)
+    out = np.array([batch_turbulence(stream, [300.0, 300.0], [50.0, 50.0], 2.0, 7.7)
+                    for _ in range(2000)])
+    assert out.shape == (2000, 2, 3)
+    assert abs(np.corrcoef(out[:, 0, 2], out[:, 1, 2])[0, 1]) < 0.2
+
+
+def test_large_jump_generates_one_block():
+    """Salto de distância enorme custa um bloco novo, não um por bloco pulado; inf é rejeitado"""
+    stream = TurbulenceStream(seed=2, block_size=1024, overlap=64)
+    before = stream.blocks_generated
+    sample = stream.advance(1e12)
+    assert np.all(np.isfinite(sample))
+    assert stream.blocks_generated - before <= 2 * stream.rows
+    with pytest.raises(ValueError, match="finita"):
+        stream.advance(np.inf)
+
+
+def test_wind_layers_and_gust():
+    """Vento de oeste sopra para leste; rajada 1-cosseno volta a zero"""
+    layers = WindLayers(CONFIG['weather']['wind_layers'])
+    north, east, _ = layers.wind_ned(1000.0)
+    assert abs(north) < 1e-9
+    assert abs(east - 15.0) < 1e-6
+
+    gust = DiscreteGust((0.0, 0.0, -5.0), length=50.0)
+    peak = gust.advance(50.0)
+    assert abs(peak[2] + 5.0) < 1e-9
+    assert gust.advance(60.0) is None
+
+
+def test_publishes_environment():
+    """Weather publica no tópico 'environment' que Aerodynamics assina"""
+    bus = MessageBus()
+    weather = Weather(bus, CONFIG)
+    received = []
+    bus.subscribe('environment', received.append)
+
+    bus.publish('aircraft_state', AircraftState(Vector3(0, 0, -1500), Vector3(55, 0, 0), Vector3(0, 0, 0),
+                                                Vector3(0, 0, 0), 1000.0, (1.0, 1.0, 1.0)))
+    weather.update()
+    assert len(received) == 1
+    assert received[0].density < 1.225
+    assert any(t != 0.0 for t in received[0].turbulence_body)
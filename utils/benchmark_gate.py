@@ -0,0 +1,106 @@
+"""
+Portão de regressão de desempenho sobre resultados do pytest-benchmark
+- Lê o JSON de --benchmark-json / --benchmark-save (baseline e execução atual)
+- Regressão = média mais lenta que o limiar relativo E estatisticamente
+  significativa pelo teste t de Welch (média, desvio e nº de rodadas de cada
+  lado); ruído de máquina sozinho não reprova
+- Benchmarks que sumiram da execução atual também são reportados
+- Baseline versionado só com as estatísticas resumidas (sem as amostras brutas)
+- Uso: python utils/benchmark_gate.py baseline.json atual.json [--threshold 0.1]
+       python utils/benchmark_gate.py baseline.json atual.json --update   (regrava o baseline)
+"""
+
+from dataclasses import dataclass
+import json
+import math
+from typing import Dict, List, Optional
+
+
+@dataclass
+class BenchmarkComparison:
+    name: str
+    baseline_mean: float          # s
+    current_mean: Optional[float]
+    change: float                 # relativo (+0.2 = 20 % mais lento)
+    t_statistic: float
+    regression: bool
+
+
+def load_benchmarks(path: str) -> Dict[str, dict]:
+    """fullname → stats (mean, stddev, rounds, ...) no formato do pytest-benchmark"""
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    return {bench.get('fullname', bench['name']): bench['stats'] for bench in report['benchmarks']}
+
+
+def write_baseline(report_path: str, baseline_path: str):
+    """Copia o relatório do pytest-benchmark sem as amostras de cada rodada (stats['data'])"""
+    with open(report_path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    for bench in report['benchmarks']:
+        bench['stats'].pop('data', None)
+    with open(baseline_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def welch_t(baseline: dict, current: dict) -> float:
+    """Estatística t de Welch para (atual − baseline); positiva = mais lento"""
+    variance = (baseline['stddev'] ** 2 / max(baseline['rounds'], 1)
+                + current['stddev'] ** 2 / max(current['rounds'], 1))
+    difference = current['mean'] - baseline['mean']
+    if variance <= 0.0:
+        return math.copysign(math.inf, difference) if difference else 0.0
+    return difference / math.sqrt(variance)
+
+
+def compare_runs(baseline: Dict[str, dict], current: Dict[str, dict], threshold: float = 0.10,
+                 t_critical: float = 3.0) -> List[BenchmarkComparison]:
+    """
+    Compara benchmark a benchmark. t_critical = 3 ≈ p < 0,3 % (bilateral) para
+    rodadas suficientes: exige evidência forte antes de reprovar o CI
+    """
+    results = []
+    for name, before in baseline.items():
+        after = current.get(name)
+        if after is None:
+            results.append(BenchmarkComparison(name, before['mean'], None, math.nan, math.nan, True))
+            continue
+        change = after['mean'] / before['mean'] - 1.0
+        t = welch_t(before, after)
+        results.append(BenchmarkComparison(name, before['mean'], after['mean'], change, t,
+                                           change > threshold and t > t_critical))
+    return results
+
+
+def format_comparisons(results: List[BenchmarkComparison]) -> str:
+    lines = []
+    for r in sorted(results, key=lambda r: (not r.regression, r.name)):
+        if r.current_mean is None:
+            lines.append(f"FALTA     {r.name}")
+            continue
+        status = 'REGRESSÃO' if r.regression else 'ok'
+        lines.append(f"{status:9s} {r.name}: {r.baseline_mean * 1e6:.2f} → {r.current_mean * 1e6:.2f} µs "
+                     f"({r.change:+.1%}, t={r.t_statistic:.1f})")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Falha se algum benchmark regrediu de forma significativa")
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.10, help="piora relativa mínima (0.1 = 10 %%)")
+    parser.add_argument('--t-critical', type=float, default=3.0)
+    parser.add_argument('--update', action='store_true', help="regrava o baseline a partir da execução atual")
+    args = parser.parse_args()
+    if args.update:
+        write_baseline(args.current, args.baseline)
+        print(f"Baseline atualizado: {args.baseline}")
+        sys.exit(0)
+    comparisons = compare_runs(load_benchmarks(args.baseline), load_benchmarks(args.current),
+                               args.threshold, args.t_critical)
+    print(format_comparisons(comparisons))
+    sys.exit(1 if any(c.regression for c in comparisons) else 0)
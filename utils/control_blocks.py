@@ -0,0 +1,358 @@
+"""
+Blocos de controle componíveis e compilação de diagramas
+- Cada bloco lê sinais nomeados e escreve um sinal de saída
+- BlockDiagram.compile() ordena os blocos topologicamente uma única vez, aloca
+  a matriz de sinais (n_sinais × n_aeronaves) e liga cada bloco a visões das
+  suas linhas; evaluate() percorre a lista plana de passos com operações NumPy
+  in-place (out=), sem alocar arrays
+- Todas as operações valem para um lote de aeronaves (uma coluna por aeronave)
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+_TWO_PI = 2.0 * math.pi
+
+
+class Block:
+    """Base: 'output' é o sinal escrito, 'inputs' os sinais lidos"""
+
+    def __init__(self, output: str, inputs: Sequence[str], name: Optional[str] = None):
+        self.output = output
+        self.inputs = list(inputs)
+        self.name = name or output
+
+    def bind(self, diagram: "BlockDiagram", dt: float):
+        """Guarda visões dos sinais e aloca estados/buffers (chamado por compile)"""
+        self._in = [diagram.signal(name) for name in self.inputs]
+        self._out = diagram.signal(self.output)
+
+    def reset(self):
+        pass
+
+    def step(self):
+        raise NotImplementedError
+
+
+class Gain(Block):
+    def __init__(self, output, input, gain: float, name=None):
+        super().__init__(output, [input], name)
+        self.gain = float(gain)
+
+    def step(self):
+        np.multiply(self._in[0], self.gain, out=self._out)
+
+
+class Sum(Block):
+    """Soma com sinais: Sum('erro', ['ref', 'medida'], '+-')"""
+
+    def __init__(self, output, inputs, signs: Optional[str] = None, name=None):
+        super().__init__(output, inputs, name)
+        self.signs = signs or '+' * len(inputs)
+        if len(self.signs) != len(inputs):
+            raise ValueError(f"Sum '{self.name}': {len(inputs)} entradas e {len(self.signs)} sinais")
+
+    def step(self):
+        out = self._out
+        if self.signs[0] == '+':
+            np.copyto(out, self._in[0])
+        else:
+            np.negative(self._in[0], out=out)
+        for sign, value in zip(self.signs[1:], self._in[1:]):
+            if sign == '+':
+                np.add(out, value, out=out)
+            else:
+                np.subtract(out, value, out=out)
+
+
+class Saturation(Block):
+    def __init__(self, output, input, lower: float, upper: float, name=None):
+        super().__init__(output, [input], name)
+        self.lower, self.upper = float(lower), float(upper)
+
+    def step(self):
+        np.clip(self._in[0], self.lower, self.upper, out=self._out)
+
+
+class Wrap(Block):
+    """Ângulo reduzido a [-π, π)"""
+
+    def __init__(self, output, input, name=None):
+        super().__init__(output, [input], name)
+
+    def step(self):
+        out = self._out
+        np.add(self._in[0], math.pi, out=out)
+        np.remainder(out, _TWO_PI, out=out)
+        np.subtract(out, math.pi, out=out)
+
+
+class Switch(Block):
+    """Saída = on_true onde condition > 0.5, senão on_false"""
+
+    def __init__(self, output, condition, on_true, on_false, name=None):
+        super().__init__(output, [condition, on_true, on_false], name)
+
+    def bind(self, diagram, dt):
+        super().bind(diagram, dt)
+        self._mask = np.zeros(diagram.batch_size, dtype=bool)
+
+    def step(self):
+        condition, on_true, on_false = self._in
+        np.greater(condition, 0.5, out=self._mask)
+        np.copyto(self._out, on_false)
+        np.copyto(self._out, on_true, where=self._mask)
+
+
+class RateLimiter(Block):
+    """Limita a taxa de variação da saída a ±rate [unidades/s]"""
+
+    def __init__(self, output, input, rate: float, name=None):
+        super().__init__(output, [input], name)
+        self.rate = float(rate)
+
+    def bind(self, diagram, dt):
+        super().bind(diagram, dt)
+        self._max_step = self.rate * dt
+        self._delta = np.zeros(diagram.batch_size)
+        self._primed = False
+
+    def reset(self):
+        self._primed = False
+
+    def step(self):
+        out = self._out
+        if not self._primed:
+            np.copyto(out, self._in[0])
+            self._primed = True
+            return
+        np.subtract(self._in[0], out, out=self._delta)
+        np.clip(self._delta, -self._max_step, self._max_step, out=self._delta)
+        np.add(out, self._delta, out=out)
+
+
+class PID(Block):
+    """
+    PID com derivada filtrada (polo em 'derivative_filter' rad/s) e integrador
+    limitado à faixa de saída (anti-windup por grampeamento)
+    """
+
+    def __init__(self, output, input, kp: float, ki: float = 0.0, kd: float = 0.0,
+                 lower: float = -math.inf, upper: float = math.inf, derivative_filter: float = 20.0, name=None):
+        super().__init__(output, [input], name)
+        self.kp, self.ki, self.kd = float(kp), float(ki), float(kd)
+        self.lower, self.upper = float(lower), float(upper)
+        self.derivative_filter = float(derivative_filter)
+
+    def bind(self, diagram, dt):
+        super().bind(diagram, dt)
+        batch = diagram.batch_size
+        self._ki_dt = self.ki * dt
+        # Derivada filtrada por Euler regressivo: d = (Tf·d + kd·Δe) / (Tf + dt)
+        tf = 1.0 / self.derivative_filter
+        self._d_decay = tf / (tf + dt)
+        self._d_gain = self.kd / (tf + dt)
+        self._integral = np.zeros(batch)
+        self._derivative = np.zeros(batch)
+        self._previous = np.zeros(batch)
+        self._tmp = np.zeros(batch)
+        self._primed = False
+
+    def reset(self):
+        self._integral[:] = 0.0
+        self._derivative[:] = 0.0
+        self._primed = False
+
+    def step(self):
+        error, out, tmp = self._in[0], self._out, self._tmp
+        if not self._primed:
+            np.copyto(self._previous, error)   # sem chute derivativo no engate
+            self._primed = True
+
+        if self.ki:
+            np.multiply(error, self._ki_dt, out=tmp)
+            np.add(self._integral, tmp, out=self._integral)
+            np.clip(self._integral, self.lower, self.upper, out=self._integral)
+        if self.kd:
+            np.subtract(error, self._previous, out=tmp)
+            np.multiply(tmp, self._d_gain, out=tmp)
+            np.multiply(self._derivative, self._d_decay, out=self._derivative)
+            np.add(self._derivative, tmp, out=self._derivative)
+            np.copyto(self._previous, error)
+
+        np.multiply(error, self.kp, out=out)
+        np.add(out, self._integral, out=out)
+        np.add(out, self._derivative, out=out)
+        np.clip(out, self.lower, self.upper, out=out)
+
+
+class TransferFunction(Block):
+    """
+    Função de transferência discreta em z⁻¹ (forma direta II transposta):
+    H(z) = (b0 + b1 z⁻¹ + ...) / (1 + a1 z⁻¹ + ...)
+    """
+
+    def __init__(self, output, input, num: Sequence[float], den: Sequence[float], name=None):
+        super().__init__(output, [input], name)
+        self.num, self.den = self._normalize(num, den)
+
+    @staticmethod
+    def _normalize(num, den):
+        num = np.asarray(num, dtype=float)
+        den = np.asarray(den, dtype=float)
+        order = max(len(num), len(den))
+        num = np.pad(num, (0, order - len(num)))
+        den = np.pad(den, (0, order - len(den)))
+        return num / den[0], den / den[0]
+
+    def _coefficients(self, dt):
+        return self.num, self.den
+
+    def bind(self, diagram, dt):
+        super().bind(diagram, dt)
+        self._b, self._a = (tuple(c.tolist()) for c in self._coefficients(dt))
+        self._z = np.zeros((max(len(self._b) - 1, 0), diagram.batch_size))
+        self._tmp = np.zeros(diagram.batch_size)
+        self._tmp2 = np.zeros(diagram.batch_size)
+        self._primed = False
+
+    def reset(self):
+        self._z[:] = 0.0
+        self._primed = False
+
+    def _prime(self, x):
+        """Estados de regime para a entrada atual (sem transitório na partida)"""
+        b, a = np.array(self._b), np.array(self._a)
+        dc_gain = b.sum() / a.sum()
+        y = dc_gain * x
+        # z_i = Σ_{k>i} (b_k x - a_k y)
+        for i in range(len(self._z)):
+            self._z[i] = b[i + 1:].sum() * x - a[i + 1:].sum() * y
+
+    def step(self):
+        x, y, z = self._in[0], self._out, self._z
+        if not self._primed:
+            self._prime(x)
+            self._primed = True
+        b, a = self._b, self._a
+        np.multiply(x, b[0], out=y)
+        if len(z) == 0:
+            return
+        np.add(y, z[0], out=y)
+        last = len(z) - 1
+        for i in range(len(z)):
+            np.multiply(x, b[i + 1], out=self._tmp)
+            np.multiply(y, a[i + 1], out=self._tmp2)
+            np.subtract(self._tmp, self._tmp2, out=self._tmp)
+            if i < last:
+                np.add(self._tmp, z[i + 1], out=z[i])
+            else:
+                np.copyto(z[i], self._tmp)
+
+
+class LeadLag(TransferFunction):
+    """gain · (lead·s + 1) / (lag·s + 1) discretizado por Tustin no passo do diagrama"""
+
+    def __init__(self, output, input, lead: float, lag: float, gain: float = 1.0, name=None):
+        Block.__init__(self, output, [input], name)
+        self.lead, self.lag, self.gain = float(lead), float(lag), float(gain)
+
+    def _coefficients(self, dt):
+        k = 2.0 / dt
+        num = [self.gain * (self.lead * k + 1.0), self.gain * (1.0 - self.lead * k)]
+        den = [self.lag * k + 1.0, 1.0 - self.lag * k]
+        return self._normalize(num, den)
+
+
+class FirstOrderLag(LeadLag):
+    """1 / (tau·s + 1) - dinâmica de atuador"""
+
+    def __init__(self, output, input, tau: float, name=None):
+        super().__init__(output, input, lead=0.0, lag=tau, name=name)
+
+
+class BlockDiagram:
+    """Diagrama de blocos compilado para avaliação plana e vetorizada"""
+
+    def __init__(self, blocks: Sequence[Block] = (), batch_size: int = 1):
+        self.blocks: List[Block] = list(blocks)
+        self.batch_size = batch_size
+        self.index: Dict[str, int] = {}
+        self.signals = None
+        self.order: List[Block] = []
+        self._steps = []
+
+    def add(self, block: Block) -> Block:
+        self.blocks.append(block)
+        return block
+
+    def compile(self, dt: float) -> "BlockDiagram":
+        """Ordem topológica, matriz de sinais e ligação dos blocos - uma única vez"""
+        writers = {}
+        for block in self.blocks:
+            if block.output in writers:
+                raise ValueError(f"Sinal '{block.output}' escrito por mais de um bloco")
+            writers[block.output] = block
+
+        names = []
+        for block in self.blocks:
+            for name in block.inputs + [block.output]:
+                if name not in self.index:
+                    self.index[name] = len(names)
+                    names.append(name)
+
+        # Kahn: um bloco fica pronto quando todos os sinais lidos já foram escritos
+        pending = {id(b): sum(1 for n in b.inputs if n in writers) for b in self.blocks}
+        readers = {}
+        for block in self.blocks:
+            for name in block.inputs:
+                readers.setdefault(name, []).append(block)
+        ready = [b for b in self.blocks if pending[id(b)] == 0]
+        order = []
+        while ready:
+            block = ready.pop(0)
+            order.append(block)
+            for reader in readers.get(block.output, ()):
+                pending[id(reader)] -= 1
+                if pending[id(reader)] == 0:
+                    ready.append(reader)
+        if len(order) != len(self.blocks):
+            stuck = sorted(b.name for b in self.blocks if b not in order)
+            raise ValueError(f"Laço algébrico no diagrama: {stuck}")
+
+        self.signals = np.zeros((len(names), self.batch_size))
+        self.order = order
+        for block in order:
+            block.bind(self, dt)
+        self._steps = [block.step for block in order]
+        return self
+
+    @property
+    def external_inputs(self) -> List[str]:
+        """Sinais lidos que nenhum bloco escreve (entradas do diagrama)"""
+        written = {b.output for b in self.blocks}
+        return [name for name in self.index if name not in written]
+
+    def signal(self, name: str) -> np.ndarray:
+        """Visão (linha) do sinal - escrever nela alimenta o diagrama sem cópia"""
+        return self.signals[self.index[name]]
+
+    def set(self, name: str, value):
+        self.signals[self.index[name]] = value
+
+    def block(self, name: str) -> Block:
+        for block in self.blocks:
+            if block.name == name:
+                return block
+        raise KeyError(name)
+
+    def reset(self, names: Optional[Sequence[str]] = None):
+        for block in self.order:
+            if names is None or block.name in names:
+                block.reset()
+
+    def evaluate(self):
+        for step in self._steps:
+            step()
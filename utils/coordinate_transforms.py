@@ -0,0 +1,226 @@
+"""
+Transformações de coordenadas WGS-84: LLA ↔ ECEF ↔ NED e corpo ↔ NED
+- Todas as funções são vetorizadas (escalares ou arrays com broadcast, sem laços Python)
+- ECEF → LLA em forma fechada (Heikkinen), sem iteração
+- LocalTangentPlane guarda a origem ECEF e a rotação ECEF→NED; planos iguais
+  são reaproveitados pelo cache de local_tangent_plane()
+Latitude/longitude em graus, ângulos de atitude em radianos, distâncias em metros
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# Elipsoide WGS-84
+WGS84_A = 6378137.0
+WGS84_F = 1.0 / 298.257223563
+WGS84_B = WGS84_A * (1.0 - WGS84_F)
+WGS84_E2 = WGS84_F * (2.0 - WGS84_F)
+WGS84_EP2 = (WGS84_A ** 2 - WGS84_B ** 2) / WGS84_B ** 2
+
+
+def earth_radii(lat_deg):
+    """(raio meridional M, raio do primeiro vertical N) [m] na latitude dada"""
+    s = np.sin(np.radians(lat_deg))
+    w2 = 1.0 - WGS84_E2 * s * s
+    prime_vertical = WGS84_A / np.sqrt(w2)
+    meridian = prime_vertical * (1.0 - WGS84_E2) / w2
+    return meridian, prime_vertical
+
+
+def lla_to_ecef(lat_deg, lon_deg, alt_m):
+    """Geodésicas (graus, graus, m) → ECEF (m)"""
+    lat = np.radians(lat_deg)
+    lon = np.radians(lon_deg)
+    s_lat, c_lat = np.sin(lat), np.cos(lat)
+    n = WGS84_A / np.sqrt(1.0 - WGS84_E2 * s_lat * s_lat)
+    x = (n + alt_m) * c_lat * np.cos(lon)
+    y = (n + alt_m) * c_lat * np.sin(lon)
+    z = (n * (1.0 - WGS84_E2) + alt_m) * s_lat
+    return x, y, z
+
+
+def ecef_to_lla(x, y, z):
+    """ECEF (m) → geodésicas (graus, graus, m) - solução fechada de Heikkinen"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    z = np.asarray(z, dtype=float)
+    a2 = WGS84_A ** 2
+    b2 = WGS84_B ** 2
+    e2 = WGS84_E2
+    e4 = e2 * e2
+
+    p2 = x * x + y * y
+    p = np.sqrt(p2)
+    z2 = z * z
+    f = 54.0 * b2 * z2
+    g = p2 + (1.0 - e2) * z2 - e2 * (a2 - b2)
+    c = e4 * f * p2 / (g * g * g)
+    s = np.cbrt(1.0 + c + np.sqrt(c * c + 2.0 * c))
+    k = s + 1.0 + 1.0 / s
+    big_p = f / (3.0 * k * k * g * g)
+    q = np.sqrt(1.0 + 2.0 * e4 * big_p)
+    r0 = (-(big_p * e2 * p) / (1.0 + q)
+          + np.sqrt(np.maximum(0.5 * a2 * (1.0 + 1.0 / q)
+                               - big_p * (1.0 - e2) * z2 / (q * (1.0 + q))
+                               - 0.5 * big_p * p2, 0.0)))
+    d = p - e2 * r0
+    u = np.sqrt(d * d + z2)
+    v = np.sqrt(d * d + (1.0 - e2) * z2)
+    z0 = b2 * z / (WGS84_A * v)
+
+    alt = u * (1.0 - b2 / (WGS84_A * v))
+    lat = np.degrees(np.arctan2(z + WGS84_EP2 * z0, p))
+    lon = np.degrees(np.arctan2(y, x))
+    return lat, lon, alt
+
+
+def ecef_to_ned_matrix(lat_deg, lon_deg) -> np.ndarray:
+    """Matriz de rotação ECEF → NED na origem dada (3x3)"""
+    lat = np.radians(lat_deg)
+    lon = np.radians(lon_deg)
+    s_lat, c_lat = np.sin(lat), np.cos(lat)
+    s_lon, c_lon = np.sin(lon), np.cos(lon)
+    return np.array([[-s_lat * c_lon, -s_lat * s_lon, c_lat],
+                     [-s_lon, c_lon, 0.0],
+                     [-c_lat * c_lon, -c_lat * s_lon, -s_lat]])
+
+
+class LocalTangentPlane:
+    """Plano tangente local NED com origem e rotação pré-computadas"""
+
+    def __init__(self, lat_deg: float, lon_deg: float, alt_m: float = 0.0):
+        self.origin_lla = (float(lat_deg), float(lon_deg), float(alt_m))
+        self.origin_ecef = np.array(lla_to_ecef(lat_deg, lon_deg, alt_m), dtype=float)
+        self.rotation = ecef_to_ned_matrix(lat_deg, lon_deg)   # ECEF → NED
+
+    def ecef_to_ned(self, x, y, z):
+        delta = np.stack(np.broadcast_arrays(x, y, z), axis=-1) - self.origin_ecef
+        ned = delta @ self.rotation.T
+        return ned[..., 0], ned[..., 1], ned[..., 2]
+
+    def ned_to_ecef(self, north, east, down):
+        ned = np.stack(np.broadcast_arrays(north, east, down), axis=-1).astype(float)
+        ecef = ned @ self.rotation + self.origin_ecef
+        return ecef[..., 0], ecef[..., 1], ecef[..., 2]
+
+    def lla_to_ned(self, lat_deg, lon_deg, alt_m):
+        return self.ecef_to_ned(*lla_to_ecef(lat_deg, lon_deg, alt_m))
+
+    def ned_to_lla(self, north, east, down):
+        return ecef_to_lla(*self.ned_to_ecef(north, east, down))
+
+
+@lru_cache(maxsize=64)
+def local_tangent_plane(lat_deg: float, lon_deg: float, alt_m: float = 0.0) -> LocalTangentPlane:
+    """Plano tangente local reaproveitado para a mesma origem"""
+    return LocalTangentPlane(lat_deg, lon_deg, alt_m)
+
+
+def geodetic_rates(lat_deg, alt_m, v_north, v_east, v_down):
+    """
+    Derivadas (lat, lon, alt) [graus/s, graus/s, m/s] para velocidade NED
+    sobre o elipsoide (raios meridional e do primeiro vertical)
+    """
+    meridian, prime_vertical = earth_radii(lat_deg)
+    lat_dot = v_north / (meridian + alt_m)
+    lon_dot = v_east / ((prime_vertical + alt_m) * np.cos(np.radians(lat_deg)))
+    return np.degrees(lat_dot), np.degrees(lon_dot), -np.asarray(v_down)
+
+
+def euler_to_dcm(phi, theta, psi) -> np.ndarray:
+    """
+    Matriz corpo → NED (sequência 3-2-1) a partir dos ângulos de Euler [rad]
+    Para entradas em array retorna (..., 3, 3)
+    """
+    s_phi, c_phi = np.sin(phi), np.cos(phi)
+    s_theta, c_theta = np.sin(theta), np.cos(theta)
+    s_psi, c_psi = np.sin(psi), np.cos(psi)
+    dcm = np.array([
+        [c_theta * c_psi, s_phi * s_theta * c_psi - c_phi * s_psi, c_phi * s_theta * c_psi + s_phi * s_psi],
+        [c_theta * s_psi, s_phi * s_theta * s_psi + c_phi * c_psi, c_phi * s_theta * s_psi - s_phi * c_psi],
+        [-s_theta, s_phi * c_theta, c_phi * c_theta],
+    ])
+    return np.moveaxis(dcm, (0, 1), (-2, -1)) if dcm.ndim > 2 else dcm
+
+
+def body_to_ned(vectors, phi, theta, psi):
+    """Rotaciona vetores (..., 3) do corpo para NED"""
+    return np.einsum('...ij,...j->...i', euler_to_dcm(phi, theta, psi), vectors)
+
+
+def ned_to_body(vectors, phi, theta, psi):
+    """Rotaciona vetores (..., 3) de NED para o corpo"""
+    return np.einsum('...ji,...j->...i', euler_to_dcm(phi, theta, psi), vectors)
+
+
+def dcm_to_euler(dcm):
+    """Ângulos de Euler (phi, theta, psi) [rad] a partir da matriz corpo → NED"""
+    dcm = np.asarray(dcm, dtype=float)
+    phi = np.arctan2(dcm[..., 2, 1], dcm[..., 2, 2])
+    theta = -np.arcsin(np.clip(dcm[..., 2, 0], -1.0, 1.0))
+    psi = np.arctan2(dcm[..., 1, 0], dcm[..., 0, 0])
+    return phi, theta, psi
+
+
+def euler_to_quaternion(phi, theta, psi) -> np.ndarray:
+    """Quaternion corpo → NED [w, x, y, z] (sequência 3-2-1); para arrays retorna (..., 4)"""
+    s_phi, c_phi = np.sin(np.multiply(phi, 0.5)), np.cos(np.multiply(phi, 0.5))
+    s_theta, c_theta = np.sin(np.multiply(theta, 0.5)), np.cos(np.multiply(theta, 0.5))
+    s_psi, c_psi = np.sin(np.multiply(psi, 0.5)), np.cos(np.multiply(psi, 0.5))
+    return np.stack([
+        c_phi * c_theta * c_psi + s_phi * s_theta * s_psi,
+        s_phi * c_theta * c_psi - c_phi * s_theta * s_psi,
+        c_phi * s_theta * c_psi + s_phi * c_theta * s_psi,
+        c_phi * c_theta * s_psi - s_phi * s_theta * c_psi,
+    ], axis=-1)
+
+
+def quaternion_to_euler(q):
+    """Ângulos de Euler (phi, theta, psi) [rad] a partir do quaternion corpo → NED"""
+    q = np.asarray(q, dtype=float)
+    w, x, y, z = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    phi = np.arctan2(2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y))
+    theta = np.arcsin(np.clip(2.0 * (w * y - z * x), -1.0, 1.0))
+    psi = np.arctan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))
+    return phi, theta, psi
+
+
+def quaternion_multiply(a, b) -> np.ndarray:
+    """Produto de Hamilton a ⊗ b (aplica b e depois a; com b no corpo: rotação incremental)"""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    aw, ax, ay, az = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    bw, bx, by, bz = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+    return np.stack([
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ], axis=-1)
+
+
+def rotation_quaternion(rotation_vector) -> np.ndarray:
+    """Quaternion de uma rotação θ·n (vetor de rotação [rad], ex.: ω·dt)"""
+    rotation_vector = np.asarray(rotation_vector, dtype=float)
+    angle = np.linalg.norm(rotation_vector, axis=-1, keepdims=True)
+    # sin(θ/2)/θ → 1/2 quando θ → 0 (evita 0/0)
+    scale = np.where(angle > 1e-12, np.sin(0.5 * angle) / np.where(angle > 1e-12, angle, 1.0), 0.5)
+    return np.concatenate([np.cos(0.5 * angle), scale * rotation_vector], axis=-1)
+
+
+def quaternion_slerp(q0, q1, fraction) -> np.ndarray:
+    """Interpolação esférica pelo caminho mais curto (q e -q são a mesma atitude)"""
+    q0, q1 = np.asarray(q0, dtype=float), np.asarray(q1, dtype=float)
+    dot = np.sum(q0 * q1, axis=-1, keepdims=True)
+    q1 = np.where(dot < 0.0, -q1, q1)
+    dot = np.abs(dot)
+    fraction = np.asarray(fraction, dtype=float)[..., None] if np.ndim(fraction) else fraction
+    # Quase paralelos: interpolação linear normalizada (sin(Ω) → 0)
+    angle = np.arccos(np.clip(dot, -1.0, 1.0))
+    sin_angle = np.sin(angle)
+    near = sin_angle < 1e-6
+    safe = np.where(near, 1.0, sin_angle)
+    w0 = np.where(near, 1.0 - fraction, np.sin((1.0 - fraction) * angle) / safe)
+    w1 = np.where(near, fraction, np.sin(fraction * angle) / safe)
+    q = w0 * q0 + w1 * q1
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
@@ -0,0 +1,159 @@
+"""
+Tabelas de interpolação pré-computadas em grade regular
+- Índice da célula obtido em O(1) (espaçamento uniforme por eixo)
+- Interpolação multilinear vetorizada para lotes (arrays NumPy)
+- Caminho escalar num kernel "estilo C" para o laço de frame (sem overhead de arrays
+  pequenos; Python puro ou Numba, ver utils/jit.py)
+"""
+
+from typing import Callable, Sequence
+
+import numpy as np
+
+from utils import jit
+
+
+def resample_uniform(breakpoints, values, num_points: int = 64):
+    """
+    Reamostra uma tabela com breakpoints arbitrários (ex.: vinda do YAML)
+    para uma grade uniforme, permitindo busca de célula em O(1)
+    """
+    x = np.asarray(breakpoints, dtype=float)
+    y = np.asarray(values, dtype=float)
+    if x.ndim != 1 or x.shape != y.shape or x.size < 2:
+        raise ValueError("breakpoints e values devem ser vetores 1-D do mesmo tamanho (>= 2)")
+    if np.any(np.diff(x) <= 0.0):
+        raise ValueError("breakpoints devem ser estritamente crescentes")
+
+    grid = np.linspace(x[0], x[-1], num_points)
+    return grid, np.interp(grid, x, y)
+
+
+def interp_multilinear(flat, origin, inv_step, last_cell, strides, corner_offsets, coords, fracs, work):
+    """
+    Um ponto numa grade regular, saturando nas bordas; reduz os 2^N cantos por
+    interpolações lineares sucessivas, do eixo 0 ao último (fracs e work são rascunho)
+    """
+    base = 0
+    for d in range(len(origin)):
+        pos = (coords[d] - origin[d]) * inv_step[d]
+        last = last_cell[d]
+        if pos <= 0.0:
+            idx, frac = 0, 0.0
+        elif pos >= last + 1.0:
+            idx, frac = last, 1.0
+        else:
+            idx = int(pos)
+            if idx > last:
+                idx = last
+            frac = pos - idx
+        fracs[d] = frac
+        base += idx * strides[d]
+
+    count = len(corner_offsets)
+    for i in range(count):
+        work[i] = flat[base + corner_offsets[i]]
+    for d in range(len(origin)):
+        count >>= 1
+        for i in range(count):
+            work[i] = work[i] + fracs[d] * (work[i + count] - work[i])
+    return work[0]
+
+
+@jit.register_warmup
+def _warm_up():
+    LookupTable([[0.0, 1.0], [0.0, 1.0]], [[0.0, 1.0], [2.0, 3.0]]).scalar(0.25, 0.75)
+
+
+class LookupTable:
+    """
+    Tabela N-D em grade regular com interpolação multilinear e saturação nas bordas
+    """
+
+    def __init__(self, axes: Sequence[Sequence[float]], values):
+        self.axes = [np.asarray(a, dtype=float) for a in axes]
+        self.values = np.ascontiguousarray(values, dtype=float)
+        self.ndim = len(self.axes)
+
+        if self.values.shape != tuple(a.size for a in self.axes):
+            raise ValueError(f"Formato da tabela {self.values.shape} não corresponde aos eixos "
+                             f"{tuple(a.size for a in self.axes)}")
+
+        self._origin = []
+        self._inv_step = []
+        self._last_cell = []
+        for axis in self.axes:
+            if axis.size < 2:
+                raise ValueError("Cada eixo precisa de pelo menos 2 pontos")
+            steps = np.diff(axis)
+            if np.any(steps <= 0.0) or not np.allclose(steps, steps[0], rtol=1e-9, atol=0.0):
+                raise ValueError("Eixos devem ser uniformes e crescentes (use resample_uniform)")
+            self._origin.append(float(axis[0]))
+            self._inv_step.append(1.0 / float(steps[0]))
+            self._last_cell.append(axis.size - 2)
+
+        # Strides em número de elementos para indexação plana
+        self._strides = [s // self.values.itemsize for s in self.values.strides]
+        self._flat = self.values.ravel()
+        self._flat_list = self._flat.tolist()
+
+        # Deslocamentos dos 2^N cantos da célula (pré-computados)
+        self._corners = []
+        for corner in range(1 << self.ndim):
+            bits = [(corner >> d) & 1 for d in range(self.ndim)]
+            offset = sum(b * s for b, s in zip(bits, self._strides))
+            self._corners.append((bits, offset))
+        # Ordem dos cantos com o eixo 0 como bit mais significativo (usada no caminho escalar)
+        self._corner_offsets = []
+        for corner in range(1 << self.ndim):
+            bits = [(corner >> (self.ndim - 1 - d)) & 1 for d in range(self.ndim)]
+            self._corner_offsets.append(sum(b * s for b, s in zip(bits, self._strides)))
+
+        # Kernel escalar e seus argumentos no formato do backend (utils/jit.py)
+        self._kernel_backend = jit.backend()
+        self._interp = jit.compiled(interp_multilinear)
+        self._flat_kernel = jit.buffer(self._flat_list)
+        self._origin_kernel = jit.buffer(self._origin)
+        self._inv_step_kernel = jit.buffer(self._inv_step)
+        self._last_cell_kernel = jit.buffer(self._last_cell, dtype=int)
+        self._strides_kernel = jit.buffer(self._strides, dtype=int)
+        self._corner_offsets_kernel = jit.buffer(self._corner_offsets, dtype=int)
+        self._fracs_kernel = jit.buffer(self.ndim)
+        self._work_kernel = jit.buffer(len(self._corner_offsets))
+
+    @classmethod
+    def from_function(cls, axes: Sequence[Sequence[float]], func: Callable):
+        """Pré-computa a tabela avaliando func(*grade) uma única vez"""
+        axes = [np.asarray(a, dtype=float) for a in axes]
+        mesh = np.meshgrid(*axes, indexing="ij")
+        return cls(axes, np.broadcast_to(func(*mesh), mesh[0].shape))
+
+    def __call__(self, *coords):
+        """Interpolação vetorizada; aceita escalares ou arrays com broadcast"""
+        if len(coords) != self.ndim:
+            raise ValueError(f"Esperadas {self.ndim} coordenadas, recebidas {len(coords)}")
+
+        coords = np.broadcast_arrays(*[np.asarray(c, dtype=float) for c in coords])
+        base = np.zeros(coords[0].shape, dtype=np.intp)
+        fracs = []
+        for d, c in enumerate(coords):
+            pos = np.clip((c - self._origin[d]) * self._inv_step[d], 0.0, self._last_cell[d] + 1.0)
+            idx = np.minimum(pos.astype(np.intp), self._last_cell[d])
+            fracs.append(pos - idx)
+            base += idx * self._strides[d]
+
+        result = np.zeros(coords[0].shape, dtype=float)
+        for bits, offset in self._corners:
+            weight = np.ones(coords[0].shape, dtype=float)
+            for d, bit in enumerate(bits):
+                weight *= fracs[d] if bit else (1.0 - fracs[d])
+            result += weight * self._flat[base + offset]
+        return result
+
+    def scalar(self, *coords) -> float:
+        """Interpolação de um único ponto (caminho rápido por frame, kernel interp_multilinear)"""
+        if self._kernel_backend != 'python':
+            coords = jit.buffer(coords, self._kernel_backend)
+        return self._interp(self._flat_kernel, self._origin_kernel, self._inv_step_kernel, self._last_cell_kernel,
+                            self._strides_kernel, self._corner_offsets_kernel, coords,
+                            self._fracs_kernel, self._work_kernel)
@@ -0,0 +1,98 @@
+"""
+Backend dos kernels numéricos do laço de frame (feature flag)
+- Kernels escritos uma única vez em Python "estilo C": só escalares, laços e buffers
+  pré-alocados - rodam como estão no CPython e compilam sem alteração no Numba
+- 'python' (padrão): as próprias funções, operando sobre listas
+- 'numba': numba.njit(cache=True) das mesmas funções, sobre arrays float64; sem
+  fastmath, a ordem das operações é a mesma do caminho Python (a equivalência é
+  conferida em tests/test_kernels.py quando numba está instalado)
+- 'auto': numba se estiver instalado, senão python
+- Escolha por simulation.kernels no YAML ou pela variável FLIGHTSIM_KERNELS (que tem
+  precedência); deve ser feita antes de construir os módulos, que resolvem os kernels
+  e alocam seus buffers no construtor
+- warm_up() chama cada kernel uma vez na partida: a compilação (ou a leitura do cache
+  em __pycache__) acontece fora do laço de frame
+"""
+
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+BACKENDS = ('python', 'numba', 'auto')
+ENV_VAR = 'FLIGHTSIM_KERNELS'
+
+_BACKEND: Optional[str] = None
+_COMPILED: Dict[Tuple[Callable, str], Callable] = {}
+_WARMUPS: List[Callable[[], None]] = []
+
+
+def _numba():
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba
+
+
+def numba_available() -> bool:
+    return _numba() is not None
+
+
+def select_backend(name: Optional[str] = None) -> str:
+    """Resolve o backend pedido (variável de ambiente > argumento > 'python')"""
+    global _BACKEND
+    requested = os.environ.get(ENV_VAR) or name or 'python'
+    if requested not in BACKENDS:
+        raise ValueError(f"Backend de kernels desconhecido: {requested!r} (opções: {', '.join(BACKENDS)})")
+    if requested == 'auto':
+        requested = 'numba' if numba_available() else 'python'
+    elif requested == 'numba' and not numba_available():
+        raise ImportError("Backend 'numba' pedido mas numba não está instalado (pip install numba)")
+    _BACKEND = requested
+    return requested
+
+
+def backend() -> str:
+    if _BACKEND is None:
+        select_backend()
+    return _BACKEND
+
+
+def compiled(func: Callable, backend_name: Optional[str] = None) -> Callable:
+    """Versão do kernel para o backend (a própria função no backend python)"""
+    name = backend_name or backend()
+    if name == 'python':
+        return func
+    key = (func, name)
+    if key not in _COMPILED:
+        _COMPILED[key] = _numba().njit(cache=True)(func)
+    return _COMPILED[key]
+
+
+def buffer(values, backend_name: Optional[str] = None, dtype=float):
+    """
+    Buffer no formato que o backend indexa mais rápido: lista no CPython (sem criar
+    escalares NumPy a cada acesso), array contíguo float64/int64 no Numba.
+    Um inteiro em values pede um buffer de zeros desse tamanho. Sempre copia: os
+    kernels escrevem nos buffers, e o array do chamador não pode mudar junto
+    """
+    if isinstance(values, int):
+        values = [0] * values
+    if (backend_name or backend()) == 'python':
+        return [dtype(v) for v in values]
+    import numpy as np
+    return np.array(values, dtype=np.float64 if dtype is float else np.int64, copy=True)
+
+
+def register_warmup(func: Callable[[], None]) -> Callable[[], None]:
+    """Decorador para a rotina que exercita os kernels de um módulo"""
+    _WARMUPS.append(func)
+    return func
+
+
+def warm_up() -> float:
+    """Compila/carrega todos os kernels registrados; devolve o tempo gasto [s]"""
+    start = time.perf_counter()
+    for func in _WARMUPS:
+        func()
+    return time.perf_counter() - start
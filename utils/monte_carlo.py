@@ -0,0 +1,412 @@
+"""
+Varreduras de parâmetros e dispersões Monte Carlo sem interface gráfica
+- Especificação em YAML: manobra do check ride, grade (produto cartesiano) e
+  distribuições sobre valores do veículo ('vehicle.<caminho>') e condições
+  iniciais ('initial.<nome>')
+- Parâmetros da rodada i dependem só de (seed, i): qualquer subconjunto pode ser
+  refeito ou retomado sem mudar as outras rodadas
+- Rodadas em processos (spawn) com janela limitada de tarefas em voo; cada
+  resumo volta por streaming e é gravado como uma linha JSON assim que chega
+- Agregação online em memória constante: Welford (média/variância) e histograma
+  de bins fixos que dobra a faixa quando preciso (quantis)
+- Retomada: rodadas já presentes no arquivo de resultados não são refeitas
+- Uso: python utils/monte_carlo.py varredura.yaml --results resultados.jsonl
+
+Exemplo de especificação:
+    maneuver: trim_cruise
+    samples: 50                  # sorteios por ponto da grade
+    seed: 7
+    grid:
+      vehicle.mass_properties.components[rear_passengers].mass: [0.0, 40.0, 80.0]
+    distributions:
+      initial.airspeed: {normal: [50.0, 2.0]}
+      vehicle.propulsion.engine.rated_power: {uniform: [120000.0, 134226.0]}
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+import hashlib
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import re
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+if __name__ == '__main__':
+    # Só como script (python utils/monte_carlo.py): importar o módulo não mexe no sys.path
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.validation_tools import CHECK_RIDE, VEHICLE_CONFIG, Maneuver, run_maneuver
+
+DISTRIBUTIONS = ('normal', 'uniform', 'choice')
+_SELECTOR = re.compile(r'^([^\[\]]+)(?:\[([^\[\]]+)\])?$')
+
+
+# ============================================================== estatística online
+
+class RunningStats:
+    """Welford: média e variância numericamente estáveis, mínimo e máximo"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        """Variância amostral (n − 1)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class StreamingHistogram:
+    """
+    Quantis em memória fixa: as primeiras `bins` amostras ficam guardadas (quantis
+    exatos); depois, histograma de `bins` bins iguais cuja faixa dobra (juntando
+    pares de bins) sempre que chega valor fora dela. Erro ≤ largura de um bin
+    """
+
+    def __init__(self, bins: int = 1024):
+        if bins < 2 or bins % 2:
+            raise ValueError("bins deve ser par e >= 2")
+        self.bins = bins
+        self._buffer: Optional[List[float]] = []
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.low = 0.0
+        self.width = 0.0
+
+    def add(self, value: float):
+        if self._buffer is not None:
+            self._buffer.append(value)
+            if len(self._buffer) == self.bins:
+                self._start_histogram()
+            return
+        while value < self.low:
+            self._double(keep_high=True)
+        while value >= self.low + self.width * self.bins:
+            self._double(keep_high=False)
+        self.counts[min(int((value - self.low) / self.width), self.bins - 1)] += 1
+
+    def _start_histogram(self):
+        values = np.array(self._buffer)
+        self._buffer = None
+        self.low = float(values.min())
+        span = float(values.max()) - self.low
+        self.width = (span if span > 0.0 else max(abs(self.low), 1.0) * 1e-9) * (1.0 + 1e-9) / self.bins
+        for value in values:
+            self.counts[min(int((value - self.low) / self.width), self.bins - 1)] += 1
+
+    def _double(self, keep_high: bool):
+        half = self.bins // 2
+        merged = self.counts[0::2] + self.counts[1::2]
+        self.counts[:] = 0
+        if keep_high:
+            # faixa antiga vira a metade de cima; cresce para baixo
+            self.low -= self.width * self.bins
+            self.counts[half:] = merged
+        else:
+            self.counts[:half] = merged
+        self.width *= 2.0
+
+    def quantile(self, q: float) -> float:
+        if self._buffer is not None:
+            return float(np.quantile(self._buffer, q)) if self._buffer else math.nan
+        total = self.counts.sum()
+        cumulative = np.cumsum(self.counts)
+        target = q * total
+        k = int(np.searchsorted(cumulative, target, side='left'))
+        k = min(k, self.bins - 1)
+        before = cumulative[k - 1] if k > 0 else 0
+        fraction = (target - before) / self.counts[k] if self.counts[k] else 0.0
+        return self.low + (k + fraction) * self.width
+
+
+class SweepAggregate:
+    """Estatísticas por métrica + contagem de rodadas que falharam"""
+
+    QUANTILES = (0.05, 0.5, 0.95)
+
+    def __init__(self, bins: int = 1024):
+        self.bins = bins
+        self.stats: Dict[str, RunningStats] = {}
+        self.histograms: Dict[str, StreamingHistogram] = {}
+        self.runs = 0
+        self.failures = 0
+
+    def add(self, summary: dict):
+        self.runs += 1
+        if summary.get('error'):
+            self.failures += 1
+            return
+        for name, value in summary['metrics'].items():
+            if name not in self.stats:
+                self.stats[name] = RunningStats()
+                self.histograms[name] = StreamingHistogram(self.bins)
+            self.stats[name].add(value)
+            self.histograms[name].add(value)
+
+    def table(self) -> List[dict]:
+        rows = []
+        for name, stats in self.stats.items():
+            row = {'metric': name, 'n': stats.count, 'mean': stats.mean, 'std': stats.std,
+                   'min': stats.min, 'max': stats.max}
+            row.update({f'p{int(q * 100)}': self.histograms[name].quantile(q) for q in self.QUANTILES})
+            rows.append(row)
+        return rows
+
+    def format(self) -> str:
+        lines = [f"rodadas: {self.runs}  falhas: {self.failures}",
+                 f"{'métrica':18s} {'n':>6s} {'média':>11s} {'desvio':>11s} {'p5':>11s} {'p50':>11s} {'p95':>11s}"]
+        for row in self.table():
+            lines.append(f"{row['metric']:18s} {row['n']:6d} {row['mean']:11.5g} {row['std']:11.5g} "
+                         f"{row['p5']:11.5g} {row['p50']:11.5g} {row['p95']:11.5g}")
+        return "\n".join(lines)
+
+
+# ============================================================== especificação
+
+def set_path(config: dict, path: str, value):
+    """
+    'mass_properties.components[rear_passengers].mass' - seletor entre colchetes
+    é índice ou o campo 'name' do item. Só troca chaves que já existem (erro de
+    digitação na especificação falha na carga, não vira parâmetro ignorado)
+    """
+    parts = path.split('.')
+    target = config
+    for depth, part in enumerate(parts):
+        match = _SELECTOR.match(part)
+        if match is None:
+            raise ValueError(f"Trecho inválido '{part}' em '{path}'")
+        key, selector = match.groups()
+        last = depth == len(parts) - 1
+        if not isinstance(target, dict) or key not in target:
+            raise ValueError(f"'{path}': chave '{key}' não existe")
+        if selector is None:
+            if last:
+                target[key] = value
+                return
+            target = target[key]
+            continue
+        items = target[key]
+        if selector.lstrip('-').isdigit():
+            index = int(selector)
+        else:
+            index = next((n for n, item in enumerate(items) if isinstance(item, dict) and item.get('name') == selector),
+                         None)
+            if index is None:
+                raise ValueError(f"'{path}': nenhum item com name '{selector}' em '{key}'")
+        if last:
+            items[index] = value
+            return
+        target = items[index]
+
+
+@dataclass
+class SweepSpec:
+    maneuver: str
+    grid: Dict[str, List] = field(default_factory=dict)
+    distributions: Dict[str, dict] = field(default_factory=dict)
+    samples: int = 1                      # sorteios por ponto da grade
+    seed: int = 0
+    duration: Optional[float] = None      # sobrescreve a duração da manobra
+    vehicle_config: str = VEHICLE_CONFIG
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SweepSpec':
+        spec = cls(**data)
+        spec.validate()
+        return spec
+
+    @classmethod
+    def load(cls, path: str) -> 'SweepSpec':
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(yaml.safe_load(f))
+
+    @property
+    def total_runs(self) -> int:
+        return math.prod(len(values) for values in self.grid.values()) * self.samples
+
+    def fingerprint(self) -> str:
+        """Identifica a especificação no arquivo de resultados (retomar só com a mesma)"""
+        text = json.dumps({k: v for k, v in self.__dict__.items()}, sort_keys=True, default=str)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+    def validate(self):
+        maneuver = base_maneuver(self.maneuver)
+        for path, dist in self.distributions.items():
+            kind = next(iter(dist)) if isinstance(dist, dict) and len(dist) == 1 else None
+            if kind not in DISTRIBUTIONS:
+                raise ValueError(f"{path}: distribuição deve ser uma de {DISTRIBUTIONS}, recebido {dist!r}")
+        with open(self.vehicle_config, "r", encoding="utf-8") as f:
+            vehicle = yaml.safe_load(f)
+        first = {path: values[0] for path, values in self.grid.items()}
+        first.update({path: 0.0 for path in self.distributions})
+        apply_parameters(maneuver, vehicle, first)
+
+    def parameters(self, index: int) -> Dict[str, float]:
+        """Parâmetros da rodada `index`: ponto da grade + sorteio com semente (seed, index)"""
+        point = index // self.samples
+        values = {}
+        for path, options in reversed(list(self.grid.items())):
+            point, k = divmod(point, len(options))
+            values[path] = options[k]
+        rng = np.random.default_rng([self.seed, index])
+        for path, dist in self.distributions.items():
+            (kind, args), = dist.items()
+            if kind == 'normal':
+                values[path] = float(rng.normal(*args))
+            elif kind == 'uniform':
+                values[path] = float(rng.uniform(*args))
+            else:
+                values[path] = args[int(rng.integers(len(args)))]
+        return {path: values[path] for path in itertools.chain(self.grid, self.distributions)}
+
+
+def base_maneuver(name: str) -> Maneuver:
+    for maneuver in CHECK_RIDE:
+        if maneuver.name == name:
+            return maneuver
+    raise ValueError(f"Manobra desconhecida '{name}' (disponíveis: {', '.join(m.name for m in CHECK_RIDE)})")
+
+
+def apply_parameters(maneuver: Maneuver, vehicle: dict, parameters: Dict[str, float]) -> Tuple[Maneuver, dict]:
+    initial = dict(maneuver.initial)
+    for path, value in parameters.items():
+        scope, _, rest = path.partition('.')
+        if scope == 'vehicle':
+            set_path(vehicle, rest, value)
+        elif scope == 'initial' and rest in initial:
+            initial[rest] = value
+        else:
+            raise ValueError(f"Parâmetro '{path}': use 'vehicle.<caminho>' ou 'initial.<{'|'.join(initial)}>'")
+    return replace(maneuver, initial=initial), vehicle
+
+
+# ============================================================== execução
+
+def run_one(spec: SweepSpec, index: int) -> dict:
+    """Uma rodada headless → resumo pequeno (parâmetros, métricas, erro, tempo)"""
+    start = time.perf_counter()
+    parameters = spec.parameters(index)
+    summary = {'run': index, 'parameters': parameters, 'metrics': {}, 'error': None}
+    try:
+        maneuver = base_maneuver(spec.maneuver)
+        if spec.duration is not None:
+            maneuver = replace(maneuver, duration=spec.duration)
+        with open(spec.vehicle_config, "r", encoding="utf-8") as f:
+            vehicle = yaml.safe_load(f)
+        maneuver, vehicle = apply_parameters(maneuver, vehicle, parameters)
+        recording = run_maneuver(maneuver, vehicle)
+        if maneuver.metrics is not None:
+            summary['metrics'] = {name: float(value) for name, value in maneuver.metrics(recording).items()}
+        summary['metrics']['final_altitude'] = float(recording['altitude'][-1])
+        summary['metrics']['final_airspeed'] = float(recording['airspeed'][-1])
+    except Exception as error:
+        summary['error'] = f"{error.__class__.__name__}: {error}"
+    summary['elapsed'] = time.perf_counter() - start
+    return summary
+
+
+def read_results(path: str, fingerprint: str) -> Iterator[dict]:
+    """Resumos já gravados (linha a linha); a primeira linha identifica a especificação"""
+    with open(path, "r", encoding="utf-8") as f:
+        header = f.readline()
+        if header and json.loads(header).get('spec') != fingerprint:
+            raise ValueError(f"{path} foi gerado por outra especificação; use outro arquivo ou --restart")
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return          # última linha truncada pela interrupção: a rodada é refeita
+
+
+def run_sweep(spec: SweepSpec, results_path: str, processes: Optional[int] = None, restart: bool = False,
+              limit: Optional[int] = None, bins: int = 1024, progress=None) -> SweepAggregate:
+    """
+    Executa as rodadas que faltam e agrega tudo (inclusive o que já estava no
+    arquivo). limit: no máximo tantas rodadas novas nesta chamada
+    """
+    fingerprint = spec.fingerprint()
+    aggregate = SweepAggregate(bins)
+    done = np.zeros(spec.total_runs, dtype=bool)      # 1 byte por rodada
+    if restart or not os.path.exists(results_path):
+        with open(results_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({'spec': fingerprint, 'total_runs': spec.total_runs}) + "\n")
+    else:
+        valid = 0
+        for summary in read_results(results_path, fingerprint):
+            if not done[summary['run']]:
+                done[summary['run']] = True
+                aggregate.add(summary)
+            valid += 1
+        _truncate_after(results_path, valid + 1)
+
+    pending = iter(np.flatnonzero(~done)[:limit].tolist())
+    workers = processes or os.cpu_count() or 1
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool, \
+            open(results_path, "a", encoding="utf-8") as out:
+        # Janela limitada: memória não cresce com o número de rodadas
+        in_flight = {pool.submit(run_one, spec, index) for index in itertools.islice(pending, 2 * workers)}
+        while in_flight:
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                summary = future.result()
+                out.write(json.dumps(summary) + "\n")
+                out.flush()
+                aggregate.add(summary)
+                if progress is not None:
+                    progress(summary, aggregate)
+            in_flight |= {pool.submit(run_one, spec, index) for index in itertools.islice(pending, len(finished))}
+    return aggregate
+
+
+def _truncate_after(path: str, lines: int):
+    """Descarta uma linha final incompleta deixada por uma interrupção"""
+    with open(path, "rb+") as f:
+        for _ in range(lines):
+            if not f.readline():
+                return
+        f.truncate(f.tell())
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Varredura/dispersão Monte Carlo em paralelo, retomável")
+    parser.add_argument('spec', help="YAML com maneuver, grid, distributions, samples, seed")
+    parser.add_argument('--results', required=True, help="arquivo JSONL de resumos (retomado se existir)")
+    parser.add_argument('--processes', type=int)
+    parser.add_argument('--restart', action='store_true', help="ignora resultados existentes")
+    parser.add_argument('--limit', type=int, help="no máximo N rodadas novas nesta execução")
+    args = parser.parse_args()
+
+    sweep = SweepSpec.load(args.spec)
+
+    def report(summary, aggregate):
+        status = summary['error'] or 'ok'
+        print(f"[{aggregate.runs}/{sweep.total_runs}] rodada {summary['run']}: {status} ({summary['elapsed']:.1f} s)")
+
+    print(run_sweep(sweep, args.results, args.processes, args.restart, args.limit, progress=report).format())
@@ -0,0 +1,94 @@
+"""
+Integração numérica e discretização de sistemas lineares
+- expm: exponencial de matriz por escalonamento e quadratura (sem SciPy)
+- discretize_zoh: sistema contínuo (A, B) → discreto (Ad, Bd) com segurador de ordem zero
+- transfer_function_ss: função de transferência em s → forma canônica controlável
+- solve_continuous_riccati: equação algébrica de Riccati pelo subespaço estável
+  da matriz Hamiltoniana (projeto LQ sem SciPy)
+"""
+
+import math
+
+import numpy as np
+
+
+def expm(matrix, terms: int = 18) -> np.ndarray:
+    """Exponencial de matriz: série de Taylor em A / 2^s seguida de s quadraturas"""
+    a = np.asarray(matrix, dtype=float)
+    norm = np.abs(a).sum(axis=1).max() if a.size else 0.0
+    squarings = max(0, int(math.ceil(math.log2(norm))) + 1) if norm > 0.5 else 0
+    a = a / (2.0 ** squarings)
+
+    result = np.eye(a.shape[0])
+    term = np.eye(a.shape[0])
+    for k in range(1, terms + 1):
+        term = term @ a / k
+        result = result + term
+    for _ in range(squarings):
+        result = result @ result
+    return result
+
+
+def discretize_zoh(a, b, dt: float):
+    """
+    Discretização exata de x' = A x + B u com entrada constante no passo:
+    exp([[A, B], [0, 0]] dt) = [[Ad, Bd], [0, I]]
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    n, m = b.shape
+    augmented = np.zeros((n + m, n + m))
+    augmented[:n, :n] = a
+    augmented[:n, n:] = b
+    phi = expm(augmented * dt)
+    return phi[:n, :n], phi[:n, n:]
+
+
+def transfer_function_ss(num, den):
+    """
+    H(s) = num(s) / den(s) (potências decrescentes de s) → (A, B, C, D) na forma
+    canônica controlável, uma entrada e uma saída
+    """
+    num = np.atleast_1d(np.asarray(num, dtype=float))
+    den = np.atleast_1d(np.asarray(den, dtype=float))
+    if len(num) > len(den):
+        raise ValueError("Função de transferência imprópria (grau do numerador > denominador)")
+    num, den = num / den[0], den / den[0]
+    order = len(den) - 1
+    num = np.pad(num, (order + 1 - len(num), 0))
+    d = num[0]
+    # Parte estritamente própria: num - d·den
+    remainder = num[1:] - d * den[1:]
+
+    a = np.zeros((order, order))
+    if order:
+        a[:-1, 1:] = np.eye(order - 1)
+        a[-1] = -den[:0:-1]
+    b = np.zeros((order, 1))
+    if order:
+        b[-1, 0] = 1.0
+    c = remainder[::-1].reshape(1, order)
+    return a, b, c, np.array([[d]])
+
+
+def solve_continuous_riccati(a, b, q, r, s=None) -> np.ndarray:
+    """
+    P de Aᵀ P + P A - (P B + S) R⁻¹ (Bᵀ P + Sᵀ) + Q = 0 (S: termo cruzado 2 xᵀ S u)
+    Autovetores estáveis [U1; U2] da Hamiltoniana → P = U2 U1⁻¹
+    """
+    a, b, q, r = (np.atleast_2d(np.asarray(x, dtype=float)) for x in (a, b, q, r))
+    n = a.shape[0]
+    if s is not None:
+        # Termo cruzado eliminado pela troca u = v - R⁻¹ Sᵀ x
+        s = np.atleast_2d(np.asarray(s, dtype=float))
+        r_inv_st = np.linalg.solve(r, s.T)
+        a = a - b @ r_inv_st
+        q = q - s @ r_inv_st
+    hamiltonian = np.block([[a, -b @ np.linalg.solve(r, b.T)],
+                            [-q, -a.T]])
+    values, vectors = np.linalg.eig(hamiltonian)
+    stable = vectors[:, values.real < 0.0]
+    if stable.shape[1] != n:
+        raise ValueError("Riccati sem solução estabilizante (modos no eixo imaginário)")
+    p = np.real(stable[n:] @ np.linalg.inv(stable[:n]))
+    return 0.5 * (p + p.T)
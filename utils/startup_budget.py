@@ -0,0 +1,145 @@
+"""
+Orçamento de tempo de partida do simulador (main.py até o primeiro frame)
+- Cada medição é um processo novo (sys.modules limpo, como numa reinicialização entre
+  sessões): import de main, build_simulation() com a configuração padrão e um frame
+- Tempos = mediana de várias rodadas; uma rodada extra com -X importtime atribui o
+  custo de import por módulo (quem importa primeiro paga)
+- Reprova se a partida passar do orçamento ou se algum módulo pesado que só deveria
+  carregar sob demanda aparecer no processo
+- Uso: python utils/startup_budget.py [--runs 5] [--budget-ms 500] [--top 15]
+"""
+
+from dataclasses import dataclass, field
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Limites [s]: partida dentro do processo e processo inteiro (inclui o interpretador)
+DEFAULT_BUDGET = {'total': 0.5, 'process': 0.75}
+
+# Carregados só quando usados (backend, CLI, cache, som) - nunca na partida padrão
+LAZY_MODULES = ('matplotlib', 'scipy', 'numba', 'sounddevice', 'asyncio', 'tempfile', 'xpc_mock')
+
+STARTUP = """
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+    from core.module_registry import ModuleRegistry
+    imported = time.perf_counter()
+    registry = ModuleRegistry.from_files(main.SIMULATION_CONFIG, main.VEHICLE_CONFIG)
+    orchestrator, modules = main.build_simulation(registry)
+    built = time.perf_counter()
+    orchestrator._update_all_modules()
+    done = time.perf_counter()
+print(json.dumps({'imports': imported - start, 'build': built - imported, 'first_frame': done - built,
+                  'loaded': sorted(sys.modules)}))
+"""
+
+_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+@dataclass
+class StartupProfile:
+    imports: float          # s, import de main e do registro
+    build: float            # s, configuração + construção dos módulos
+    first_frame: float      # s
+    process: float          # s, do exec do interpretador ao fim do primeiro frame
+    heaviest: List[Tuple[str, float, float]] = field(default_factory=list)   # (módulo, próprio, cumulativo) [s]
+    loaded: List[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> float:
+        return self.imports + self.build + self.first_frame
+
+
+def parse_importtime(text: str) -> List[Tuple[str, int, float, float]]:
+    """Linhas do -X importtime → (módulo, profundidade, próprio, cumulativo) [s], na ordem do log"""
+    entries = []
+    for line in text.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            entries.append((name, len(indent) // 2, int(own) * 1e-6, int(cumulative) * 1e-6))
+    return entries
+
+
+def _run(extra_args: Sequence[str] = ()) -> Tuple[dict, float, str]:
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *extra_args, '-c', STARTUP], capture_output=True, text=True,
+                            timeout=120, cwd=ROOT)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Partida falhou:\n{result.stderr}")
+    return json.loads(result.stdout.splitlines()[-1]), elapsed, result.stderr
+
+
+def measure_startup(runs: int = 5, top: int = 15) -> StartupProfile:
+    """Mediana de runs partidas limpas + atribuição por módulo numa rodada com -X importtime"""
+    if runs < 1:
+        raise ValueError(f"runs deve ser >= 1, recebido {runs}")
+    samples = [_run() for _ in range(runs)]
+    info, _, stderr = _run(['-X', 'importtime'])
+    # Profundidade 0: o que cada import de primeiro nível (main, módulos do registro) custou
+    heaviest = sorted(((name, own, cumulative) for name, depth, own, cumulative in parse_importtime(stderr)
+                       if depth == 0), key=lambda entry: entry[2], reverse=True)[:top]
+    return StartupProfile(imports=statistics.median(s['imports'] for s, _, _ in samples),
+                          build=statistics.median(s['build'] for s, _, _ in samples),
+                          first_frame=statistics.median(s['first_frame'] for s, _, _ in samples),
+                          process=statistics.median(elapsed for _, elapsed, _ in samples),
+                          heaviest=heaviest, loaded=info['loaded'])
+
+
+def check_budget(profile: StartupProfile, budget: Optional[Dict[str, float]] = None,
+                 lazy_modules: Sequence[str] = LAZY_MODULES) -> List[str]:
+    """Violações do orçamento (vazio = dentro)"""
+    budget = dict(DEFAULT_BUDGET, **(budget or {}))
+    violations = []
+    for key in ('total', 'process'):
+        value = getattr(profile, key)
+        if value > budget[key]:
+            violations.append(f"{key}: {value * 1e3:.1f}ms > orçamento de {budget[key] * 1e3:.1f}ms")
+    loaded = set(profile.loaded)
+    for name in lazy_modules:
+        if name in loaded:
+            violations.append(f"'{name}' carregado na partida (deveria ser sob demanda)")
+    return violations
+
+
+def format_profile(profile: StartupProfile) -> str:
+    lines = [f"{'imports':20s} {profile.imports * 1e3:8.1f}ms",
+             f"{'build':20s} {profile.build * 1e3:8.1f}ms",
+             f"{'primeiro frame':20s} {profile.first_frame * 1e3:8.1f}ms",
+             f"{'total':20s} {profile.total * 1e3:8.1f}ms",
+             f"{'processo':20s} {profile.process * 1e3:8.1f}ms",
+             "",
+             f"{'import (-X importtime)':40s} {'próprio':>9s} {'cumul.':>9s}"]
+    for name, own, cumulative in profile.heaviest:
+        lines.append(f"{name:40s} {own * 1e3:7.1f}ms {cumulative * 1e3:7.1f}ms")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Falha se a partida do simulador estourar o orçamento")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help="imports mais caros listados")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET['total'] * 1e3,
+                        help="limite do import + construção + primeiro frame")
+    parser.add_argument('--process-budget-ms', type=float, default=DEFAULT_BUDGET['process'] * 1e3,
+                        help="limite do processo inteiro, com o interpretador")
+    args = parser.parse_args()
+    profile = measure_startup(args.runs, args.top)
+    violations = check_budget(profile, {'total': args.budget_ms * 1e-3, 'process': args.process_budget_ms * 1e-3})
+    print(format_profile(profile))
+    for violation in violations:
+        print(f"ESTOURO   {violation}")
+    sys.exit(1 if violations else 0)
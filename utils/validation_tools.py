@@ -0,0 +1,376 @@
+"""
+Validação do modelo (proof-of-match) sem interface gráfica
+- Manobras roteirizadas: comandos do piloto em degraus no tempo + ações pontuais
+  (engajar autopiloto, mudar alvo) executadas num barramento isolado, sem X-Plane
+- Gravação em colunas no mesmo formato de visual_systems.visualization
+- Trajetórias de referência (golden) em .npz; todos os canais comparados de uma
+  vez contra tolerância absoluta + relativa por canal
+- Métricas de proof-of-match: regime (trim), resposta ao degrau (subida,
+  sobressinal, acomodação) e período/amortecimento de oscilações (fugoide,
+  período curto)
+- Casos independentes rodam em paralelo, um processo por caso
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+from dataclasses import dataclass, field
+import math
+import multiprocessing
+import os
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VEHICLE_CONFIG = os.path.join(ROOT, "config", "vehicle_configs", "cessna_172.yaml")
+GOLDEN_DIR = os.path.join(ROOT, "tests", "golden")
+
+CHANNELS = ('time', 'north', 'east', 'down', 'u', 'v', 'w', 'p', 'q', 'r', 'phi', 'theta', 'psi',
+            'airspeed', 'altitude', 'throttle', 'elevator', 'aileron', 'rudder')
+
+# Envelope além do qual o caso é abortado (um modelo divergente pode travar o clima/propulsão)
+MAX_AIRSPEED = 150.0      # m/s
+MAX_RATE = 5.0            # rad/s
+
+# Ar calmo: a turbulência do cenário não pode mexer na referência
+CALM_WEATHER = {'weather': {'seed': 0, 'temperature_offset': 0.0,
+                            'wind_layers': [{'altitude': 0.0, 'speed': 0.0, 'direction_deg': 0.0}],
+                            'turbulence': {'wind_20ft': 0.0}}}
+
+
+@dataclass
+class Maneuver:
+    """
+    Caso de teste roteirizado
+    inputs: canal do piloto → [(t, valor)] mantido até o próximo degrau
+    actions: [(t, método de FlightControls, kwargs)]
+    tolerances / metric_tolerances: nome → (absoluta, relativa)
+    """
+    name: str
+    duration: float
+    initial: Dict[str, float] = field(default_factory=lambda: {'north': 0.0, 'east': 0.0, 'altitude': 1000.0,
+                                                               'heading_deg': 0.0, 'airspeed': 50.0})
+    inputs: Dict[str, Sequence[Tuple[float, float]]] = field(default_factory=dict)
+    actions: Sequence[Tuple[float, str, dict]] = ()
+    tolerances: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    metrics: Optional[Callable[[Dict[str, np.ndarray]], Dict[str, float]]] = None
+    metric_tolerances: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+
+
+@dataclass
+class ChannelResult:
+    max_error: float
+    limit: float                  # tolerância no instante de maior excesso sobre ela
+    fraction_outside: float
+    first_violation: Optional[float] = None   # s
+
+
+@dataclass
+class CaseResult:
+    name: str
+    passed: bool
+    channels: Dict[str, ChannelResult] = field(default_factory=dict)
+    metrics: Dict[str, Tuple[float, float, bool]] = field(default_factory=dict)   # valor, golden, ok
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+# ============================================================== execução
+
+def schedule(points: Sequence[Tuple[float, float]], time_s: np.ndarray, default: float = 0.0) -> np.ndarray:
+    """Degraus (t, valor) amostrados em todos os frames de uma vez"""
+    if not points:
+        return np.full(len(time_s), default)
+    points = sorted(points)
+    breaks = np.array([t for t, _ in points])
+    values = np.array([default] + [v for _, v in points])
+    return values[np.searchsorted(breaks, time_s, side='right')]
+
+
+def build_headless_modules(bus, vehicle_config: dict, dt: float):
+    """Mesma cadeia e ordem de main.py, sem X-Plane, instrumentos nem saídas"""
+    from dynamics.flight_dynamics import SimpleFlightDynamics
+    from dynamics.mass_properties import MassProperties
+    from systems.flight_controls import FlightControls
+    from systems.propulsion import Propulsion
+    from systems.weather import Weather
+
+    dynamics = SimpleFlightDynamics(bus, dt=dt)
+    controls = FlightControls(bus, vehicle_config, dt=dt)
+    modules = [controls, Propulsion(bus, vehicle_config), MassProperties(bus, vehicle_config, dt=dt),
+               Weather(bus, CALM_WEATHER, dt=dt), dynamics]
+    return modules, controls, dynamics
+
+
+def run_maneuver(maneuver: Maneuver, vehicle_config: dict, dt: float = 1 / 60.0) -> Dict[str, np.ndarray]:
+    """Executa a manobra frame a frame e devolve a gravação em colunas"""
+    from core.message_bus import MessageBus
+    from interfaces.scripted_inputs import InputScenario
+
+    frames = int(round(maneuver.duration / dt))
+    time_s = np.arange(frames) * dt
+    pilot = InputScenario.from_steps(maneuver.name, maneuver.duration, maneuver.inputs).compile(1.0 / dt)
+    actions = sorted(maneuver.actions, key=lambda action: action[0])
+    action_frames = [int(round(t / dt)) for t, _, _ in actions]
+    data = np.empty((frames, len(CHANNELS)))
+
+    # O barramento e os módulos ainda imprimem a cada mensagem
+    with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+        bus = MessageBus()
+        modules, controls, dynamics = build_headless_modules(bus, vehicle_config, dt)
+        dynamics.reset_position(**maneuver.initial)
+        next_action = 0
+        for k in range(frames):
+            while next_action < len(actions) and action_frames[next_action] <= k:
+                _, method, kwargs = actions[next_action]
+                getattr(controls, method)(**kwargs)
+                next_action += 1
+            bus.publish('pilot_controls', pilot.frame(k, dt))
+            for module in modules:
+                module.update()
+
+            s, c = dynamics.state, controls.controls
+            u, v, w = s.velocity_body.x, s.velocity_body.y, s.velocity_body.z
+            data[k] = (time_s[k], s.position_ned.x, s.position_ned.y, s.position_ned.z, u, v, w,
+                       s.rates_body.x, s.rates_body.y, s.rates_body.z, s.euler.x, s.euler.y, s.euler.z,
+                       math.sqrt(u * u + v * v + w * w), -s.position_ned.z,
+                       c.throttle, c.elevator, c.aileron, c.rudder)
+            if not (np.isfinite(data[k]).all() and data[k, 13] < MAX_AIRSPEED
+                    and np.abs(data[k, 7:10]).max() < MAX_RATE):
+                raise FloatingPointError(f"{maneuver.name}: estado divergiu em t={time_s[k]:.2f} s")
+    return {name: data[:, i] for i, name in enumerate(CHANNELS)}
+
+
+# ============================================================== métricas
+
+def steady_state(time_s, values, window: float) -> Tuple[float, float]:
+    """Média e desvio padrão nos últimos `window` segundos"""
+    time_s, values = np.asarray(time_s), np.asarray(values)
+    tail = values[time_s >= time_s[-1] - window]
+    return float(tail.mean()), float(tail.std())
+
+
+def step_metrics(time_s, values, t_step: float, settle_band: float = 0.05, final_window: float = 5.0) -> Dict[str, float]:
+    """Tempo de subida 10→90 %, sobressinal e tempo de acomodação de uma resposta ao degrau"""
+    time_s, values = np.asarray(time_s), np.asarray(values)
+    after = time_s >= t_step
+    t, y = time_s[after], values[after]
+    initial = y[0]
+    final, _ = steady_state(t, y, final_window)
+    normalized = (y - initial) / (final - initial)
+    t10 = t[np.argmax(normalized >= 0.1)]
+    t90 = t[np.argmax(normalized >= 0.9)]
+    outside = np.flatnonzero(np.abs(normalized - 1.0) > settle_band)
+    settling = t[outside[-1]] - t_step if outside.size else 0.0
+    return {'rise_time': float(t90 - t10), 'overshoot': float(max(normalized.max() - 1.0, 0.0)),
+            'settling_time': float(settling), 'final_value': float(final)}
+
+
+def oscillation_metrics(time_s, values, t_start: float = 0.0) -> Dict[str, float]:
+    """
+    Período e amortecimento por decremento logarítmico entre picos sucessivos
+    (fugoide: altitude/velocidade; período curto: q ou α após pulso de profundor)
+    """
+    time_s, values = np.asarray(time_s), np.asarray(values)
+    keep = time_s >= t_start
+    t, y = time_s[keep], values[keep]
+    y = y - np.polyval(np.polyfit(t, y, 1), t)          # remove tendência lenta
+    slope = np.diff(y)
+    peaks = np.flatnonzero((slope[:-1] > 0.0) & (slope[1:] <= 0.0)) + 1
+    troughs = np.flatnonzero((slope[:-1] < 0.0) & (slope[1:] >= 0.0)) + 1
+    # Amplitude pico-a-vale: insensível ao resíduo de offset deixado pela tendência
+    troughs = troughs[troughs > peaks[0]] if peaks.size else troughs
+    count = min(peaks.size, troughs.size)
+    if count < 2:
+        raise ValueError("Menos de dois ciclos: sem oscilação para medir")
+    amplitude = y[peaks[:count]] - y[troughs[:count]]
+    period = float(np.diff(t[peaks]).mean())
+    decrement = float(np.log(amplitude[:-1] / amplitude[1:]).mean())
+    damping = decrement / math.sqrt(4.0 * math.pi ** 2 + decrement ** 2)
+    return {'period': period, 'damping_ratio': damping}
+
+
+# ============================================================== referência e comparação
+
+def save_golden(path: str, recording: Dict[str, np.ndarray], channels: Sequence[str],
+                metrics: Optional[Dict[str, float]] = None):
+    """Só os canais verificados (+ tempo) em float32 comprimido; métricas como 'metric.<nome>'"""
+    arrays = {name: np.asarray(recording[name], dtype=np.float32) for name in ('time',) + tuple(channels)}
+    arrays.update({f'metric.{name}': np.float64(value) for name, value in (metrics or {}).items()})
+    np.savez_compressed(path, **arrays)
+
+
+def load_golden(path: str) -> Tuple[Dict[str, np.ndarray], Dict[str, float]]:
+    with np.load(path) as data:
+        recording = {name: data[name].astype(float) for name in data.files if not name.startswith('metric.')}
+        metrics = {name[len('metric.'):]: float(data[name]) for name in data.files if name.startswith('metric.')}
+    return recording, metrics
+
+
+def within(value, reference, tolerance: Tuple[float, float]):
+    """|valor − referência| ≤ abs + rel·|referência| (NaN nunca passa)"""
+    return np.abs(np.asarray(value) - reference) <= tolerance[0] + tolerance[1] * np.abs(reference)
+
+
+def compare(recording: Dict[str, np.ndarray], golden: Dict[str, np.ndarray],
+            tolerances: Dict[str, Tuple[float, float]]) -> Dict[str, ChannelResult]:
+    """Todos os canais × amostras numa só matriz; a referência é interpolada no tempo da gravação"""
+    names = list(tolerances)
+    time_s = recording['time']
+    if abs(time_s[-1] - golden['time'][-1]) > 1e-3:
+        raise ValueError(f"Duração difere da referência: {time_s[-1]:.3f} s vs {golden['time'][-1]:.3f} s")
+    actual = np.stack([recording[name] for name in names])
+    reference = np.stack([np.interp(time_s, golden['time'], golden[name]) for name in names])
+    limits = np.array([tolerances[name] for name in names])
+    allowed = limits[:, :1] + limits[:, 1:] * np.abs(reference)
+
+    error = np.abs(actual - reference)
+    outside = ~(error <= allowed)
+    worst = np.argmax(np.where(np.isnan(error), np.inf, error - allowed), axis=1)
+    first = np.argmax(outside, axis=1)
+    rows = np.arange(len(names))
+    return {name: ChannelResult(max_error=float(error[i, worst[i]]), limit=float(allowed[i, worst[i]]),
+                                fraction_outside=float(outside[i].mean()),
+                                first_violation=float(time_s[first[i]]) if outside[i, first[i]] else None)
+            for i, name in zip(rows, names)}
+
+
+def evaluate_case(maneuver: Maneuver, vehicle_config: dict, golden_path: str) -> CaseResult:
+    start = time.perf_counter()
+    result = CaseResult(maneuver.name, passed=False)
+    try:
+        recording = run_maneuver(maneuver, vehicle_config)
+        golden, golden_metrics = load_golden(golden_path)
+        result.channels = compare(recording, golden, maneuver.tolerances)
+        if maneuver.metrics is not None:
+            for name, value in maneuver.metrics(recording).items():
+                reference = golden_metrics[name]
+                ok = bool(within(value, reference, maneuver.metric_tolerances.get(name, (0.0, 0.05))))
+                result.metrics[name] = (value, reference, ok)
+        result.passed = (all(c.first_violation is None for c in result.channels.values())
+                         and all(ok for _, _, ok in result.metrics.values()))
+    except Exception as error:
+        result.error = f"{error.__class__.__name__}: {error}"
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+# ============================================================== check ride
+
+def trim_metrics(recording) -> Dict[str, float]:
+    altitude, _ = steady_state(recording['time'], recording['altitude'], 10.0)
+    airspeed, _ = steady_state(recording['time'], recording['airspeed'], 10.0)
+    _, pitch_rate = steady_state(recording['time'], recording['q'], 10.0)
+    return {'altitude': altitude, 'airspeed': airspeed, 'pitch_rate_rms': pitch_rate}
+
+
+def altitude_step_metrics(recording) -> Dict[str, float]:
+    return step_metrics(recording['time'], recording['altitude'], t_step=10.0, final_window=10.0)
+
+
+def heading_step_metrics(recording) -> Dict[str, float]:
+    metrics = step_metrics(recording['time'], recording['psi'], t_step=5.0, final_window=5.0)
+    metrics['max_bank'] = float(np.abs(recording['phi']).max())
+    return metrics
+
+
+_AUTOPILOT = ((0.0, 'engage_altitude_hold', {'altitude': 1000.0}), (0.0, 'engage_heading_hold', {'heading': 0.0}))
+
+# Tolerâncias no espírito dos testes objetivos de FSTD (AC 120-40B / CS-FSTD):
+# atitude ±1.5°, velocidade ±3 kt, altitude ±20 ft, taxas ±2 °/s
+_LONGITUDINAL = {'altitude': (6.0, 0.0), 'airspeed': (1.5, 0.0), 'theta': (math.radians(1.5), 0.0),
+                 'q': (math.radians(2.0), 0.0), 'elevator': (0.05, 0.0)}
+_LATERAL = {'psi': (math.radians(2.0), 0.0), 'phi': (math.radians(1.5), 0.0), 'p': (math.radians(2.0), 0.0),
+            'r': (math.radians(2.0), 0.0), 'aileron': (0.05, 0.0)}
+
+# Fugoide e período curto em malha aberta exigem estabilidade aerodinâmica em arfagem,
+# que SimpleFlightDynamics não tem; steady_state/step_metrics/oscillation_metrics já cobrem
+# esses testes quando o modelo de aeronave os suportar
+CHECK_RIDE = (
+    Maneuver('trim_cruise', 30.0, actions=_AUTOPILOT, tolerances=_LONGITUDINAL, metrics=trim_metrics,
+             metric_tolerances={'altitude': (3.0, 0.0), 'airspeed': (0.5, 0.0),
+                                'pitch_rate_rms': (math.radians(0.5), 0.0)}),
+    Maneuver('altitude_step', 50.0, actions=_AUTOPILOT + ((10.0, 'engage_altitude_hold', {'altitude': 1030.0}),),
+             tolerances=_LONGITUDINAL, metrics=altitude_step_metrics,
+             metric_tolerances={'rise_time': (1.0, 0.1), 'overshoot': (0.05, 0.0),
+                                'settling_time': (3.0, 0.1), 'final_value': (3.0, 0.0)}),
+    Maneuver('heading_step', 35.0, actions=_AUTOPILOT + ((5.0, 'engage_heading_hold', {'heading': math.radians(30.0)}),),
+             tolerances=dict(_LATERAL, altitude=(6.0, 0.0)), metrics=heading_step_metrics,
+             metric_tolerances={'rise_time': (1.0, 0.1), 'overshoot': (0.05, 0.0), 'settling_time': (3.0, 0.1),
+                                'final_value': (math.radians(1.0), 0.0), 'max_bank': (math.radians(1.5), 0.0)}),
+)
+
+
+def _load_vehicle(config_path: str) -> dict:
+    with open(config_path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _check_case(maneuver: Maneuver, config_path: str, golden_dir: str) -> CaseResult:
+    return evaluate_case(maneuver, _load_vehicle(config_path), os.path.join(golden_dir, f"{maneuver.name}.npz"))
+
+
+def _record_case(maneuver: Maneuver, config_path: str, golden_dir: str) -> str:
+    recording = run_maneuver(maneuver, _load_vehicle(config_path))
+    metrics = maneuver.metrics(recording) if maneuver.metrics is not None else None
+    path = os.path.join(golden_dir, f"{maneuver.name}.npz")
+    save_golden(path, recording, list(maneuver.tolerances), metrics)
+    return path
+
+
+def _parallel(task, cases, config_path, golden_dir, processes):
+    # 'spawn': cada caso parte de um interpretador limpo, igual no Linux e no Windows
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=processes or min(len(cases), os.cpu_count() or 1),
+                             mp_context=context) as pool:
+        futures = [pool.submit(task, case, config_path, golden_dir) for case in cases]
+        return [future.result() for future in futures]
+
+
+def run_check_ride(cases: Sequence[Maneuver] = CHECK_RIDE, golden_dir: str = GOLDEN_DIR,
+                   config_path: str = VEHICLE_CONFIG, processes: Optional[int] = None) -> List[CaseResult]:
+    """Executa e compara todos os casos, um processo por caso"""
+    return _parallel(_check_case, list(cases), config_path, golden_dir, processes)
+
+
+def update_goldens(cases: Sequence[Maneuver] = CHECK_RIDE, golden_dir: str = GOLDEN_DIR,
+                   config_path: str = VEHICLE_CONFIG, processes: Optional[int] = None) -> List[str]:
+    """Regrava as referências (só depois de revisar a mudança de comportamento!)"""
+    os.makedirs(golden_dir, exist_ok=True)
+    return _parallel(_record_case, list(cases), config_path, golden_dir, processes)
+
+
+def format_report(results: Sequence[CaseResult]) -> str:
+    lines = []
+    for result in results:
+        lines.append(f"{'PASS' if result.passed else 'FAIL'}  {result.name}  ({result.elapsed:.1f} s)")
+        if result.error:
+            lines.append(f"      {result.error}")
+        for name, channel in result.channels.items():
+            if channel.first_violation is not None:
+                lines.append(f"      {name}: erro {channel.max_error:.4g} > {channel.limit:.4g} "
+                             f"a partir de t={channel.first_violation:.2f} s ({channel.fraction_outside:.1%})")
+        for name, (value, reference, ok) in result.metrics.items():
+            if not ok:
+                lines.append(f"      métrica {name}: {value:.4g} (referência {reference:.4g})")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    sys.path.append(ROOT)
+    parser = argparse.ArgumentParser(description="Check ride: manobras headless contra trajetórias de referência")
+    parser.add_argument('--update', action='store_true', help="regrava as referências em tests/golden")
+    parser.add_argument('--processes', type=int)
+    args = parser.parse_args()
+    if args.update:
+        for path in update_goldens(processes=args.processes):
+            print(path)
+    else:
+        results = run_check_ride(processes=args.processes)
+        print(format_report(results))
+        sys.exit(0 if all(result.passed for result in results) else 1)
@@ -0,0 +1,535 @@
+# visual_systems/motion_cueing.py
+"""
+Motion cueing: washout das acelerações da aeronave para uma plataforma Stewart
+- Entradas por amostra: força específica [fx, fy, fz] e taxas [p, q, r] no corpo,
+  estimadas de aircraft_state (dV/dt + ω×V - g) e interpoladas entre frames
+- Washout clássico: passa-altas de 3ª ordem na translação, passa-altas de 2ª
+  ordem na rotação e coordenação de inclinação (passa-baixas + limite de taxa)
+- Washout ótimo: projeto LQ com modelos vestibulares (otólitos e canais
+  semicirculares) resolvido uma vez pela Riccati contínua
+- Os dois viram um único sistema linear discretizado uma vez (ZOH); cada
+  amostra é uma multiplicação z·M com z = [x | u]
+- Cinemática inversa vetorizada nas 6 pernas (e em lotes de poses) e
+  verificação do espaço de trabalho com recuo da pose até caber
+- A plataforma roda a ~500 Hz: update() executa os subpassos do frame
+"""
+
+from dataclasses import dataclass
+import math
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from utils.numerical_integration import discretize_zoh, solve_continuous_riccati, transfer_function_ss
+
+GRAVITY = 9.81
+
+# Força específica em voo nivelado não acelerado (corpo): removida antes do washout
+NEUTRAL_INPUT = np.array([0.0, 0.0, -GRAVITY, 0.0, 0.0, 0.0])
+
+DEFAULT_CLASSICAL = {
+    'force_scale': 0.5,
+    'rate_scale': 0.5,
+    'force_limit': 5.0,            # m/s² após a escala
+    'rate_limit': 0.5,             # rad/s após a escala
+    # Passa-altas s³/((s² + 2ζωn s + ωn²)(s + ωb)) antes da dupla integração
+    'translational': {
+        'x': {'wn': 2.5, 'zeta': 1.0, 'wb': 0.25},
+        'y': {'wn': 2.5, 'zeta': 1.0, 'wb': 0.25},
+        'z': {'wn': 4.0, 'zeta': 1.0, 'wb': 0.25},
+    },
+    # Passa-altas s²/(s² + 2ζωn s + ωn²) antes da integração
+    'rotational': {
+        'roll': {'wn': 1.0, 'zeta': 1.0},
+        'pitch': {'wn': 1.0, 'zeta': 1.0},
+        'yaw': {'wn': 0.7, 'zeta': 1.0},
+    },
+    'tilt': {'wn': 5.0, 'zeta': 1.0, 'rate_limit_deg': 3.0},
+}
+
+DEFAULT_OPTIMAL = {
+    'force_scale': 0.5,
+    'rate_scale': 0.5,
+    'force_limit': 5.0,
+    'rate_limit': 0.5,
+    'input_bandwidth': 0.5,        # rad/s - entrada modelada como ruído branco filtrado
+    # Otólito K(τa s + 1)/((τL s + 1)(τs s + 1)); canal τa·τ1·s²/((τa s + 1)(τ1 s + 1)(τ2 s + 1))
+    'otolith': {'gain': 0.4, 'tau_a': 13.2, 'tau_l': 5.33, 'tau_s': 0.66},
+    'canal': {'tau_a': 80.0, 'tau_1': 5.73, 'tau_2': 0.005},
+    # Pesos: erro de sensação, erro direto de cue, estados da plataforma e comandos
+    'weights': {'otolith': 0.1, 'canal': 10.0, 'specific_force': 3.0, 'rotation': 1.0,
+                'position': 8.0, 'velocity': 2.0, 'angle': 1.0, 'acceleration': 0.05, 'angular_rate': 0.5},
+}
+
+DEFAULT_PLATFORM = {
+    'base_radius': 1.0,            # m
+    'platform_radius': 0.6,        # m
+    'base_separation_deg': 20.0,   # ângulo entre as juntas de cada par
+    'platform_separation_deg': 20.0,
+    'min_leg': 1.1,                # m
+    'max_leg': 1.7,                # m
+    # Excursões máximas da pose: x, y, z [m] e roll, pitch, yaw [graus]
+    'pose_limits': [0.3, 0.3, 0.2, 20.0, 20.0, 25.0],
+}
+
+
+@dataclass(frozen=True)
+class MotionCommand:
+    """Contrato: MotionCueing → plataforma de movimento, DataRecorder"""
+    pose: Tuple[float, ...] = (0.0,) * 6          # x, y, z [m] (NED da plataforma), roll, pitch, yaw [rad]
+    leg_lengths: Tuple[float, ...] = (0.0,) * 6   # m
+    limited: bool = False                         # pose recuada para caber no espaço de trabalho
+    tick: int = 0                                 # amostras da plataforma desde o início
+
+
+class StateSpaceFilter:
+    """
+    Sistema linear discreto x ← Ad·x + Bd·u, y = C·x
+    Estado e saída saem de uma única multiplicação: [x⁺ | y⁺] = [x | u] · M,
+    M = [Adᵀ; Bdᵀ] · [I | Cᵀ] montada uma vez
+    """
+
+    def __init__(self, ad, bd, c):
+        ad, bd, c = (np.atleast_2d(np.asarray(m, dtype=float)) for m in (ad, bd, c))
+        n, m = bd.shape
+        self.num_states = n
+        self._matrix = np.ascontiguousarray(np.vstack([ad.T, bd.T]) @ np.hstack([np.eye(n), c.T]))
+        self._z = np.zeros(n + m)
+        self._result = np.zeros(n + c.shape[0])
+        self.inputs = self._z[n:]
+        self.outputs = self._result[n:]
+
+    @classmethod
+    def from_continuous(cls, a, b, c, dt: float) -> "StateSpaceFilter":
+        ad, bd = discretize_zoh(a, b, dt)
+        return cls(ad, bd, c)
+
+    def reset(self):
+        self._z[:] = 0.0
+        self._result[:] = 0.0
+
+    def step(self) -> np.ndarray:
+        """Avança uma amostra com as entradas já escritas em self.inputs"""
+        np.dot(self._z, self._matrix, out=self._result)
+        self._z[:self.num_states] = self._result[:self.num_states]
+        return self.outputs
+
+
+def _block_diagonal(systems, num_inputs: int, num_outputs: int):
+    """
+    Empilha subsistemas (A, B, C, entradas, saídas) em um único (A, B, C)
+    'entradas'/'saídas' são os índices globais das colunas de B e linhas de C
+    """
+    num_states = sum(a.shape[0] for a, *_ in systems)
+    a_full = np.zeros((num_states, num_states))
+    b_full = np.zeros((num_states, num_inputs))
+    c_full = np.zeros((num_outputs, num_states))
+    i = 0
+    for a, b, c, inputs, outputs in systems:
+        n = a.shape[0]
+        a_full[i:i + n, i:i + n] = a
+        b_full[i:i + n, inputs] = b
+        c_full[outputs, i:i + n] = c
+        i += n
+    return a_full, b_full, c_full
+
+
+def _merge(defaults: dict, overrides: dict) -> dict:
+    merged = dict(defaults)
+    for key, value in overrides.items():
+        merged[key] = _merge(defaults[key], value) if isinstance(defaults.get(key), dict) else value
+    return merged
+
+
+class _Washout:
+    """Base: escala/satura as entradas e avança o filtro linear"""
+
+    def __init__(self, params: dict, dt: float):
+        self.dt = dt
+        self.scale = np.array([params['force_scale']] * 3 + [params['rate_scale']] * 3)
+        self.limit = np.array([params['force_limit']] * 3 + [params['rate_limit']] * 3)
+        self.pose = np.zeros(6)
+        self.filter = None
+
+    def _load_inputs(self, inputs):
+        u = self.filter.inputs
+        np.subtract(inputs, NEUTRAL_INPUT, out=u)
+        np.multiply(u, self.scale, out=u)
+        np.clip(u, -self.limit, self.limit, out=u)
+
+    def reset(self):
+        self.filter.reset()
+        self.pose[:] = 0.0
+
+
+class ClassicalWashout(_Washout):
+    """
+    Washout clássico (Reid & Nahon) com eixos da plataforma alinhados ao corpo
+    Saídas do filtro: posição x, y, z; força filtrada para inclinação (fx, fy);
+    ângulos de roll, pitch e yaw do canal de rotação
+    """
+
+    def __init__(self, params: dict, dt: float):
+        super().__init__(params, dt)
+        systems = []
+        for axis, name in enumerate('xyz'):
+            p = params['translational'][name]
+            # Posição/aceleração = passa-altas de 3ª ordem / s²
+            den = np.polymul([1.0, 2.0 * p['zeta'] * p['wn'], p['wn'] ** 2], [1.0, p['wb']])
+            a, b, c, _ = transfer_function_ss([1.0, 0.0], den)
+            systems.append((a, b, c, [axis], [axis]))
+
+        tilt = params['tilt']
+        a, b, c, _ = transfer_function_ss([tilt['wn'] ** 2], [1.0, 2.0 * tilt['zeta'] * tilt['wn'], tilt['wn'] ** 2])
+        systems.append((a, b, c, [0], [3]))
+        systems.append((a, b, c, [1], [4]))
+
+        for axis, name in enumerate(('roll', 'pitch', 'yaw')):
+            p = params['rotational'][name]
+            # Ângulo/taxa = passa-altas de 2ª ordem / s
+            a, b, c, _ = transfer_function_ss([1.0, 0.0], [1.0, 2.0 * p['zeta'] * p['wn'], p['wn'] ** 2])
+            systems.append((a, b, c, [3 + axis], [5 + axis]))
+
+        self.filter = StateSpaceFilter.from_continuous(*_block_diagonal(systems, 6, 8), dt)
+        self.tilt_step = math.radians(tilt['rate_limit_deg']) * dt
+        self.tilt = np.zeros(2)          # roll, pitch de coordenação
+        self._tilt_target = np.zeros(2)
+
+    def reset(self):
+        super().reset()
+        self.tilt[:] = 0.0
+
+    def step(self, inputs) -> np.ndarray:
+        """[fx, fy, fz, p, q, r] → pose [x, y, z, roll, pitch, yaw]"""
+        self._load_inputs(inputs)
+        out = self.filter.step()
+
+        # Inclinação sustentada: fx = g·sen θ, fy = -g·sen φ (abaixo do limiar de taxa)
+        target = self._tilt_target
+        target[0] = -out[4]
+        target[1] = out[3]
+        np.divide(target, GRAVITY, out=target)
+        np.clip(target, -1.0, 1.0, out=target)
+        np.arcsin(target, out=target)
+        np.subtract(target, self.tilt, out=target)
+        np.clip(target, -self.tilt_step, self.tilt_step, out=target)
+        np.add(self.tilt, target, out=self.tilt)
+
+        pose = self.pose
+        pose[:3] = out[:3]
+        pose[3] = out[5] + self.tilt[0]
+        pose[4] = out[6] + self.tilt[1]
+        pose[5] = out[7]
+        return pose
+
+
+class OptimalWashout(_Washout):
+    """
+    Washout ótimo (Sivan/Telban): minimiza o erro entre a sensação vestibular
+    da aeronave e da plataforma e o erro direto de cue (força específica e
+    taxa), com custo nos estados e comandos da plataforma
+    Canais independentes: surge+pitch, sway+roll (acoplados pela inclinação),
+    heave (só otólito) e yaw (só canal). O ganho LQ sai da Riccati contínua e
+    a malha fechada inteira é discretizada uma vez
+    """
+
+    # (força, taxa, sinal da inclinação em f = a + s·g·ângulo, saída de posição, saída de ângulo)
+    CHANNELS = ((0, 4, +1.0, 0, 4), (1, 3, -1.0, 1, 3), (2, None, 0.0, 2, None), (None, 5, 0.0, None, 5))
+
+    def __init__(self, params: dict, dt: float):
+        super().__init__(params, dt)
+        systems = [self._channel(params, *channel) for channel in self.CHANNELS]
+        self.filter = StateSpaceFilter.from_continuous(*_block_diagonal(systems, 6, 6), dt)
+
+    @staticmethod
+    def _channel(params, force, rate, tilt_sign, position_output, angle_output):
+        """Malha fechada contínua do canal: entradas da aeronave → pose da plataforma"""
+        oto, scc, w = params['otolith'], params['canal'], params['weights']
+        blocks = []   # (A, B, C) dos modelos vestibulares usados
+        if force is not None:
+            blocks.append(transfer_function_ss([oto['gain'] * oto['tau_a'], oto['gain']],
+                                               np.polymul([oto['tau_l'], 1.0], [oto['tau_s'], 1.0])))
+        if rate is not None:
+            tau_a, tau_1, tau_2 = scc['tau_a'], scc['tau_1'], scc['tau_2']
+            den = np.polymul(np.polymul([tau_a, 1.0], [tau_1, 1.0]), [tau_2, 1.0])
+            blocks.append(transfer_function_ss([tau_a * tau_1, 0.0, 0.0], den))
+
+        # Estados: [vestibulares | posição, velocidade | ângulo]; comandos: [aceleração | taxa]
+        vestibular = sum(a.shape[0] for a, *_ in blocks)
+        num_platform = (2 if force is not None else 0) + (1 if rate is not None else 0)
+        n = vestibular + num_platform
+        m = len(blocks)
+        a = np.zeros((n, n))
+        b_u = np.zeros((n, m))
+        b_d = np.zeros((n, m))
+        sensed = np.zeros((m, n))
+        q_platform = np.zeros(n)
+        r_weights, sensation_weights, cue_weights = [], [], []
+
+        i, platform = 0, vestibular
+        angle_state = vestibular + (2 if force is not None else 0)
+        for k, (a_v, b_v, c_v, _) in enumerate(blocks):
+            size = a_v.shape[0]
+            rows = slice(i, i + size)
+            i += size
+            a[rows, rows] = a_v
+            # Erro de sensação: o modelo vê (aeronave - plataforma)
+            b_d[rows, k] = b_v[:, 0]
+            b_u[rows, k] = -b_v[:, 0]
+            sensed[k, rows] = c_v[0]
+            if force is not None and k == 0:
+                if rate is not None:
+                    # Inclinação da plataforma também aparece como força específica
+                    a[rows, angle_state] = -tilt_sign * GRAVITY * b_v[:, 0]
+                a[platform, platform + 1] = 1.0
+                b_u[platform + 1, k] = 1.0
+                q_platform[platform:platform + 2] = (w['position'], w['velocity'])
+                r_weights.append(w['acceleration'])
+                sensation_weights.append(w['otolith'])
+                cue_weights.append(w['specific_force'])
+            else:
+                b_u[angle_state, k] = 1.0
+                q_platform[angle_state] = w['angle']
+                r_weights.append(w['angular_rate'])
+                sensation_weights.append(w['canal'])
+                cue_weights.append(w['rotation'])
+        cue_weights = np.diag(cue_weights)
+
+        # Projeto: entrada da aeronave como estado (ruído branco filtrado) → ganho de feedforward
+        gamma = params['input_bandwidth']
+        a_design = np.block([[a, b_d], [np.zeros((m, n)), -gamma * np.eye(m)]])
+        b_design = np.vstack([b_u, np.zeros((m, m))])
+        q_design = np.zeros((n + m, n + m))
+        q_design[:n, :n] = sensed.T @ np.diag(sensation_weights) @ sensed + np.diag(q_platform)
+
+        # Erro direto de cue (aeronave - plataforma) = H_x·X - u, com a inclinação na força
+        h_x = np.hstack([np.zeros((m, n)), np.eye(m)])
+        if force is not None and rate is not None:
+            h_x[0, angle_state] = -tilt_sign * GRAVITY
+        q_design += h_x.T @ cue_weights @ h_x
+        cross = -h_x.T @ cue_weights
+        r = np.diag(r_weights) + cue_weights
+        p = solve_continuous_riccati(a_design, b_design, q_design, r, cross)
+        gain = np.linalg.solve(r, b_design.T @ p + cross.T)
+        k_state, k_input = gain[:, :n], gain[:, n:]
+
+        a_closed = a - b_u @ k_state
+        b_closed = b_d - b_u @ k_input
+        c = np.zeros((m, n))
+        outputs, inputs, row = [], [], 0
+        if force is not None:
+            c[row, vestibular] = 1.0
+            outputs.append(position_output)
+            inputs.append(force)
+            row += 1
+        if rate is not None:
+            c[row, angle_state] = 1.0
+            outputs.append(angle_output)
+            inputs.append(rate)
+        return a_closed, b_closed, c, inputs, outputs
+
+    def step(self, inputs) -> np.ndarray:
+        """[fx, fy, fz, p, q, r] → pose [x, y, z, roll, pitch, yaw]"""
+        self._load_inputs(inputs)
+        np.copyto(self.pose, self.filter.step())
+        return self.pose
+
+
+WASHOUTS = {'classical': (ClassicalWashout, DEFAULT_CLASSICAL), 'optimal': (OptimalWashout, DEFAULT_OPTIMAL)}
+
+
+def build_washout(config: dict, dt: float):
+    """Washout da seção 'motion_cueing' ('washout': classical | optimal)"""
+    kind = config.get('washout', 'classical')
+    if kind not in WASHOUTS:
+        raise ValueError(f"Washout desconhecido: {kind} (opções: {sorted(WASHOUTS)})")
+    cls, defaults = WASHOUTS[kind]
+    return cls(_merge(defaults, config.get(kind, {})), dt)
+
+
+def rotation_matrices(angles) -> np.ndarray:
+    """Lote de ângulos (N, 3) [roll, pitch, yaw] → matrizes (N, 3, 3) plataforma → base (3-2-1)"""
+    angles = np.asarray(angles, dtype=float)
+    s_phi, s_theta, s_psi = np.sin(angles).T
+    c_phi, c_theta, c_psi = np.cos(angles).T
+    r = np.empty((len(angles), 3, 3))
+    r[:, 0, 0] = c_theta * c_psi
+    r[:, 0, 1] = s_phi * s_theta * c_psi - c_phi * s_psi
+    r[:, 0, 2] = c_phi * s_theta * c_psi + s_phi * s_psi
+    r[:, 1, 0] = c_theta * s_psi
+    r[:, 1, 1] = s_phi * s_theta * s_psi + c_phi * c_psi
+    r[:, 1, 2] = c_phi * s_theta * s_psi - s_phi * c_psi
+    r[:, 2, 0] = -s_theta
+    r[:, 2, 1] = s_phi * c_theta
+    r[:, 2, 2] = c_phi * c_theta
+    return r
+
+
+class StewartPlatform:
+    """
+    Plataforma 6-6 com juntas em pares a cada 120°, eixos NED (z para baixo)
+    com origem no centro da base; pose relativa à posição neutra (pernas no
+    meio do curso)
+    """
+
+    def __init__(self, base_radius=1.0, platform_radius=0.6, base_separation_deg=20.0,
+                 platform_separation_deg=20.0, min_leg=1.1, max_leg=1.7,
+                 pose_limits=(0.3, 0.3, 0.2, 20.0, 20.0, 25.0)):
+        pair = np.repeat(np.arange(3) * 2.0 * math.pi / 3.0, 2)
+        side = np.tile([-1.0, 1.0], 3)
+        base_angles = pair + side * math.radians(base_separation_deg) / 2.0
+        platform_angles = pair + side * (math.pi / 3.0 - math.radians(platform_separation_deg) / 2.0)
+        self.base_joints = np.column_stack([base_radius * np.cos(base_angles),
+                                            base_radius * np.sin(base_angles), np.zeros(6)])
+        self.platform_joints = np.column_stack([platform_radius * np.cos(platform_angles),
+                                                platform_radius * np.sin(platform_angles), np.zeros(6)])
+        self.min_leg, self.max_leg = float(min_leg), float(max_leg)
+
+        # Altura neutra: todas as pernas com o comprimento médio
+        nominal = 0.5 * (self.min_leg + self.max_leg)
+        horizontal = np.linalg.norm(self.platform_joints[0] - self.base_joints[0])
+        if horizontal >= nominal:
+            raise ValueError("Geometria inválida: pernas mais curtas que a distância horizontal entre juntas")
+        self.neutral_height = math.sqrt(nominal * nominal - horizontal * horizontal)
+        self.nominal_leg = nominal
+        self._offset = np.array([0.0, 0.0, -self.neutral_height]) - self.base_joints  # (6, 3)
+
+        limits = np.asarray(pose_limits, dtype=float)
+        self.pose_limits = np.concatenate([limits[:3], np.radians(limits[3:])])
+
+        self._legs = np.zeros((6, 3))
+        self.lengths = np.zeros(6)
+
+    @classmethod
+    def from_config(cls, config: dict) -> "StewartPlatform":
+        return cls(**{**DEFAULT_PLATFORM, **config})
+
+    def inverse_kinematics(self, pose) -> np.ndarray:
+        """Pose → comprimentos das 6 pernas (buffer reaproveitado), l_i = |t + R·p_i - b_i|"""
+        rotation = rotation_matrices(np.asarray(pose[3:6])[None])[0]
+        legs = self._legs
+        np.dot(self.platform_joints, rotation.T, out=legs)
+        legs += self._offset
+        legs += pose[:3]
+        np.sqrt(np.einsum('ij,ij->i', legs, legs), out=self.lengths)
+        return self.lengths
+
+    def leg_lengths(self, poses) -> np.ndarray:
+        """Lote de poses (N, 6) → comprimentos (N, 6)"""
+        poses = np.atleast_2d(np.asarray(poses, dtype=float))
+        rotations = rotation_matrices(poses[:, 3:])
+        legs = np.einsum('nij,kj->nki', rotations, self.platform_joints)
+        legs += self._offset
+        legs += poses[:, None, :3]
+        return np.sqrt(np.einsum('nki,nki->nk', legs, legs))
+
+    def check(self, poses, lengths=None) -> np.ndarray:
+        """Máscara (N,) das poses dentro do espaço de trabalho: excursões por eixo e curso das pernas"""
+        poses = np.atleast_2d(np.asarray(poses, dtype=float))
+        if lengths is None:
+            lengths = self.leg_lengths(poses)
+        lengths = np.atleast_2d(lengths)
+        within_pose = np.all(np.abs(poses) <= self.pose_limits, axis=1)
+        within_legs = np.all((lengths >= self.min_leg) & (lengths <= self.max_leg), axis=1)
+        return within_pose & within_legs
+
+    def limit(self, pose, candidates: int = 16):
+        """
+        Pose que cabe no espaço de trabalho: a própria, ou recuada em direção à
+        neutra pelo maior fator de uma grade avaliada em lote → (pose, fator)
+        """
+        pose = np.asarray(pose, dtype=float)
+        if self.check(pose, self.inverse_kinematics(pose))[0]:
+            return pose, 1.0
+        scales = np.linspace(1.0, 0.0, candidates + 1)[1:]
+        trial = scales[:, None] * pose
+        valid = self.check(trial)
+        # A pose neutra (fator 0) sempre cabe
+        scale = float(scales[np.argmax(valid)]) if valid.any() else 0.0
+        limited = scale * pose
+        self.inverse_kinematics(limited)
+        return limited, scale
+
+
+class MotionCueing:
+    def __init__(self, message_bus, config, dt: float = 1 / 60.0, sink: Optional[Callable] = None):
+        self.bus = message_bus
+        self.dt = dt
+
+        motion = config.get('motion_cueing', {})
+        # Subpassos inteiros por frame: taxa efetiva ≥ rate_hz pedida
+        self.substeps = max(1, math.ceil(float(motion.get('rate_hz', 500.0)) * dt - 1e-9))
+        self.sample_dt = dt / self.substeps
+        self.rate_hz = 1.0 / self.sample_dt
+        self.washout = build_washout(motion, self.sample_dt)
+        self.platform = StewartPlatform.from_config(motion.get('platform', {}))
+        self.sink = sink     # recebe (pose, comprimentos) a cada amostra da plataforma
+
+        self.state = None
+        self._previous_velocity = None
+        self._inputs = NEUTRAL_INPUT.copy()
+        self._previous_inputs = NEUTRAL_INPUT.copy()
+        self._sample = np.zeros(6)
+        self.command = MotionCommand(leg_lengths=(self.platform.nominal_leg,) * 6)
+        self.ticks = 0
+        self.limited_samples = 0
+
+        # ASSINA estes tópicos:
+        self.bus.subscribe('aircraft_state', self.handle_aircraft_state)
+
+    def handle_aircraft_state(self, state):
+        self.state = state
+
+    def specific_force(self):
+        """Força específica [m/s²] e taxas [rad/s] no corpo: f = dV/dt + ω×V - g"""
+        state = self.state
+        u, v, w = state.velocity_body.x, state.velocity_body.y, state.velocity_body.z
+        p, q, r = state.rates_body.x, state.rates_body.y, state.rates_body.z
+        phi, theta = state.euler.x, state.euler.y
+        if self._previous_velocity is None:
+            du = dv = dw = 0.0
+        else:
+            du = (u - self._previous_velocity[0]) / self.dt
+            dv = (v - self._previous_velocity[1]) / self.dt
+            dw = (w - self._previous_velocity[2]) / self.dt
+        self._previous_velocity = (u, v, w)
+        c_theta = math.cos(theta)
+        inputs = self._inputs
+        inputs[0] = du + q * w - r * v + GRAVITY * math.sin(theta)
+        inputs[1] = dv + r * u - p * w - GRAVITY * math.sin(phi) * c_theta
+        inputs[2] = dw + p * v - q * u - GRAVITY * math.cos(phi) * c_theta
+        inputs[3], inputs[4], inputs[5] = p, q, r
+        return inputs
+
+    def process(self, inputs):
+        """Uma amostra da plataforma: washout → espaço de trabalho → cinemática inversa"""
+        pose = self.washout.step(inputs)
+        pose, scale = self.platform.limit(pose)
+        self.ticks += 1
+        if scale < 1.0:
+            self.limited_samples += 1
+        if self.sink is not None:
+            self.sink(pose, self.platform.lengths)
+        return pose, scale
+
+    def update(self):
+        if self.state is None:
+            return
+
+        # LÓGICA: entradas do frame interpoladas linearmente pelos subpassos da plataforma
+        previous, current = self._previous_inputs, self.specific_force()
+        sample = self._sample
+        limited = False
+        for k in range(1, self.substeps + 1):
+            np.subtract(current, previous, out=sample)
+            sample *= k / self.substeps
+            sample += previous
+            pose, scale = self.process(sample)
+            limited = limited or scale < 1.0
+        np.copyto(previous, current)
+
+        self.command = MotionCommand(tuple(pose.tolist()), tuple(self.platform.lengths.tolist()), limited,
+                                     self.ticks)
+
+        # PUBLICA neste tópico:
+        self.bus.publish('motion_commands', self.command)
@@ -0,0 +1,464 @@
+# visual_systems/sound_system.py
+"""
+Síntese sonora: motor, hélice, vento e trem de pouso
+- O loop da simulação só troca os parâmetros mais recentes (rpm, potência,
+  velocidade, contato com o solo) por LatestValue; nunca gera amostras
+- Thread de síntese gera blocos vetorizados (256-1024 amostras) em um ring
+  buffer; thread de áudio consome o ring no ritmo do dispositivo/relógio
+- Motor e hélice: um único acumulador de fase do eixo e todas as ordens
+  harmônicas em uma multiplicação (amostras × ordens) · (ordens × 2) com
+  rampa linear de amplitude/frequência dentro do bloco (sem "zipper noise")
+- Vento e rolagem no solo: tabelas de ruído periódicas geradas uma vez por
+  FFT (laço sem emenda), lidas com índices e misturadas por banda
+- Saídas: NullSink e WaveFileSink para rodar sem placa de som; DeviceSink
+  usa 'sounddevice' quando instalado
+- measure_real_time_factor() mede segundos de áudio gerados por segundo de CPU
+"""
+
+from dataclasses import dataclass
+import math
+import threading
+import time
+import wave
+
+import numpy as np
+
+from core.concurrency import LatestValue
+
+DEFAULT_SOUND = {
+    'sample_rate': 22050,
+    'block_size': 512,
+    'ring_blocks': 8,              # capacidade do ring buffer em blocos
+    'latency_blocks': 3,           # blocos mantidos à frente da thread de áudio
+    'cylinders': 4,
+    'propeller_blades': 2,
+    'master_gain': 0.8,
+    'levels': {'engine': 0.35, 'propeller': 0.25, 'combustion': 0.15, 'wind': 0.3,
+               'rumble': 0.3, 'touchdown': 0.6},
+    'reference_airspeed': 60.0,    # m/s - vento em nível e brilho máximos
+    'reference_ground_speed': 30.0,
+}
+
+# Harmônicos da frequência de disparo (ordem, amplitude relativa) e da passagem das pás
+ENGINE_HARMONICS = ((1.0, 1.0), (2.0, 0.5), (3.0, 0.35), (4.0, 0.25), (6.0, 0.15))
+PROPELLER_HARMONICS = ((1.0, 1.0), (2.0, 0.4), (3.0, 0.2))
+
+_NOISE_LENGTH = 1 << 16
+_TWO_PI = 2.0 * math.pi
+
+
+@dataclass(frozen=True)
+class SoundParameters:
+    """Contrato: SoundSystem → thread de síntese (troca pelo valor mais recente)"""
+    rpm: float = 0.0
+    power_fraction: float = 0.0      # potência / potência nominal
+    tip_mach: float = 0.0            # Mach na ponta da hélice
+    airspeed: float = 0.0            # m/s
+    weight_on_wheels: bool = False
+    ground_speed: float = 0.0        # m/s
+
+
+def _band_noise(rng, length: int, sample_rate: float, low: float, high: float) -> np.ndarray:
+    """Ruído branco restrito a [low, high] Hz, periódico em 'length' amostras, RMS unitário"""
+    spectrum = rng.normal(size=length // 2 + 1) + 1j * rng.normal(size=length // 2 + 1)
+    frequencies = np.fft.rfftfreq(length, 1.0 / sample_rate)
+    spectrum[(frequencies < low) | (frequencies > high)] = 0.0
+    noise = np.fft.irfft(spectrum, length)
+    return (noise / noise.std()).astype(np.float32)
+
+
+class SoundSynthesizer:
+    """Gera blocos de áudio mono float32 a partir de SoundParameters"""
+
+    def __init__(self, config: dict, sample_rate: int = 22050, block_size: int = 512, seed: int = 0):
+        sound = {**DEFAULT_SOUND, **config}
+        self.levels = {**DEFAULT_SOUND['levels'], **config.get('levels', {})}
+        self.sample_rate = int(sample_rate)
+        self.block_size = int(block_size)
+        self.master_gain = float(sound['master_gain'])
+        self.reference_airspeed = float(sound['reference_airspeed'])
+        self.reference_ground_speed = float(sound['reference_ground_speed'])
+
+        # Ordens em múltiplos da rotação do eixo (4 tempos: disparos = cilindros/2 por volta)
+        firing = sound['cylinders'] / 2.0
+        blades = float(sound['propeller_blades'])
+        self.orders = np.array([firing * k for k, _ in ENGINE_HARMONICS] + [blades * k for k, _ in PROPELLER_HARMONICS])
+        self._engine_shape = np.array([a for _, a in ENGINE_HARMONICS] + [0.0] * len(PROPELLER_HARMONICS))
+        self._propeller_shape = np.array([0.0] * len(ENGINE_HARMONICS) + [a for _, a in PROPELLER_HARMONICS])
+        self.firing = firing
+
+        rng = np.random.default_rng(seed)
+        self._rumble_noise = _band_noise(rng, _NOISE_LENGTH, sample_rate, 20.0, 250.0)
+        self._wind_low = _band_noise(rng, _NOISE_LENGTH, sample_rate, 80.0, 800.0)
+        self._wind_high = _band_noise(rng, _NOISE_LENGTH, sample_rate, 800.0, 6000.0)
+
+        n = self.block_size
+        self._ramp = np.arange(1, n + 1) / n              # 1/n … 1: interpolação dentro do bloco
+        self._offsets = np.arange(n)
+        self._levels = np.zeros((self.orders.size, 2))     # amplitudes por ordem (início, fim do bloco)
+
+        self.reset()
+
+    def reset(self, params: SoundParameters = None):
+        """Reinicia fase e ruído; 'params' evita a rampa a partir do silêncio no primeiro bloco"""
+        self.phase = 0.0                 # fase do eixo [rad]
+        self._previous = params if params is not None else SoundParameters()
+        self._noise_position = 0
+        self._touchdown_time = math.inf  # s desde o último toque no solo
+        self._touchdown_level = 0.0
+
+    def _amplitudes(self, params: SoundParameters):
+        """Amplitudes-alvo de cada fonte para os parâmetros dados"""
+        levels = self.levels
+        running = params.rpm > 1.0
+        power = min(max(params.power_fraction, 0.0), 1.0)
+        engine = levels['engine'] * (0.3 + 0.7 * power) if running else 0.0
+        propeller = levels['propeller'] * min(params.tip_mach / 0.8, 1.0) ** 2
+        combustion = levels['combustion'] * (0.2 + 0.8 * power) if running else 0.0
+        speed = min(abs(params.airspeed) / self.reference_airspeed, 1.0)
+        wind = levels['wind'] * speed * speed
+        ground = min(params.ground_speed / self.reference_ground_speed, 1.0)
+        rumble = levels['rumble'] * ground if params.weight_on_wheels else 0.0
+        return engine, propeller, combustion, wind, speed, rumble
+
+    def render(self, params: SoundParameters) -> np.ndarray:
+        """Um bloco de block_size amostras, contínuo em fase com o anterior"""
+        n, fs = self.block_size, self.sample_rate
+        previous, ramp = self._previous, self._ramp
+        start = self._amplitudes(previous)
+        end = self._amplitudes(params)
+
+        # Fase do eixo com rampa de rotação: φ[k] = φ0 + Σ 2π f[k]/fs
+        shaft_start, shaft_end = previous.rpm / 60.0, params.rpm / 60.0
+        increments = (shaft_start + (shaft_end - shaft_start) * ramp) * (_TWO_PI / fs)
+        phase = np.cumsum(increments)
+        phase += self.phase
+        self.phase = float(phase[-1] % _TWO_PI)
+
+        # Motor + hélice: (n × ordens) · (ordens × [início, fim]) e mistura pela rampa
+        levels = self._levels
+        levels[:, 0] = start[0] * self._engine_shape + start[1] * self._propeller_shape
+        levels[:, 1] = end[0] * self._engine_shape + end[1] * self._propeller_shape
+        tonal = np.sin(np.multiply.outer(phase, self.orders)) @ levels
+        out = tonal[:, 0] + (tonal[:, 1] - tonal[:, 0]) * ramp
+
+        index = self._offsets + self._noise_position
+        self._noise_position = (self._noise_position + n) % _NOISE_LENGTH
+        rumble_noise = self._rumble_noise.take(index, mode='wrap')
+        # Mesma tabela meio período adiante: ruído de rolagem descorrelacionado da combustão
+        index += _NOISE_LENGTH // 2
+        ground_noise = self._rumble_noise.take(index, mode='wrap')
+
+        # Ruído de combustão modulado na frequência de disparo
+        combustion = start[2] + (end[2] - start[2]) * ramp
+        out += combustion * rumble_noise * (0.5 + 0.5 * np.cos(self.firing * phase))
+
+        # Vento: nível ∝ V², brilho (mistura baixa/alta frequência) ∝ V
+        wind = start[3] + (end[3] - start[3]) * ramp
+        brightness = start[4] + (end[4] - start[4]) * ramp
+        low = self._wind_low.take(index, mode='wrap')
+        high = self._wind_high.take(index, mode='wrap')
+        out += wind * (low + brightness * (high - low))
+
+        # Rolagem no solo e pancada do toque (borda de subida de weight_on_wheels)
+        rumble = start[5] + (end[5] - start[5]) * ramp
+        out += rumble * ground_noise
+        if params.weight_on_wheels and not previous.weight_on_wheels:
+            self._touchdown_time = 0.0
+            self._touchdown_level = self.levels['touchdown'] * min(params.ground_speed / 20.0 + 0.3, 1.0)
+        if self._touchdown_time < 1.0:
+            t = self._touchdown_time + self._offsets / fs
+            out += self._touchdown_level * np.exp(-t / 0.12) * np.sin(_TWO_PI * 55.0 * t)
+            self._touchdown_time += n / fs
+
+        self._previous = params
+        # Limitador suave da mistura
+        return np.tanh(self.master_gain * out).astype(np.float32)
+
+
+class AudioRingBuffer:
+    """
+    Ring buffer de amostras, um produtor e um consumidor
+    Contadores monotônicos: o produtor só avança 'written' depois de copiar os
+    dados e o consumidor só avança 'read' depois de copiá-los (sem locks)
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity, dtype=np.float32)
+        self.written = 0
+        self.read_count = 0
+
+    @property
+    def available(self) -> int:
+        return self.written - self.read_count
+
+    @property
+    def free(self) -> int:
+        return self.capacity - self.available
+
+    def write(self, block) -> bool:
+        n = len(block)
+        if n > self.free:
+            return False
+        start = self.written % self.capacity
+        first = min(n, self.capacity - start)
+        self._data[start:start + first] = block[:first]
+        self._data[:n - first] = block[first:]
+        self.written += n
+        return True
+
+    def read(self, out: np.ndarray) -> int:
+        """Preenche 'out' (zeros no que faltar) e retorna quantas amostras havia"""
+        n = min(len(out), self.available)
+        start = self.read_count % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self._data[start:start + first]
+        out[first:n] = self._data[:n - first]
+        out[n:] = 0.0
+        self.read_count += n
+        return n
+
+
+class NullSink:
+    """Descarta as amostras (testes e máquinas sem áudio)"""
+    blocking = False
+
+    def __init__(self):
+        self.frames = 0
+
+    def write(self, block):
+        self.frames += len(block)
+
+    def close(self):
+        pass
+
+
+class WaveFileSink:
+    """Grava as amostras em um .wav PCM 16 bits mono"""
+    blocking = False
+
+    def __init__(self, path: str, sample_rate: int):
+        self.path = path
+        self.frames = 0
+        self._file = wave.open(path, 'wb')
+        self._file.setnchannels(1)
+        self._file.setsampwidth(2)
+        self._file.setframerate(sample_rate)
+
+    def write(self, block):
+        self._file.writeframes((np.clip(block, -1.0, 1.0) * 32767.0).astype('<i2').tobytes())
+        self.frames += len(block)
+
+    def close(self):
+        self._file.close()
+
+
+class DeviceSink:
+    """Placa de som via 'sounddevice' (opcional); write() bloqueia no ritmo do dispositivo"""
+    blocking = True
+
+    def __init__(self, sample_rate: int, block_size: int):
+        try:
+            import sounddevice
+        except ImportError as error:
+            raise ImportError("DeviceSink requer o pacote 'sounddevice' (use sink: null ou file)") from error
+        self.frames = 0
+        self._stream = sounddevice.OutputStream(samplerate=sample_rate, blocksize=block_size,
+                                                channels=1, dtype='float32')
+        self._stream.start()
+
+    def write(self, block):
+        self._stream.write(block.reshape(-1, 1))
+        self.frames += len(block)
+
+    def close(self):
+        self._stream.stop()
+        self._stream.close()
+
+
+def make_sink(config: dict, sample_rate: int, block_size: int):
+    kind = config.get('sink') or 'null'     # YAML 'null' chega como None
+    if kind == 'null':
+        return NullSink()
+    if kind == 'file':
+        return WaveFileSink(config.get('file', 'sound_output.wav'), sample_rate)
+    if kind == 'device':
+        return DeviceSink(sample_rate, block_size)
+    raise ValueError(f"Saída de áudio desconhecida: {kind} (opções: null, file, device)")
+
+
+class AudioEngine:
+    """Thread de síntese (produtor do ring) e thread de áudio (consumidor → sink)"""
+
+    def __init__(self, synthesizer: SoundSynthesizer, sink, ring_blocks: int = 8, latency_blocks: int = 3):
+        self.synthesizer = synthesizer
+        self.sink = sink
+        self.block_size = synthesizer.block_size
+        self.block_period = self.block_size / synthesizer.sample_rate
+        self.ring = AudioRingBuffer(ring_blocks * self.block_size)
+        self.target_fill = min(latency_blocks, ring_blocks) * self.block_size
+        self.parameters = LatestValue(SoundParameters())
+
+        self.blocks_rendered = 0
+        self.blocks_played = 0
+        self.underruns = 0
+        self.render_time = 0.0
+        self._out = np.zeros(self.block_size, dtype=np.float32)
+
+        self._threads = []
+        self._stop = threading.Event()
+
+    def render_block(self) -> bool:
+        """Gera um bloco com os parâmetros mais recentes, se couber no ring"""
+        if self.ring.free < self.block_size:
+            return False
+        start = time.perf_counter()
+        block = self.synthesizer.render(self.parameters.read())
+        self.render_time += time.perf_counter() - start
+        self.ring.write(block)
+        self.blocks_rendered += 1
+        return True
+
+    def play_block(self):
+        """Entrega um bloco ao sink (silêncio no que faltar = underrun)"""
+        if self.ring.read(self._out) < self.block_size:
+            self.underruns += 1
+        self.sink.write(self._out)
+        self.blocks_played += 1
+
+    def _render_loop(self):
+        while not self._stop.is_set():
+            if self.ring.available < self.target_fill and self.render_block():
+                continue
+            time.sleep(self.block_period / 4.0)
+
+    def _output_loop(self):
+        # Espera a thread de síntese encher a latência alvo antes de começar a tocar
+        while self.ring.available < self.target_fill and not self._stop.is_set():
+            time.sleep(self.block_period / 4.0)
+        deadline = time.perf_counter()
+        while not self._stop.is_set():
+            self.play_block()
+            if self.sink.blocking:
+                continue
+            # Sink sem relógio próprio: ritmo de tempo real pelo perf_counter
+            deadline += self.block_period
+            delay = deadline - time.perf_counter()
+            if delay > 0.0:
+                time.sleep(delay)
+            elif -delay > self.block_period:
+                deadline = time.perf_counter()
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        self.synthesizer.reset(self.parameters.read())
+        self._threads = [threading.Thread(target=self._render_loop, name='sound-synthesis', daemon=True),
+                         threading.Thread(target=self._output_loop, name='sound-output', daemon=True)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+        self.sink.close()
+
+    def stats(self) -> dict:
+        mean_render = self.render_time / self.blocks_rendered if self.blocks_rendered else 0.0
+        return {
+            'blocks_rendered': self.blocks_rendered,
+            'blocks_played': self.blocks_played,
+            'underruns': self.underruns,
+            'render_ms': mean_render * 1e3,
+            'real_time_factor': self.block_period / mean_render if mean_render > 0.0 else 0.0,
+            'latency_ms': self.ring.available / self.synthesizer.sample_rate * 1e3,
+        }
+
+
+def measure_real_time_factor(synthesizer: SoundSynthesizer, seconds: float = 10.0) -> float:
+    """Segundos de áudio gerados por segundo de relógio, varrendo rpm/velocidade"""
+    blocks = max(1, int(seconds * synthesizer.sample_rate / synthesizer.block_size))
+    sweep = np.linspace(0.0, 1.0, blocks)
+    parameters = [SoundParameters(rpm=700.0 + 2000.0 * x, power_fraction=x, tip_mach=0.2 + 0.6 * x,
+                                  airspeed=60.0 * x, weight_on_wheels=x < 0.3, ground_speed=30.0 * x)
+                  for x in sweep]
+    synthesizer.reset()
+    start = time.perf_counter()
+    for params in parameters:
+        synthesizer.render(params)
+    elapsed = time.perf_counter() - start
+    return blocks * synthesizer.block_size / synthesizer.sample_rate / elapsed
+
+
+class SoundSystem:
+    def __init__(self, message_bus, config, sink=None, dt: float = 1 / 60.0):
+        self.bus = message_bus
+        self.dt = dt
+
+        sound = {**DEFAULT_SOUND, **config.get('sound', {})}
+        sample_rate, block_size = int(sound['sample_rate']), int(sound['block_size'])
+        self.synthesizer = SoundSynthesizer(sound, sample_rate, block_size)
+        if sink is None:
+            sink = make_sink(sound, sample_rate, block_size)
+        self.engine = AudioEngine(self.synthesizer, sink, int(sound['ring_blocks']), int(sound['latency_blocks']))
+
+        propulsion = config.get('propulsion', {})
+        self.rated_power = float(propulsion.get('engine', {}).get('rated_power', 1.0))
+        self.propeller_diameter = float(propulsion.get('propeller', {}).get('diameter', 0.0))
+
+        self.propulsion = None
+        self.state = None
+        self.gear = None
+        self.speed_of_sound = 340.29
+
+        # ASSINA estes tópicos:
+        self.bus.subscribe('propulsion_state', self.handle_propulsion_state)
+        self.bus.subscribe('aircraft_state', self.handle_aircraft_state)
+        self.bus.subscribe('gear_state', self.handle_gear_state)
+        self.bus.subscribe('environment', self.handle_environment)
+
+    def handle_propulsion_state(self, propulsion_state):
+        self.propulsion = propulsion_state
+
+    def handle_aircraft_state(self, state):
+        self.state = state
+
+    def handle_gear_state(self, gear_state):
+        self.gear = gear_state
+
+    def handle_environment(self, environment):
+        self.speed_of_sound = environment.speed_of_sound
+
+    def start(self):
+        self.engine.start()
+
+    def stop(self):
+        self.engine.stop()
+
+    def stats(self) -> dict:
+        return self.engine.stats()
+
+    def parameters(self) -> SoundParameters:
+        """Parâmetros de síntese do estado atual (só escalares, sem gerar amostras)"""
+        rpm = power = tip_mach = airspeed = ground_speed = 0.0
+        on_ground = False
+        if self.propulsion is not None:
+            rpm = self.propulsion.rpm
+            power = self.propulsion.power / self.rated_power
+            tip_speed = math.pi * self.propeller_diameter * rpm / 60.0
+            tip_mach = tip_speed / self.speed_of_sound
+        if self.state is not None:
+            u, v, w = self.state.velocity_body.x, self.state.velocity_body.y, self.state.velocity_body.z
+            airspeed = math.sqrt(u * u + v * v + w * w)
+        if self.gear is not None:
+            on_ground = self.gear.weight_on_wheels
+            ground_speed = self.gear.ground_speed
+        return SoundParameters(rpm, power, tip_mach, airspeed, on_ground, ground_speed)
+
+    def update(self):
+        # LÓGICA: só troca os parâmetros; a síntese roda na thread de áudio
+        self.engine.parameters.write(self.parameters())
@@ -0,0 +1,248 @@
+# visual_systems/visualization.py
+"""
+Visualização offline de gravações de voo
+- Gravação: colunas 1-D com o mesmo comprimento, incluindo 'time' [s]
+  (.npz com um array por coluna ou .npy estruturado, aberto com mmap)
+- Decimação min/max por balde antes de plotar: picos e vales sobrevivem e o
+  matplotlib recebe ~2 pontos por pixel em vez de milhões de amostras
+- Trajetória (planta norte/leste + perfil de altitude), séries temporais e
+  histograma dos tempos de frame
+- Relatórios multi-painel gerados em um processo separado (ReportWorker):
+  o processo principal só passa caminhos; o trabalho pesado não disputa o GIL
+- matplotlib é opcional: só o desenho (draw_report) depende dele
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+import multiprocessing
+import os
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Colunas com papel fixo no relatório (as demais viram séries temporais)
+TIME = 'time'
+POSITION = ('north', 'east', 'down')
+FRAME_TIME = 'frame_time'
+
+
+@dataclass
+class Series:
+    name: str
+    time: np.ndarray
+    values: np.ndarray
+
+
+@dataclass
+class ReportData:
+    """Tudo o que o desenho precisa, já decimado (poucos milhares de pontos por painel)"""
+    title: str
+    samples: int
+    duration: float
+    path: Optional[Tuple[np.ndarray, np.ndarray]] = None           # (leste, norte)
+    altitude: Optional[Series] = None
+    series: List[Series] = field(default_factory=list)
+    histogram: Optional[Tuple[np.ndarray, np.ndarray]] = None      # (contagens, bordas em ms)
+    frame_stats: Dict[str, float] = field(default_factory=dict)
+
+
+def load_recording(path: str) -> Mapping[str, np.ndarray]:
+    """Abre a gravação sem copiar: .npy estruturado por mmap, .npz coluna a coluna sob demanda"""
+    if path.endswith('.npy'):
+        data = np.load(path, mmap_mode='r')
+        if data.dtype.names is None:
+            raise ValueError(f"{path}: esperado array estruturado (uma coluna por campo)")
+        return {name: data[name] for name in data.dtype.names}
+    if path.endswith('.npz'):
+        return np.load(path)
+    raise ValueError(f"Formato de gravação não suportado: {path} (use .npz ou .npy)")
+
+
+def minmax_decimate(time, values, buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mínimo e máximo de cada balde, na ordem em que ocorrem: no máximo
+    2·buckets pontos (+2 do balde final incompleto) preservando os extremos
+    """
+    time = np.asarray(time)
+    values = np.asarray(values)
+    n = len(values)
+    if n <= 2 * buckets:
+        return np.array(time), np.array(values)
+
+    size = n // buckets
+    main = size * buckets
+    blocks = values[:main].reshape(buckets, size)
+    low = blocks.argmin(axis=1)
+    high = blocks.argmax(axis=1)
+    base = np.arange(buckets) * size
+    index = np.empty(2 * buckets, dtype=np.int64)
+    index[0::2] = np.minimum(low, high) + base
+    index[1::2] = np.maximum(low, high) + base
+    if main < n:
+        tail = values[main:]
+        index = np.concatenate([index, np.sort([main + tail.argmin(), main + tail.argmax()])])
+    return time[index], values[index]
+
+
+def decimate_path(x, y, buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Caminho 2-D: mantém em cada balde os extremos de x e de y (até 4 pontos), em ordem"""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(x)
+    if n <= 4 * buckets:
+        return np.array(x), np.array(y)
+
+    size = n // buckets
+    main = size * buckets
+    base = np.arange(buckets)[:, None] * size
+    picks = [base + arr[:main].reshape(buckets, size).argmin(axis=1)[:, None] for arr in (x, y)]
+    picks += [base + arr[:main].reshape(buckets, size).argmax(axis=1)[:, None] for arr in (x, y)]
+    index = np.sort(np.hstack(picks), axis=1).ravel()
+    index = np.concatenate([[0], index, [n - 1]])
+    # Remove repetidos consecutivos (mesma amostra extrema em x e y)
+    index = index[np.concatenate([[True], np.diff(index) != 0])]
+    return x[index], y[index]
+
+
+def frame_time_histogram(frame_times, bins: int = 100) -> Tuple[np.ndarray, np.ndarray, Dict[str, float]]:
+    """Histograma dos tempos de frame em ms + média, p99 e máximo"""
+    milliseconds = np.asarray(frame_times, dtype=float) * 1e3
+    counts, edges = np.histogram(milliseconds, bins=bins)
+    stats = {'mean_ms': float(milliseconds.mean()), 'p99_ms': float(np.percentile(milliseconds, 99)),
+             'max_ms': float(milliseconds.max())}
+    return counts, edges, stats
+
+
+def prepare_report(recording: Mapping[str, np.ndarray], channels: Optional[Sequence[str]] = None,
+                   buckets: int = 2000, bins: int = 100, title: str = 'Gravação de voo') -> ReportData:
+    """Decima cada painel da gravação (sem matplotlib)"""
+    if TIME not in recording:
+        raise ValueError(f"Gravação sem a coluna '{TIME}'")
+    time = recording[TIME]
+    report = ReportData(title=title, samples=len(time), duration=float(time[-1] - time[0]) if len(time) else 0.0)
+
+    names = list(recording.keys())
+    if all(name in names for name in POSITION[:2]):
+        report.path = decimate_path(recording['east'], recording['north'], buckets)
+    if POSITION[2] in names:
+        altitude_time, altitude = minmax_decimate(time, recording['down'], buckets)
+        report.altitude = Series('altitude', altitude_time, -altitude)
+
+    if channels is None:
+        channels = [name for name in names if name not in (TIME, FRAME_TIME) + POSITION]
+    for name in channels:
+        report.series.append(Series(name, *minmax_decimate(time, recording[name], buckets)))
+
+    if FRAME_TIME in names:
+        counts, edges, stats = frame_time_histogram(recording[FRAME_TIME], bins)
+        report.histogram = (counts, edges)
+        report.frame_stats = stats
+    return report
+
+
+def _require_matplotlib():
+    try:
+        import matplotlib
+    except ImportError as error:
+        raise ImportError("draw_report requer matplotlib (pip install matplotlib)") from error
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def draw_report(report: ReportData, output_path: str, dpi: int = 110) -> str:
+    """Figura multi-painel: trajetória, altitude, séries temporais e tempos de frame"""
+    plt = _require_matplotlib()
+    top = [panel for panel in ('path', 'altitude', 'histogram') if getattr(report, panel) is not None]
+    rows = (1 if top else 0) + len(report.series)
+    figure = plt.figure(figsize=(12, 2.2 * rows + 1.5))
+    grid = figure.add_gridspec(max(rows, 1), max(len(top), 1))
+
+    for column, panel in enumerate(top):
+        axes = figure.add_subplot(grid[0, column])
+        if panel == 'path':
+            east, north = report.path
+            axes.plot(east, north, linewidth=0.8)
+            axes.set_xlabel('leste [m]')
+            axes.set_ylabel('norte [m]')
+            axes.set_aspect('equal', adjustable='datalim')
+            axes.set_title('Trajetória')
+        elif panel == 'altitude':
+            axes.plot(report.altitude.time, report.altitude.values, linewidth=0.8)
+            axes.set_xlabel('t [s]')
+            axes.set_ylabel('altitude [m]')
+            axes.set_title('Perfil de altitude')
+        else:
+            counts, edges = report.histogram
+            axes.stairs(counts, edges, fill=True)
+            for key, style in (('mean_ms', '-'), ('p99_ms', '--')):
+                axes.axvline(report.frame_stats[key], color='k', linestyle=style, linewidth=0.8, label=key)
+            axes.set_xlabel('tempo de frame [ms]')
+            axes.set_title('Tempos de frame')
+            axes.legend(fontsize='small')
+
+    first = 1 if top else 0
+    shared = None
+    for row, series in enumerate(report.series):
+        axes = figure.add_subplot(grid[first + row, :], sharex=shared)
+        shared = shared or axes
+        axes.plot(series.time, series.values, linewidth=0.6)
+        axes.set_ylabel(series.name)
+        axes.grid(True, alpha=0.3)
+    if report.series:
+        axes.set_xlabel('t [s]')
+
+    figure.suptitle(f"{report.title} - {report.samples} amostras, {report.duration:.0f} s")
+    figure.tight_layout()
+    figure.savefig(output_path, dpi=dpi)
+    plt.close(figure)
+    return output_path
+
+
+def render_report(recording_path: str, output_path: str, channels: Optional[Sequence[str]] = None,
+                  buckets: int = 2000, bins: int = 100) -> str:
+    """Carrega, decima e desenha - ponto de entrada executado no processo de trabalho"""
+    recording = load_recording(recording_path)
+    title = os.path.splitext(os.path.basename(recording_path))[0]
+    report = prepare_report(recording, channels, buckets, bins, title)
+    return draw_report(report, output_path)
+
+
+class ReportWorker:
+    """
+    Processo dedicado aos relatórios: recebe só caminhos (nada de arrays
+    grandes serializados) e devolve Futures com o arquivo gerado
+    'spawn' evita herdar por fork as threads do simulador (áudio, force feel)
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self._executor = ProcessPoolExecutor(max_workers=max_workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+
+    def submit(self, recording_path: str, output_path: str, **options) -> Future:
+        return self._executor.submit(render_report, os.path.abspath(recording_path),
+                                     os.path.abspath(output_path), **options)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser = argparse.ArgumentParser(description="Relatório de uma gravação de voo (.npz/.npy)")
+    parser.add_argument('recording')
+    parser.add_argument('output', help="imagem/PDF de saída (ex.: relatorio.png)")
+    parser.add_argument('--channels', nargs='*')
+    parser.add_argument('--buckets', type=int, default=2000)
+    args = parser.parse_args()
+    with ReportWorker() as worker:
+        print(worker.submit(args.recording, args.output, channels=args.channels, buckets=args.buckets).result())
@@ -1,6 +1,10 @@
 from dataclasses import dataclass
 import math
 
+# Elipsoide WGS-84 (mesmas constantes de utils/coordinate_transforms.py; o mock é independente)
+WGS84_A = 6378137.0
+WGS84_E2 = (1.0 / 298.257223563) * (2.0 - 1.0 / 298.257223563)
+
 @dataclass
 class SimState:
     lat: float = -23.4322     # Galeão de presente ;)
@@ -35,14 +39,19 @@ def step_dynamics(s: SimState, ctrls, dt: float):
     s.v_ms = max(0.0, s.v_ms)
 
     # subir/descer por pitch (simplificado)
-    climb_rate = s.v_ms * math.sin(math.radians(s.pitch_deg))
+    pitch = math.radians(s.pitch_deg)
+    climb_rate = s.v_ms * math.sin(pitch)
     s.alt_m += climb_rate * dt
     s.alt_m = max(0.0, s.alt_m)
 
-    # avançar lat/lon pelo rumo e v horizontal
-    vxy = s.v_ms * math.cos(math.radians(s.pitch_deg))
-    R_earth = 6_371_000.0
-    d_north = vxy * math.cos(math.radians(s.yaw_deg)) * dt
-    d_east  = vxy * math.sin(math.radians(s.yaw_deg)) * dt
-    s.lat += (d_north / R_earth) * (180.0 / math.pi)
-    s.lon += (d_east  / (R_earth * math.cos(math.radians(s.lat)))) * (180.0 / math.pi)
+    # avançar lat/lon pelo rumo e v horizontal (elipsoide WGS-84)
+    vxy = s.v_ms * math.cos(pitch)
+    yaw = math.radians(s.yaw_deg)
+    sin_lat = math.sin(math.radians(s.lat))
+    w2 = 1.0 - WGS84_E2 * sin_lat * sin_lat
+    prime_vertical = WGS84_A / math.sqrt(w2)
+    meridian = prime_vertical * (1.0 - WGS84_E2) / w2
+    lat_dot = vxy * math.cos(yaw) / (meridian + s.alt_m)
+    lon_dot = vxy * math.sin(yaw) / ((prime_vertical + s.alt_m) * math.cos(math.radians(s.lat)))
+    s.lat += math.degrees(lat_dot) * dt
+    s.lon += math.degrees(lon_dot) * dt